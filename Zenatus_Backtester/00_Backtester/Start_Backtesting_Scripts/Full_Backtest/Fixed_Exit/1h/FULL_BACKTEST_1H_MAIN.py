@@ -8,7 +8,6 @@ import argparse
 import concurrent.futures
 import pandas as pd
 import numpy as np
-import importlib.util
 from pathlib import Path
 from datetime import datetime
 
@@ -19,6 +18,7 @@ DATA_PATH = BASE_PATH / "99_Historic_Data" / "Forex" / "Major"
 SPREADS_PATH = BASE_PATH / "00_Backtester" / "Spreads"
 PARAM_OPT_PATH = BASE_PATH / "01_Strategy" / "Parameter_Optimization"
 DOC_BASE = Path(r"/opt/Zenatus_Dokumentation")
+CORE_PATH = BASE_PATH / "00_Backtester" / "Zenatus_Core"
 
 # Output Paths
 RESULTS_DIR = DOC_BASE / "Dokumentation" / "Fixed_Exit" / "1h"
@@ -37,37 +37,43 @@ COMMISSION_PER_LOT = 3.0
 PIP_VALUE = 0.0001
 TIMEOUT_SEC = 1800  # 30m
 
+# Simulation
+SIM_MODE = "broadcast"  # "broadcast" (1-D close/entries, no copies) or "replicate" (legacy pd.concat)
+MEMORY_BUDGET_MB = 512  # Per-process budget, determines the TP/SL chunk size
+EXIT_ENGINE = "vectorbt"  # "vectorbt" (Portfolio.from_signals) or "first_passage" / "first_passage_close" (shared TP/SL first-hit tables, stops on open/high/low or close)
+REGISTRY_FILE = DOC_BASE / "Listing" / "strategy_registry.json"  # Index of INDICATORS_PATH, re-parsed per changed source
+REGISTRY = None  # StrategyRegistry (strategy_registry), inherited by the forked pool processes
+
 try:
     import vectorbt as vbt
 except:
     print("[FATAL] vectorbt not installed")
     sys.exit(1)
 
+sys.path.insert(0, str(CORE_PATH))
+from zenatus_core.first_passage import FIRST_PASSAGE_HIGH_LOW, engine_results_dir, first_passage_metrics
+from zenatus_core.memory import ChunkStats, run_chunks
+from zenatus_core.metrics import fixed_exit_metrics, metrics_frame
+from zenatus_core.registry import StrategyRegistry
+from zenatus_core.simulation import chunk_size_for_budget, simulate_fixed_exit
+from zenatus_core.store import frame_hash, load_ohlcv, source_path
+
+RESULTS_DIR = engine_results_dir(RESULTS_DIR, EXIT_ENGINE)
+
+CHUNK_STATS = ChunkStats()  # Chunk sizes, MemoryError shrinks and peak RSS of the running indicator
+
 def load_data():
     spreads_df = pd.read_csv(SPREADS_PATH / "FTMO_SPREADS_FOREX.csv")
     spreads = {row["Symbol"].replace("/", "_"): row["Typical_Spread_Pips"] for _, row in spreads_df.iterrows()}
     cache = {}
     for symbol in SYMBOLS:
-        fp = DATA_PATH / TIMEFRAME / symbol / f"{symbol}_aggregated.csv"
-        if not fp.exists():
-            print(f"[WARN] {symbol} data not found at {fp}")
+        # Memory-mapped store if converted (Zenatus_Core/CONVERT_OHLCV_STORE.py), else the aggregated CSV/parquet
+        df = load_ohlcv(DATA_PATH, TIMEFRAME, symbol, DATE_START, DATE_END)
+        if df is None:
+            print(f"[WARN] {symbol} data not found at {source_path(DATA_PATH, TIMEFRAME, symbol)}")
             continue
-        df = pd.read_csv(fp)
-        df.columns = [c.lower() for c in df.columns]
-        
-        # Handle duplicate columns
-        if len(df.columns) != len(set(df.columns)):
-            print(f"[WARN] Duplicate columns in {symbol}: {df.columns.tolist()}")
-            # Keep first occurrence
-            df = df.loc[:, ~df.columns.duplicated()]
-            
-        if "time" not in df.columns and "Time" in [c for c in df.columns]:
-            df.rename(columns={"Time": "time"}, inplace=True)
-        df["time"] = pd.to_datetime(df["time"])
-        df.set_index("time", inplace=True)
-        df = df[(df.index >= DATE_START) & (df.index < DATE_END)]
-        cache[symbol] = {"full": df}
-        print(f"[DATA] {symbol} bars={len(df)}")
+        cache[symbol] = {"full": df, "hash": frame_hash(df)}
+        print(f"[DATA] {symbol} bars={len(df)} hash={cache[symbol]['hash']}")
     return spreads, cache
 
 def get_combo_limit(ind_num):
@@ -189,155 +195,102 @@ def batch_backtest(df, entries, tp_sl_combos, spread_pips):
             sl_array.append(effective_sl)
             valid.append((tp_pips, sl_pips))
             
-    if not valid: return []
+    if not valid: return pd.DataFrame()
     
     # VectorBT Execution
-    # Note: For 10000 combos, doing all at once might be memory intensive.
-    # Splitting into chunks of 1000 might be safer.
+    # Chunk size follows the memory budget instead of a fixed 1000 combos.
+    chunk_size = chunk_size_for_budget(len(df), len(valid), MEMORY_BUDGET_MB, SIM_MODE, int(entries.sum()))
+    if EXIT_ENGINE in FIRST_PASSAGE_HIGH_LOW:
+        # Memory is O(entries x levels + combos), all combos share one first-hit table
+        chunk_size = len(valid)
     
-    CHUNK_SIZE = 1000
-    all_results = []
-    
-    for i in range(0, len(valid), CHUNK_SIZE):
-        chunk_valid = valid[i:i+CHUNK_SIZE]
-        chunk_tp = np.array(tp_array[i:i+CHUNK_SIZE])
-        chunk_sl = np.array(sl_array[i:i+CHUNK_SIZE])
-        
-        # Always use DataFrame to ensure consistent 2D shape for vbt
-        close_in = pd.concat([df["close"]]*len(chunk_valid), axis=1)
-        entries_in = pd.concat([entries]*len(chunk_valid), axis=1)
-        
-        # Ensure unique column names
-        cols = [f"c{k}" for k in range(len(chunk_valid))]
-        close_in.columns = cols
-        entries_in.columns = cols
+    def run_chunk(i, j):
+        chunk_valid = valid[i:j]
+        chunk_tp = np.array(tp_array[i:j])
+        chunk_sl = np.array(sl_array[i:j])
         
         try:
-            pf = vbt.Portfolio.from_signals(
-                close=close_in,
-                entries=entries_in,
-                exits=False,
-                tp_stop=chunk_tp,
-                sl_stop=chunk_sl,
-                init_cash=INITIAL_CAPITAL,
-                size=POSITION_SIZE,
-                size_type="amount",
-                fees=0.0,
-                freq=FREQ
-            )
-            
-            # Batch calculate metrics (much faster and avoids indexing issues)
-            # All these return Series of shape (N,)
-            m_trades = pf.trades.count()
-            m_total_profit = pf.total_profit()
-            
-            # Equity & Drawdown
-            equity = pf.value()
-            cummax = equity.expanding().max()
-            drawdowns = (equity - cummax) / cummax
-            m_max_dd = abs(drawdowns.min()) * 100
-            
-            m_win_rate = pf.trades.win_rate() * 100
-            m_pfactor = pf.trades.profit_factor()
-            m_sharpe = pf.sharpe_ratio()
-            
-            m_winning_trades = pf.trades.winning.count()
-            m_losing_trades = pf.trades.losing.count()
-            m_avg_win = pf.trades.winning.pnl.mean()
-            m_avg_loss = pf.trades.losing.pnl.mean()
-            m_highest_win = pf.trades.winning.pnl.max()
-            m_highest_loss = pf.trades.losing.pnl.min()
-            m_gross_profit = pf.trades.winning.pnl.sum()
-
-            lot_size = POSITION_SIZE / 100000
-
-            for idx, (tp_pips, sl_pips) in enumerate(chunk_valid):
-                trades = int(m_trades.iloc[idx])
-                if trades < 1: continue
-
-                total_profit = m_total_profit.iloc[idx]
-                total_commission = trades * COMMISSION_PER_LOT * lot_size
-                net_profit = total_profit - total_commission
-                net_return = (net_profit / INITIAL_CAPITAL) * 100
-                
-                max_dd = float(m_max_dd.iloc[idx])
-                win_rate = float(m_win_rate.iloc[idx])
-                pfactor = float(m_pfactor.iloc[idx])
-                sharpe = float(m_sharpe.iloc[idx])
+            if EXIT_ENGINE in FIRST_PASSAGE_HIGH_LOW:
+                metrics = first_passage_metrics(
+                    df,
+                    entries,
+                    chunk_tp,
+                    chunk_sl,
+                    init_cash=INITIAL_CAPITAL,
+                    size=POSITION_SIZE,
+                    commission_per_lot=COMMISSION_PER_LOT,
+                    lot_size=POSITION_SIZE / 100000,
+                    freq=FREQ,
+                    use_high_low=FIRST_PASSAGE_HIGH_LOW[EXIT_ENGINE]
+                )
+            else:
+                pf = simulate_fixed_exit(
+                    df["close"],
+                    entries,
+                    chunk_tp,
+                    chunk_sl,
+                    mode=SIM_MODE,
+                    exits=False,
+                    init_cash=INITIAL_CAPITAL,
+                    size=POSITION_SIZE,
+                    size_type="amount",
+                    fees=0.0,
+                    freq=FREQ
+                )
                 
-                winning_trades = int(m_winning_trades.iloc[idx])
-                losing_trades = int(m_losing_trades.iloc[idx])
-                avg_win = float(m_avg_win.iloc[idx])
-                avg_loss = float(m_avg_loss.iloc[idx])
-                highest_win = float(m_highest_win.iloc[idx])
-                highest_loss = float(m_highest_loss.iloc[idx])
-                gross_profit = float(m_gross_profit.iloc[idx])
+                # Fused metrics: one compiled pass over order records + close for all columns
+                metrics = fixed_exit_metrics(pf, COMMISSION_PER_LOT, POSITION_SIZE / 100000, FREQ)
+
+            traded = metrics["Total_Trades"] >= 1
+            if not traded.any(): return None
 
-                vals = {
-                    "TP_Pips": tp_pips,
-                    "SL_Pips": sl_pips,
-                    "Spread_Pips": spread_pips,
-                    "Slippage_Pips": SLIPPAGE_PIPS,
-                    "Entry_period": "NA",
-                    "Total_Return": float(f"{net_return:.4f}"),
-                    "Max_Drawdown": float(f"{max_dd:.4f}"),
-                    "Daily_Drawdown": 0.0,
-                    "Win_Rate_%": float(f"{win_rate:.2f}"),
-                    "Total_Trades": int(trades),
-                    "Winning_Trades": int(winning_trades),
-                    "Losing_Trades": int(losing_trades),
-                    "Avg_Win": float(f"{avg_win:.2f}") if not np.isnan(avg_win) else 0.0,
-                    "Avg_Loss": float(f"{avg_loss:.2f}") if not np.isnan(avg_loss) else 0.0,
-                    "Highest_Win": float(f"{highest_win:.2f}") if not np.isnan(highest_win) else 0.0,
-                    "Highest_Loss": float(f"{highest_loss:.2f}") if not np.isnan(highest_loss) else 0.0,
-                    "Gross_Profit": float(f"{gross_profit:.2f}"),
-                    "Commission": float(f"{total_commission:.2f}"),
-                    "Net_Profit": float(f"{net_profit:.2f}"),
-                    "Profit_Factor": float(f"{0.0 if np.isnan(pfactor) or np.isinf(pfactor) else pfactor:.3f}"),
-                    "Sharpe_Ratio": float(f"{0.0 if np.isnan(sharpe) or np.isinf(sharpe) else sharpe:.3f}"),
-                }
-                all_results.append(vals)
+            chunk_arr = np.array(chunk_valid)[traded]
+            frame = metrics_frame(metrics[traded])
+            frame.insert(0, "TP_Pips", chunk_arr[:, 0])
+            frame.insert(1, "SL_Pips", chunk_arr[:, 1])
+            frame.insert(2, "Spread_Pips", spread_pips)
+            frame.insert(3, "Slippage_Pips", SLIPPAGE_PIPS)
+            frame.insert(4, "Entry_period", "NA")
+            return frame
 
+        except MemoryError:
+            raise  # run_chunks halves the chunk and retries
         except Exception as e:
             print(f"[ERR-BATCH] {len(chunk_valid)} combos: {e}")
             import traceback
             traceback.print_exc()
-                
-    return all_results
+    
+    all_results = [r for r in run_chunks(len(valid), chunk_size, run_chunk, CHUNK_STATS) if r is not None]
+    if not all_results: return pd.DataFrame()
+    return pd.concat(all_results, ignore_index=True)
+
+def strategy_registry():
+    """Index of INDICATORS_PATH, built (or refreshed for changed sources) on first use."""
+    global REGISTRY
+    if REGISTRY is None:
+        REGISTRY = StrategyRegistry(INDICATORS_PATH, REGISTRY_FILE)
+    return REGISTRY
 
 def process_indicator(ind_name, spreads, data_cache):
     try:
         ind_num = int(ind_name.split("_")[0])
     except:
         return f"[SKIP] Invalid name {ind_name}"
-        
+    
+    CHUNK_STATS.reset()
     limit = get_combo_limit(ind_num)
     combos = generate_combos(ind_num, limit)
     
-    # Find Script
-    ind_path = None
-    for f in INDICATORS_PATH.glob(f"{ind_name}*.py"):
-        if f.stem == ind_name:
-            ind_path = f
-            break
-    if not ind_path:
+    # Find Script / Load Class (registry index instead of glob + dir(module) scan)
+    registry = strategy_registry()
+    if ind_name not in registry:
         return f"[SKIP] File not found {ind_name}"
-        
-    # Load Class
-    spec = importlib.util.spec_from_file_location(ind_name, ind_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    klass = None
-    for attr in dir(module):
-        obj = getattr(module, attr)
-        if isinstance(obj, type) and ("Indicator" in attr or hasattr(obj, "generate_signals_fixed")):
-            klass = obj
-            break
+    klass = registry.load_class(ind_name)
     if not klass:
         return f"[SKIP] Class not found {ind_name}"
         
     # Run
-    all_rows = []
+    all_frames = []
     start_time = time.time()
     
     for symbol in SYMBOLS:
@@ -347,6 +300,7 @@ def process_indicator(ind_name, spreads, data_cache):
         
         try:
             instance = klass()
+            instance.signals_only = True  # Entries only, exits come from tp_stop/sl_stop (zenatus_core.signals)
             signals = instance.generate_signals_fixed(df, {})
             entries = signals["entries"].values
             if isinstance(entries, np.ndarray):
@@ -355,17 +309,20 @@ def process_indicator(ind_name, spreads, data_cache):
             
             if entries.sum() > 0:
                 res = batch_backtest(df, entries, combos, spread_pips)
-                for r in res:
-                    row = {"Indicator_Num": ind_num, "Indicator": ind_name, "Symbol": symbol, "Timeframe": TIMEFRAME}
-                    row.update(r)
-                    all_rows.append(row)
+                if len(res):
+                    res.insert(0, "Indicator_Num", ind_num)
+                    res.insert(1, "Indicator", ind_name)
+                    res.insert(2, "Symbol", symbol)
+                    res.insert(3, "Timeframe", TIMEFRAME)
+                    res["Data_Hash"] = data_cache[symbol]["hash"]
+                    all_frames.append(res)
         except Exception as e:
             print(f"[ERR] {ind_name} {symbol}: {e}")
             import traceback
             traceback.print_exc()
             
     # Save
-    if all_rows:
+    if all_frames:
         RESULTS_DIR.mkdir(parents=True, exist_ok=True)
         csv_path = RESULTS_DIR / f"{ind_num:03d}_{ind_name}_{TIMEFRAME}.csv"
         
@@ -373,18 +330,18 @@ def process_indicator(ind_name, spreads, data_cache):
         cols = ["Indicator_Num","Indicator","Symbol","Timeframe","TP_Pips","SL_Pips","Spread_Pips","Slippage_Pips",
                 "Entry_period","Total_Return","Max_Drawdown","Daily_Drawdown","Win_Rate_%","Total_Trades",
                 "Winning_Trades","Losing_Trades","Avg_Win","Avg_Loss","Highest_Win","Highest_Loss",
-                "Gross_Profit","Commission","Net_Profit","Profit_Factor","Sharpe_Ratio"]
+                "Gross_Profit","Commission","Net_Profit","Profit_Factor","Sharpe_Ratio","Data_Hash"]
         
-        df_out = pd.DataFrame(all_rows)
+        df_out = pd.concat(all_frames, ignore_index=True)
         # Add missing columns with 0/NA
         for c in cols:
             if c not in df_out.columns:
                 df_out[c] = 0
         
         df_out[cols].to_csv(csv_path, index=False, float_format="%.6f")
-        return f"[DONE] {ind_name} saved with {len(all_rows)} rows. ({int(time.time()-start_time)}s)"
+        return f"[DONE] {ind_name} saved with {len(df_out)} rows. ({int(time.time()-start_time)}s) [{CHUNK_STATS.summary()}]"
     else:
-        return f"[DONE] {ind_name} produced no results."
+        return f"[DONE] {ind_name} produced no results. [{CHUNK_STATS.summary()}]"
 
 def main():
     print("=== FULL BACKTEST STARTED ===")
@@ -402,6 +359,7 @@ def main():
         print("Queue is empty.")
         return
         
+    print(f"[REGISTRY] {strategy_registry().summary()}")
     spreads, data_cache = load_data()
     
     # Parallel Execution
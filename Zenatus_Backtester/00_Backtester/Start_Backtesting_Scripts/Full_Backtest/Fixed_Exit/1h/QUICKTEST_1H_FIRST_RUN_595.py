@@ -6,8 +6,12 @@ import re
 import csv
 import os
 import argparse
+import contextlib
+import io
 import subprocess
 import threading
+import traceback
+import warnings
 from queue import Queue, Empty
 from pathlib import Path
 from datetime import datetime
@@ -22,11 +26,13 @@ DATA_PATH = BASE_PATH / "99_Historic_Data" / "Forex" / "Major"
 OUTPUT_PATH = BASE_PATH / "01_Backtest_System"
 SPREADS_PATH = BASE_PATH / "00_Backtester" / "Spreads"
 PARAM_OPT_PATH = BASE_PATH / "01_Strategy" / "Parameter_Optimization"
+CORE_PATH = BASE_PATH / "00_Backtester" / "Zenatus_Core"
 DOC_BASE = Path(r"/opt/Zenatus_Dokumentation")
 LOG_DIR = DOC_BASE / "LOG" / "1h"
 LISTING_DIR = DOC_BASE / "Listing" / "Quicktest" / "1h"
 SUCCESS_LISTING_FILE = LISTING_DIR / "indicators_succesful_backtested.json"
 BRIDGE_SCRIPT = BASE_PATH / "02_Agents" / "bridge_agent.py"
+COST_TABLE_FILE = DOC_BASE / "Listing" / "strategy_costs.json"  # Zenatus_Core/PROFILE_STRATEGIES.py
 LOG_FILES = {
     "ALL": LOG_DIR / "indicators_all.log",
     "ERROR": LOG_DIR / "indicators_errors.log",
@@ -48,6 +54,11 @@ SLIPPAGE_PIPS = 0.5
 COMMISSION_PER_LOT = 3.0
 pip_value = 0.0001
 
+sys.path.insert(0, str(CORE_PATH))
+from zenatus_core.pool import TASK_DONE, TASK_TIMEOUT, WarmWorkerPool
+from zenatus_core.profiling import expected_bars, predict_seconds, read_cost_table
+from zenatus_core.store import frame_hash, load_ohlcv, source_path
+
 try:
     import vectorbt as vbt
 except:
@@ -59,19 +70,13 @@ def load_data():
     spreads = {row["Symbol"].replace("/", "_"): row["Typical_Spread_Pips"] for _, row in spreads_df.iterrows()}
     cache = {}
     for symbol in SYMBOLS:
-        fp = DATA_PATH / TIMEFRAME / symbol / f"{symbol}_aggregated.csv"
-        if not fp.exists():
-            print(f"[WARN] {symbol} data not found at {fp}")
+        # Memory-mapped store if converted (Zenatus_Core/CONVERT_OHLCV_STORE.py), else the aggregated CSV/parquet
+        df = load_ohlcv(DATA_PATH, TIMEFRAME, symbol, DATE_START, DATE_END)
+        if df is None:
+            print(f"[WARN] {symbol} data not found at {source_path(DATA_PATH, TIMEFRAME, symbol)}")
             continue
-        df = pd.read_csv(fp)
-        df.columns = [c.lower() for c in df.columns]
-        if "time" not in df.columns and "Time" in [c for c in df.columns]:
-            df.rename(columns={"Time": "time"}, inplace=True)
-        df["time"] = pd.to_datetime(df["time"])
-        df.set_index("time", inplace=True)
-        df = df[(df.index >= DATE_START) & (df.index < DATE_END)]
-        cache[symbol] = {"full": df}
-        print(f"[DATA] {symbol} bars={len(df)}")
+        cache[symbol] = {"full": df, "hash": frame_hash(df)}
+        print(f"[DATA] {symbol} bars={len(df)} hash={cache[symbol]['hash']}")
     return spreads, cache
 
 def select_two_combos(ind_num, ind_name):
@@ -266,6 +271,7 @@ def run_indicator(ind_path, spreads, data_cache):
         df = data_cache[symbol]["full"]
         spread_pips = spreads.get(symbol, 2.0)
         instance = klass()
+        instance.signals_only = True  # Entries only, exits come from tp_stop/sl_stop (zenatus_core.signals)
         try:
             signals = instance.generate_signals_fixed(df, {})
         except:
@@ -287,6 +293,7 @@ def run_indicator(ind_path, spreads, data_cache):
                 "Slippage_Pips": SLIPPAGE_PIPS
             }
             row.update(r)
+            row["Data_Hash"] = data_cache[symbol]["hash"]
             all_rows.append(row)
     elapsed = time.time() - start
 
@@ -334,7 +341,7 @@ class Runner:
         base = self.indicator_path.stem
         stdout_fp = raw_dir / f"{base}.{stamp}.stdout.log"
         stderr_fp = raw_dir / f"{base}.{stamp}.stderr.log"
-        cmd = [sys.executable, str(Path(__file__)), str(self.indicator_path)]
+        cmd = [sys.executable, str(Path(__file__)), str(self.indicator_path), "--no-bridge"]
         t0 = time.time()
         p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         out_stream = Streamer(p.stdout, stdout_fp)
@@ -488,6 +495,74 @@ class Classifier:
         }
         return cat, info
 
+WARM = {}  # spreads, data_cache, data_lines of the parent; inherited by the forked pool workers
+
+def run_warm_task(ind_path):
+    """run_indicator in a warm pool worker, with the output a Runner child would have printed."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+    t0 = time.time()
+    # catch_warnings resets the once-per-location registry: every indicator reports its warnings like a fresh process
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr), warnings.catch_warnings():
+        try:
+            run_indicator(ind_path, WARM["spreads"], WARM["data_cache"])
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+    return {
+        "exit_code": exit_code,
+        "runtime_sec": int(time.time() - t0),
+        "stdout_lines": WARM["data_lines"] + stdout.getvalue().splitlines(),
+        "stderr_lines": stderr.getvalue().splitlines(),
+    }
+
+def write_raw_logs(ind_path, r):
+    raw_dir = LOG_DIR / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    r["stdout_fp"] = str(raw_dir / f"{ind_path.stem}.{stamp}.stdout.log")
+    r["stderr_fp"] = str(raw_dir / f"{ind_path.stem}.{stamp}.stderr.log")
+    for key, fp in (("stdout_lines", r["stdout_fp"]), ("stderr_lines", r["stderr_fp"])):
+        with open(fp, "a", encoding="utf-8") as f:
+            f.writelines(s + "\n" for s in r[key])
+    return r
+
+def run_warm(inds, timeout_sec, processes):
+    """Indicators in forked pool workers: data, vectorbt and the Numba kernels are loaded once, not per indicator."""
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        spreads, data_cache = load_data()
+    print(buf.getvalue(), end="")
+    WARM.update(spreads=spreads, data_cache=data_cache, data_lines=buf.getvalue().splitlines())
+    with WarmWorkerPool(run_warm_task, processes=processes, timeout_sec=timeout_sec) as pool:
+        for ind, status, r in pool.imap_unordered(inds):
+            if status == TASK_TIMEOUT:
+                r = {"exit_code": None, "runtime_sec": timeout_sec, "stdout_lines": [], "stderr_lines": []}
+            elif status != TASK_DONE:
+                r = {"exit_code": 1, "runtime_sec": 0, "stdout_lines": [],
+                     "stderr_lines": [f"[FATAL] pool worker {status}: {r}"]}
+            yield ind, write_raw_logs(ind, r)
+
+def run_isolated(inds, timeout_sec, max_workers):
+    """One fresh interpreter per indicator (Runner)."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(Runner(ind, timeout_sec=timeout_sec).run): ind for ind in inds}
+        for fut in concurrent.futures.as_completed(futures):
+            try:
+                r = fut.result()
+            except Exception as e:
+                r = {
+                    "exit_code": 1,
+                    "runtime_sec": 0,
+                    "stdout_lines": [],
+                    "stderr_lines": [str(e)],
+                    "stdout_fp": "",
+                    "stderr_fp": "",
+                }
+            yield futures[fut], r
+
 def self_timeout_threshold():
     return 900
 
@@ -508,50 +583,70 @@ def sync_success_listing():
         json.dump(payload, f, ensure_ascii=False, indent=2)
     return len(names)
 
-def validate_all(timeout_sec=900, limit=None, workers=0):
+def predicted_runtimes(inds):
+    """Predicted seconds per indicator run (import + one signals call per symbol), None if not profiled."""
+    table = read_cost_table(COST_TABLE_FILE)
+    bars = expected_bars(TIMEFRAME, DATE_START, DATE_END)
+    out = {}
+    for ind in inds:
+        row = table.get(ind.stem)
+        if row is not None and row.get("status") == "timeout":
+            out[ind.stem] = float("inf")
+            continue
+        sec = predict_seconds(row, bars, len(SYMBOLS))
+        out[ind.stem] = None if sec is None else sec + row.get("import_sec", 0)
+    return out
+
+def run_bridge():
+    """Sync the quicktest logs into the Listing JSONs (02_Agents/bridge_agent.py), once per run."""
+    if BRIDGE_SCRIPT.exists():
+        print(f"[BRIDGE] Running bridge agent: {BRIDGE_SCRIPT}")
+        try:
+            subprocess.run([sys.executable, str(BRIDGE_SCRIPT)], check=False)
+        except Exception as e:
+            print(f"[BRIDGE] Error running bridge: {e}")
+
+def validate_all(timeout_sec=900, limit=None, workers=0, skip_predicted_timeouts=False, isolated=False):
     inds = sorted(INDICATORS_PATH.glob("*.py"))
     if limit is not None:
         inds = inds[:limit]
     if not inds:
         return
+    # Profiled indicators longest first (the pool finishes together), unprofiled ones after them
+    predicted = predicted_runtimes(inds)
+    inds.sort(key=lambda p: (predicted[p.stem] is None, -(predicted[p.stem] or 0)))
+    if skip_predicted_timeouts:
+        for ind in [p for p in inds if (predicted[p.stem] or 0) >= timeout_sec]:
+            write_jsonl(LOG_FILES["TIMEOUT"], {"indicator": ind.stem, "reason": "PREDICTED_TIMEOUT",
+                                               "predicted_sec": predicted[ind.stem], "ts": datetime.utcnow().isoformat()})
+            print(f"[COST] {ind.stem} skipped, predicted {predicted[ind.stem]:.0f}s >= timeout {timeout_sec}s")
+            inds.remove(ind)
     max_workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
     max_workers = max(1, min(max_workers, len(inds)))
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
-        for ind in inds:
-            ind_name = ind.stem
-            try:
-                ind_num = int(ind_name.split("_")[0])
-            except:
-                ind_num = 0
-            combos_count = len(select_two_combos(ind_num, ind_name)) if ind_num else 0
-            write_jsonl(LOG_FILES["ALL"], {"indicator": ind_name, "status": "STARTED", "ts": datetime.utcnow().isoformat()})
-            write_jsonl(LOG_FILES["WORKING"], {"indicator": ind_name, "status": "RUNNING", "ts": datetime.utcnow().isoformat()})
-            fut = executor.submit(Runner(ind, timeout_sec=timeout_sec).run)
-            futures[fut] = (ind_name, ind_num, combos_count)
-        for fut in concurrent.futures.as_completed(futures):
-            ind_name, ind_num, combos_count = futures[fut]
-            try:
-                r = fut.result()
-            except Exception as e:
-                r = {
-                    "exit_code": 1,
-                    "runtime_sec": 0,
-                    "stdout_lines": [],
-                    "stderr_lines": [str(e)],
-                    "stdout_fp": "",
-                    "stderr_fp": "",
-                }
-            cat, info = Classifier().classify(ind_name, r)
-            write_jsonl(LOG_FILES[cat], info)
-            metrics = {
-                "Total_Return": info.get("net_return"),
-                "Max_Drawdown": info.get("max_dd"),
-                "Profit_Factor": info.get("profit_factor"),
-                "Sharpe_Ratio": info.get("sharpe_ratio"),
-                "Total_Trades": info.get("trades"),
-            }
-            print_progress(ind_num if ind_num else 0, ind_name, combos_count, metrics, info.get("runtime_sec", 0))
+    jobs = {}
+    for ind in inds:
+        ind_name = ind.stem
+        try:
+            ind_num = int(ind_name.split("_")[0])
+        except:
+            ind_num = 0
+        combos_count = len(select_two_combos(ind_num, ind_name)) if ind_num else 0
+        write_jsonl(LOG_FILES["ALL"], {"indicator": ind_name, "status": "STARTED", "ts": datetime.utcnow().isoformat()})
+        write_jsonl(LOG_FILES["WORKING"], {"indicator": ind_name, "status": "RUNNING", "ts": datetime.utcnow().isoformat()})
+        jobs[ind] = (ind_name, ind_num, combos_count)
+    results = run_isolated(inds, timeout_sec, max_workers) if isolated else run_warm(inds, timeout_sec, max_workers)
+    for ind, r in results:
+        ind_name, ind_num, combos_count = jobs[ind]
+        cat, info = Classifier().classify(ind_name, r)
+        write_jsonl(LOG_FILES[cat], info)
+        metrics = {
+            "Total_Return": info.get("net_return"),
+            "Max_Drawdown": info.get("max_dd"),
+            "Profit_Factor": info.get("profit_factor"),
+            "Sharpe_Ratio": info.get("sharpe_ratio"),
+            "Total_Trades": info.get("trades"),
+        }
+        print_progress(ind_num if ind_num else 0, ind_name, combos_count, metrics, info.get("runtime_sec", 0))
 
 def main():
     parser = argparse.ArgumentParser()
@@ -560,6 +655,9 @@ def main():
     parser.add_argument("--timeout-sec", type=int, default=900)
     parser.add_argument("--limit", type=int, default=None)
     parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--skip-predicted-timeouts", action="store_true", help="Do not run indicators the cost table predicts above --timeout-sec")
+    parser.add_argument("--isolated", action="store_true", help="One subprocess per indicator instead of the warm worker pool")
+    parser.add_argument("--no-bridge", action="store_true", help="Skip the bridge agent (Runner children, the parent runs it once)")
     parser.add_argument("indicator", nargs="?", default=None)
     args = parser.parse_args()
     if args.sync_success_listing:
@@ -568,21 +666,19 @@ def main():
         return
     ind_arg = Path(args.indicator) if args.indicator else None
     if args.validate_all:
-        validate_all(timeout_sec=args.timeout_sec, limit=args.limit, workers=args.workers)
-        return
-    spreads, data_cache = load_data()
-    if ind_arg and ind_arg.exists():
-        run_indicator(ind_arg, spreads, data_cache)
+        validate_all(timeout_sec=args.timeout_sec, limit=args.limit, workers=args.workers,
+                     skip_predicted_timeouts=args.skip_predicted_timeouts, isolated=args.isolated)
     else:
-        validate_all(timeout_sec=args.timeout_sec, limit=args.limit, workers=args.workers)
+        spreads, data_cache = load_data()
+        if ind_arg and ind_arg.exists():
+            run_indicator(ind_arg, spreads, data_cache)
+        else:
+            validate_all(timeout_sec=args.timeout_sec, limit=args.limit, workers=args.workers,
+                         skip_predicted_timeouts=args.skip_predicted_timeouts, isolated=args.isolated)
         
-    # Trigger Bridge Agent
-    if BRIDGE_SCRIPT.exists():
-        print(f"[BRIDGE] Running bridge agent: {BRIDGE_SCRIPT}")
-        try:
-            subprocess.run([sys.executable, str(BRIDGE_SCRIPT)], check=False)
-        except Exception as e:
-            print(f"[BRIDGE] Error running bridge: {e}")
+    # Trigger Bridge Agent: after all indicators, outside the per-indicator output the Classifier reads
+    if not args.no_bridge:
+        run_bridge()
             
     time.sleep(1)
 
@@ -10,6 +10,7 @@ from pathlib import Path
 QUEUE_FILE = Path(r"/opt/Zenatus_Dokumentation/Listing/Full_backtest/1h/indicators_working.json")
 BLOCKED_FILE = Path(r"/opt/Zenatus_Dokumentation/Listing/Full_backtest/1h/indicators_blocked.json")
 RESULTS_DIR = Path(r"/opt/Zenatus_Dokumentation/Dokumentation/Fixed_Exit/1h")
+ASSIGNMENT_FILE = Path(r"/opt/Zenatus_Dokumentation/LOG/1h/nodes/node_assignment.json")  # Written by RUN_ALL_10_NODES.py
 RUN_SCRIPT = Path(r"/opt/Zenatus_Backtester/00_Backtester/Start_Backtesting_Scripts/Full_Backtest/Fixed_Exit/1h/RUN_ALL_10_NODES.py")
 
 def main():
@@ -55,8 +56,14 @@ def main():
 
     # 4. Identify Current Strategies (First of each chunk)
     NUM_NODES = 10
-    chunk_size = (total_remaining + NUM_NODES - 1) // NUM_NODES
-    chunks = [scripts_to_run[i:i + chunk_size] for i in range(0, total_remaining, chunk_size)]
+    if ASSIGNMENT_FILE.exists():
+        # Cost-balanced launch: first remaining strategy of each node
+        remaining = set(scripts_to_run)
+        with open(ASSIGNMENT_FILE, "r", encoding="utf-8") as f:
+            chunks = [[s for s in c if s in remaining] for c in json.load(f).get("chunks", [])]
+    else:
+        chunk_size = (total_remaining + NUM_NODES - 1) // NUM_NODES
+        chunks = [scripts_to_run[i:i + chunk_size] for i in range(0, total_remaining, chunk_size)]
     
     stuck_candidates = []
     for chunk in chunks:
@@ -4,6 +4,7 @@ from pathlib import Path
 
 QUEUE_FILE = Path(r"/opt/Zenatus_Dokumentation/Listing/Full_backtest/1h/indicators_working.json")
 RESULTS_DIR = Path(r"/opt/Zenatus_Dokumentation/Dokumentation/Fixed_Exit/1h")
+ASSIGNMENT_FILE = Path(r"/opt/Zenatus_Dokumentation/LOG/1h/nodes/node_assignment.json")  # Written by RUN_ALL_10_NODES.py
 
 def main():
     # 1. Load Queue
@@ -29,11 +30,16 @@ def main():
     # Better: Loop through all scripts and check if done
     stuck_list = []
     
-    # Replicate Sharding Logic
+    # Replicate Sharding Logic (cost-balanced launches write their node assignment)
     NUM_NODES = 10
     total = len(all_scripts)
-    chunk_size = (total + NUM_NODES - 1) // NUM_NODES
-    chunks = [all_scripts[i:i + chunk_size] for i in range(0, total, chunk_size)]
+    if ASSIGNMENT_FILE.exists():
+        with open(ASSIGNMENT_FILE, "r", encoding="utf-8") as f:
+            chunks = json.load(f).get("chunks", [])
+        chunk_size = max((len(c) for c in chunks), default=0)
+    else:
+        chunk_size = (total + NUM_NODES - 1) // NUM_NODES
+        chunks = [all_scripts[i:i + chunk_size] for i in range(0, total, chunk_size)]
     
     print(f"Total: {total}, Chunk size: {chunk_size}")
     
@@ -6,9 +6,9 @@ import csv
 import os
 import argparse
 import concurrent.futures
+import functools
 import pandas as pd
 import numpy as np
-import importlib.util
 from pathlib import Path
 from datetime import datetime
 
@@ -19,6 +19,8 @@ DATA_PATH = BASE_PATH / "99_Historic_Data" / "Forex" / "Major"
 SPREADS_PATH = BASE_PATH / "00_Backtester" / "Spreads"
 PARAM_OPT_PATH = BASE_PATH / "01_Strategy" / "Parameter_Optimization"
 DOC_BASE = Path(r"/opt/Zenatus_Dokumentation")
+CORE_PATH = BASE_PATH / "00_Backtester" / "Zenatus_Core"
+VBT_PATH = BASE_PATH / "00_Backtester" / "Vectorbt_Master"
 
 # Settings
 TIMEFRAME = "30m"
@@ -44,6 +46,41 @@ SLIPPAGE_PIPS = 0.5  # Base slippage, might be adjusted per symbol if needed
 COMMISSION_PER_LOT = 3.0
 PIP_VALUE = 0.0001
 TIMEOUT_SEC = 1800  # 30m
+POOL_SIZE = 1  # Warm worker processes per node (RUN_ALL_10_NODES already runs 10 nodes)
+
+# Simulation
+SIM_MODE = "broadcast"  # "broadcast" (1-D close/entries, no copies) or "replicate" (legacy pd.concat)
+MEMORY_BUDGET_MB = 512  # Per-process budget, determines the TP/SL chunk size
+CROSS_SYMBOL = False  # True: all SYMBOLS of an entry param set in one (bars x symbols*combos) simulation
+EXIT_ENGINE = "vectorbt"  # "vectorbt" (Portfolio.from_signals) or "first_passage" / "first_passage_close" (shared TP/SL first-hit tables, stops on open/high/low or close)
+SIM_THREADS = 1  # Threads per simulation call, >1 simulates the TP/SL columns in parallel (vendored vectorbt)
+
+# Entry param search
+SEARCH_MODE = "grid"  # "grid" or "successive-halving" (prune entry combos on growing date prefixes)
+SH_ETA = 3  # Successive halving: keep the best 1/eta per stage, window grows by eta
+SH_STAGES = 3  # Successive halving: stages including the final full-range run
+ENTRY_BATCH_SIZE = 64  # Entry param sets per generate_entries_batch call (strategies that implement it), 0: per param set
+
+# Data
+SHM_MANIFEST = None  # Shared-memory manifest of the RUN_ALL launcher (--shm-manifest), None: load from disk
+RESAMPLE_FROM_BASE = False  # True: build TIMEFRAME from the finest base timeframe even if it has its own aggregate
+EXTEND_MODE = False  # True: continue from the checkpoint of the last run, only bars after it (INGEST_NEW_BARS.py) are simulated
+PANEL = None  # Aligned symbols x bars x fields panel of data_cache (build_panel), inherited by the forked pool processes
+PRIMITIVE_CACHE_MB = 256  # Memoized SMA/EMA/RSI/ATR/... for strategies that opt in (zenatus_core.primitives), 0: off
+PRIMITIVES = None  # PrimitiveCache of this process (load_data), each pool process fills its own copy
+REGISTRY_FILE = DOC_BASE / "Listing" / "strategy_registry.json"  # Index of INDICATORS_PATH, re-parsed per changed source
+REGISTRY = None  # StrategyRegistry (strategy_registry), inherited by the forked pool processes
+SIGNAL_CACHE_DIR = DOC_BASE / "Cache" / "signals"  # Shared by all nodes and timeframes (zenatus_core.signal_cache)
+SIGNAL_CACHE_MB = 2048  # LRU size bound of SIGNAL_CACHE_DIR, 0: off
+SIGNALS = None  # SignalCache of this process (load_data)
+
+# Results
+OUTPUT_FORMATS = ["csv", "parquet"]  # Streamed per indicator, the CSV is kept for the existing tooling
+RESULT_FLUSH_ROWS = 20000  # Rows buffered before a batch is written (bounds memory)
+
+# Vendored vectorbt first (parallel from_signals), installed package as fallback
+if VBT_PATH.exists():
+    sys.path.insert(0, str(VBT_PATH))
 
 try:
     import vectorbt as vbt
@@ -51,31 +88,51 @@ except:
     print("[FATAL] vectorbt not installed")
     sys.exit(1)
 
+sys.path.insert(0, str(CORE_PATH))
+from zenatus_core.extend import ExtendCheckpoint, extend_metrics, initial_state, simulate_window, stops_hash
+from zenatus_core.first_passage import EXIT_ENGINES, FIRST_PASSAGE_HIGH_LOW, engine_results_dir, first_passage_metrics
+from zenatus_core.metrics import fixed_exit_metrics, metrics_frame
+from zenatus_core.panel import Panel
+from zenatus_core.primitives import PrimitiveCache
+from zenatus_core.registry import StrategyRegistry
+from zenatus_core.pool import TASK_CRASHED, TASK_ERROR, TASK_TIMEOUT, WarmWorkerPool
+from zenatus_core.memory import ChunkStats, run_chunks
+from zenatus_core.resample import load_timeframe
+from zenatus_core.results import RESULT_FORMATS, ResultWriter
+from zenatus_core.search import SEARCH_MODES, successive_halving
+from zenatus_core.signal_cache import SignalCache
+from zenatus_core.signals import EntryBatches, entries_fingerprint
+from zenatus_core.shm import attach_frames
+from zenatus_core.simulation import (SIM_MODES, chunk_size_for_budget, simulate_fixed_exit,
+                                     simulate_fixed_exit_cross)
+from zenatus_core.store import frame_hash, source_path
+
 def load_data():
+    global PRIMITIVES, SIGNALS
     spreads_df = pd.read_csv(SPREADS_PATH / "FTMO_SPREADS_FOREX.csv")
     spreads = {row["Symbol"].replace("/", "_"): row["Typical_Spread_Pips"] for _, row in spreads_df.iterrows()}
     cache = {}
+    # Symbols preloaded by the RUN_ALL launcher: read-only views on shared memory, no copy
+    shared = attach_frames(SHM_MANIFEST, TIMEFRAME, DATE_START, DATE_END) if SHM_MANIFEST else {}
     for symbol in SYMBOLS:
-        fp = DATA_PATH / TIMEFRAME / symbol / f"{symbol}_aggregated.csv"
-        if not fp.exists():
-            print(f"[WARN] {symbol} data not found at {fp}")
+        df = shared.get(symbol)
+        if df is None:
+            # Memory-mapped store if converted (Zenatus_Core/CONVERT_OHLCV_STORE.py), else the aggregated CSV/parquet;
+            # timeframes without an aggregate (2h, 3h, ...) are resampled from the finest base and cached
+            df = load_timeframe(DATA_PATH, TIMEFRAME, symbol, DATE_START, DATE_END, RESAMPLE_FROM_BASE)
+        if df is None:
+            print(f"[WARN] {symbol} data not found at {source_path(DATA_PATH, TIMEFRAME, symbol)}")
             continue
-        df = pd.read_csv(fp)
-        df.columns = [c.lower() for c in df.columns]
-        
-        # Handle duplicate columns
-        if len(df.columns) != len(set(df.columns)):
-            print(f"[WARN] Duplicate columns in {symbol}: {df.columns.tolist()}")
-            # Keep first occurrence
-            df = df.loc[:, ~df.columns.duplicated()]
-            
-        if "time" not in df.columns and "Time" in [c for c in df.columns]:
-            df.rename(columns={"Time": "time"}, inplace=True)
-        df["time"] = pd.to_datetime(df["time"])
-        df.set_index("time", inplace=True)
-        df = df[(df.index >= DATE_START) & (df.index < DATE_END)]
-        cache[symbol] = {"full": df}
-        print(f"[DATA] {symbol} bars={len(df)}")
+        # Validated at conversion/ingest (validate.py), the hash goes into every result row
+        cache[symbol] = {"full": df, "hash": frame_hash(df)}
+        print(f"[DATA] {symbol} bars={len(df)} hash={cache[symbol]['hash']}"
+              + (" (shared memory)" if symbol in shared else ""))
+    if PRIMITIVE_CACHE_MB:
+        PRIMITIVES = PrimitiveCache(PRIMITIVE_CACHE_MB)
+        for entry in cache.values():
+            PRIMITIVES.register(entry["full"], entry["hash"])
+    if SIGNAL_CACHE_MB:
+        SIGNALS = SignalCache(SIGNAL_CACHE_DIR, SIGNAL_CACHE_MB)
     return spreads, cache
 
 import itertools
@@ -205,7 +262,88 @@ def calculate_metrics(pf, spread_pips, tp_pips, sl_pips, entry_params):
     }
     return vals
 
-def batch_backtest(df, entries, tp_sl_combos, spread_pips):
+def strategy_instance(klass):
+    instance = klass()
+    instance.signals_only = True  # Entries only, exits come from tp_stop/sl_stop (zenatus_core.signals)
+    instance.primitives = PRIMITIVES
+    return instance
+
+def entry_batches(klass, df, entry_combos):
+    """EntryBatches over the entry combos of one symbol if the strategy has generate_entries_batch, else None."""
+    if not ENTRY_BATCH_SIZE or not hasattr(klass, "generate_entries_batch"):
+        return None
+    return EntryBatches(strategy_instance(klass), df, entry_combos, ENTRY_BATCH_SIZE)
+
+def generate_entries(klass, df, entry_params, symbol=None, batches=None, scope=None):
+    if PANEL is not None and symbol is not None and hasattr(klass, "generate_signals_panel"):
+        # Cross-asset strategy: entries of all symbols in one call on the panel, cached per param set
+        return PANEL.entries(klass, symbol, entry_params)
+    if SIGNALS is not None and scope is not None:
+        # Same strategy source, bars and params as an earlier run: packed entries from disk
+        values = SIGNALS.entries(scope, entry_params, len(df),
+                                 lambda: compute_entries(klass, df, entry_params, batches).values)
+        return pd.Series(values, index=df.index)
+    return compute_entries(klass, df, entry_params, batches)
+
+def compute_entries(klass, df, entry_params, batches=None):
+    if batches is not None:
+        # Batch strategy: ENTRY_BATCH_SIZE param sets per call (bars x params matrix)
+        return batches.entries(entry_params)
+    instance = strategy_instance(klass)
+
+    try:
+        signals = instance.generate_signals_fixed(df, entry_params)
+    except TypeError:
+        for k, v in entry_params.items():
+            setattr(instance, k, v)
+        signals = instance.generate_signals_fixed(df, {})
+
+    # Robust extraction of entries
+    if isinstance(signals, dict):
+        if "entries" in signals:
+            entries = signals["entries"]
+        elif "Entries" in signals:
+            entries = signals["Entries"]
+        else:
+            # Fallback: assume the dict might contain Series/Arrays directly if not keyed
+            raise ValueError(f"Signals dict missing 'entries' key. Keys: {list(signals.keys())}")
+    else:
+        entries = signals
+
+    if hasattr(entries, "values"):
+        entries = entries.values
+
+    if not isinstance(entries, np.ndarray):
+        entries = np.array(entries)
+
+    if entries.ndim > 1:
+        entries = entries.flatten()
+
+    if len(entries) != len(df):
+         raise ValueError(f"Entries length {len(entries)} != DF length {len(df)}")
+
+    entries = pd.Series(entries, index=df.index)
+    return entries.fillna(False).astype(bool)
+
+def results_frame(metrics, tp_sl_combos, spread_pips):
+    """CSV result columns for all combos with at least one trade (spread_pips: scalar or per combo)."""
+    traded = metrics["Total_Trades"] >= 1
+    combos = np.array(tp_sl_combos).reshape(-1, 2)[traded]
+    frame = metrics_frame(metrics[traded])
+    frame.insert(0, "TP_Pips", combos[:, 0])
+    frame.insert(1, "SL_Pips", combos[:, 1])
+    frame.insert(2, "Spread_Pips", spread_pips if np.isscalar(spread_pips) else np.asarray(spread_pips)[traded])
+    frame.insert(3, "Slippage_Pips", SLIPPAGE_PIPS)
+    frame.insert(4, "Entry_period", "NA")
+    return frame
+
+CHUNK_STATS = ChunkStats()  # Chunk sizes, MemoryError shrinks and peak RSS of the running indicator
+
+def sim_parallel_kwargs():
+    """from_signals kwargs for the column-parallel simulation (only with SIM_THREADS > 1)."""
+    return {"parallel": SIM_THREADS} if SIM_THREADS > 1 else {}
+
+def batch_backtest(df, entries, tp_sl_combos, spread_pips, checkpoint=None, checkpoint_key=None):
     tp_array = []
     sl_array = []
     valid = []
@@ -217,147 +355,340 @@ def batch_backtest(df, entries, tp_sl_combos, spread_pips):
             sl_array.append(effective_sl)
             valid.append((tp_pips, sl_pips))
             
-    if not valid: return []
+    if not valid: return pd.DataFrame()
+    if checkpoint is not None:
+        return extend_backtest(df, entries, valid, tp_array, sl_array, spread_pips, checkpoint, checkpoint_key)
     
     # VectorBT Execution
-    # Note: For 10000 combos, doing all at once might be memory intensive.
-    # Splitting into smaller chunks reduces RAM-Spitzenlast.
+    # Chunk size follows the memory budget: broadcast mode only allocates per-column
+    # state, so far more combos fit into one call than with replicated frames.
+    chunk_size = chunk_size_for_budget(len(df), len(valid), MEMORY_BUDGET_MB, SIM_MODE, int(entries.sum()))
+    if EXIT_ENGINE in FIRST_PASSAGE_HIGH_LOW:
+        # Memory is O(entries x levels + combos), all combos share one first-hit table
+        chunk_size = len(valid)
     
-    CHUNK_SIZE = 100
-    all_results = []
-    
-    for i in range(0, len(valid), CHUNK_SIZE):
-        chunk_valid = valid[i:i+CHUNK_SIZE]
-        chunk_tp = np.array(tp_array[i:i+CHUNK_SIZE])
-        chunk_sl = np.array(sl_array[i:i+CHUNK_SIZE])
-        
-        # Always use DataFrame to ensure consistent 2D shape for vbt
-        close_in = pd.concat([df["close"]]*len(chunk_valid), axis=1)
-        entries_in = pd.concat([entries]*len(chunk_valid), axis=1)
-        
-        # Ensure unique column names
-        cols = [f"c{k}" for k in range(len(chunk_valid))]
-        close_in.columns = cols
-        entries_in.columns = cols
+    def run_chunk(i, j):
+        chunk_valid = valid[i:j]
+        chunk_tp = np.array(tp_array[i:j])
+        chunk_sl = np.array(sl_array[i:j])
         
         try:
-            pf = vbt.Portfolio.from_signals(
-                close=close_in,
-                entries=entries_in,
+            if EXIT_ENGINE in FIRST_PASSAGE_HIGH_LOW:
+                metrics = first_passage_metrics(
+                    df,
+                    entries,
+                    chunk_tp,
+                    chunk_sl,
+                    init_cash=INITIAL_CAPITAL,
+                    size=POSITION_SIZE,
+                    commission_per_lot=COMMISSION_PER_LOT,
+                    lot_size=POSITION_SIZE / 100000,
+                    freq=FREQ,
+                    use_high_low=FIRST_PASSAGE_HIGH_LOW[EXIT_ENGINE]
+                )
+            else:
+                pf = simulate_fixed_exit(
+                    df["close"],
+                    entries,
+                    chunk_tp,
+                    chunk_sl,
+                    mode=SIM_MODE,
+                    exits=False,
+                    init_cash=INITIAL_CAPITAL,
+                    size=POSITION_SIZE,
+                    size_type="amount",
+                    fees=0.0,
+                    freq=FREQ,
+                    **sim_parallel_kwargs()
+                )
+                
+                # Fused metrics: one compiled pass over order records + close for all columns
+                metrics = fixed_exit_metrics(pf, COMMISSION_PER_LOT, POSITION_SIZE / 100000, FREQ)
+
+            return results_frame(metrics, chunk_valid, spread_pips)
+
+        except MemoryError:
+            raise  # run_chunks halves the chunk and retries
+        except Exception as e:
+            print(f"[ERR-BATCH] {len(chunk_valid)} combos: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    all_results = [r for r in run_chunks(len(valid), chunk_size, run_chunk, CHUNK_STATS) if r is not None]
+    if not all_results: return pd.DataFrame()
+    return pd.concat(all_results, ignore_index=True)
+
+def extend_backtest(df, entries, valid, tp_array, sl_array, spread_pips, checkpoint, checkpoint_key):
+    """
+    Extend mode of batch_backtest: if the checkpoint still matches (old bars
+    and entries unchanged) only the bars from the earliest open trade on are
+    simulated, otherwise a full run. Stores the new checkpoint either way.
+    """
+    stops = stops_hash(tp_array, sl_array, INITIAL_CAPITAL, POSITION_SIZE, COMMISSION_PER_LOT)
+    state = checkpoint.lookup(checkpoint_key, df, entries.values, stops)
+    resumed = state is not None
+    if resumed:
+        checkpoint.resumed += 1
+        checkpoint.window_bars.append(len(df) - int(state["resume"].min()))
+    else:
+        checkpoint.full += 1
+        state = initial_state(float(INITIAL_CAPITAL), len(valid))
+    
+    # The window entries are (bars x combos), chunk like replicated frames
+    n_bars = len(df) - int(state["resume"].min())
+    chunk_size = chunk_size_for_budget(n_bars, len(valid), MEMORY_BUDGET_MB, "replicate" if resumed else SIM_MODE,
+                                       int(entries.sum()))
+    pf_kwargs = dict(exits=False, size=POSITION_SIZE, size_type="amount", fees=0.0, freq=FREQ, **sim_parallel_kwargs())
+    
+    def run_chunk(i, j):
+        chunk_state = state[i:j]
+        if resumed:
+            pf, cut = simulate_window(df["close"], entries.values, chunk_state, tp_array[i:j], sl_array[i:j], **pf_kwargs)
+        else:
+            pf, cut = simulate_fixed_exit(df["close"], entries, np.array(tp_array[i:j]), np.array(sl_array[i:j]),
+                                          mode=SIM_MODE, init_cash=INITIAL_CAPITAL, **pf_kwargs), 0
+        metrics, new_state = extend_metrics(pf, df["close"].values, cut, chunk_state, COMMISSION_PER_LOT,
+                                            POSITION_SIZE / 100000, FREQ)
+        return results_frame(metrics, valid[i:j], spread_pips), new_state
+    
+    try:
+        parts = run_chunks(len(valid), chunk_size, run_chunk, CHUNK_STATS)
+    except MemoryError:
+        raise
+    except Exception as e:
+        print(f"[ERR-EXTEND] {len(valid)} combos: {e}")
+        return pd.DataFrame()
+    checkpoint.put(checkpoint_key, df, entries.values, stops, np.concatenate([p[1] for p in parts]))
+    return pd.concat([p[0] for p in parts], ignore_index=True)
+
+def batch_backtest_cross(aligned, batch, spreads):
+    """
+    Backtest several symbols in one simulation.
+
+    aligned: (index, close, valid, symbols) from PANEL.aligned_close
+    batch: list of (symbol, df, entries, tp_sl_combos), entries on the symbol's own index
+
+    Columns are laid out symbol-major (bars x symbols*combos) with per-column
+    spread-adjusted TP/SL. Returns one result frame per batch item.
+    """
+    if EXIT_ENGINE in FIRST_PASSAGE_HIGH_LOW:
+        # The first-passage engine already shares its work across all combos of a symbol
+        return [batch_backtest(df, entries, combos, spreads.get(symbol, 2.0)) for symbol, df, entries, combos in batch]
+    
+    index, close, valid_bars, symbols = aligned
+    entries_2d = np.zeros(close.shape, dtype=bool)
+    col_item, col_symbol, tp_array, sl_array, valid, spread_array = [], [], [], [], [], []
+    for b, (symbol, df, entries, combos) in enumerate(batch):
+        k = symbols.index(symbol)
+        entries_2d[PANEL.rows(symbol), k] = entries.values
+        spread_pips = spreads.get(symbol, 2.0)
+        for tp_pips, sl_pips in combos:
+            effective_tp = (tp_pips - spread_pips - SLIPPAGE_PIPS) * PIP_VALUE
+            effective_sl = (sl_pips + spread_pips + SLIPPAGE_PIPS) * PIP_VALUE
+            if effective_tp > 0 and effective_sl > 0:
+                col_item.append(b)
+                col_symbol.append(k)
+                tp_array.append(effective_tp)
+                sl_array.append(effective_sl)
+                valid.append((tp_pips, sl_pips))
+                spread_array.append(spread_pips)
+    
+    if not valid: return [pd.DataFrame() for _ in batch]
+    col_item = np.array(col_item)
+    col_symbol = np.array(col_symbol)
+    
+    max_entries = int(entries_2d.sum(axis=0).max())
+    chunk_size = chunk_size_for_budget(len(index), len(valid), MEMORY_BUDGET_MB, "cross", max_entries)
+    
+    def run_chunk(i, j):
+        chunk = slice(i, j)
+        try:
+            pf = simulate_fixed_exit_cross(
+                index,
+                close,
+                entries_2d,
+                col_symbol[chunk],
+                np.array(tp_array[chunk]),
+                np.array(sl_array[chunk]),
                 exits=False,
-                tp_stop=chunk_tp,
-                sl_stop=chunk_sl,
                 init_cash=INITIAL_CAPITAL,
                 size=POSITION_SIZE,
                 size_type="amount",
                 fees=0.0,
-                freq=FREQ
+                freq=FREQ,
+                **sim_parallel_kwargs()
             )
-            
-            # Batch calculate metrics (much faster and avoids indexing issues)
-            # All these return Series of shape (N,)
-            m_trades = pf.trades.count()
-            m_total_profit = pf.total_profit()
-            
-            # Equity & Drawdown
-            equity = pf.value()
-            cummax = equity.expanding().max()
-            drawdowns = (equity - cummax) / cummax
-            m_max_dd = abs(drawdowns.min()) * 100
-            
-            m_win_rate = pf.trades.win_rate() * 100
-            m_pfactor = pf.trades.profit_factor()
-            m_sharpe = pf.sharpe_ratio()
-            
-            m_winning_trades = pf.trades.winning.count()
-            m_losing_trades = pf.trades.losing.count()
-            m_avg_win = pf.trades.winning.pnl.mean()
-            m_avg_loss = pf.trades.losing.pnl.mean()
-            m_highest_win = pf.trades.winning.pnl.max()
-            m_highest_loss = pf.trades.losing.pnl.min()
-            m_gross_profit = pf.trades.winning.pnl.sum()
-
-            lot_size = POSITION_SIZE / 100000
-
-            for idx, (tp_pips, sl_pips) in enumerate(chunk_valid):
-                trades = int(m_trades.iloc[idx])
-                if trades < 1: continue
-
-                total_profit = m_total_profit.iloc[idx]
-                total_commission = trades * COMMISSION_PER_LOT * lot_size
-                net_profit = total_profit - total_commission
-                net_return = (net_profit / INITIAL_CAPITAL) * 100
-                
-                max_dd = float(m_max_dd.iloc[idx])
-                win_rate = float(m_win_rate.iloc[idx])
-                pfactor = float(m_pfactor.iloc[idx])
-                sharpe = float(m_sharpe.iloc[idx])
-                
-                winning_trades = int(m_winning_trades.iloc[idx])
-                losing_trades = int(m_losing_trades.iloc[idx])
-                avg_win = float(m_avg_win.iloc[idx])
-                avg_loss = float(m_avg_loss.iloc[idx])
-                highest_win = float(m_highest_win.iloc[idx])
-                highest_loss = float(m_highest_loss.iloc[idx])
-                gross_profit = float(m_gross_profit.iloc[idx])
-
-                vals = {
-                    "TP_Pips": tp_pips,
-                    "SL_Pips": sl_pips,
-                    "Spread_Pips": spread_pips,
-                    "Slippage_Pips": SLIPPAGE_PIPS,
-                    "Entry_period": "NA",
-                    "Total_Return": float(f"{net_return:.4f}"),
-                    "Max_Drawdown": float(f"{max_dd:.4f}"),
-                    "Daily_Drawdown": 0.0,
-                    "Win_Rate_%": float(f"{win_rate:.2f}"),
-                    "Total_Trades": int(trades),
-                    "Winning_Trades": int(winning_trades),
-                    "Losing_Trades": int(losing_trades),
-                    "Avg_Win": float(f"{avg_win:.2f}") if not np.isnan(avg_win) else 0.0,
-                    "Avg_Loss": float(f"{avg_loss:.2f}") if not np.isnan(avg_loss) else 0.0,
-                    "Highest_Win": float(f"{highest_win:.2f}") if not np.isnan(highest_win) else 0.0,
-                    "Highest_Loss": float(f"{highest_loss:.2f}") if not np.isnan(highest_loss) else 0.0,
-                    "Gross_Profit": float(f"{gross_profit:.2f}"),
-                    "Commission": float(f"{total_commission:.2f}"),
-                    "Net_Profit": float(f"{net_profit:.2f}"),
-                    "Profit_Factor": float(f"{0.0 if np.isnan(pfactor) or np.isinf(pfactor) else pfactor:.3f}"),
-                    "Sharpe_Ratio": float(f"{0.0 if np.isnan(sharpe) or np.isinf(sharpe) else sharpe:.3f}"),
-                }
-                all_results.append(vals)
-
+            metrics = fixed_exit_metrics(pf, COMMISSION_PER_LOT, POSITION_SIZE / 100000, FREQ,
+                                         close=close, close_col=col_symbol[chunk], valid=valid_bars)
+            frame = results_frame(metrics, valid[chunk], spread_array[chunk])
+            frame["_item"] = col_item[chunk][metrics["Total_Trades"] >= 1]
+            return frame
+        except MemoryError:
+            raise
         except Exception as e:
-            print(f"[ERR-BATCH] {len(chunk_valid)} combos: {e}")
+            print(f"[ERR-BATCH] {len(valid[chunk])} cross-symbol combos: {e}")
             import traceback
             traceback.print_exc()
-                
-    return all_results
-
-import multiprocessing
-
-def worker_process(ind_name, spreads, data_cache, queue, worker_id):
+    
+    all_results = [r for r in run_chunks(len(valid), chunk_size, run_chunk, CHUNK_STATS) if r is not None]
+    if not all_results: return [pd.DataFrame() for _ in batch]
+    full = pd.concat(all_results, ignore_index=True)
+    return [full[full["_item"] == b].drop(columns="_item").reset_index(drop=True) for b in range(len(batch))]
+
+def label_results(res, ind_num, ind_name, symbol, entry_params, data_hash="NA"):
+    res.insert(0, "Indicator_Num", ind_num)
+    res.insert(1, "Indicator", ind_name)
+    res.insert(2, "Symbol", symbol)
+    res.insert(3, "Timeframe", TIMEFRAME)
+    
+    p_idx = 1
+    for p_name, p_val in entry_params.items():
+        if p_idx <= 10:
+            res[f"Parameter {p_idx}"] = p_val
+        p_idx += 1
+    res["Data_Hash"] = data_hash  # Content hash of the bars the row was computed on
+    return res
+
+def run_cross_symbol(klass, ind_num, ind_name, entry_combos, exit_combos, limit, spreads, data_cache):
     """
-    Function to run in a separate process.
+    Cross-symbol mode: per entry param set all SYMBOLS run in one simulation.
+    Combo limits and entries dedup are tracked per symbol like in the per-symbol loop.
     """
-    try:
-        # Re-import needed modules here to be safe in multiprocessing context
-        import pandas as pd
-        import numpy as np
-        import importlib.util
-        import vectorbt as vbt # Ensure vbt is available
+    symbols = list(PANEL.symbols)  # = SYMBOLS in data_cache
+    frames = {s: [] for s in symbols}
+    dedup_hits = 0
+    if not symbols: return [], dedup_hits
+    
+    index, close, valid_bars = PANEL.aligned_close()
+    aligned = (index, close, valid_bars, symbols)
+    batches = {s: entry_batches(klass, data_cache[s]["full"], entry_combos) for s in symbols}
+    scopes = {s: signal_scope(ind_name, klass, s, data_cache) for s in symbols}
+    tests_run = {s: 0 for s in symbols}
+    seen_entries = {s: {} for s in symbols}  # (entries fingerprint, n exit combos) -> unlabelled results
+    failed = set()
+    
+    for entry_params in entry_combos:
+        active = [s for s in symbols if s not in failed and tests_run[s] < limit]
+        if not active: break
         
-        # We need to reconstruct the process_indicator logic here
-        # Or better, just call the logic function if we split it.
-        # But for minimal changes, let's just copy the logic or import it?
-        # Since this script IS the module, we can just use the function logic.
+        batch = []
+        for symbol in active:
+            df = data_cache[symbol]["full"]
+            current_exit_combos = exit_combos[:limit - tests_run[symbol]]
+            try:
+                entries = generate_entries(klass, df, entry_params, symbol, batches[symbol], scopes[symbol])
+            except Exception as e:
+                print(f"[ERR] {ind_name} {symbol}: {e}")
+                failed.add(symbol)
+                continue
+            
+            if entries.sum() == 0:
+                tests_run[symbol] += len(current_exit_combos)
+                continue
+            
+            key = (entries_fingerprint(entries.values), len(current_exit_combos))
+            if key in seen_entries[symbol]:
+                res = seen_entries[symbol][key].copy()
+                dedup_hits += 1
+                if len(res):
+                    frames[symbol].append(label_results(res, ind_num, ind_name, symbol, entry_params,
+                                                        data_cache[symbol]["hash"]))
+                tests_run[symbol] += len(res)
+            else:
+                batch.append((symbol, df, entries, current_exit_combos))
         
-        # NOTE: Passing 'data_cache' (large dict of DFs) to a process might be slow due to pickling.
-        # However, since we use 'fork' on Linux, it should be copy-on-write and fast.
+        if not batch: continue
         
-        res = run_indicator_logic(ind_name, spreads, data_cache, worker_id)
-        queue.put(res)
-    except Exception as e:
-        queue.put(f"[FATAL-WORKER] {e}")
+        for (symbol, df, entries, combos), res in zip(batch, batch_backtest_cross(aligned, batch, spreads)):
+            key = (entries_fingerprint(entries.values), len(combos))
+            seen_entries[symbol][key] = res.copy()
+            if len(res):
+                frames[symbol].append(label_results(res, ind_num, ind_name, symbol, entry_params,
+                                                    data_cache[symbol]["hash"]))
+            tests_run[symbol] += len(res)
+    
+    # Same row order as the per-symbol loop
+    return [f for s in symbols for f in frames[s]], dedup_hits
+
+def prune_entry_combos(klass, df, entry_combos, exit_combos, spread_pips, symbol=None, batches=None, scope=None):
+    """
+    Successive halving over the entry combos of one symbol.
+    Score of a combo: best Net_Profit over the exit combos on the date prefix.
+    Returns (survivors best first, stages).
+    """
+    scores = {}  # (entries fingerprint, prefix bars) -> score
+    
+    def score(entry_params, n_bars):
+        entries = generate_entries(klass, df, entry_params, symbol, batches, scope).iloc[:n_bars]
+        if entries.sum() == 0:
+            return np.nan
+        key = (entries_fingerprint(entries.values), n_bars)
+        if key not in scores:
+            res = batch_backtest(df.iloc[:n_bars], entries, exit_combos, spread_pips)
+            scores[key] = res["Net_Profit"].max() if len(res) else np.nan
+        return scores[key]
+    
+    return successive_halving(entry_combos, score, len(df), SH_ETA, SH_STAGES)
+
+def search_summary(search_log):
+    """Candidates per stage summed over symbols, e.g. 'SH: 120->40->14'."""
+    n_stages = max(len(stages) for stages in search_log.values())
+    counts = [sum(stages[k]["candidates"] for stages in search_log.values() if len(stages) > k) for k in range(n_stages)]
+    final = sum(stages[-1]["survivors"] for stages in search_log.values() if stages)
+    return "SH: " + "->".join(str(c) for c in counts + [final])
+
+def write_search_log(search_log, ind_num, ind_name):
+    """Stage survivors and timings next to the result files (audit trail of the pruning)."""
+    path = RESULTS_DIR / f"{ind_num:03d}_{ind_name}_{TIMEFRAME}_search.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"mode": SEARCH_MODE, "eta": SH_ETA, "stages": SH_STAGES,
+                   "date_start": DATE_START, "date_end": DATE_END, "symbols": search_log}, f, indent=2, default=str)
+
+def extend_checkpoint_path(ind_num, ind_name):
+    """Extend-mode checkpoint of one indicator, next to its results."""
+    return RESULTS_DIR / "extend_state" / f"{ind_num:03d}_{ind_name}_{TIMEFRAME}.npz"
+
+def build_panel(queue, data_cache):
+    """
+    PANEL of data_cache, only for cross-symbol mode or a queued cross-asset strategy
+    (generate_signals_panel): a dense copy of all symbols, built before the pool forks.
+    """
+    global PANEL
+    registry = strategy_registry()
+    if CROSS_SYMBOL or any(registry.has(name, "generate_signals_panel") for name in queue):
+        PANEL = Panel.from_frames({s: entry["full"] for s, entry in data_cache.items()})
+        print(f"[PANEL] {PANEL!r}")
+
+def strategy_registry():
+    """Index of INDICATORS_PATH, built (or refreshed for changed sources) on first use."""
+    global REGISTRY
+    if REGISTRY is None:
+        REGISTRY = StrategyRegistry(INDICATORS_PATH, REGISTRY_FILE)
+    return REGISTRY
+
+def signal_scope(ind_name, klass, symbol, data_cache):
+    """Signal cache key prefix of the indicator on one symbol, None if not cached (off / cross-asset / random strategy)."""
+    if SIGNALS is None or hasattr(klass, "generate_signals_panel"):
+        return None
+    strategy_hash = strategy_registry().signal_hash(ind_name)  # Source + the zenatus_core modules it uses
+    if strategy_hash is None:
+        return None
+    return SIGNALS.scope(strategy_hash, data_cache[symbol]["hash"], TIMEFRAME, DATE_START, DATE_END)
+
+def warm_up(spreads, data_cache):
+    """
+    Pool initializer: compile the simulation/metrics kernels once per worker
+    process, so indicator tasks start with warm Numba dispatchers.
+    """
+    for symbol in SYMBOLS:
+        if symbol not in data_cache: continue
+        df = data_cache[symbol]["full"].iloc[:500]
+        entries = pd.Series(False, index=df.index)
+        entries.iloc[::50] = True
+        batch_backtest(df, entries, [(20, 10), (30, 15)], spreads.get(symbol, 2.0))
+        if EXTEND_MODE:
+            batch_backtest(df, entries, [(20, 10), (30, 15)], spreads.get(symbol, 2.0), ExtendCheckpoint(), "warm-up")
+        break
 
 def log_status(fp, indicator, status, duration=0, details=""):
     entry = {
@@ -380,6 +711,13 @@ def run_indicator_logic(ind_name, spreads, data_cache, worker_id):
             ind_num = int(ind_name.split("_")[0])
         except:
             return f"[SKIP] Invalid name {ind_name}"
+        
+        # Chunk sizes / peak RSS are reported per indicator
+        CHUNK_STATS.reset()
+        if PRIMITIVES is not None:
+            PRIMITIVES.reset()
+        if SIGNALS is not None:
+            SIGNALS.reset()
             
         # Checkpoint Init
         checkpoint_file = CHECKPOINT_DIR / f"worker_{worker_id}_checkpoint.json"
@@ -390,46 +728,52 @@ def run_indicator_logic(ind_name, spreads, data_cache, worker_id):
         if not entry_combos or not exit_combos:
             return f"[SKIP] No combos found in Handbook for {ind_name}"
     
-        # Find Script
-        ind_path = None
-        for f in INDICATORS_PATH.glob(f"{ind_name}*.py"):
-            if f.stem == ind_name:
-                ind_path = f
-                break
-        if not ind_path:
+        # Find Script / Load Class (registry index instead of glob + dir(module) scan)
+        registry = strategy_registry()
+        if ind_name not in registry:
             return f"[SKIP] File not found {ind_name}"
-            
-        # Load Class
-        spec = importlib.util.spec_from_file_location(ind_name, ind_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        klass = None
-        for attr in dir(module):
-            obj = getattr(module, attr)
-            if isinstance(obj, type) and ("Indicator" in attr or hasattr(obj, "generate_signals_fixed")):
-                klass = obj
-                break
+        klass = registry.load_class(ind_name)
         if not klass:
             return f"[SKIP] Class not found {ind_name}"
             
         # Run
-        all_rows = []
+        writer = ResultWriter(RESULTS_DIR / f"{ind_num:03d}_{ind_name}_{TIMEFRAME}", OUTPUT_FORMATS, RESULT_FLUSH_ROWS)
         start_time = time.time()
         last_checkpoint_time = start_time
         
         # Global limit counter for this indicator
         total_tests_run = 0
+        dedup_hits = 0
+        search_log = {}  # symbol -> successive-halving stages
+        checkpoint = ExtendCheckpoint(extend_checkpoint_path(ind_num, ind_name)) if EXTEND_MODE else None
+        
+        # Cross-symbol mode replaces the per-symbol loop below
+        if CROSS_SYMBOL:
+            frames, dedup_hits = run_cross_symbol(klass, ind_num, ind_name, entry_combos, exit_combos,
+                                                  limit, spreads, data_cache)
+            for frame in frames:
+                writer.write(frame)
         
-        for symbol in SYMBOLS:
+        for symbol in ([] if CROSS_SYMBOL else SYMBOLS):
             if symbol not in data_cache: continue
             df = data_cache[symbol]["full"]
             spread_pips = spreads.get(symbol, 2.0)
+            scope = signal_scope(ind_name, klass, symbol, data_cache)
             
             symbol_tests_run = 0
+            seen_entries = {}  # (entries fingerprint, n exit combos) -> unlabelled results
             
             try:
+                symbol_entry_combos = entry_combos
+                batches = entry_batches(klass, df, entry_combos)
+                if SEARCH_MODE == "successive-halving":
+                    # Only the survivors of the prefix stages run on the full range
+                    symbol_entry_combos, stages = prune_entry_combos(klass, df, entry_combos, exit_combos[:limit],
+                                                                     spread_pips, symbol, batches, scope)
+                    search_log[symbol] = stages
+                
                 # Iterate through Entry Params
-                for entry_params in entry_combos:
+                for entry_params in symbol_entry_combos:
                     if symbol_tests_run >= limit:
                         break
                         
@@ -446,12 +790,12 @@ def run_indicator_logic(ind_name, spreads, data_cache, worker_id):
                                 "current_combo": total_tests_run + symbol_tests_run,
                                 "total_combos": limit, # Estimate
                                 "last_update": time.time(),
-                                "best_return": max([r["Total_Return"] for r in all_rows], default=0) if all_rows else 0,
-                                "best_dd": min([r["Max_Drawdown"] for r in all_rows], default=0) if all_rows else 0,
-                                "best_winrate": max([r["Win_Rate_%"] for r in all_rows], default=0) if all_rows else 0,
-                                "best_trades": max([r["Total_Trades"] for r in all_rows], default=0) if all_rows else 0,
-                                "best_pf": max([r["Profit_Factor"] for r in all_rows], default=0) if all_rows else 0,
-                                "best_sharpe": max([r["Sharpe_Ratio"] for r in all_rows], default=0) if all_rows else 0,
+                                "best_return": float(writer.col_max.get("Total_Return", 0)),
+                                "best_dd": float(writer.col_min.get("Max_Drawdown", 0)),
+                                "best_winrate": float(writer.col_max.get("Win_Rate_%", 0)),
+                                "best_trades": int(writer.col_max.get("Total_Trades", 0)),
+                                "best_pf": float(writer.col_max.get("Profit_Factor", 0)),
+                                "best_sharpe": float(writer.col_max.get("Sharpe_Ratio", 0)),
                             }
                             with open(checkpoint_file, "w") as f:
                                 json.dump(cp_data, f)
@@ -462,56 +806,22 @@ def run_indicator_logic(ind_name, spreads, data_cache, worker_id):
                     if len(current_exit_combos) > remaining:
                         current_exit_combos = current_exit_combos[:remaining]
                     
-                    instance = klass()
-                    
-                    try:
-                        signals = instance.generate_signals_fixed(df, entry_params)
-                    except TypeError:
-                        for k, v in entry_params.items():
-                            setattr(instance, k, v)
-                        signals = instance.generate_signals_fixed(df, {})
-                    
-                    # Robust extraction of entries
-                    if isinstance(signals, dict):
-                        if "entries" in signals:
-                            entries = signals["entries"]
-                        elif "Entries" in signals:
-                            entries = signals["Entries"]
-                        else:
-                            # Fallback: assume the dict might contain Series/Arrays directly if not keyed
-                            raise ValueError(f"Signals dict missing 'entries' key. Keys: {list(signals.keys())}")
-                    else:
-                        entries = signals
-
-                    if hasattr(entries, "values"):
-                        entries = entries.values
-                    
-                    if not isinstance(entries, np.ndarray):
-                        entries = np.array(entries)
-
-                    if entries.ndim > 1:
-                        entries = entries.flatten()
-
-                    if len(entries) != len(df):
-                         raise ValueError(f"Entries length {len(entries)} != DF length {len(df)}")
-
-                    entries = pd.Series(entries, index=df.index)
-                    entries = entries.fillna(False).astype(bool)
+                    entries = generate_entries(klass, df, entry_params, symbol, batches, scope)
                     
                     if entries.sum() > 0:
-                        res = batch_backtest(df, entries, current_exit_combos, spread_pips)
+                        # Params that do not change the entries vector give identical results
+                        key = (entries_fingerprint(entries.values), len(current_exit_combos))
+                        if key in seen_entries:
+                            res = seen_entries[key].copy()
+                            dedup_hits += 1
+                        else:
+                            res = batch_backtest(df, entries, current_exit_combos, spread_pips, checkpoint,
+                                                 ExtendCheckpoint.key(symbol, entry_params))
+                            seen_entries[key] = res.copy()
                         
-                        for r in res:
-                            row = {"Indicator_Num": ind_num, "Indicator": ind_name, "Symbol": symbol, "Timeframe": TIMEFRAME}
-                            row.update(r)
-                            
-                            p_idx = 1
-                            for p_name, p_val in entry_params.items():
-                                if p_idx <= 10:
-                                    row[f"Parameter {p_idx}"] = p_val
-                                p_idx += 1
-                            
-                            all_rows.append(row)
+                        if len(res):
+                            writer.write(label_results(res, ind_num, ind_name, symbol, entry_params,
+                                                       data_cache[symbol]["hash"]))
                             
                         symbol_tests_run += len(res)
                     else:
@@ -520,46 +830,37 @@ def run_indicator_logic(ind_name, spreads, data_cache, worker_id):
             except Exception as e:
                 print(f"[ERR] {ind_name} {symbol}: {e}")
                 
-        # Save
-        if all_rows:
-            RESULTS_DIR.mkdir(parents=True, exist_ok=True)
-            csv_path = RESULTS_DIR / f"{ind_num:03d}_{ind_name}_{TIMEFRAME}.csv"
-            
-            param_cols = [f"Parameter {i}" for i in range(1, 11)]
-            
-            cols = ["Indicator_Num","Indicator","Symbol","Timeframe"] + param_cols + \
-                   ["TP_Pips","SL_Pips","Spread_Pips","Slippage_Pips",
-                    "Entry_period","Total_Return","Max_Drawdown","Daily_Drawdown","Win_Rate_%","Total_Trades",
-                    "Winning_Trades","Losing_Trades","Avg_Win","Avg_Loss","Highest_Win","Highest_Loss",
-                    "Gross_Profit","Commission","Net_Profit","Profit_Factor","Sharpe_Ratio"]
+        # Save (rows were streamed, close renames the CSV and merges the parquet parts)
+        if writer.n_rows:
+            writer.close()
+            if search_log:
+                write_search_log(search_log, ind_num, ind_name)
+            if checkpoint is not None:
+                checkpoint.save()
             
-            df_out = pd.DataFrame(all_rows)
-            for c in cols:
-                if c not in df_out.columns:
-                    if "Parameter" in c:
-                        df_out[c] = "NA"
-                    else:
-                        df_out[c] = 0
-            
-            df_out[cols].to_csv(csv_path, index=False, float_format="%.6f")
-            
-            best_row = df_out.loc[df_out["Net_Profit"].idxmax()]
+            best_row = writer.best_row
             duration = time.time() - start_time
             
             # LOG SUCCESS
-            log_status(LOG_SUCCESS, ind_name, "SUCCESS", duration, f"Combos: {len(df_out)}")
+            log_status(LOG_SUCCESS, ind_name, "SUCCESS", duration, f"Combos: {writer.n_rows}, Dedup: {dedup_hits}")
             
             now_str = datetime.now().strftime("%H:%M:%S")
             duration_str = time.strftime("%H:%M:%S", time.gmtime(duration))
             
             summary = (f"[{now_str}] [{ind_num:03d}] [{ind_name}] [{TIMEFRAME}] "
-                       f"[Combos: {len(df_out)}] "
+                       f"[Combos: {writer.n_rows}] "
                        f"[Ret: {best_row['Total_Return']}%] "
                        f"[DD: {best_row['Max_Drawdown']}%] "
                        f"[PF: {best_row['Profit_Factor']}] "
                        f"[Sharpe: {best_row['Sharpe_Ratio']}] "
                        f"[Trades: {best_row['Total_Trades']}] "
                        f"[WR: {best_row['Win_Rate_%']}%] "
+                       f"[Dedup: {dedup_hits}] "
+                       + (f"[{search_summary(search_log)}] " if search_log else "") +
+                       (f"[{checkpoint.summary()}] " if checkpoint is not None else "") +
+                       (f"[{PRIMITIVES.summary()}] " if PRIMITIVES is not None and PRIMITIVES.misses else "") +
+                       (f"[{SIGNALS.summary()}] " if SIGNALS is not None and (SIGNALS.hits or SIGNALS.misses) else "") +
+                       f"[{CHUNK_STATS.summary()}] "
                        f"[{duration_str}]")
             
             return summary
@@ -573,36 +874,83 @@ def run_indicator_logic(ind_name, spreads, data_cache, worker_id):
         log_status(LOG_ERROR, ind_name, "ERROR", duration, str(e))
         return f"[FATAL] {ind_name} crashed: {e}"
 
-def process_indicator(ind_name, spreads, data_cache, worker_id):
-    # Wrapper that uses multiprocessing to enforce HARD TIMEOUT
-    q = multiprocessing.Queue()
-    p = multiprocessing.Process(target=worker_process, args=(ind_name, spreads, data_cache, q, worker_id))
-    p.start()
-    p.join(timeout=TIMEOUT_SEC)
-    
-    if p.is_alive():
-        p.terminate()
-        # Give it a second
-        time.sleep(1)
-        if p.is_alive():
-            p.kill() # Hard kill (SIGKILL)
-        print(f"[TIMEOUT] {ind_name} killed after {TIMEOUT_SEC}s")
-        log_status(LOG_TIMEOUT, ind_name, "TIMEOUT", TIMEOUT_SEC, "Process killed")
-        return f"[TIMEOUT] {ind_name} killed"
-    
-    if not q.empty():
-        return q.get()
-    else:
-        return f"[ERR] {ind_name} process finished but returned no result"
+def process_queue(queue, spreads, data_cache, worker_id):
+    # Warm worker pool; the supervisor enforces the HARD TIMEOUT per indicator
+    # and only recycles the process that overran.
+    task_fn = functools.partial(run_indicator_logic, spreads=spreads, data_cache=data_cache, worker_id=worker_id)
+    with WarmWorkerPool(task_fn, initializer=warm_up, initargs=(spreads, data_cache),
+                        processes=POOL_SIZE, timeout_sec=TIMEOUT_SEC) as pool:
+        for ind_name, status, res in pool.imap_unordered(queue):
+            if status == TASK_TIMEOUT:
+                print(f"[TIMEOUT] {ind_name} killed after {TIMEOUT_SEC}s")
+                log_status(LOG_TIMEOUT, ind_name, "TIMEOUT", TIMEOUT_SEC, "Process killed")
+                res = f"[TIMEOUT] {ind_name} killed"
+            elif status == TASK_CRASHED:
+                res = f"[ERR] {ind_name} process finished but returned no result"
+            elif status == TASK_ERROR:
+                res = f"[FATAL-WORKER] {res}"
+            print(f"[W{worker_id}] {res}")
 
 def main():
+    global RESULTS_DIR, SIM_MODE, MEMORY_BUDGET_MB, PRIMITIVE_CACHE_MB, SIGNAL_CACHE_MB, EXIT_ENGINE, ENTRY_BATCH_SIZE, POOL_SIZE, CROSS_SYMBOL, SIM_THREADS, OUTPUT_FORMATS, SEARCH_MODE, SHM_MANIFEST, RESAMPLE_FROM_BASE, EXTEND_MODE
+    
     parser = argparse.ArgumentParser()
     parser.add_argument("--scripts", type=str, help="Comma-separated list of scripts to process")
     parser.add_argument("--worker-id", type=int, default=0, help="ID of this worker node")
+    parser.add_argument("--sim-mode", type=str, choices=SIM_MODES, help="broadcast (default) or replicate (legacy pd.concat)")
+    parser.add_argument("--memory-budget-mb", type=int, help="Per-process memory budget for TP/SL chunking")
+    parser.add_argument("--primitive-cache-mb", type=int, help="Per-process indicator primitive cache, 0: off")
+    parser.add_argument("--signal-cache-mb", type=int, help="On-disk entry signal cache (shared by all nodes), 0: off")
+    parser.add_argument("--engine", type=str, choices=EXIT_ENGINES, help="vectorbt (default), first_passage (stops on open/high/low) or first_passage_close (stops on close); non-default engines write to RESULTS_DIR/<engine>")
+    parser.add_argument("--pool-size", type=int, help="Number of warm worker processes")
+    parser.add_argument("--cross-symbol", action="store_true", help="Simulate all symbols of an entry param set in one call")
+    parser.add_argument("--threads", type=int, help="Threads per simulation call (column-parallel from_signals)")
+    parser.add_argument("--search", type=str, choices=SEARCH_MODES, help="Entry param search: grid (default) or successive-halving")
+    parser.add_argument("--entry-batch-size", type=int, help="Entry param sets per generate_entries_batch call, 0: per param set")
+    parser.add_argument("--resample-from-base", action="store_true", help="Resample TIMEFRAME from the finest base timeframe")
+    parser.add_argument("--shm-manifest", type=str, help="Attach the OHLCV data preloaded by the launcher")
+    parser.add_argument("--extend", action="store_true", help="Only simulate the bars after the last run's checkpoint")
+    parser.add_argument("--output-formats", type=str, help=f"Comma-separated result formats {RESULT_FORMATS}")
     args = parser.parse_args()
 
     print(f"=== WORKER {args.worker_id} STARTED ===")
     
+    if args.sim_mode:
+        SIM_MODE = args.sim_mode
+    if args.memory_budget_mb:
+        MEMORY_BUDGET_MB = args.memory_budget_mb
+    if args.primitive_cache_mb is not None:
+        PRIMITIVE_CACHE_MB = args.primitive_cache_mb
+    if args.signal_cache_mb is not None:
+        SIGNAL_CACHE_MB = args.signal_cache_mb
+    if args.engine:
+        EXIT_ENGINE = args.engine
+    RESULTS_DIR = engine_results_dir(RESULTS_DIR, EXIT_ENGINE)
+    if args.pool_size:
+        POOL_SIZE = args.pool_size
+    if args.cross_symbol:
+        CROSS_SYMBOL = True
+    if args.threads:
+        SIM_THREADS = args.threads
+    if args.search:
+        SEARCH_MODE = args.search
+    if args.entry_batch_size is not None:
+        ENTRY_BATCH_SIZE = args.entry_batch_size
+    if SEARCH_MODE != "grid" and CROSS_SYMBOL:
+        print(f"[WARN] --search {SEARCH_MODE} prunes per symbol, cross-symbol mode runs the full grid")
+    if args.resample_from_base:
+        RESAMPLE_FROM_BASE = True
+    if args.shm_manifest:
+        SHM_MANIFEST = args.shm_manifest
+    if args.extend:
+        EXTEND_MODE = True
+    if EXTEND_MODE and (CROSS_SYMBOL or EXIT_ENGINE != "vectorbt"):
+        print("[WARN] --extend needs the per-symbol vectorbt engine, running full backtests")
+        EXTEND_MODE = False
+    if args.output_formats:
+        OUTPUT_FORMATS = [f for f in args.output_formats.split(",") if f in RESULT_FORMATS]
+    print(f"Simulation: Engine={EXIT_ENGINE}, Mode={SIM_MODE}, Budget={MEMORY_BUDGET_MB}MB, Primitives={PRIMITIVE_CACHE_MB}MB, Signals={SIGNAL_CACHE_MB}MB, Pool={POOL_SIZE}, Cross-Symbol={CROSS_SYMBOL}, Threads={SIM_THREADS}, Search={SEARCH_MODE}, Entry-Batch={ENTRY_BATCH_SIZE}, Extend={EXTEND_MODE}, Output={OUTPUT_FORMATS}")
+    
     if not args.scripts:
         print("No scripts provided.")
         return
@@ -610,15 +958,14 @@ def main():
     queue = args.scripts.split(",")
     print(f"Processing {len(queue)} indicators...")
         
+    print(f"[REGISTRY] {strategy_registry().summary()}")
     spreads, data_cache = load_data()
+    build_panel(queue, data_cache)
     
     # Checkpoint Dir Ensure
     CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
     
-    for ind in queue:
-        # Pass worker_id to process_indicator
-        res = process_indicator(ind, spreads, data_cache, args.worker_id)
-        print(f"[W{args.worker_id}] {res}")
+    process_queue(queue, spreads, data_cache, args.worker_id)
 
 if __name__ == "__main__":
     main()
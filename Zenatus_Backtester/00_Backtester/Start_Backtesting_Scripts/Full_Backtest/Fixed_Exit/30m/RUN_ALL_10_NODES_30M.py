@@ -4,6 +4,7 @@ import subprocess
 import sys
 import time
 import os
+from datetime import datetime
 from pathlib import Path
 
 # CONFIG
@@ -13,12 +14,56 @@ QUEUE_FILE = Path(r"/opt/Zenatus_Dokumentation/Listing/Full_backtest/30m/indicat
 BLOCKED_FILE = Path(r"/opt/Zenatus_Dokumentation/Listing/Full_backtest/30m/indicators_blocked.json")
 RESULTS_DIR = Path(r"/opt/Zenatus_Dokumentation/Dokumentation/Fixed_Exit/30m")
 LOG_DIR = Path(r"/opt/Zenatus_Dokumentation/LOG/30m/nodes")
+THREADS_PER_NODE = None  # Simulation threads per node, None: CPU cores / NUM_NODES
+MEMORY_BUDGET_MB = None  # Chunk memory budget per node, None: available RAM / NUM_NODES (see zenatus_core.memory)
+
+# Cost-balanced nodes: predicted runtimes from the cost table (Zenatus_Core/PROFILE_STRATEGIES.py), no table: equal chunks.
+# The node assignment is written to LOG_DIR for find_stuck.py / block_current_and_restart.py.
+COST_TABLE_FILE = Path(r"/opt/Zenatus_Dokumentation/Listing/strategy_costs.json")
+ASSIGNMENT_FILE = "node_assignment.json"
+TIMEOUT_SEC = 1800  # Must match the worker, strategies predicted above it are reported
+COMBO_LIMIT = 10000  # Worker get_combo_limit (ind 5+), ends the entry loop early
+BLOCK_PREDICTED_TIMEOUTS = False  # True: strategies predicted above TIMEOUT_SEC are not launched
+
+# Shared data: every symbol is loaded once into shared memory, nodes attach read-only.
+# Must match the worker defaults (FULL_BACKTEST_30M_WORKER.py); on a mismatch the nodes load from disk.
+SHARED_DATA = True
+DATA_PATH = BASE_PATH / "99_Historic_Data" / "Forex" / "Major"
+TIMEFRAME = "30m"
+SYMBOLS = ["EUR_USD", "GBP_USD", "USD_CHF", "USD_CAD", "AUD_USD", "NZD_USD"]
+DATE_START = "2023-01-01"
+DATE_END = datetime.now().strftime("%Y-%m-%d")
+
+CORE_PATH = BASE_PATH / "00_Backtester" / "Zenatus_Core"
+sys.path.insert(0, str(CORE_PATH))
+from zenatus_core.memory import node_memory_budget_mb
+from zenatus_core.profiling import balance_by_cost, entry_calls, expected_bars, predict_seconds, read_cost_table
+from zenatus_core.shm import SharedDataCache
 
 def get_existing_strategies():
     if not RESULTS_DIR.exists():
         return set()
     return set() # Placeholder, logic is in main
 
+def predicted_costs(scripts):
+    """Predicted worker seconds per script ({} without a cost table, profiling timeouts are inf)."""
+    table = read_cost_table(COST_TABLE_FILE)
+    if not table:
+        return {}
+    bars = expected_bars(TIMEFRAME, DATE_START, DATE_END)
+    costs = {}
+    for s in scripts:
+        row = table.get(s)
+        if row is None:
+            continue
+        if row.get("status") == "timeout":
+            costs[s] = float("inf")
+            continue
+        sec = predict_seconds(row, bars, entry_calls(row, COMBO_LIMIT))
+        if sec is not None:
+            costs[s] = sec * len(SYMBOLS)
+    return costs
+
 def main():
     print("=== 10-NODE CLUSTER LAUNCHER (RESUME MODE + SKIP BLOCKED) ===")
     
@@ -70,13 +115,44 @@ def main():
         print("All strategies completed! Nothing to run.")
         return
         
-    # 4. Split into 10 chunks
+    # 4. Split into 10 chunks (balanced by predicted cost if profiled)
     NUM_NODES = 10
-    chunk_size = (total_remaining + NUM_NODES - 1) // NUM_NODES
-    chunks = [scripts_to_run[i:i + chunk_size] for i in range(0, total_remaining, chunk_size)]
+    costs = predicted_costs(scripts_to_run)
+    if costs:
+        over = sorted((s for s in costs if costs[s] > TIMEOUT_SEC), key=lambda s: -costs[s])
+        print(f"Cost table:     {len(costs)}/{total_remaining} profiled, {len(over)} predicted above {TIMEOUT_SEC}s")
+        for s in over:
+            print(f"  [COST] predicted timeout: {s} (~{costs[s]:.0f}s)")
+        if BLOCK_PREDICTED_TIMEOUTS and over:
+            skip = set(over)
+            scripts_to_run = [s for s in scripts_to_run if s not in skip]
+            total_remaining = len(scripts_to_run)
+            print(f"Skipping {len(over)} predicted timeouts, remaining: {total_remaining}")
+            if total_remaining == 0:
+                return
+        # The worker kills an indicator at TIMEOUT_SEC, so no node carries more than that per strategy
+        chunks, loads = balance_by_cost(scripts_to_run, {s: min(c, TIMEOUT_SEC) for s, c in costs.items()}, NUM_NODES)
+        chunk_size = max(len(c) for c in chunks)
+        print(f"Predicted node load: {min(loads) / 3600:.1f}h .. {max(loads) / 3600:.1f}h")
+    else:
+        chunk_size = (total_remaining + NUM_NODES - 1) // NUM_NODES
+        chunks = [scripts_to_run[i:i + chunk_size] for i in range(0, total_remaining, chunk_size)]
+    threads = THREADS_PER_NODE or max(1, (os.cpu_count() or 1) // NUM_NODES)
+    budget_mb = MEMORY_BUDGET_MB or node_memory_budget_mb(NUM_NODES)
     
-    print(f"Launching {len(chunks)} nodes with ~{chunk_size} tasks each...")
+    print(f"Launching {len(chunks)} nodes with ~{chunk_size} tasks each ({threads} threads, "
+          f"{budget_mb or 'default'} MB chunk budget per node)...")
     LOG_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOG_DIR / ASSIGNMENT_FILE, "w", encoding="utf-8") as f:
+        json.dump({"created": datetime.now().isoformat(timespec="seconds"), "chunks": chunks}, f, indent=2)
+    
+    # Preload the data once; segments are unlinked when the launcher exits (atexit)
+    shm_manifest = None
+    if SHARED_DATA:
+        shared = SharedDataCache()
+        shared.publish(DATA_PATH, TIMEFRAME, SYMBOLS, DATE_START, DATE_END)
+        shm_manifest = shared.write_manifest(LOG_DIR / "shm_manifest.json")
+        print(f"Shared data: {len(shared.segments)} symbols, {shared.nbytes / 1024 ** 2:.1f} MB ({shm_manifest})")
     
     procs = []
     
@@ -91,8 +167,13 @@ def main():
             sys.executable, "-u",
             str(WORKER_SCRIPT),
             "--worker-id", str(node_id),
-            "--scripts", scripts_arg
+            "--scripts", scripts_arg,
+            "--threads", str(threads)
         ]
+        if budget_mb:
+            cmd += ["--memory-budget-mb", str(budget_mb)]
+        if shm_manifest:
+            cmd += ["--shm-manifest", str(shm_manifest)]
         
         print(f"  -> Launching Node {node_id} ({len(chunk)} tasks)")
         
@@ -120,6 +201,7 @@ def main():
             print(f"Nodes running: {alive}/{NUM_NODES}...", end="\r")
             time.sleep(5)
     except KeyboardInterrupt:
+        # Attached nodes keep their mapping, only the segment names are removed
         print("\nLauncher stopping (nodes continue running)...")
 
 if __name__ == "__main__":
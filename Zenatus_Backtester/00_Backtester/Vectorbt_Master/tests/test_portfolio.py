@@ -3403,6 +3403,36 @@ class TestFromSignals:
         with pytest.raises(Exception):
             _ = from_signals_both(close=price_wide, log=True, max_logs=5)
 
+    @pytest.mark.parametrize(
+        "test_parallel",
+        [True, 2, 5],
+    )
+    def test_parallel(self, test_parallel):
+        close = big_price_wide.iloc[:, :10]
+        np.random.seed(seed)
+        _entries = pd.DataFrame(np.random.uniform(size=close.shape) < 0.1, index=close.index)
+        kwargs = dict(
+            close=close,
+            entries=_entries,
+            exits=False,
+            sl_stop=np.linspace(0.1, 0.5, 10),
+            tp_stop=0.3,
+            fees=0.01,
+            log=True
+        )
+        pf = from_signals_longonly(**kwargs)
+        pf_parallel = from_signals_longonly(**kwargs, parallel=test_parallel)
+        record_arrays_close(pf_parallel.order_records, pf.order_records)
+        record_arrays_close(pf_parallel.log_records, pf.log_records)
+        pf = from_signals_both(close=price_wide, max_orders=6)
+        pf_parallel = from_signals_both(close=price_wide, max_orders=6, parallel=test_parallel)
+        record_arrays_close(pf_parallel.order_records, pf.order_records)
+        with pytest.raises(Exception):
+            _ = from_signals_both(close=price_wide, max_orders=3, parallel=test_parallel)
+        with pytest.raises(Exception):
+            _ = from_signals_both(close=price_wide, group_by=np.array([0, 0, 1]), cash_sharing=True,
+                                  parallel=test_parallel)
+
 
 # ############# from_holding ############# #
 
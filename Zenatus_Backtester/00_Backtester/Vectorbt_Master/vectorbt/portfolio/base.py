@@ -1410,8 +1410,11 @@ You can also replace templates across all subplots by using the global template
 
 ![](/assets/images/portfolio_plot_path.svg)
 """
+import functools
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
+import numba
 import numpy as np
 import pandas as pd
 
@@ -1488,6 +1491,78 @@ __pdoc__['returns_acc_config'] = f"""Config of returns accessor methods to be ad
 PortfolioT = tp.TypeVar("PortfolioT", bound="Portfolio")
 
 
+def simulate_from_signal_parallel(target_shape: tp.Shape,
+                                  group_lens: tp.Array1d,
+                                  init_cash: tp.Array1d,
+                                  call_seq: tp.Array2d,
+                                  n_threads: tp.Optional[int] = None,
+                                  max_orders: tp.Optional[int] = None,
+                                  max_logs: int = 0,
+                                  use_stops: bool = True,
+                                  **kwargs) -> tp.Tuple[tp.RecordArray, tp.RecordArray]:
+    """Parallel version of `vectorbt.portfolio.nb.simulate_from_signal_func_nb`.
+
+    Splits columns into `n_threads` contiguous chunks and simulates each chunk in its own thread
+    using `vectorbt.portfolio.nb.simulate_from_signal_cols_nb`, which releases the GIL.
+    The returned records are identical to those of the sequential version.
+
+    `n_threads` defaults to `numba.get_num_threads`, which can be set with `numba.set_num_threads`
+    or the `NUMBA_NUM_THREADS` environment variable.
+
+    `kwargs` must contain all remaining arguments of `vectorbt.portfolio.nb.simulate_from_signal_func_nb`.
+
+    !!! note
+        Columns must not be grouped (no cash sharing).
+
+        `max_orders` and `max_logs` are split evenly across columns, thus each column gets
+        `ceil(max_orders / n_cols)` order records. Defaults to one order record per bar.
+
+        Random order rejection (`reject_prob`) is not reproducible with a seed."""
+    if np.any(group_lens > 1):
+        raise ValueError("Parallel simulation doesn't support grouping (cash sharing)")
+    nb.check_group_lens_nb(group_lens, target_shape[1])
+    nb.check_group_init_cash_nb(group_lens, target_shape[1], init_cash, False)
+    if n_threads is None:
+        n_threads = numba.get_num_threads()
+
+    n_cols = target_shape[1]
+    if max_orders is None:
+        col_max_orders = target_shape[0]
+    else:
+        col_max_orders = -(-max_orders // n_cols)
+    col_max_logs = -(-max_logs // n_cols)
+    order_records, log_records = nb.init_records_nb(target_shape, n_cols * col_max_orders, n_cols * col_max_logs)
+    order_counts = np.zeros(n_cols, dtype=np.int64)
+    log_counts = np.zeros(n_cols, dtype=np.int64)
+    state = dict(zip(nb.from_signal_state_fields, nb.init_from_signal_state_nb(n_cols, use_stops)))
+    init_cash = init_cash.astype(np.float64)
+
+    def _simulate_cols(from_col: int, to_col: int) -> None:
+        nb.simulate_from_signal_cols_nb(
+            from_col, to_col, target_shape, init_cash, call_seq,
+            col_max_orders=col_max_orders,
+            col_max_logs=col_max_logs,
+            order_records=order_records,
+            log_records=log_records,
+            order_counts=order_counts,
+            log_counts=log_counts,
+            use_stops=use_stops,
+            **kwargs,
+            **state
+        )
+
+    bounds = np.linspace(0, n_cols, max(1, min(n_threads, n_cols)) + 1).astype(np.int64)
+    if len(bounds) == 2:
+        _simulate_cols(0, n_cols)
+    else:
+        with ThreadPoolExecutor(max_workers=len(bounds) - 1) as executor:
+            futures = [executor.submit(_simulate_cols, bounds[k], bounds[k + 1]) for k in range(len(bounds) - 1)]
+            for future in futures:
+                future.result()
+    return nb.compact_col_records_nb(order_records, log_records, order_counts, log_counts,
+                                     col_max_orders, col_max_logs)
+
+
 class MetaPortfolio(type(StatsBuilderMixin), type(PlotsBuilderMixin)):
     pass
 
@@ -2078,6 +2153,7 @@ class Portfolio(Wrapping, StatsBuilderMixin, PlotsBuilderMixin, metaclass=MetaPo
                      wrapper_kwargs: tp.KwargsLike = None,
                      freq: tp.Optional[tp.FrequencyLike] = None,
                      attach_call_seq: tp.Optional[bool] = None,
+                     parallel: tp.Union[bool, int] = False,
                      **kwargs) -> PortfolioT:
         """Simulate portfolio from entry and exit signals.
 
@@ -2260,6 +2336,10 @@ class Portfolio(Wrapping, StatsBuilderMixin, PlotsBuilderMixin, metaclass=MetaPo
             wrapper_kwargs (dict): See `Portfolio.from_orders`.
             freq (any): See `Portfolio.from_orders`.
             attach_call_seq (bool): See `Portfolio.from_orders`.
+            parallel (bool or int): Whether to simulate columns in parallel threads.
+
+                Pass an integer to set the number of threads, True uses `numba.get_num_threads`.
+                Not supported with cash sharing. See `simulate_from_signal_parallel`.
             **kwargs: Keyword arguments passed to the `__init__` method.
 
         All broadcastable arguments will broadcast using `vectorbt.base.reshape_fns.broadcast`
@@ -2957,7 +3037,16 @@ class Portfolio(Wrapping, StatsBuilderMixin, PlotsBuilderMixin, metaclass=MetaPo
         checks.assert_numba_func(adjust_tp_func_nb)
 
         # Perform the simulation
-        order_records, log_records = nb.simulate_from_signal_func_nb(
+        if parallel:
+            if cash_sharing:
+                raise ValueError("Parallel simulation doesn't support cash sharing")
+            simulate_func = functools.partial(
+                simulate_from_signal_parallel,
+                n_threads=None if parallel is True else int(parallel)
+            )
+        else:
+            simulate_func = nb.simulate_from_signal_func_nb
+        order_records, log_records = simulate_func(
             target_shape_2d,
             cs_group_lens,  # group only if cash sharing is enabled to speed up
             init_cash,
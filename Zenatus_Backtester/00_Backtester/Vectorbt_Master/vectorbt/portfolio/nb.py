@@ -1846,6 +1846,528 @@ AdjustSLFuncT = tp.Callable[[AdjustSLContext, tp.VarArg()], tp.Tuple[float, bool
 AdjustTPFuncT = tp.Callable[[AdjustTPContext, tp.VarArg()], float]
 
 
+@njit(cache=True)
+def init_from_signal_state_nb(n_cols: int, use_stops: bool) -> tp.Tuple[tp.Array1d, ...]:
+    """Initialize the per-column state of `simulate_from_signal_func_nb`."""
+    last_position = np.full(n_cols, 0., dtype=np.float64)
+    last_debt = np.full(n_cols, 0., dtype=np.float64)
+    last_val_price = np.full(n_cols, np.nan, dtype=np.float64)
+    if use_stops:
+        sl_init_i = np.full(n_cols, -1, dtype=np.int64)
+        sl_init_price = np.full(n_cols, np.nan, dtype=np.float64)
+        sl_curr_i = np.full(n_cols, -1, dtype=np.int64)
+        sl_curr_price = np.full(n_cols, np.nan, dtype=np.float64)
+        sl_curr_stop = np.full(n_cols, np.nan, dtype=np.float64)
+        sl_curr_trail = np.full(n_cols, False, dtype=np.bool_)
+        tp_init_i = np.full(n_cols, -1, dtype=np.int64)
+        tp_init_price = np.full(n_cols, np.nan, dtype=np.float64)
+        tp_curr_stop = np.full(n_cols, np.nan, dtype=np.float64)
+    else:
+        sl_init_i = np.empty(0, dtype=np.int64)
+        sl_init_price = np.empty(0, dtype=np.float64)
+        sl_curr_i = np.empty(0, dtype=np.int64)
+        sl_curr_price = np.empty(0, dtype=np.float64)
+        sl_curr_stop = np.empty(0, dtype=np.float64)
+        sl_curr_trail = np.empty(0, dtype=np.bool_)
+        tp_init_i = np.empty(0, dtype=np.int64)
+        tp_init_price = np.empty(0, dtype=np.float64)
+        tp_curr_stop = np.empty(0, dtype=np.float64)
+    price_arr = np.full(n_cols, np.nan, dtype=np.float64)
+    size_arr = np.empty(n_cols, dtype=np.float64)
+    size_type_arr = np.empty(n_cols, dtype=np.float64)
+    slippage_arr = np.empty(n_cols, dtype=np.float64)
+    direction_arr = np.empty(n_cols, dtype=np.int64)
+    temp_order_value = np.empty(n_cols, dtype=np.float64)
+    return (
+        last_position,
+        last_debt,
+        last_val_price,
+        sl_init_i,
+        sl_init_price,
+        sl_curr_i,
+        sl_curr_price,
+        sl_curr_stop,
+        sl_curr_trail,
+        tp_init_i,
+        tp_init_price,
+        tp_curr_stop,
+        price_arr,
+        size_arr,
+        size_type_arr,
+        slippage_arr,
+        direction_arr,
+        temp_order_value
+    )
+
+
+from_signal_state_fields = (
+    'last_position',
+    'last_debt',
+    'last_val_price',
+    'sl_init_i',
+    'sl_init_price',
+    'sl_curr_i',
+    'sl_curr_price',
+    'sl_curr_stop',
+    'sl_curr_trail',
+    'tp_init_i',
+    'tp_init_price',
+    'tp_curr_stop',
+    'price_arr',
+    'size_arr',
+    'size_type_arr',
+    'slippage_arr',
+    'direction_arr',
+    'temp_order_value'
+)
+"""Names of the state arrays returned by `init_from_signal_state_nb`."""
+
+
+@njit
+def simulate_from_signal_group_nb(group: int,
+                                  from_col: int,
+                                  to_col: int,
+                                  target_shape: tp.Shape,
+                                  init_cash: tp.Array1d,
+                                  call_seq: tp.Array2d,
+                                  cash_sharing: bool,
+                                  signal_func_nb: SignalFuncT,
+                                  signal_args: tp.ArgsLike,
+                                  size: tp.ArrayLike,
+                                  price: tp.ArrayLike,
+                                  size_type: tp.ArrayLike,
+                                  fees: tp.ArrayLike,
+                                  fixed_fees: tp.ArrayLike,
+                                  slippage: tp.ArrayLike,
+                                  min_size: tp.ArrayLike,
+                                  max_size: tp.ArrayLike,
+                                  size_granularity: tp.ArrayLike,
+                                  reject_prob: tp.ArrayLike,
+                                  lock_cash: tp.ArrayLike,
+                                  allow_partial: tp.ArrayLike,
+                                  raise_reject: tp.ArrayLike,
+                                  log: tp.ArrayLike,
+                                  accumulate: tp.ArrayLike,
+                                  upon_long_conflict: tp.ArrayLike,
+                                  upon_short_conflict: tp.ArrayLike,
+                                  upon_dir_conflict: tp.ArrayLike,
+                                  upon_opposite_entry: tp.ArrayLike,
+                                  val_price: tp.ArrayLike,
+                                  open: tp.ArrayLike,
+                                  high: tp.ArrayLike,
+                                  low: tp.ArrayLike,
+                                  close: tp.ArrayLike,
+                                  sl_stop: tp.ArrayLike,
+                                  sl_trail: tp.ArrayLike,
+                                  tp_stop: tp.ArrayLike,
+                                  stop_entry_price: tp.ArrayLike,
+                                  stop_exit_price: tp.ArrayLike,
+                                  upon_stop_exit: tp.ArrayLike,
+                                  upon_stop_update: tp.ArrayLike,
+                                  adjust_sl_func_nb: AdjustSLFuncT,
+                                  adjust_sl_args: tp.Args,
+                                  adjust_tp_func_nb: AdjustTPFuncT,
+                                  adjust_tp_args: tp.Args,
+                                  use_stops: bool,
+                                  auto_call_seq: bool,
+                                  ffill_val_price: bool,
+                                  update_value: bool,
+                                  flex_2d: bool,
+                                  order_records: tp.RecordArray,
+                                  log_records: tp.RecordArray,
+                                  last_position: tp.Array1d,
+                                  last_debt: tp.Array1d,
+                                  last_val_price: tp.Array1d,
+                                  sl_init_i: tp.Array1d,
+                                  sl_init_price: tp.Array1d,
+                                  sl_curr_i: tp.Array1d,
+                                  sl_curr_price: tp.Array1d,
+                                  sl_curr_stop: tp.Array1d,
+                                  sl_curr_trail: tp.Array1d,
+                                  tp_init_i: tp.Array1d,
+                                  tp_init_price: tp.Array1d,
+                                  tp_curr_stop: tp.Array1d,
+                                  price_arr: tp.Array1d,
+                                  size_arr: tp.Array1d,
+                                  size_type_arr: tp.Array1d,
+                                  slippage_arr: tp.Array1d,
+                                  direction_arr: tp.Array1d,
+                                  temp_order_value: tp.Array1d,
+                                  oidx: int,
+                                  lidx: int) -> tp.Tuple[int, int]:
+    """Simulate one group of `simulate_from_signal_func_nb`.
+
+    Writes order and log records starting at `oidx` and `lidx` and returns the next free indices.
+    Columns outside of `from_col:to_col` are not touched."""
+    group_len = to_col - from_col
+    cash_now = init_cash[group]
+    free_cash_now = init_cash[group]
+
+    for i in range(target_shape[0]):
+        for k in range(group_len):
+            col = from_col + k
+
+            # Resolve order price
+            _price = flex_select_auto_nb(price, i, col, flex_2d)
+            if np.isinf(_price):
+                if _price > 0:
+                    _price = flex_select_auto_nb(close, i, col, flex_2d)  # upper bound is close
+                else:
+                    _open = flex_select_auto_nb(open, i, col, flex_2d)
+                    if not np.isnan(_open):
+                        _price = _open  # lower bound is open
+                    elif i > 0:
+                        _price = flex_select_auto_nb(close, i - 1, col, flex_2d)  # lower bound is prev close
+                    else:
+                        _price = np.nan  # first timestamp has no prev close
+
+            # Resolve valuation price
+            _val_price = flex_select_auto_nb(val_price, i, col, flex_2d)
+            if np.isinf(_val_price):
+                if _val_price > 0:
+                    _val_price = _price  # upper bound is order price
+                elif i > 0:
+                    _val_price = flex_select_auto_nb(close, i - 1, col, flex_2d)  # lower bound is prev close
+                else:
+                    _val_price = np.nan  # first timestamp has no prev close
+            if not np.isnan(_val_price) or not ffill_val_price:
+                last_val_price[col] = _val_price
+            price_arr[col] = _price
+
+        # Get size and value of each order
+        for k in range(group_len):
+            col = from_col + k  # order doesn't matter
+
+            position_now = last_position[col]
+            _price = price_arr[col]
+            _slippage = flex_select_auto_nb(slippage, i, col, flex_2d)
+            stop_price = np.nan
+            if use_stops:
+                # Adjust stops
+                adjust_sl_ctx = AdjustSLContext(
+                    i=i,
+                    col=col,
+                    position_now=last_position[col],
+                    val_price_now=last_val_price[col],
+                    init_i=sl_init_i[col],
+                    init_price=sl_init_price[col],
+                    curr_i=sl_curr_i[col],
+                    curr_price=sl_curr_price[col],
+                    curr_stop=sl_curr_stop[col],
+                    curr_trail=sl_curr_trail[col]
+                )
+                sl_curr_stop[col], sl_curr_trail[col] = adjust_sl_func_nb(adjust_sl_ctx, *adjust_sl_args)
+                adjust_tp_ctx = AdjustTPContext(
+                    i=i,
+                    col=col,
+                    position_now=last_position[col],
+                    val_price_now=last_val_price[col],
+                    init_i=tp_init_i[col],
+                    init_price=tp_init_price[col],
+                    curr_stop=tp_curr_stop[col]
+                )
+                tp_curr_stop[col] = adjust_tp_func_nb(adjust_tp_ctx, *adjust_tp_args)
+
+                if not np.isnan(sl_curr_stop[col]) or not np.isnan(tp_curr_stop[col]):
+                    # Resolve current bar
+                    _open = flex_select_auto_nb(open, i, col, flex_2d)
+                    _high = flex_select_auto_nb(high, i, col, flex_2d)
+                    _low = flex_select_auto_nb(low, i, col, flex_2d)
+                    _close = flex_select_auto_nb(close, i, col, flex_2d)
+                    if np.isnan(_open):
+                        _open = _close
+                    if np.isnan(_low):
+                        _low = min(_open, _close)
+                    if np.isnan(_high):
+                        _high = max(_open, _close)
+
+                    # Get stop price
+                    if not np.isnan(sl_curr_stop[col]):
+                        stop_price = get_stop_price_nb(
+                            position_now,
+                            sl_curr_price[col],
+                            sl_curr_stop[col],
+                            _open, _low, _high,
+                            True
+                        )
+                    if np.isnan(stop_price) and not np.isnan(tp_curr_stop[col]):
+                        stop_price = get_stop_price_nb(
+                            position_now,
+                            tp_init_price[col],
+                            tp_curr_stop[col],
+                            _open, _low, _high,
+                            False
+                        )
+
+                    if not np.isnan(sl_curr_stop[col]) and sl_curr_trail[col]:
+                        # Update trailing stop
+                        if position_now > 0:
+                            if _high > sl_curr_price[col]:
+                                sl_curr_i[col] = i
+                                sl_curr_price[col] = _high
+                        elif position_now < 0:
+                            if _low < sl_curr_price[col]:
+                                sl_curr_i[col] = i
+                                sl_curr_price[col] = _low
+
+            # Get signals
+            _accumulate = flex_select_auto_nb(accumulate, i, col, flex_2d)
+            if use_stops and not np.isnan(stop_price):
+                # Stop signal comes first
+                _upon_stop_exit = flex_select_auto_nb(upon_stop_exit, i, col, flex_2d)
+                is_long_entry, is_long_exit, is_short_entry, is_short_exit, _accumulate = \
+                    generate_stop_signal_nb(position_now, _upon_stop_exit, _accumulate)
+
+                _close = flex_select_auto_nb(close, i, col, flex_2d)
+                _stop_exit_price = flex_select_auto_nb(stop_exit_price, i, col, flex_2d)
+                _price, _slippage = resolve_stop_price_and_slippage_nb(
+                    stop_price,
+                    _price,
+                    _close,
+                    _slippage,
+                    _stop_exit_price
+                )
+            else:
+                # User-defined signal comes first
+                signal_ctx = SignalContext(
+                    i=i,
+                    col=col,
+                    position_now=position_now,
+                    val_price_now=last_val_price[col],
+                    flex_2d=flex_2d
+                )
+                is_long_entry, is_long_exit, is_short_entry, is_short_exit = \
+                    signal_func_nb(signal_ctx, *signal_args)
+
+                # Resolve signal conflicts
+                if is_long_entry or is_short_entry:
+                    _upon_long_conflict = flex_select_auto_nb(upon_long_conflict, i, col, flex_2d)
+                    is_long_entry, is_long_exit = resolve_signal_conflict_nb(
+                        position_now,
+                        is_long_entry,
+                        is_long_exit,
+                        Direction.LongOnly,
+                        _upon_long_conflict
+                    )
+                    _upon_short_conflict = flex_select_auto_nb(upon_short_conflict, i, col, flex_2d)
+                    is_short_entry, is_short_exit = resolve_signal_conflict_nb(
+                        position_now,
+                        is_short_entry,
+                        is_short_exit,
+                        Direction.ShortOnly,
+                        _upon_short_conflict
+                    )
+
+                    # Resolve direction conflicts
+                    _upon_dir_conflict = flex_select_auto_nb(upon_dir_conflict, i, col, flex_2d)
+                    is_long_entry, is_short_entry = resolve_dir_conflict_nb(
+                        position_now,
+                        is_long_entry,
+                        is_short_entry,
+                        _upon_dir_conflict
+                    )
+
+                    # Resolve opposite entry
+                    _upon_opposite_entry = flex_select_auto_nb(upon_opposite_entry, i, col, flex_2d)
+                    is_long_entry, is_long_exit, is_short_entry, is_short_exit, _accumulate = \
+                        resolve_opposite_entry_nb(
+                            position_now,
+                            is_long_entry,
+                            is_long_exit,
+                            is_short_entry,
+                            is_short_exit,
+                            _upon_opposite_entry,
+                            _accumulate
+                        )
+
+            # Convert both signals to size (direction-aware), size type, and direction
+            _size, _size_type, _direction = signals_to_size_nb(
+                last_position[col],
+                is_long_entry,
+                is_long_exit,
+                is_short_entry,
+                is_short_exit,
+                flex_select_auto_nb(size, i, col, flex_2d),
+                flex_select_auto_nb(size_type, i, col, flex_2d),
+                _accumulate,
+                last_val_price[col]
+            )
+
+            # Save all info
+            price_arr[col] = _price
+            slippage_arr[col] = _slippage
+            size_arr[col] = _size
+            size_type_arr[col] = _size_type
+            direction_arr[col] = _direction
+
+            if cash_sharing:
+                if _size == 0:
+                    temp_order_value[k] = 0.
+                else:
+                    # Approximate order value
+                    if _size_type == SizeType.Amount:
+                        temp_order_value[k] = _size * last_val_price[col]
+                    elif _size_type == SizeType.Value:
+                        temp_order_value[k] = _size
+                    else:  # SizeType.Percent
+                        if _size >= 0:
+                            temp_order_value[k] = _size * cash_now
+                        else:
+                            asset_value_now = last_position[col] * last_val_price[col]
+                            if _direction == Direction.LongOnly:
+                                temp_order_value[k] = _size * asset_value_now
+                            else:
+                                max_exposure = (2 * max(asset_value_now, 0) + max(free_cash_now, 0))
+                                temp_order_value[k] = _size * max_exposure
+
+        if cash_sharing:
+            # Dynamically sort by order value -> selling comes first to release funds early
+            if auto_call_seq:
+                insert_argsort_nb(temp_order_value[:group_len], call_seq[i, from_col:to_col])
+
+            # Same as get_group_value_ctx_nb but with flexible indexing
+            value_now = cash_now
+            for k in range(group_len):
+                col = from_col + k
+                if last_position[col] != 0:
+                    value_now += last_position[col] * last_val_price[col]
+
+        for k in range(group_len):
+            col = from_col + k
+            if cash_sharing:
+                col_i = call_seq[i, col]
+                if col_i >= group_len:
+                    raise ValueError("Call index exceeds bounds of the group")
+                col = from_col + col_i
+
+            # Get current values per column
+            position_now = last_position[col]
+            debt_now = last_debt[col]
+            val_price_now = last_val_price[col]
+            if not cash_sharing:
+                value_now = cash_now
+                if position_now != 0:
+                    value_now += position_now * val_price_now
+
+            # Generate the next order
+            _price = price_arr[col]
+            _size = size_arr[col]  # already takes into account direction
+            _size_type = size_type_arr[col]
+            _direction = direction_arr[col]
+            _slippage = slippage_arr[col]
+            if _size != 0:
+                if _size > 0:  # long order
+                    if _direction == Direction.ShortOnly:
+                        _size *= -1  # must reverse for process_order_nb
+                else:  # short order
+                    if _direction == Direction.ShortOnly:
+                        _size *= -1
+                order = order_nb(
+                    size=_size,
+                    price=_price,
+                    size_type=_size_type,
+                    direction=_direction,
+                    fees=flex_select_auto_nb(fees, i, col, flex_2d),
+                    fixed_fees=flex_select_auto_nb(fixed_fees, i, col, flex_2d),
+                    slippage=_slippage,
+                    min_size=flex_select_auto_nb(min_size, i, col, flex_2d),
+                    max_size=flex_select_auto_nb(max_size, i, col, flex_2d),
+                    size_granularity=flex_select_auto_nb(size_granularity, i, col, flex_2d),
+                    reject_prob=flex_select_auto_nb(reject_prob, i, col, flex_2d),
+                    lock_cash=flex_select_auto_nb(lock_cash, i, col, flex_2d),
+                    allow_partial=flex_select_auto_nb(allow_partial, i, col, flex_2d),
+                    raise_reject=flex_select_auto_nb(raise_reject, i, col, flex_2d),
+                    log=flex_select_auto_nb(log, i, col, flex_2d)
+                )
+
+                # Process the order
+                state = ProcessOrderState(
+                    cash=cash_now,
+                    position=position_now,
+                    debt=debt_now,
+                    free_cash=free_cash_now,
+                    val_price=val_price_now,
+                    value=value_now,
+                    oidx=oidx,
+                    lidx=lidx
+                )
+
+                order_result, new_state = process_order_nb(
+                    i, col, group,
+                    state,
+                    update_value,
+                    order,
+                    order_records,
+                    log_records
+                )
+
+                # Update state
+                cash_now = new_state.cash
+                position_now = new_state.position
+                debt_now = new_state.debt
+                free_cash_now = new_state.free_cash
+                val_price_now = new_state.val_price
+                value_now = new_state.value
+                oidx = new_state.oidx
+                lidx = new_state.lidx
+
+                if use_stops:
+                    # Update stop price
+                    if order_result.status == OrderStatus.Filled:
+                        if position_now == 0:
+                            # Position closed -> clear stops
+                            sl_curr_i[col] = sl_init_i[col] = -1
+                            sl_curr_price[col] = sl_init_price[col] = np.nan
+                            sl_curr_stop[col] = np.nan
+                            sl_curr_trail[col] = False
+                            tp_init_i[col] = -1
+                            tp_init_price[col] = np.nan
+                            tp_curr_stop[col] = np.nan
+                        else:
+                            _stop_entry_price = flex_select_auto_nb(stop_entry_price, i, col, flex_2d)
+                            if _stop_entry_price == StopEntryPrice.ValPrice:
+                                new_init_price = val_price_now
+                            elif _stop_entry_price == StopEntryPrice.Price:
+                                new_init_price = order.price
+                            elif _stop_entry_price == StopEntryPrice.FillPrice:
+                                new_init_price = order_result.price
+                            else:
+                                new_init_price = flex_select_auto_nb(close, i, col, flex_2d)
+                            _upon_stop_update = flex_select_auto_nb(upon_stop_update, i, col, flex_2d)
+                            _sl_stop = flex_select_auto_nb(sl_stop, i, col, flex_2d)
+                            _sl_trail = flex_select_auto_nb(sl_trail, i, col, flex_2d)
+                            _tp_stop = flex_select_auto_nb(tp_stop, i, col, flex_2d)
+
+                            if state.position == 0 or np.sign(position_now) != np.sign(state.position):
+                                # Position opened/reversed -> set stops
+                                sl_curr_i[col] = sl_init_i[col] = i
+                                sl_curr_price[col] = sl_init_price[col] = new_init_price
+                                sl_curr_stop[col] = _sl_stop
+                                sl_curr_trail[col] = _sl_trail
+                                tp_init_i[col] = i
+                                tp_init_price[col] = new_init_price
+                                tp_curr_stop[col] = _tp_stop
+                            elif abs(position_now) > abs(state.position):
+                                # Position increased -> keep/override stops
+                                if should_update_stop_nb(_sl_stop, _upon_stop_update):
+                                    sl_curr_i[col] = sl_init_i[col] = i
+                                    sl_curr_price[col] = sl_init_price[col] = new_init_price
+                                    sl_curr_stop[col] = _sl_stop
+                                    sl_curr_trail[col] = _sl_trail
+                                if should_update_stop_nb(_tp_stop, _upon_stop_update):
+                                    tp_init_i[col] = i
+                                    tp_init_price[col] = new_init_price
+                                    tp_curr_stop[col] = _tp_stop
+
+            # Now becomes last
+            last_position[col] = position_now
+            last_debt[col] = debt_now
+            if not np.isnan(val_price_now) or not ffill_val_price:
+                last_val_price[col] = val_price_now
+
+    return oidx, lidx
+
+
 @njit
 def simulate_from_signal_func_nb(target_shape: tp.Shape,
                                  group_lens: tp.Array1d,
@@ -1950,409 +2472,177 @@ def simulate_from_signal_func_nb(target_shape: tp.Shape,
 
     order_records, log_records = init_records_nb(target_shape, max_orders, max_logs)
     init_cash = init_cash.astype(np.float64)
-    last_position = np.full(target_shape[1], 0., dtype=np.float64)
-    last_debt = np.full(target_shape[1], 0., dtype=np.float64)
-    last_val_price = np.full(target_shape[1], np.nan, dtype=np.float64)
-    if use_stops:
-        sl_init_i = np.full(target_shape[1], -1, dtype=np.int64)
-        sl_init_price = np.full(target_shape[1], np.nan, dtype=np.float64)
-        sl_curr_i = np.full(target_shape[1], -1, dtype=np.int64)
-        sl_curr_price = np.full(target_shape[1], np.nan, dtype=np.float64)
-        sl_curr_stop = np.full(target_shape[1], np.nan, dtype=np.float64)
-        sl_curr_trail = np.full(target_shape[1], False, dtype=np.bool_)
-        tp_init_i = np.full(target_shape[1], -1, dtype=np.int64)
-        tp_init_price = np.full(target_shape[1], np.nan, dtype=np.float64)
-        tp_curr_stop = np.full(target_shape[1], np.nan, dtype=np.float64)
-    else:
-        sl_init_i = np.empty(0, dtype=np.int64)
-        sl_init_price = np.empty(0, dtype=np.float64)
-        sl_curr_i = np.empty(0, dtype=np.int64)
-        sl_curr_price = np.empty(0, dtype=np.float64)
-        sl_curr_stop = np.empty(0, dtype=np.float64)
-        sl_curr_trail = np.empty(0, dtype=np.bool_)
-        tp_init_i = np.empty(0, dtype=np.int64)
-        tp_init_price = np.empty(0, dtype=np.float64)
-        tp_curr_stop = np.empty(0, dtype=np.float64)
-    price_arr = np.full(target_shape[1], np.nan, dtype=np.float64)
-    size_arr = np.empty(target_shape[1], dtype=np.float64)
-    size_type_arr = np.empty(target_shape[1], dtype=np.float64)
-    slippage_arr = np.empty(target_shape[1], dtype=np.float64)
-    direction_arr = np.empty(target_shape[1], dtype=np.int64)
-    temp_order_value = np.empty(target_shape[1], dtype=np.float64)
+    (
+        last_position,
+        last_debt,
+        last_val_price,
+        sl_init_i,
+        sl_init_price,
+        sl_curr_i,
+        sl_curr_price,
+        sl_curr_stop,
+        sl_curr_trail,
+        tp_init_i,
+        tp_init_price,
+        tp_curr_stop,
+        price_arr,
+        size_arr,
+        size_type_arr,
+        slippage_arr,
+        direction_arr,
+        temp_order_value
+    ) = init_from_signal_state_nb(target_shape[1], use_stops)
     oidx = 0
     lidx = 0
 
     from_col = 0
     for group in range(len(group_lens)):
         to_col = from_col + group_lens[group]
-        group_len = to_col - from_col
-        cash_now = init_cash[group]
-        free_cash_now = init_cash[group]
-
-        for i in range(target_shape[0]):
-            for k in range(group_len):
-                col = from_col + k
-
-                # Resolve order price
-                _price = flex_select_auto_nb(price, i, col, flex_2d)
-                if np.isinf(_price):
-                    if _price > 0:
-                        _price = flex_select_auto_nb(close, i, col, flex_2d)  # upper bound is close
-                    else:
-                        _open = flex_select_auto_nb(open, i, col, flex_2d)
-                        if not np.isnan(_open):
-                            _price = _open  # lower bound is open
-                        elif i > 0:
-                            _price = flex_select_auto_nb(close, i - 1, col, flex_2d)  # lower bound is prev close
-                        else:
-                            _price = np.nan  # first timestamp has no prev close
-
-                # Resolve valuation price
-                _val_price = flex_select_auto_nb(val_price, i, col, flex_2d)
-                if np.isinf(_val_price):
-                    if _val_price > 0:
-                        _val_price = _price  # upper bound is order price
-                    elif i > 0:
-                        _val_price = flex_select_auto_nb(close, i - 1, col, flex_2d)  # lower bound is prev close
-                    else:
-                        _val_price = np.nan  # first timestamp has no prev close
-                if not np.isnan(_val_price) or not ffill_val_price:
-                    last_val_price[col] = _val_price
-                price_arr[col] = _price
-
-            # Get size and value of each order
-            for k in range(group_len):
-                col = from_col + k  # order doesn't matter
-
-                position_now = last_position[col]
-                _price = price_arr[col]
-                _slippage = flex_select_auto_nb(slippage, i, col, flex_2d)
-                stop_price = np.nan
-                if use_stops:
-                    # Adjust stops
-                    adjust_sl_ctx = AdjustSLContext(
-                        i=i,
-                        col=col,
-                        position_now=last_position[col],
-                        val_price_now=last_val_price[col],
-                        init_i=sl_init_i[col],
-                        init_price=sl_init_price[col],
-                        curr_i=sl_curr_i[col],
-                        curr_price=sl_curr_price[col],
-                        curr_stop=sl_curr_stop[col],
-                        curr_trail=sl_curr_trail[col]
-                    )
-                    sl_curr_stop[col], sl_curr_trail[col] = adjust_sl_func_nb(adjust_sl_ctx, *adjust_sl_args)
-                    adjust_tp_ctx = AdjustTPContext(
-                        i=i,
-                        col=col,
-                        position_now=last_position[col],
-                        val_price_now=last_val_price[col],
-                        init_i=tp_init_i[col],
-                        init_price=tp_init_price[col],
-                        curr_stop=tp_curr_stop[col]
-                    )
-                    tp_curr_stop[col] = adjust_tp_func_nb(adjust_tp_ctx, *adjust_tp_args)
-
-                    if not np.isnan(sl_curr_stop[col]) or not np.isnan(tp_curr_stop[col]):
-                        # Resolve current bar
-                        _open = flex_select_auto_nb(open, i, col, flex_2d)
-                        _high = flex_select_auto_nb(high, i, col, flex_2d)
-                        _low = flex_select_auto_nb(low, i, col, flex_2d)
-                        _close = flex_select_auto_nb(close, i, col, flex_2d)
-                        if np.isnan(_open):
-                            _open = _close
-                        if np.isnan(_low):
-                            _low = min(_open, _close)
-                        if np.isnan(_high):
-                            _high = max(_open, _close)
-
-                        # Get stop price
-                        if not np.isnan(sl_curr_stop[col]):
-                            stop_price = get_stop_price_nb(
-                                position_now,
-                                sl_curr_price[col],
-                                sl_curr_stop[col],
-                                _open, _low, _high,
-                                True
-                            )
-                        if np.isnan(stop_price) and not np.isnan(tp_curr_stop[col]):
-                            stop_price = get_stop_price_nb(
-                                position_now,
-                                tp_init_price[col],
-                                tp_curr_stop[col],
-                                _open, _low, _high,
-                                False
-                            )
-
-                        if not np.isnan(sl_curr_stop[col]) and sl_curr_trail[col]:
-                            # Update trailing stop
-                            if position_now > 0:
-                                if _high > sl_curr_price[col]:
-                                    sl_curr_i[col] = i
-                                    sl_curr_price[col] = _high
-                            elif position_now < 0:
-                                if _low < sl_curr_price[col]:
-                                    sl_curr_i[col] = i
-                                    sl_curr_price[col] = _low
-
-                # Get signals
-                _accumulate = flex_select_auto_nb(accumulate, i, col, flex_2d)
-                if use_stops and not np.isnan(stop_price):
-                    # Stop signal comes first
-                    _upon_stop_exit = flex_select_auto_nb(upon_stop_exit, i, col, flex_2d)
-                    is_long_entry, is_long_exit, is_short_entry, is_short_exit, _accumulate = \
-                        generate_stop_signal_nb(position_now, _upon_stop_exit, _accumulate)
-
-                    _close = flex_select_auto_nb(close, i, col, flex_2d)
-                    _stop_exit_price = flex_select_auto_nb(stop_exit_price, i, col, flex_2d)
-                    _price, _slippage = resolve_stop_price_and_slippage_nb(
-                        stop_price,
-                        _price,
-                        _close,
-                        _slippage,
-                        _stop_exit_price
-                    )
-                else:
-                    # User-defined signal comes first
-                    signal_ctx = SignalContext(
-                        i=i,
-                        col=col,
-                        position_now=position_now,
-                        val_price_now=last_val_price[col],
-                        flex_2d=flex_2d
-                    )
-                    is_long_entry, is_long_exit, is_short_entry, is_short_exit = \
-                        signal_func_nb(signal_ctx, *signal_args)
-
-                    # Resolve signal conflicts
-                    if is_long_entry or is_short_entry:
-                        _upon_long_conflict = flex_select_auto_nb(upon_long_conflict, i, col, flex_2d)
-                        is_long_entry, is_long_exit = resolve_signal_conflict_nb(
-                            position_now,
-                            is_long_entry,
-                            is_long_exit,
-                            Direction.LongOnly,
-                            _upon_long_conflict
-                        )
-                        _upon_short_conflict = flex_select_auto_nb(upon_short_conflict, i, col, flex_2d)
-                        is_short_entry, is_short_exit = resolve_signal_conflict_nb(
-                            position_now,
-                            is_short_entry,
-                            is_short_exit,
-                            Direction.ShortOnly,
-                            _upon_short_conflict
-                        )
-
-                        # Resolve direction conflicts
-                        _upon_dir_conflict = flex_select_auto_nb(upon_dir_conflict, i, col, flex_2d)
-                        is_long_entry, is_short_entry = resolve_dir_conflict_nb(
-                            position_now,
-                            is_long_entry,
-                            is_short_entry,
-                            _upon_dir_conflict
-                        )
-
-                        # Resolve opposite entry
-                        _upon_opposite_entry = flex_select_auto_nb(upon_opposite_entry, i, col, flex_2d)
-                        is_long_entry, is_long_exit, is_short_entry, is_short_exit, _accumulate = \
-                            resolve_opposite_entry_nb(
-                                position_now,
-                                is_long_entry,
-                                is_long_exit,
-                                is_short_entry,
-                                is_short_exit,
-                                _upon_opposite_entry,
-                                _accumulate
-                            )
-
-                # Convert both signals to size (direction-aware), size type, and direction
-                _size, _size_type, _direction = signals_to_size_nb(
-                    last_position[col],
-                    is_long_entry,
-                    is_long_exit,
-                    is_short_entry,
-                    is_short_exit,
-                    flex_select_auto_nb(size, i, col, flex_2d),
-                    flex_select_auto_nb(size_type, i, col, flex_2d),
-                    _accumulate,
-                    last_val_price[col]
-                )
-
-                # Save all info
-                price_arr[col] = _price
-                slippage_arr[col] = _slippage
-                size_arr[col] = _size
-                size_type_arr[col] = _size_type
-                direction_arr[col] = _direction
-
-                if cash_sharing:
-                    if _size == 0:
-                        temp_order_value[k] = 0.
-                    else:
-                        # Approximate order value
-                        if _size_type == SizeType.Amount:
-                            temp_order_value[k] = _size * last_val_price[col]
-                        elif _size_type == SizeType.Value:
-                            temp_order_value[k] = _size
-                        else:  # SizeType.Percent
-                            if _size >= 0:
-                                temp_order_value[k] = _size * cash_now
-                            else:
-                                asset_value_now = last_position[col] * last_val_price[col]
-                                if _direction == Direction.LongOnly:
-                                    temp_order_value[k] = _size * asset_value_now
-                                else:
-                                    max_exposure = (2 * max(asset_value_now, 0) + max(free_cash_now, 0))
-                                    temp_order_value[k] = _size * max_exposure
-
-            if cash_sharing:
-                # Dynamically sort by order value -> selling comes first to release funds early
-                if auto_call_seq:
-                    insert_argsort_nb(temp_order_value[:group_len], call_seq[i, from_col:to_col])
-
-                # Same as get_group_value_ctx_nb but with flexible indexing
-                value_now = cash_now
-                for k in range(group_len):
-                    col = from_col + k
-                    if last_position[col] != 0:
-                        value_now += last_position[col] * last_val_price[col]
-
-            for k in range(group_len):
-                col = from_col + k
-                if cash_sharing:
-                    col_i = call_seq[i, col]
-                    if col_i >= group_len:
-                        raise ValueError("Call index exceeds bounds of the group")
-                    col = from_col + col_i
-
-                # Get current values per column
-                position_now = last_position[col]
-                debt_now = last_debt[col]
-                val_price_now = last_val_price[col]
-                if not cash_sharing:
-                    value_now = cash_now
-                    if position_now != 0:
-                        value_now += position_now * val_price_now
-
-                # Generate the next order
-                _price = price_arr[col]
-                _size = size_arr[col]  # already takes into account direction
-                _size_type = size_type_arr[col]
-                _direction = direction_arr[col]
-                _slippage = slippage_arr[col]
-                if _size != 0:
-                    if _size > 0:  # long order
-                        if _direction == Direction.ShortOnly:
-                            _size *= -1  # must reverse for process_order_nb
-                    else:  # short order
-                        if _direction == Direction.ShortOnly:
-                            _size *= -1
-                    order = order_nb(
-                        size=_size,
-                        price=_price,
-                        size_type=_size_type,
-                        direction=_direction,
-                        fees=flex_select_auto_nb(fees, i, col, flex_2d),
-                        fixed_fees=flex_select_auto_nb(fixed_fees, i, col, flex_2d),
-                        slippage=_slippage,
-                        min_size=flex_select_auto_nb(min_size, i, col, flex_2d),
-                        max_size=flex_select_auto_nb(max_size, i, col, flex_2d),
-                        size_granularity=flex_select_auto_nb(size_granularity, i, col, flex_2d),
-                        reject_prob=flex_select_auto_nb(reject_prob, i, col, flex_2d),
-                        lock_cash=flex_select_auto_nb(lock_cash, i, col, flex_2d),
-                        allow_partial=flex_select_auto_nb(allow_partial, i, col, flex_2d),
-                        raise_reject=flex_select_auto_nb(raise_reject, i, col, flex_2d),
-                        log=flex_select_auto_nb(log, i, col, flex_2d)
-                    )
-
-                    # Process the order
-                    state = ProcessOrderState(
-                        cash=cash_now,
-                        position=position_now,
-                        debt=debt_now,
-                        free_cash=free_cash_now,
-                        val_price=val_price_now,
-                        value=value_now,
-                        oidx=oidx,
-                        lidx=lidx
-                    )
-
-                    order_result, new_state = process_order_nb(
-                        i, col, group,
-                        state,
-                        update_value,
-                        order,
-                        order_records,
-                        log_records
-                    )
+        oidx, lidx = simulate_from_signal_group_nb(
+            group, from_col, to_col, target_shape, init_cash, call_seq, cash_sharing,
+            signal_func_nb, signal_args, size, price, size_type, fees, fixed_fees, slippage,
+            min_size, max_size, size_granularity, reject_prob, lock_cash, allow_partial,
+            raise_reject, log, accumulate, upon_long_conflict, upon_short_conflict,
+            upon_dir_conflict, upon_opposite_entry, val_price, open, high, low, close,
+            sl_stop, sl_trail, tp_stop, stop_entry_price, stop_exit_price, upon_stop_exit,
+            upon_stop_update, adjust_sl_func_nb, adjust_sl_args, adjust_tp_func_nb,
+            adjust_tp_args, use_stops, auto_call_seq, ffill_val_price, update_value, flex_2d,
+            order_records, log_records, last_position, last_debt, last_val_price, sl_init_i,
+            sl_init_price, sl_curr_i, sl_curr_price, sl_curr_stop, sl_curr_trail, tp_init_i,
+            tp_init_price, tp_curr_stop, price_arr, size_arr, size_type_arr, slippage_arr,
+            direction_arr, temp_order_value, oidx, lidx
+        )
+        from_col = to_col
 
-                    # Update state
-                    cash_now = new_state.cash
-                    position_now = new_state.position
-                    debt_now = new_state.debt
-                    free_cash_now = new_state.free_cash
-                    val_price_now = new_state.val_price
-                    value_now = new_state.value
-                    oidx = new_state.oidx
-                    lidx = new_state.lidx
+    return order_records[:oidx], log_records[:lidx]
 
-                    if use_stops:
-                        # Update stop price
-                        if order_result.status == OrderStatus.Filled:
-                            if position_now == 0:
-                                # Position closed -> clear stops
-                                sl_curr_i[col] = sl_init_i[col] = -1
-                                sl_curr_price[col] = sl_init_price[col] = np.nan
-                                sl_curr_stop[col] = np.nan
-                                sl_curr_trail[col] = False
-                                tp_init_i[col] = -1
-                                tp_init_price[col] = np.nan
-                                tp_curr_stop[col] = np.nan
-                            else:
-                                _stop_entry_price = flex_select_auto_nb(stop_entry_price, i, col, flex_2d)
-                                if _stop_entry_price == StopEntryPrice.ValPrice:
-                                    new_init_price = val_price_now
-                                elif _stop_entry_price == StopEntryPrice.Price:
-                                    new_init_price = order.price
-                                elif _stop_entry_price == StopEntryPrice.FillPrice:
-                                    new_init_price = order_result.price
-                                else:
-                                    new_init_price = flex_select_auto_nb(close, i, col, flex_2d)
-                                _upon_stop_update = flex_select_auto_nb(upon_stop_update, i, col, flex_2d)
-                                _sl_stop = flex_select_auto_nb(sl_stop, i, col, flex_2d)
-                                _sl_trail = flex_select_auto_nb(sl_trail, i, col, flex_2d)
-                                _tp_stop = flex_select_auto_nb(tp_stop, i, col, flex_2d)
-
-                                if state.position == 0 or np.sign(position_now) != np.sign(state.position):
-                                    # Position opened/reversed -> set stops
-                                    sl_curr_i[col] = sl_init_i[col] = i
-                                    sl_curr_price[col] = sl_init_price[col] = new_init_price
-                                    sl_curr_stop[col] = _sl_stop
-                                    sl_curr_trail[col] = _sl_trail
-                                    tp_init_i[col] = i
-                                    tp_init_price[col] = new_init_price
-                                    tp_curr_stop[col] = _tp_stop
-                                elif abs(position_now) > abs(state.position):
-                                    # Position increased -> keep/override stops
-                                    if should_update_stop_nb(_sl_stop, _upon_stop_update):
-                                        sl_curr_i[col] = sl_init_i[col] = i
-                                        sl_curr_price[col] = sl_init_price[col] = new_init_price
-                                        sl_curr_stop[col] = _sl_stop
-                                        sl_curr_trail[col] = _sl_trail
-                                    if should_update_stop_nb(_tp_stop, _upon_stop_update):
-                                        tp_init_i[col] = i
-                                        tp_init_price[col] = new_init_price
-                                        tp_curr_stop[col] = _tp_stop
 
-                # Now becomes last
-                last_position[col] = position_now
-                last_debt[col] = debt_now
-                if not np.isnan(val_price_now) or not ffill_val_price:
-                    last_val_price[col] = val_price_now
+@njit(nogil=True)
+def simulate_from_signal_cols_nb(from_col: int,
+                                 to_col: int,
+                                 target_shape: tp.Shape,
+                                 init_cash: tp.Array1d,
+                                 call_seq: tp.Array2d,
+                                 signal_func_nb: SignalFuncT,
+                                 signal_args: tp.ArgsLike,
+                                 size: tp.ArrayLike,
+                                 price: tp.ArrayLike,
+                                 size_type: tp.ArrayLike,
+                                 fees: tp.ArrayLike,
+                                 fixed_fees: tp.ArrayLike,
+                                 slippage: tp.ArrayLike,
+                                 min_size: tp.ArrayLike,
+                                 max_size: tp.ArrayLike,
+                                 size_granularity: tp.ArrayLike,
+                                 reject_prob: tp.ArrayLike,
+                                 lock_cash: tp.ArrayLike,
+                                 allow_partial: tp.ArrayLike,
+                                 raise_reject: tp.ArrayLike,
+                                 log: tp.ArrayLike,
+                                 accumulate: tp.ArrayLike,
+                                 upon_long_conflict: tp.ArrayLike,
+                                 upon_short_conflict: tp.ArrayLike,
+                                 upon_dir_conflict: tp.ArrayLike,
+                                 upon_opposite_entry: tp.ArrayLike,
+                                 val_price: tp.ArrayLike,
+                                 open: tp.ArrayLike,
+                                 high: tp.ArrayLike,
+                                 low: tp.ArrayLike,
+                                 close: tp.ArrayLike,
+                                 sl_stop: tp.ArrayLike,
+                                 sl_trail: tp.ArrayLike,
+                                 tp_stop: tp.ArrayLike,
+                                 stop_entry_price: tp.ArrayLike,
+                                 stop_exit_price: tp.ArrayLike,
+                                 upon_stop_exit: tp.ArrayLike,
+                                 upon_stop_update: tp.ArrayLike,
+                                 adjust_sl_func_nb: AdjustSLFuncT,
+                                 adjust_sl_args: tp.Args,
+                                 adjust_tp_func_nb: AdjustTPFuncT,
+                                 adjust_tp_args: tp.Args,
+                                 use_stops: bool,
+                                 auto_call_seq: bool,
+                                 ffill_val_price: bool,
+                                 update_value: bool,
+                                 flex_2d: bool,
+                                 col_max_orders: int,
+                                 col_max_logs: int,
+                                 order_records: tp.RecordArray,
+                                 log_records: tp.RecordArray,
+                                 order_counts: tp.Array1d,
+                                 log_counts: tp.Array1d,
+                                 last_position: tp.Array1d,
+                                 last_debt: tp.Array1d,
+                                 last_val_price: tp.Array1d,
+                                 sl_init_i: tp.Array1d,
+                                 sl_init_price: tp.Array1d,
+                                 sl_curr_i: tp.Array1d,
+                                 sl_curr_price: tp.Array1d,
+                                 sl_curr_stop: tp.Array1d,
+                                 sl_curr_trail: tp.Array1d,
+                                 tp_init_i: tp.Array1d,
+                                 tp_init_price: tp.Array1d,
+                                 tp_curr_stop: tp.Array1d,
+                                 price_arr: tp.Array1d,
+                                 size_arr: tp.Array1d,
+                                 size_type_arr: tp.Array1d,
+                                 slippage_arr: tp.Array1d,
+                                 direction_arr: tp.Array1d,
+                                 temp_order_value: tp.Array1d) -> None:
+    """Simulate the ungrouped columns `from_col:to_col` of `simulate_from_signal_func_nb`.
+
+    Each column is simulated as its own group and writes into its own slice of `order_records`
+    and `log_records` with `col_max_orders` and `col_max_logs` records respectively. The number of
+    records written by each column is stored in `order_counts` and `log_counts`.
+
+    Releases the GIL, thus disjoint column ranges can be simulated in parallel threads using shared
+    records and state arrays. Use `compact_col_records_nb` to merge the records afterwards.
+
+    For arguments, see `simulate_from_signal_func_nb`. State arrays are created by
+    `init_from_signal_state_nb`."""
+    for col in range(from_col, to_col):
+        col_order_records = order_records[col * col_max_orders:(col + 1) * col_max_orders]
+        col_log_records = log_records[col * col_max_logs:(col + 1) * col_max_logs]
+        order_counts[col], log_counts[col] = simulate_from_signal_group_nb(
+            col, col, col + 1, target_shape, init_cash, call_seq, False,
+            signal_func_nb, signal_args, size, price, size_type, fees, fixed_fees, slippage,
+            min_size, max_size, size_granularity, reject_prob, lock_cash, allow_partial,
+            raise_reject, log, accumulate, upon_long_conflict, upon_short_conflict,
+            upon_dir_conflict, upon_opposite_entry, val_price, open, high, low, close,
+            sl_stop, sl_trail, tp_stop, stop_entry_price, stop_exit_price, upon_stop_exit,
+            upon_stop_update, adjust_sl_func_nb, adjust_sl_args, adjust_tp_func_nb,
+            adjust_tp_args, use_stops, auto_call_seq, ffill_val_price, update_value, flex_2d,
+            col_order_records, col_log_records, last_position, last_debt, last_val_price,
+            sl_init_i, sl_init_price, sl_curr_i, sl_curr_price, sl_curr_stop, sl_curr_trail,
+            tp_init_i, tp_init_price, tp_curr_stop, price_arr, size_arr, size_type_arr,
+            slippage_arr, direction_arr, temp_order_value, 0, 0
+        )
 
-        from_col = to_col
 
+@njit(cache=True)
+def compact_col_records_nb(order_records: tp.RecordArray,
+                           log_records: tp.RecordArray,
+                           order_counts: tp.Array1d,
+                           log_counts: tp.Array1d,
+                           col_max_orders: int,
+                           col_max_logs: int) -> tp.Tuple[tp.RecordArray, tp.RecordArray]:
+    """Merge per-column record slices written by `simulate_from_signal_cols_nb` in place.
+
+    Records are kept in column order and get global ids, thus the result is the same as
+    if all columns were simulated by `simulate_from_signal_func_nb`."""
+    oidx = 0
+    lidx = 0
+    for col in range(len(order_counts)):
+        for j in range(log_counts[col]):
+            log_records[lidx] = log_records[col * col_max_logs + j]
+            log_records[lidx]['id'] = lidx
+            if log_records[lidx]['order_id'] != -1:
+                log_records[lidx]['order_id'] += oidx
+            lidx += 1
+        for j in range(order_counts[col]):
+            order_records[oidx] = order_records[col * col_max_orders + j]
+            order_records[oidx]['id'] = oidx
+            oidx += 1
     return order_records[:oidx], log_records[:lidx]
 
 
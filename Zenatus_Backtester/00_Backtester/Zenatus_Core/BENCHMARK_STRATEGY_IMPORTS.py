@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Import-time check of the All_Strategys modules (import contract in
+zenatus_core/signals.py). Every module is imported in a fresh interpreter
+with numpy/pandas/numba preloaded; modules above the budget or pulling in
+vectorbt/talib/scipy/sklearn at import are listed and the script exits
+with 1, so it can gate a strategy commit.
+
+    python BENCHMARK_STRATEGY_IMPORTS.py                    # all modules, default budget
+    python BENCHMARK_STRATEGY_IMPORTS.py --budget-ms 50 --only 001_trend_sma 241_skewness
+    python BENCHMARK_STRATEGY_IMPORTS.py --static           # top-level imports only (AST, no timing)
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# CONFIG
+BASE_PATH = Path(os.environ.get("ZENATUS_BASE_PATH", r"/opt/Zenatus_Backtester"))
+INDICATORS_PATH = BASE_PATH / "01_Strategy" / "Strategy" / "Full_595" / "All_Strategys"
+CORE_PATH = BASE_PATH / "00_Backtester" / "Zenatus_Core"
+
+sys.path.insert(0, str(CORE_PATH))
+from zenatus_core.profiling import IMPORT_BUDGET_SEC, cold_import, eager_imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget of the strategy modules")
+    parser.add_argument("--only", nargs="+", help="Module names (default: all in INDICATORS_PATH)")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_SEC * 1000, help="Budget per module")
+    parser.add_argument("--static", action="store_true", help="Only check the top-level imports")
+    parser.add_argument("--timeout-sec", type=int, default=60, help="Per module")
+    args = parser.parse_args()
+
+    paths = sorted(INDICATORS_PATH.glob("*.py"))
+    if args.only:
+        paths = [p for p in paths if p.stem in set(args.only)]
+    budget = args.budget_ms / 1000
+    print(f"=== STRATEGY IMPORT BENCHMARK ({len(paths)} modules, budget={args.budget_ms:.0f}ms"
+          f"{', static' if args.static else ''}) ===")
+
+    t0 = time.time()
+    failed, total = [], 0.0
+    for i, path in enumerate(paths, 1):
+        eager = eager_imports(path)
+        if args.static:
+            if eager:
+                failed.append(path.stem)
+                print(f"[IMPORT] {path.stem} eager={','.join(eager)}")
+            continue
+        row = cold_import(path, args.timeout_sec)
+        sec = row["sec"]
+        total += sec or 0.0
+        over = row.get("error") or sec > budget or row["heavy"] or eager
+        if over:
+            failed.append(path.stem)
+        if over or i % 50 == 0:
+            print(f"[IMPORT] {i}/{len(paths)} {path.stem} "
+                  f"{'-' if sec is None else f'{sec * 1000:.1f}ms'} heavy={','.join(row['heavy']) or '-'}"
+                  + (f" eager={','.join(eager)}" if eager else "") + (f" ({row['error']})" if row.get("error") else ""))
+
+    if not args.static and paths:
+        print(f"[IMPORT] total {total:.2f}s, mean {total / len(paths) * 1000:.1f}ms per module")
+    print(f"[DONE] {len(paths) - len(failed)}/{len(paths)} within budget ({time.time() - t0:.0f}s)")
+    if failed:
+        print(f"[FAIL] {len(failed)} modules: {', '.join(failed[:20])}{' ...' if len(failed) > 20 else ''}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+One-time conversion of the *_aggregated.csv/.parquet files into the
+memory-mapped OHLCV store (see zenatus_core/store.py). Already converted
+symbols whose source file did not change are skipped, so it can be rerun
+after every data update. Every file is validated and normalized on the way
+(validate.py), the report is kept as validation.json in the store.
+
+    python CONVERT_OHLCV_STORE.py                    # all timeframes / symbols
+    python CONVERT_OHLCV_STORE.py --timeframes 1h 30m --force
+    python CONVERT_OHLCV_STORE.py --resample 2h 3h   # + timeframes built from the finest base
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# CONFIG
+BASE_PATH = Path(os.environ.get("ZENATUS_BASE_PATH", r"/opt/Zenatus_Backtester"))
+DATA_PATH = BASE_PATH / "99_Historic_Data" / "Forex" / "Major"
+CORE_PATH = BASE_PATH / "00_Backtester" / "Zenatus_Core"
+
+sys.path.insert(0, str(CORE_PATH))
+from zenatus_core.resample import load_resampled
+from zenatus_core.store import convert_symbol, source_path, store_path
+from zenatus_core.validate import read_validation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert aggregated OHLCV files into the memory-mapped store")
+    parser.add_argument("--timeframes", nargs="+", help="Timeframes (default: all folders in DATA_PATH)")
+    parser.add_argument("--symbols", nargs="+", help="Symbols (default: all folders per timeframe)")
+    parser.add_argument("--resample", nargs="+", default=[], help="Timeframes to resample from the finest base (e.g. 2h 3h)")
+    parser.add_argument("--force", action="store_true", help="Convert even if the store is current")
+    args = parser.parse_args()
+
+    timeframes = args.timeframes or sorted(p.name for p in DATA_PATH.iterdir() if p.is_dir())
+    print(f"=== OHLCV STORE CONVERSION ({DATA_PATH}) ===")
+    for tf in timeframes:
+        symbols = args.symbols or sorted(p.name for p in (DATA_PATH / tf).iterdir() if p.is_dir())
+        for symbol in symbols:
+            if not source_path(DATA_PATH, tf, symbol).exists():
+                continue
+            t0 = time.time()
+            try:
+                schema = convert_symbol(DATA_PATH, tf, symbol, force=args.force)
+                report = read_validation(store_path(DATA_PATH, tf, symbol)) or {}
+                print(f"[STORE] {tf} {symbol} rows={schema['rows']} {schema['first']} .. {schema['last']} "
+                      f"hash={schema.get('hash')} validation={report.get('status', 'none')} ({time.time() - t0:.2f}s)")
+            except Exception as e:
+                print(f"[ERR] {tf} {symbol}: {e}")
+    
+    # Resampled timeframes are cached next to the others (rebuilt when the base data changes)
+    for tf in args.resample:
+        symbols = args.symbols or sorted({p.name for t in timeframes for p in (DATA_PATH / t).iterdir() if p.is_dir()})
+        for symbol in symbols:
+            t0 = time.time()
+            try:
+                df = load_resampled(DATA_PATH, tf, symbol)
+                if df is None:
+                    print(f"[WARN] {tf} {symbol}: no base timeframe")
+                    continue
+                print(f"[STORE] {tf} {symbol} rows={len(df)} (resampled, {time.time() - t0:.2f}s)")
+            except Exception as e:
+                print(f"[ERR] {tf} {symbol}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Append new bars from the *_aggregated.csv/.parquet files to the OHLCV store
+and record the watermark (see zenatus_core/ingest.py). Symbols without a
+store are converted on the first run.
+
+    python INGEST_NEW_BARS.py                          # all symbols of 1h
+    python INGEST_NEW_BARS.py --timeframes 1h 30m --symbols EUR_USD
+    python INGEST_NEW_BARS.py --every 15               # keep ingesting every 15 minutes
+
+Afterwards run the worker with --extend: only the bars after the watermark
+(and trades still open at it) are simulated again.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# CONFIG
+BASE_PATH = Path(os.environ.get("ZENATUS_BASE_PATH", r"/opt/Zenatus_Backtester"))
+DATA_PATH = BASE_PATH / "99_Historic_Data" / "Forex" / "Major"
+CORE_PATH = BASE_PATH / "00_Backtester" / "Zenatus_Core"
+VBT_PATH = BASE_PATH / "00_Backtester" / "Vectorbt_Master"
+
+if VBT_PATH.exists():
+    sys.path.insert(0, str(VBT_PATH))
+sys.path.insert(0, str(CORE_PATH))
+from vectorbt.utils.schedule_ import ScheduleManager
+from zenatus_core.ingest import StoreUpdater
+from zenatus_core.store import source_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append new bars to the OHLCV store")
+    parser.add_argument("--timeframes", nargs="+", default=["1h"], help="Timeframes (default: 1h)")
+    parser.add_argument("--symbols", nargs="+", help="Symbols (default: all folders per timeframe)")
+    parser.add_argument("--every", type=float, help="Repeat every N minutes (DataUpdater schedule)")
+    args = parser.parse_args()
+
+    print(f"=== BAR INGESTION ({DATA_PATH}) ===")
+    schedule_manager = ScheduleManager()
+    updaters = []
+    for tf in args.timeframes:
+        symbols = args.symbols or sorted(p.name for p in (DATA_PATH / tf).iterdir() if p.is_dir())
+        symbols = [s for s in symbols if source_path(DATA_PATH, tf, s).exists()]
+        try:
+            updaters += StoreUpdater.for_symbols(DATA_PATH, tf, symbols, schedule_manager)
+        except Exception as e:
+            print(f"[ERR] {tf}: {e}")
+
+    def update_all():
+        t0 = time.time()
+        for updater in updaters:
+            try:
+                updater.update()
+            except Exception as e:
+                print(f"[ERR] {updater.data.symbols[0]}: {e}")
+        print(f"[INGEST] {len(updaters)} symbols in {time.time() - t0:.2f}s")
+
+    update_all()
+    if args.every:
+        schedule_manager.every(int(args.every * 60), "seconds").do(update_all)
+        schedule_manager.start()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Cost table of the All_Strategys modules (see zenatus_core/profiling.py).
+Every module is timed in a warm pool process with a hard timeout, so a
+module that hangs is recorded as "timeout" instead of stopping the run;
+the AST hot-path flags are added for every module. Rows are merged into
+the existing table, so a partial run (--only / --missing) keeps the rest.
+
+    python PROFILE_STRATEGIES.py                         # all modules
+    python PROFILE_STRATEGIES.py --only 118_trend_hurstexponent 187_volume_profile
+    python PROFILE_STRATEGIES.py --missing --timeout-sec 300
+    python PROFILE_STRATEGIES.py --report 20             # slowest 20 of the table at 1h bars
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# CONFIG
+BASE_PATH = Path(os.environ.get("ZENATUS_BASE_PATH", r"/opt/Zenatus_Backtester"))
+INDICATORS_PATH = BASE_PATH / "01_Strategy" / "Strategy" / "Full_595" / "All_Strategys"
+CORE_PATH = BASE_PATH / "00_Backtester" / "Zenatus_Core"
+VBT_PATH = BASE_PATH / "00_Backtester" / "Vectorbt_Master"
+COST_TABLE_FILE = Path(r"/opt/Zenatus_Dokumentation/Listing/strategy_costs.json")
+TIMEOUT_SEC = 600  # Per module (import + all bar counts)
+REPORT_TIMEFRAME = "1h"
+REPORT_START = "2023-01-01"
+
+if VBT_PATH.exists():
+    sys.path.insert(0, str(VBT_PATH))
+sys.path.insert(0, str(CORE_PATH))
+from zenatus_core.pool import TASK_DONE, TASK_TIMEOUT, WarmWorkerPool
+from zenatus_core.profiling import (PROFILE_BARS, expected_bars, predict_seconds, profile_strategy,
+                                    read_cost_table, scan_hot_paths, write_cost_table)
+
+
+def warm_up():
+    # Shared imports of the strategies, so the first module's import time is its own
+    import numpy, pandas, vectorbt  # noqa: F401
+
+
+def report(table, top):
+    bars = expected_bars(REPORT_TIMEFRAME, REPORT_START, datetime.now())
+    rows = []
+    for name, row in table.items():
+        sec = predict_seconds(row, bars, row.get("entry_combos", 1))
+        rows.append((float("inf") if sec is None else sec, name, row))
+    rows.sort(key=lambda r: r[0], reverse=True)
+    print(f"=== SLOWEST {top} ({REPORT_TIMEFRAME}, {bars} bars, full entry grid, one symbol) ===")
+    for sec, name, row in rows[:top]:
+        exponent = row.get("exponent")
+        print(f"[COST] {name:<45} {row.get('status'):<7} "
+              f"{'?' if sec == float('inf') else f'{sec:.1f}s':>10} "
+              f"exp={'?' if exponent is None else f'{exponent:.2f}'} combos={row.get('entry_combos', '?')} "
+              f"flags={','.join(row.get('scan', {}).get('flags', [])) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the strategy modules into a cost table")
+    parser.add_argument("--only", nargs="+", help="Module names (default: all in INDICATORS_PATH)")
+    parser.add_argument("--missing", action="store_true", help="Only modules not yet in the table")
+    parser.add_argument("--bars", nargs="+", type=int, default=list(PROFILE_BARS), help="Synthetic bar counts")
+    parser.add_argument("--repeats", type=int, default=1, help="Best of n calls per bar count")
+    parser.add_argument("--timeout-sec", type=int, default=TIMEOUT_SEC, help="Hard limit per module")
+    parser.add_argument("--processes", type=int, default=1, help="Pool processes (timings interfere above 1 per core)")
+    parser.add_argument("--output", type=str, default=str(COST_TABLE_FILE), help="Cost table JSON")
+    parser.add_argument("--report", type=int, nargs="?", const=20, help="Only print the slowest n of the table")
+    args = parser.parse_args()
+
+    table = read_cost_table(args.output)
+    if args.report:
+        report(table, args.report)
+        return
+
+    paths = sorted(INDICATORS_PATH.glob("*.py"))
+    if args.only:
+        paths = [p for p in paths if p.stem in set(args.only)]
+    if args.missing:
+        paths = [p for p in paths if p.stem not in table]
+    print(f"=== STRATEGY PROFILING ({len(paths)} modules, bars={args.bars}, timeout={args.timeout_sec}s) ===")
+
+    def task(path):
+        return profile_strategy(path, bars=tuple(args.bars), repeats=args.repeats)
+
+    t0 = time.time()
+    with WarmWorkerPool(task, initializer=warm_up, processes=args.processes, timeout_sec=args.timeout_sec) as pool:
+        for i, (path, status, row) in enumerate(pool.imap_unordered(paths), 1):
+            if status != TASK_DONE:
+                row = {"status": "timeout" if status == TASK_TIMEOUT else "error", "bars": args.bars,
+                       "error": f"{status} after {args.timeout_sec}s" if status == TASK_TIMEOUT else str(row)}
+            try:
+                row["scan"] = scan_hot_paths(path)
+            except SyntaxError as e:
+                row["scan"] = {"flags": [], "error": str(e)}
+            row["profiled"] = datetime.now().isoformat(timespec="seconds")
+            table[path.stem] = row
+            sig = [f"{s:.3f}" if s is not None else "-" for s in row.get("signals_sec", [])]
+            print(f"[PROF] {i}/{len(paths)} {path.stem} {row['status']} signals_sec={sig} "
+                  f"exp={row.get('exponent') if row.get('exponent') is None else round(row['exponent'], 2)} "
+                  f"flags={','.join(row['scan']['flags']) or '-'}" + (f" ({row['error']})" if row.get("error") else ""))
+            if i % 25 == 0:
+                write_cost_table(args.output, table, args.bars)
+
+    write_cost_table(args.output, table, args.bars)
+    print(f"[DONE] {len(paths)} modules in {time.time() - t0:.0f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
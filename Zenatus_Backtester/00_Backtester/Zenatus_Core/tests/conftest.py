@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Shared setup of the Zenatus_Core tests: zenatus_core (and the vendored
+vectorbt) on the path, the strategy directory, synthetic bars and the
+bit-exact comparison the parity tests use.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BACKTESTER = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(BACKTESTER / "Zenatus_Core"))
+sys.path.insert(0, str(BACKTESTER / "Vectorbt_Master"))
+STRATEGY_PATH = BACKTESTER.parent / "01_Strategy" / "Strategy" / "Full_595" / "All_Strategys"
+
+from zenatus_core.profiling import find_strategy_class, load_strategy_module, synthetic_ohlcv  # noqa: E402
+
+SEED = 42
+
+
+def ohlcv(n=600, price=1.1, scale=0.002):
+    return synthetic_ohlcv(n, SEED, price, scale)
+
+
+def load_strategy(name):
+    """Module ``All_Strategys/<name>.py``."""
+    return load_strategy_module(STRATEGY_PATH / f"{name}.py")
+
+
+def strategy_instance(name):
+    """Instance of the module's strategy class (the workers' pick)."""
+    return find_strategy_class(load_strategy(name))()
+
+
+def same(a, b):
+    """Bit-identical values, NaN equal to NaN."""
+    return np.array_equal(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64), equal_nan=True)
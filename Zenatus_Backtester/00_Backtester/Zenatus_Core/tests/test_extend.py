@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+zenatus_core.extend: a run resumed from the checkpoint of the first N bars
+against a full run on N+k bars, and the checkpoint checks of
+ExtendCheckpoint.lookup (old bars, old entries, stops).
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ohlcv
+from zenatus_core.extend import ExtendCheckpoint, extend_metrics, initial_state, simulate_window, stops_hash
+from zenatus_core.metrics import fixed_exit_metrics, fixed_exit_metrics_dt, metrics_frame
+from zenatus_core.simulation import simulate_fixed_exit
+
+INITIAL_CAPITAL = 10000
+POSITION_SIZE = 100
+COMMISSION_PER_LOT = 3.0
+FREQ = "1H"
+TP = np.array([0.001, 0.003, 0.01, 0.05])
+SL = np.array([0.002, 0.003, 0.02, 0.05])  # Wide stops: trades still open at the checkpoint
+PF_KWARGS = dict(exits=False, size=POSITION_SIZE, size_type="amount", fees=0.0, freq=FREQ)
+KEY = ExtendCheckpoint.key("EUR_USD", {"period": 20})
+STOPS = stops_hash(TP, SL, INITIAL_CAPITAL, POSITION_SIZE, COMMISSION_PER_LOT)
+
+
+def market(n=3000):
+    df = ohlcv(n)
+    entries = pd.Series(np.arange(n) % 37 == 5, index=df.index)
+    return df, entries
+
+
+def run(df, entries, checkpoint):
+    """The worker's extend_backtest for one chunk: resume if the checkpoint matches, else a full run."""
+    state = checkpoint.lookup(KEY, df, entries.values, STOPS)
+    resumed = state is not None
+    if resumed:
+        pf, cut = simulate_window(df["close"], entries.values, state, TP, SL, **PF_KWARGS)
+    else:
+        state = initial_state(float(INITIAL_CAPITAL), len(TP))
+        pf, cut = simulate_fixed_exit(df["close"], entries, TP, SL, init_cash=INITIAL_CAPITAL, **PF_KWARGS), 0
+    metrics, new_state = extend_metrics(pf, df["close"].values, cut, state, COMMISSION_PER_LOT,
+                                        POSITION_SIZE / 100000, FREQ)
+    checkpoint.put(KEY, df, entries.values, STOPS, new_state)
+    return metrics, resumed, cut
+
+
+def full_metrics(df, entries):
+    pf = simulate_fixed_exit(df["close"], entries, TP, SL, init_cash=INITIAL_CAPITAL, **PF_KWARGS)
+    return fixed_exit_metrics(pf, COMMISSION_PER_LOT, POSITION_SIZE / 100000, FREQ)
+
+
+def assert_same_metrics(got, expected):
+    for field in fixed_exit_metrics_dt.names:
+        if got[field].dtype.kind == "i":
+            assert np.array_equal(got[field], expected[field]), field
+        else:
+            # Sharpe: merged (count, mean, M2) of the stored and the new returns
+            assert np.allclose(got[field], expected[field], rtol=1e-9, atol=1e-12, equal_nan=True), field
+
+
+def saved(checkpoint, path):
+    checkpoint.save()
+    return ExtendCheckpoint(path)
+
+
+def test_full_run_matches_fused_metrics(tmp_path):
+    df, entries = market()
+    metrics, resumed, _ = run(df, entries, ExtendCheckpoint(tmp_path / "cp.npz"))
+    assert not resumed
+    assert np.array_equal(metrics, full_metrics(df, entries))
+
+
+@pytest.mark.parametrize("n, extra", [(2500, [500]), (1000, [1, 700, 1299]), (2999, [1])])
+def test_resume_matches_full_run(tmp_path, n, extra):
+    """Checkpoint at N, resumed on N+k (several times in a row) == full run on N+k."""
+    path = tmp_path / "cp.npz"
+    df, entries = market(n + sum(extra))
+    checkpoint = ExtendCheckpoint(path)
+    run(df.iloc[:n], entries.iloc[:n], checkpoint)
+    end = n
+    for k in extra:
+        checkpoint = saved(checkpoint, path)
+        end += k
+        metrics, resumed, cut = run(df.iloc[:end], entries.iloc[:end], checkpoint)
+        assert resumed and cut <= end - k  # Window starts at the earliest open trade, at the latest on the new bars
+        expected = full_metrics(df.iloc[:end], entries.iloc[:end])
+        assert_same_metrics(metrics, expected)
+        pd.testing.assert_frame_equal(metrics_frame(metrics), metrics_frame(expected), check_exact=True)
+
+
+def test_lookup_rejects_changes(tmp_path):
+    path = tmp_path / "cp.npz"
+    df, entries = market()
+    n = 2500
+    checkpoint = ExtendCheckpoint(path)
+    run(df.iloc[:n], entries.iloc[:n], checkpoint)
+    checkpoint = saved(checkpoint, path)
+    assert checkpoint.lookup(KEY, df, entries.values, STOPS) is not None
+
+    # New bars and new entries after the checkpoint are what extend mode is for
+    later = entries.copy()
+    later.iloc[n + 3] = True
+    assert checkpoint.lookup(KEY, df, later.values, STOPS) is not None
+
+    changed_bar = df.copy()
+    changed_bar.iloc[100, changed_bar.columns.get_loc("close")] += 1e-5
+    assert checkpoint.lookup(KEY, changed_bar, entries.values, STOPS) is None
+
+    shifted = df.copy()
+    shifted.index = shifted.index + pd.Timedelta("1h")
+    assert checkpoint.lookup(KEY, shifted, entries.values, STOPS) is None
+
+    changed_entries = entries.copy()
+    changed_entries.iloc[n - 10] = not changed_entries.iloc[n - 10]
+    assert checkpoint.lookup(KEY, df, changed_entries.values, STOPS) is None
+
+    assert checkpoint.lookup(KEY, df, entries.values, stops_hash(TP, SL * 1.5, INITIAL_CAPITAL, POSITION_SIZE,
+                                                                 COMMISSION_PER_LOT)) is None
+    assert checkpoint.lookup(KEY, df, entries.values, stops_hash(TP, SL, 20000, POSITION_SIZE,
+                                                                 COMMISSION_PER_LOT)) is None
+    assert checkpoint.lookup(KEY, df.iloc[:n - 1], entries.values, STOPS) is None  # Fewer bars than checkpointed
+    assert checkpoint.lookup(ExtendCheckpoint.key("GBP_USD", {"period": 20}), df, entries.values, STOPS) is None
+
+
+def test_save_keeps_used_items(tmp_path):
+    path = tmp_path / "cp.npz"
+    df, entries = market(500)
+    checkpoint = ExtendCheckpoint(path)
+    run(df, entries, checkpoint)
+    checkpoint = saved(checkpoint, path)
+    assert list(checkpoint.items) == [KEY]
+    saved(checkpoint, path)  # Nothing used in this run: the file is kept as it is
+    assert list(ExtendCheckpoint(path).items) == [KEY]
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+zenatus_core.first_passage: the close-only mode (``use_high_low=False``,
+engine ``first_passage_close``) against the vectorbt engine, i.e.
+``fixed_exit_metrics(Portfolio.from_signals(...))`` on the same bars.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+import vectorbt as vbt
+
+from conftest import ohlcv
+from zenatus_core.first_passage import engine_results_dir, first_passage_metrics
+from zenatus_core.metrics import fixed_exit_metrics, fixed_exit_metrics_dt, metrics_frame
+
+COMMISSION_PER_LOT = 3.0
+FREQ = "1H"
+TP = np.array([0.0005, 0.001, 0.002, 0.002, 0.004, 0.01, 0.03])
+SL = np.array([0.001, 0.0005, 0.002, 0.006, 0.001, 0.02, 0.03])
+
+
+def both_engines(df, entries, init_cash, size):
+    lot_size = size / 100000
+    fp = first_passage_metrics(df, entries, TP, SL, init_cash=init_cash, size=size,
+                               commission_per_lot=COMMISSION_PER_LOT, lot_size=lot_size, freq=FREQ,
+                               use_high_low=False)
+    pf = vbt.Portfolio.from_signals(close=df["close"], entries=entries, exits=False, tp_stop=TP[None, :],
+                                    sl_stop=SL[None, :], init_cash=init_cash, size=size, size_type="amount",
+                                    fees=0.0, freq=FREQ)
+    return fp, fixed_exit_metrics(pf, COMMISSION_PER_LOT, lot_size, FREQ)
+
+
+def assert_same_metrics(got, expected):
+    for field in fixed_exit_metrics_dt.names:
+        if got[field].dtype.kind == "i":
+            assert np.array_equal(got[field], expected[field]), field
+        else:
+            # Sharpe: closed-form sums over the flat bars instead of nanmean/nanvar
+            assert np.allclose(got[field], expected[field], rtol=1e-9, atol=1e-12, equal_nan=True), field
+    pd.testing.assert_frame_equal(metrics_frame(got), metrics_frame(expected), check_exact=True)
+
+
+@pytest.mark.parametrize("every", [1, 3, 25, 200])
+def test_close_only_parity(every):
+    """Several TP/SL levels (shared and distinct), entries on exit bars (every=1, 3), an open trade at the end."""
+    df = ohlcv(2000)
+    entries = pd.Series(np.arange(len(df)) % every == 0, index=df.index)
+    entries.iloc[-3:] = True
+    fp, vb = both_engines(df, entries, 10000, 100)
+    assert (fp["Total_Trades"] > 1).all()
+    assert_same_metrics(fp, vb)
+
+
+def test_partial_fill():
+    """Cash below size x price: vectorbt fills what the cash buys, so does the engine."""
+    df = ohlcv(1500, price=150.0, scale=0.004)
+    entries = pd.Series(np.arange(len(df)) % 11 == 0, index=df.index)
+    fp, vb = both_engines(df, entries, 10000, 100)  # 100 units at ~150 > 10000 cash
+    assert_same_metrics(fp, vb)
+
+
+def test_no_entries():
+    df = ohlcv(300)
+    fp, vb = both_engines(df, pd.Series(False, index=df.index), 10000, 100)
+    assert (fp["Total_Trades"] == 0).all()
+    assert_same_metrics(fp, vb)
+
+
+def test_high_low_differs():
+    """The default mode checks stops on the bar range: other exits than the close-only engines."""
+    df = ohlcv(1000)
+    entries = pd.Series(np.arange(len(df)) % 5 == 0, index=df.index)
+    kwargs = dict(init_cash=10000, size=100, commission_per_lot=COMMISSION_PER_LOT, lot_size=0.001, freq=FREQ)
+    high_low = first_passage_metrics(df, entries, TP, SL, **kwargs)
+    close_only = first_passage_metrics(df, entries, TP, SL, use_high_low=False, **kwargs)
+    assert not np.array_equal(high_low["Total_Trades"], close_only["Total_Trades"])
+
+
+def test_engine_results_dir(tmp_path):
+    assert engine_results_dir(tmp_path, "vectorbt") == tmp_path
+    assert engine_results_dir(tmp_path, "first_passage") == tmp_path / "first_passage"
+    assert engine_results_dir(tmp_path, "first_passage_close") == tmp_path / "first_passage_close"
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Parity of zenatus_core.incremental with the pandas expressions and of every
+strategy implementing ``init_state`` / ``update`` (incremental contract in
+zenatus_core/signals.py) with its batch ``calculate`` / ``generate_signals_fixed``.
+New ports are picked up from All_Strategys automatically.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import STRATEGY_PATH, ohlcv, same, strategy_instance
+from zenatus_core import incremental
+from zenatus_core.primitives import _true_range
+
+INCREMENTAL = sorted(p.stem for p in STRATEGY_PATH.glob("*.py") if "def init_state(" in p.read_text(encoding="utf-8"))
+
+
+def series(n=2000, seed=0):
+    """Random walk with a flat run, NaN gaps and -0.0 (pandas' special cases)."""
+    x = 1.1 + np.cumsum(np.random.default_rng(seed).normal(0, 1e-3, n))
+    x[100:130] = x[100]
+    x[500] = np.nan
+    x[900:905] = np.nan
+    x[1200:1210] = -0.0
+    return x
+
+
+def market(n=1500, price=1.1, scale=0.002):
+    """Synthetic bars with a flat market in bars 300-339 (zero std, same-value windows)."""
+    df = ohlcv(n, price, scale)
+    df.iloc[300:340, df.columns.get_indexer(["open", "high", "low", "close"])] = df["close"].iloc[300]
+    return df
+
+
+def feed(obj, x):
+    return np.array([obj.update(v) for v in x])
+
+
+class TestPrimitives:
+    @pytest.mark.parametrize("window", [1, 2, 3, 14, 20, 89])
+    @pytest.mark.parametrize("min_periods", [None, 1])
+    def test_rolling(self, window, min_periods):
+        for seed in range(3):
+            x = series(seed=seed)
+            rolling = pd.Series(x).rolling(window, min_periods=min_periods)
+            assert same(feed(incremental.RollingSum(window, min_periods), x), rolling.sum())
+            assert same(feed(incremental.RollingMean(window, min_periods), x), rolling.mean())
+            assert same(feed(incremental.RollingStd(window, min_periods), x), rolling.std())
+
+    @pytest.mark.parametrize("adjust", [False, True])
+    def test_ewm(self, adjust):
+        x = pd.Series(series())
+        for span in [2, 5, 20, 89]:
+            assert same(feed(incremental.Ewm(span=span, adjust=adjust), x), x.ewm(span=span, adjust=adjust).mean())
+        assert same(feed(incremental.Ewm(alpha=0.3, adjust=adjust), x), x.ewm(alpha=0.3, adjust=adjust).mean())
+        assert same(feed(incremental.Ewm(com=4, adjust=adjust), x), x.ewm(com=4, adjust=adjust).mean())
+
+    def test_lag_atr_cross(self):
+        df = market()
+        x = df["close"].values
+        assert same(feed(incremental.Lag(3), x), df["close"].shift(3))
+        atr = incremental.Atr(14)
+        got = [atr.update(h, l, c) for h, l, c in zip(df["high"], df["low"], df["close"])]
+        assert same(got, _true_range(df["high"], df["low"], df["close"]).rolling(14).mean())
+        sma = df["close"].rolling(20).mean()
+        cross = incremental.CrossAbove()
+        got = [cross.update(a, b) for a, b in zip(df["close"], sma)]
+        assert np.array_equal(got, ((df["close"] > sma) & (df["close"].shift(1) <= sma.shift(1))).values)
+
+
+def test_strategies_found():
+    assert {"001_trend_sma", "002_trend_ema", "007_trend_kama", "013_trend_vidya"} <= set(INCREMENTAL)
+
+
+@pytest.mark.parametrize("name", INCREMENTAL)
+@pytest.mark.parametrize("price", [1.1, 150.0])
+def test_strategy_parity(name, price):
+    strategy = strategy_instance(name)
+    strategy.signals_only = True
+    df = market(price=price, scale=0.002 if price < 10 else 0.004)
+    grid = strategy.get_parameter_grid()
+    defaults = {k: v["default"] for k, v in strategy.PARAMETERS.items() if "default" in v}
+    param_sets = [defaults] + [{**defaults, k: values[i]} for k, values in grid.items()
+                               if k not in ("tp_pips", "sl_pips") for i in (0, -1)]
+    for params in param_sets:
+        entries, values, _ = incremental.run(strategy, df, params)
+        assert np.array_equal(entries, strategy.generate_signals_fixed(df, params)["entries"].values), params
+        expected = strategy.calculate(df, params)
+        if isinstance(expected, pd.DataFrame):
+            for column in expected.columns:
+                assert same([v[column] for v in values], expected[column]), (params, column)
+        else:
+            assert same(values, expected), params
+
+
+@pytest.mark.parametrize("name", INCREMENTAL)
+def test_strategy_resume(name):
+    """A pickled state continues like an uninterrupted run (live trading restart)."""
+    strategy = strategy_instance(name)
+    df = market(600)
+    params = {k: v["default"] for k, v in strategy.PARAMETERS.items() if "default" in v}
+    entries, values, _ = incremental.run(strategy, df, params)
+    head, _, state = incremental.run(strategy, df.iloc[:400], params)
+    tail, tail_values, _ = incremental.run(strategy, df.iloc[400:], params, pickle.loads(pickle.dumps(state)))
+    assert np.array_equal(np.r_[head, tail], entries)
+    assert repr(tail_values) == repr(values[400:])
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Parity of zenatus_core.kernels with the numpy/pandas expressions they replace,
+of the ported strategies with their Python loops (kernels = None) and of the
+batch entries (generate_entries_batch, EntryBatches) with generate_signals_fixed.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SEED, load_strategy, ohlcv, same
+from zenatus_core import kernels
+from zenatus_core.signals import EntryBatches
+
+
+class TestReductions:
+    @pytest.mark.parametrize("n", [1, 5, 8, 13, 16, 100, 128, 129, 1000, 4099])
+    def test_sum_mean_std(self, n):
+        a = np.random.default_rng(n).normal(0, 1e-3, n)
+        assert kernels.np_sum_nb(a) == np.sum(a)
+        assert kernels.np_mean_nb(a) == np.mean(a)
+        assert kernels.np_std_nb(a) == np.std(a)
+
+    @pytest.mark.parametrize("m", [3, 10, 17, 50, 200])
+    def test_polyfit(self, m):
+        rng = np.random.default_rng(m)
+        for _ in range(20):
+            x, y = rng.uniform(0, 3, m), rng.normal(0, 1, m)
+            assert kernels.polyfit1_nb(x, y) == tuple(np.polyfit(x, y, 1))
+
+
+class TestRolling:
+    def test_quantile(self):
+        x = ohlcv()["close"].pct_change().values
+        x[::7] = np.round(x[::7], 4)  # Ties
+        for window in [5, 20, 100]:
+            for q in [0.1, 0.25, 0.5, 0.75, 0.8]:
+                assert same(kernels.rolling_quantile_nb(x, window, q, False),
+                            pd.Series(x).rolling(window).quantile(q))
+                ref = [np.nan] * (window - 1) + [np.quantile(x[i - window + 1:i + 1], q)
+                                                 for i in range(window - 1, len(x))]
+                assert same(kernels.rolling_quantile_nb(x, window, q, True), ref)
+
+    def test_rank(self):
+        x = np.round(ohlcv()["close"].values, 3)  # Ties
+        for window in [5, 50]:
+            for pct in [False, True]:
+                assert same(kernels.rolling_rank_nb(x, window, pct), pd.Series(x).rolling(window).rank(pct=pct))
+
+    def test_linreg(self):
+        x = ohlcv()["close"]
+        for window in [2, 10, 55]:
+            slope, intercept, r2 = kernels.rolling_linreg_nb(x.values, window)
+            ref = x.rolling(window).apply(lambda w: np.polyfit(np.arange(len(w)), w, 1)[0] if len(w) > 1 else 0)
+            assert same(slope, ref)
+            i = len(x) - 1
+            w = x.values[i - window + 1:]
+            assert intercept[i] == np.polyfit(np.arange(window), w, 1)[1]
+            fit = intercept[i] + slope[i] * np.arange(window)
+            assert r2[i] == pytest.approx(1 - np.sum((w - fit) ** 2) / np.sum((w - w.mean()) ** 2), rel=1e-9)
+
+    def test_adaptive_ema(self):
+        x = ohlcv()["close"].values
+        alpha = np.random.default_rng(SEED).uniform(0, 0.5, len(x))
+        alpha[:10] = np.nan
+        y = kernels.adaptive_ema_nb(x, alpha, 0.1)
+        ref = [x[0]]
+        for i in range(1, len(x)):
+            a = 0.1 if np.isnan(alpha[i]) else alpha[i]
+            ref.append(a * x[i] + (1 - a) * ref[-1])
+        assert same(y, ref)
+
+
+class TestStrategyPorts:
+    """Ported strategies give the values of their original loop (the fallback without Zenatus_Core)."""
+
+    @pytest.mark.parametrize("name,cls,params", [
+        ("013_trend_vidya", "Indicator_VIDYA", [{"period": 2, "cmo_period": 5}, {"period": 20, "cmo_period": 9}]),
+        ("118_trend_hurstexponent", "Indicator_HurstExponent", [{"period": 50}, {"period": 100}]),
+        ("187_volume_profile", "Indicator_VolumeProfile", [{"period": 5, "bins": 5}, {"period": 20, "bins": 10},
+                                                           {"period": 29, "bins": 20}]),
+        ("341_kmeans_clustering", "Indicator_KMeansClustering", [{"period": 5, "n_clusters": 2},
+                                                                  {"period": 20, "n_clusters": 3},
+                                                                  {"period": 29, "n_clusters": 5}]),
+    ])
+    @pytest.mark.parametrize("price", [1.1, 150.0])
+    def test_identical(self, name, cls, params, price):
+        module = load_strategy(name)
+        assert module.kernels is not None
+        data = ohlcv(400, price)
+        for p in params:
+            fast = getattr(module, cls)().calculate(data, p)
+            module.kernels = None
+            try:
+                slow = getattr(module, cls)().calculate(data, p)
+            finally:
+                module.kernels = kernels
+            assert fast.equals(slow), (name, p)
+            assert fast.dtypes.equals(slow.dtypes) if isinstance(fast, pd.DataFrame) else fast.dtype == slow.dtype
+
+
+class TestBatch:
+    def test_rolling_mean(self):
+        x = np.r_[ohlcv()["close"].values, np.full(20, 1.25), [np.nan] * 3, ohlcv(50)["close"].pct_change().values]
+        windows = np.array([1, 2, 5, 13, 89])
+        for min_periods in [0, 1]:
+            m = kernels.rolling_mean_batch_nb(x, windows, min_periods)
+            for k, w in enumerate(windows):
+                assert same(m[:, k], pd.Series(x).rolling(w, min_periods=min_periods or None).mean())
+
+    def test_ewm_mean(self):
+        x = np.r_[[np.nan], ohlcv()["close"].values, np.full(20, 1.25), [np.nan] * 3, [1.3]]
+        spans = np.array([2, 3, 20, 89])
+        for adjust in [False, True]:
+            m = kernels.ewm_mean_batch_nb(x, (spans - 1) / 2, adjust)
+            for k, span in enumerate(spans):
+                assert same(m[:, k], pd.Series(x).ewm(span=span, adjust=adjust).mean())
+
+    @pytest.mark.parametrize("name", ["001_trend_sma", "002_trend_ema"])
+    def test_strategy_entries(self, name):
+        module = load_strategy(name)
+        klass = next(v for k, v in vars(module).items() if k.startswith("Indicator_"))
+        data = ohlcv()
+        combos = [{"period": p} for p in klass.PARAMETERS["period"]["values"]]
+        instance = klass()
+        instance.signals_only = True
+        matrix = instance.generate_entries_batch(data, combos)
+        for k, params in enumerate(combos):
+            assert np.array_equal(matrix[:, k], instance.generate_signals_fixed(data, params)["entries"].values)
+
+    def test_entry_batches(self):
+        class Strategy:
+            def generate_entries_batch(self, data, param_list):
+                return np.column_stack([data["close"].values > p["level"] for p in param_list])
+
+        data = ohlcv(100)
+        combos = [{"level": v} for v in np.linspace(1.05, 1.15, 10)]
+        batches = EntryBatches(Strategy(), data, combos, batch_size=4)
+        for params in combos[::-1] + combos:
+            assert np.array_equal(batches.entries(params).values, data["close"].values > params["level"])
+        assert batches.calls == 10  # From the back: one call per combo, then blocks of 4 from the front
+        assert np.array_equal(batches.entries({"level": 1.1}).values, data["close"].values > 1.1)
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+zenatus_core.metrics: the fused reducer and the CSV rounding against the
+``pf.trades`` / ``pf.value()`` accessors and ``float(f"{x:.4f}")`` formatting
+the workers used before.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+import vectorbt as vbt
+
+from conftest import ohlcv
+from zenatus_core.metrics import METRIC_COLUMNS, fixed_exit_metrics, metrics_frame, round_half_exact
+from zenatus_core.panel import Panel
+from zenatus_core.simulation import simulate_fixed_exit, simulate_fixed_exit_cross
+
+INITIAL_CAPITAL = 10000
+COMMISSION_PER_LOT = 3.0
+FREQ = "1H"
+STOPS = (np.array([0.0005, 0.002, 0.004, 0.01]), np.array([0.001, 0.001, 0.006, 0.02]))
+
+
+def baseline(pf, lot_size):
+    """Metric columns of every portfolio column, the former accessor path of the workers."""
+    m_trades = pf.trades.count()
+    m_total_profit = pf.total_profit()
+    equity = pf.value()
+    m_max_dd = abs(((equity - equity.expanding().max()) / equity.expanding().max()).min()) * 100
+    m_win_rate = pf.trades.win_rate() * 100
+    m_pfactor = pf.trades.profit_factor()
+    m_sharpe = pf.sharpe_ratio()
+    winning, losing = pf.trades.winning, pf.trades.losing
+    m_avg_win, m_avg_loss = winning.pnl.mean(), losing.pnl.mean()
+    m_highest_win, m_highest_loss = winning.pnl.max(), losing.pnl.min()
+    m_gross_profit = winning.pnl.sum()
+
+    def fmt(x, decimals, nan=False):
+        x = float(x)
+        if nan and (np.isnan(x) or np.isinf(x)):
+            return 0.0
+        return float(f"{x:.{decimals}f}")
+
+    rows = []
+    for idx in range(len(m_trades)):
+        trades = int(m_trades.iloc[idx])
+        commission = trades * COMMISSION_PER_LOT * lot_size
+        net_profit = m_total_profit.iloc[idx] - commission
+        rows.append({
+            "Total_Return": fmt(net_profit / INITIAL_CAPITAL * 100, 4),
+            "Max_Drawdown": fmt(m_max_dd.iloc[idx], 4),
+            "Daily_Drawdown": 0.0,
+            "Win_Rate_%": fmt(m_win_rate.iloc[idx], 2),
+            "Total_Trades": trades,
+            "Winning_Trades": int(winning.count().iloc[idx]),
+            "Losing_Trades": int(losing.count().iloc[idx]),
+            "Avg_Win": fmt(m_avg_win.iloc[idx], 2, True),
+            "Avg_Loss": fmt(m_avg_loss.iloc[idx], 2, True),
+            "Highest_Win": fmt(m_highest_win.iloc[idx], 2, True),
+            "Highest_Loss": fmt(m_highest_loss.iloc[idx], 2, True),
+            "Gross_Profit": fmt(m_gross_profit.iloc[idx], 2),
+            "Commission": fmt(commission, 2),
+            "Net_Profit": fmt(net_profit, 2),
+            "Profit_Factor": fmt(m_pfactor.iloc[idx], 3, True),
+            "Sharpe_Ratio": fmt(m_sharpe.iloc[idx], 3, True),
+        })
+    return pd.DataFrame(rows, columns=list(METRIC_COLUMNS))
+
+
+def fused(pf, lot_size, **kwargs):
+    return metrics_frame(fixed_exit_metrics(pf, COMMISSION_PER_LOT, lot_size, FREQ, **kwargs))
+
+
+def assert_traded_equal(got, expected):
+    """Rows with trades are identical; the workers drop the others, Total_Trades must say 0 there."""
+    traded = expected["Total_Trades"] >= 1
+    assert np.array_equal(got["Total_Trades"], expected["Total_Trades"])
+    pd.testing.assert_frame_equal(got[traded].reset_index(drop=True), expected[traded].reset_index(drop=True),
+                                  check_exact=True)
+
+
+def from_signals(close, entries, exits=False, size=100, **kwargs):
+    return vbt.Portfolio.from_signals(close=close, entries=entries, exits=exits, init_cash=INITIAL_CAPITAL,
+                                      size=size, size_type="amount", fees=0.0, freq=FREQ, **kwargs)
+
+
+@pytest.mark.parametrize("size", [100, 100000])
+@pytest.mark.parametrize("every", [7, 50])
+def test_stops(size, every):
+    """Wins and losses on TP/SL exits, re-entries on the exit bar and an open trade at the end."""
+    df = ohlcv(1500)
+    entries = pd.Series(np.arange(len(df)) % every == 3, index=df.index)
+    entries.iloc[-5:] = True
+    pf = simulate_fixed_exit(df["close"], entries, *STOPS, exits=False, init_cash=INITIAL_CAPITAL, size=size,
+                             size_type="amount", fees=0.0, freq=FREQ)
+    got, expected = fused(pf, size / 100000), baseline(pf, size / 100000)
+    assert (expected["Winning_Trades"] > 0).all() and (expected["Losing_Trades"] > 0).all()
+    assert_traded_equal(got, expected)
+
+
+def test_zero_pnl_and_open_trades():
+    """Flat exits (neither win nor loss), an open trade at the last bar, an entry on it, no trades."""
+    close = pd.Series([1.0, 1.0, 1.0, 1.2, 1.2, 0.9, 0.9, 1.0, 1.1, 1.3],
+                      index=pd.date_range("2024-01-01", periods=10, freq="h"))
+    entries = pd.DataFrame({
+        "flat": [True, False, False, False, False, False, False, False, False, False],
+        "win_loss_open": [True, False, False, False, True, False, True, False, False, False],
+        "last_bar": [False] * 9 + [True],
+        "none": [False] * 10,
+    }, index=close.index)
+    exits = pd.DataFrame({
+        "flat": [False, False, True] + [False] * 7,
+        "win_loss_open": [False, False, False, True, False, True, False, False, False, False],
+        "last_bar": [False] * 10,
+        "none": [False] * 10,
+    }, index=close.index)
+    pf = from_signals(close, entries, exits, size=1000)
+    got, expected = fused(pf, 0.01), baseline(pf, 0.01)
+    assert expected["Total_Trades"].tolist() == [1, 3, 1, 0]
+    assert expected["Winning_Trades"].tolist() == [0, 2, 0, 0]
+    assert expected["Losing_Trades"].tolist() == [0, 1, 0, 0]
+    assert_traded_equal(got, expected)
+    assert got.loc[3, "Total_Return"] == 0.0 and got.loc[3, "Net_Profit"] == 0.0
+
+
+def test_cross_symbol_gaps():
+    """close_col/valid of a panel with gaps reproduce a separate run per symbol on its own bars."""
+    full = ohlcv(800)
+    frames = {
+        "EUR_USD": full,
+        "GBP_USD": ohlcv(800, price=1.3).iloc[50:700].drop(full.index[[120, 121, 122, 400]]),
+        "USD_JPY": ohlcv(800, price=150.0, scale=0.004).iloc[::2],
+    }
+    index, close, valid = Panel.from_frames(frames).aligned_close()
+    entries = np.zeros(close.shape, dtype=np.bool_)
+    for k, df in enumerate(frames.values()):
+        entries[np.flatnonzero(index.isin(df.index))[3::17], k] = True
+    n_stops = len(STOPS[0])
+    col_symbol = np.repeat(np.arange(len(frames)), n_stops)
+    tp, sl = np.tile(STOPS[0], len(frames)), np.tile(STOPS[1], len(frames))
+    pf = simulate_fixed_exit_cross(index, close, entries, col_symbol, tp, sl, exits=False,
+                                   init_cash=INITIAL_CAPITAL, size=100, size_type="amount", fees=0.0, freq=FREQ)
+    got = fused(pf, 0.001, close=close, close_col=col_symbol, valid=valid)
+    for k, df in enumerate(frames.values()):
+        own = pd.Series(entries[index.isin(df.index), k], index=df.index)
+        pf_own = simulate_fixed_exit(df["close"], own, *STOPS, exits=False, init_cash=INITIAL_CAPITAL, size=100,
+                                     size_type="amount", fees=0.0, freq=FREQ)
+        assert_traded_equal(got.iloc[k * n_stops:(k + 1) * n_stops].reset_index(drop=True), baseline(pf_own, 0.001))
+
+
+def test_round_half_exact():
+    ties = np.array([0.015, 0.025, 0.125, 0.135, 1.005, 2.675, 1.115, -0.015, -2.675, 0.0, -0.0, 1e-9,
+                     0.00015, 12.34565, 99.995, 1234.5675])
+    values = np.r_[ties, np.random.default_rng(0).normal(0, 50, 5000), np.round(np.random.default_rng(1).uniform(
+        -10, 10, 5000), 3) + 0.0005]
+    for decimals in [2, 3, 4]:
+        expected = [float(f"{x:.{decimals}f}") for x in values]
+        assert round_half_exact(values, decimals).tolist() == expected, decimals
+
+
+def test_metrics_frame_non_finite():
+    pf = from_signals(pd.Series([1.0, 1.1, 1.2]), pd.Series([True, False, False]), pd.Series([False, True, False]))
+    frame = metrics_frame(fixed_exit_metrics(pf, COMMISSION_PER_LOT, 0.001, FREQ))
+    # One winning trade: no losses (Avg_Loss NaN, Profit_Factor inf) are written as 0.0
+    assert frame.loc[0, ["Avg_Loss", "Highest_Loss", "Profit_Factor"]].tolist() == [0.0, 0.0, 0.0]
+    assert frame.loc[0, "Winning_Trades"] == 1
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+zenatus_core.panel: union time axis, validity mask, filled close and the
+per-symbol views handed to the strategies.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import numpy as np
+import pandas as pd
+
+from zenatus_core.panel import Panel
+
+
+def frame(times, seed):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-3, len(times)))
+    index = pd.DatetimeIndex(pd.to_datetime(times), name="time")
+    return pd.DataFrame({"open": close, "high": close + 1e-3, "low": close - 1e-3, "close": close,
+                         "volume": rng.uniform(100, 500, len(times))}, index=index)
+
+
+FULL = pd.date_range("2024-01-01", periods=48, freq="h")
+FRAMES = {
+    "EUR_USD": frame(FULL, 0),  # Every bar of the axis
+    "GBP_USD": frame(FULL[5:40].delete([3, 4, 10]), 1),  # Starts late, gaps, ends early
+    "USD_JPY": frame(FULL[::2], 2),
+}
+
+
+def test_union_axis():
+    panel = Panel.from_frames(FRAMES)
+    assert panel.shape == (3, 48, 5)
+    assert panel.index.equals(pd.DatetimeIndex(FULL, name="time"))
+    for k, (symbol, df) in enumerate(FRAMES.items()):
+        rows = panel.rows(symbol)
+        assert panel.index[rows].equals(df.index)
+        assert np.array_equal(panel.values[k, rows], df[panel.fields].values)
+
+
+def test_valid_mask():
+    panel = Panel.from_frames(FRAMES)
+    for k, (symbol, df) in enumerate(FRAMES.items()):
+        assert np.array_equal(panel.valid[k], panel.index.isin(df.index))
+        assert np.isnan(panel.field("close")[k, ~panel.valid[k]]).all()
+
+
+def test_aligned_close():
+    index, close, valid = Panel.from_frames(FRAMES).aligned_close()
+    expected = pd.concat({s: df["close"] for s, df in FRAMES.items()}, axis=1).ffill().bfill()
+    assert index.equals(expected.index)
+    assert np.array_equal(close, expected.values)
+    assert np.array_equal(valid, pd.concat({s: df["close"] for s, df in FRAMES.items()}, axis=1).notna().values)
+
+
+def test_frame_views():
+    panel = Panel.from_frames(FRAMES)
+    full = panel.frame("EUR_USD")
+    assert np.shares_memory(full.values, panel.values)  # Symbol on every bar: view, no copy
+    pd.testing.assert_frame_equal(full, FRAMES["EUR_USD"][panel.fields], check_freq=False)
+    gappy = panel.frame("GBP_USD")
+    pd.testing.assert_frame_equal(gappy, FRAMES["GBP_USD"][panel.fields], check_freq=False)
+    entries = panel.series("GBP_USD", np.arange(len(panel.index)) % 3 == 0)
+    assert entries.index.equals(FRAMES["GBP_USD"].index)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+zenatus_core.primitives: PrimitiveCache values against the pandas
+expressions the strategies use, the fingerprint of registered frames and
+their prefix slices, and the LRU byte budget.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ohlcv, same, strategy_instance
+from zenatus_core.primitives import PrimitiveCache
+
+PRIMITIVE_STRATEGIES = ["001_trend_sma", "002_trend_ema", "041_trend_rsi", "043_trend_bollinger",
+                        "046_trend_donchian", "307_random_forest_ensemble"]
+
+
+def market(n=1000):
+    df = ohlcv(n)
+    df.iloc[[200, 201, 650], df.columns.get_indexer(["high", "low", "close"])] = np.nan
+    return df
+
+
+def pandas_rsi(close, period, wilder, adjust, eps=1e-10):
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    if wilder:
+        gain = gain.ewm(alpha=1 / period, min_periods=period, adjust=adjust).mean()
+        loss = loss.ewm(alpha=1 / period, min_periods=period, adjust=adjust).mean()
+    else:
+        gain, loss = gain.rolling(period).mean(), loss.rolling(period).mean()
+    return 100 - (100 / (1 + gain / (loss + eps)))
+
+
+def pandas_true_range(df):
+    prev = df["close"].shift(1)
+    return pd.concat([df["high"] - df["low"], abs(df["high"] - prev), abs(df["low"] - prev)], axis=1).max(axis=1)
+
+
+@pytest.mark.parametrize("window", [1, 2, 14, 50])
+@pytest.mark.parametrize("min_periods", [None, 1])
+def test_rolling_values(window, min_periods):
+    df = market()
+    cache = PrimitiveCache()
+    for field in ["close", "volume"]:
+        s = df[field]
+        assert same(cache.sma(s, window, min_periods=min_periods), s.rolling(window, min_periods=min_periods).mean())
+        assert same(cache.rolling_std(s, window, min_periods=min_periods),
+                    s.rolling(window, min_periods=min_periods).std())
+        assert same(cache.rolling_min(s, window, min_periods=min_periods),
+                    s.rolling(window, min_periods=min_periods).min())
+        assert same(cache.rolling_max(s, window, min_periods=min_periods),
+                    s.rolling(window, min_periods=min_periods).max())
+    assert cache.hits == 0
+
+
+@pytest.mark.parametrize("period", [2, 12, 26])
+def test_ewm_values(period):
+    df = market()
+    cache = PrimitiveCache()
+    for adjust in [True, False]:
+        assert same(cache.ema(df["close"], period, adjust=adjust), df["close"].ewm(span=period, adjust=adjust).mean())
+        for wilder in [False, True]:
+            assert same(cache.rsi(df["close"], period, wilder=wilder, adjust=adjust),
+                        pandas_rsi(df["close"], period, wilder, adjust))
+    assert same(cache.true_range(df), pandas_true_range(df))
+    assert same(cache.atr(df, period), pandas_true_range(df).rolling(period).mean())
+
+
+def test_series_wrap_cached_values():
+    df = market()
+    cache = PrimitiveCache()
+    first = cache.sma(df["close"], 20)
+    second = cache.sma(df["close"], 20)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert np.shares_memory(first.values, second.values) and not second.values.flags.writeable
+    assert second.index.equals(df.index) and second.name == "close"
+
+
+def test_prefix_fingerprint():
+    """Prefix slices of a registered frame: key from the data hash and the length, one entry per length."""
+    df = market()
+    cache = PrimitiveCache()
+    cache.register(df, "abc")
+    assert cache.fingerprint(df["close"].values) == "abc/close:1000"
+    assert cache.fingerprint(df.iloc[:400]["close"].values) == "abc/close:400"
+    assert cache.fingerprint(df["high"].iloc[:400].values) == "abc/high:400"
+
+    for n in [400, 700, 1000, 400]:
+        part = df.iloc[:n]
+        assert same(cache.sma(part["close"], 20), part["close"].rolling(20).mean())
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert sorted(key[0] for key in cache._items) == ["abc/close:1000", "abc/close:400", "abc/close:700"]
+
+    # Not a prefix (other start, stride or a copy): content hash, equal content gives the same key
+    tail, stride, copy = df["close"].values[1:], df["close"].values[::2], df["close"].values.copy()
+    assert not cache.fingerprint(tail).startswith("abc/")
+    assert not cache.fingerprint(stride).startswith("abc/")
+    assert cache.fingerprint(copy) == cache.fingerprint(df["close"].values.copy()) != "abc/close:1000"
+    changed = copy.copy()
+    changed[500] += 1e-9
+    assert cache.fingerprint(changed) != cache.fingerprint(copy)
+
+
+def test_lru_eviction():
+    df = market()
+    nbytes = df["close"].values.nbytes
+    cache = PrimitiveCache(budget_mb=3 * nbytes / 1024 ** 2)  # Three columns fit
+    for period in [2, 3, 4]:
+        cache.sma(df["close"], period)
+    assert (cache.nbytes, cache.evictions) == (3 * nbytes, 0)
+
+    cache.sma(df["close"], 2)  # Hit: period 2 becomes the most recently used
+    cache.sma(df["close"], 5)  # Evicts period 3, the least recently used
+    assert cache.evictions == 1 and cache.nbytes == 3 * nbytes
+    assert [key[3][0] for key in cache._items] == [4, 2, 5]
+
+    cache.reset()
+    assert same(cache.sma(df["close"], 3), df["close"].rolling(3).mean())  # Recomputed after the eviction
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 1, 1)
+    assert "1 evicted" in cache.summary()
+
+    small = PrimitiveCache(budget_mb=nbytes / 2 / 1024 ** 2)  # A column larger than the budget is not kept
+    assert same(small.sma(df["close"], 2), df["close"].rolling(2).mean())
+    assert small.nbytes == 0 and not small._items
+
+
+@pytest.mark.parametrize("name", PRIMITIVE_STRATEGIES)
+def test_strategy_parity(name):
+    """calculate and the signals with the workers' cache == without it (the pandas path)."""
+    df = market(1500)
+    instance = strategy_instance(name)
+    params = {k: v["default"] for k, v in instance.PARAMETERS.items() if isinstance(v, dict) and "default" in v}
+    expected_values = instance.calculate(df, params)
+    expected = instance.generate_signals_fixed(df, params)
+
+    cache = PrimitiveCache()
+    cache.register(df, "hash")
+    instance.primitives = cache
+    for _ in range(2):
+        values = instance.calculate(df, params)
+        signals = instance.generate_signals_fixed(df, params)
+        if isinstance(expected_values, pd.DataFrame):
+            pd.testing.assert_frame_equal(values, expected_values, check_exact=True)
+        else:
+            assert same(values, expected_values)
+        assert signals["entries"].equals(expected["entries"]) and signals["exits"].equals(expected["exits"])
+    assert cache.misses > 0 and cache.hits > 0
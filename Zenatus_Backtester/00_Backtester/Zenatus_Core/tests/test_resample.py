@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+zenatus_core.resample: resample_frame against ``df.resample(tf).agg(...)`` and
+the load_resampled cache (rebuilt when the base data changes).
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SEED
+from zenatus_core.resample import load_resampled, resample_frame, resampled_store_path
+from zenatus_core.store import read_schema
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def bars(n=20000, start="2024-01-03 13:17", minutes=1, seed=SEED):
+    """Irregular minute bars (dropped bars and whole gaps), NaN opens and volumes, start off any bin boundary."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=n, freq=f"{minutes}min", name="time")
+    keep = rng.random(n) > 0.3
+    keep[3000:3500] = False  # Gap longer than a day of 5m bins
+    close = 1.1 * np.exp(np.cumsum(rng.normal(0, 5e-4, n)))
+    spread = np.abs(rng.normal(0, 5e-4, n))
+    df = pd.DataFrame({"open": np.r_[close[0], close[:-1]], "high": close + spread, "low": close - spread,
+                       "close": close, "volume": rng.uniform(0.1, 500, n)}, index=index)[keep]
+    nan_rows = rng.choice(len(df), 200, replace=False)
+    df.iloc[nan_rows[:100], 0] = np.nan
+    df.iloc[nan_rows[50:], 4] = np.nan
+    return df
+
+
+def pandas_resample(df, timeframe):
+    rule = timeframe.replace("m", "min") if timeframe.endswith("m") else timeframe
+    out = df.resample(rule).agg(AGG)
+    return out[out["open"].notna()]
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "15m", "1h", "2h", "3h", "1d"])
+def test_pandas_parity(timeframe):
+    df = bars()
+    got = resample_frame(df, timeframe)
+    expected = pandas_resample(df, timeframe)
+    pd.testing.assert_frame_equal(got, expected, check_exact=True, check_freq=False)
+
+
+def test_all_nan_open_bin():
+    """A bin whose opens are all NaN is dropped (no bar), like pandas' first()."""
+    df = bars(600, minutes=5)
+    first = df.index[0].floor("1h") + pd.Timedelta("2h")
+    df.loc[(df.index >= first) & (df.index < first + pd.Timedelta("1h")), "open"] = np.nan
+    got = resample_frame(df, "1h")
+    assert first not in got.index
+    pd.testing.assert_frame_equal(got, pandas_resample(df, "1h"), check_exact=True, check_freq=False)
+
+
+def write_base(data_path, df):
+    """Aggregated 30m CSV of EUR_USD; the bars as parsed back from it."""
+    fp = data_path / "30m" / "EUR_USD" / "EUR_USD_aggregated.csv"
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    df.rename_axis("Time").to_csv(fp)
+    return pd.read_csv(fp, index_col=0, parse_dates=True).rename_axis("time")
+
+
+def same_bars(got, expected):
+    return np.array_equal(got.index.values, expected.index.values) and np.array_equal(
+        got[expected.columns].values, expected.values)
+
+
+def test_load_resampled_cache(tmp_path, capsys):
+    base = bars(4000, start="2024-01-01 00:00", minutes=30).dropna()
+    parsed = write_base(tmp_path, base)
+    path = resampled_store_path(tmp_path, "2h", "EUR_USD")
+
+    first = load_resampled(tmp_path, "2h", "EUR_USD")
+    assert "[RESAMPLE]" in capsys.readouterr().out
+    assert same_bars(first, resample_frame(parsed, "2h"))
+    built = read_schema(path)["source"]
+
+    again = load_resampled(tmp_path, "2h", "EUR_USD", "2024-02-01", "2024-02-15")
+    assert "[RESAMPLE]" not in capsys.readouterr().out  # Cache hit
+    assert again.index[0] >= pd.Timestamp("2024-02-01") and again.index[-1] < pd.Timestamp("2024-02-15")
+    assert again.equals(first[(first.index >= "2024-02-01") & (first.index < "2024-02-15")])
+
+    changed = base.copy()
+    changed.iloc[10, changed.columns.get_loc("close")] += 1e-4
+    parsed = write_base(tmp_path, changed)
+    rebuilt = load_resampled(tmp_path, "2h", "EUR_USD")
+    assert "[RESAMPLE]" in capsys.readouterr().out  # Base hash changed
+    assert read_schema(path)["source"]["hash"] != built["hash"]
+    assert same_bars(rebuilt, resample_frame(parsed, "2h"))
+    assert not same_bars(rebuilt, first)
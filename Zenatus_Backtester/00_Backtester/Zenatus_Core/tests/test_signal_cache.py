@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+zenatus_core.signal_cache: packed round trip, key canonicalization and LRU
+eviction; the strategy part of the key (registry ``signal_hash``).
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import os
+
+import numpy as np
+
+from zenatus_core import registry
+from zenatus_core.signal_cache import SignalCache
+
+SCOPE = SignalCache.scope("src", "data", "1h", "2024-01-01", "2025-01-01")
+
+
+def entries(n, seed=0):
+    return np.random.default_rng(seed).random(n) > 0.7
+
+
+def test_round_trip(tmp_path):
+    cache = SignalCache(tmp_path)
+    for n in [1, 7, 8, 9, 1000]:
+        e = entries(n, n)
+        assert cache.get(SCOPE, {"period": n}, n) is None
+        cache.put(SCOPE, {"period": n}, e)
+        assert np.array_equal(cache.get(SCOPE, {"period": n}, n), e)
+    assert cache.get(SCOPE, {"period": 9}, 10) is None  # Other bar count: miss
+    assert (cache.hits, cache.misses) == (5, 6)
+
+
+def test_key(tmp_path):
+    cache = SignalCache(tmp_path)
+    assert cache.path(SCOPE, {"a": np.int64(5), "b": 0.5}) == cache.path(SCOPE, {"b": 0.5, "a": 5})
+    assert cache.path(SCOPE, {"a": 5}) != cache.path(SCOPE, {"a": 6})
+    other = SignalCache.scope("src", "data2", "1h", "2024-01-01", "2025-01-01")
+    assert cache.path(SCOPE, {"a": 5}) != cache.path(other, {"a": 5})
+
+
+def test_entries_computes_once(tmp_path):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return entries(500)
+
+    for _ in range(3):
+        cache = SignalCache(tmp_path)  # New process, same root
+        assert np.array_equal(cache.entries(SCOPE, {}, 500, compute), entries(500))
+    assert len(calls) == 1
+
+
+def test_lru_eviction(tmp_path):
+    size = 8 + 1000 // 8
+    cache = SignalCache(tmp_path, budget_mb=10.5 * size / 1024 ** 2)
+    for k in range(10):
+        cache.put(SCOPE, {"k": k}, entries(1000, k))
+        os.utime(cache.path(SCOPE, {"k": k}), (k, k))
+    assert cache.get(SCOPE, {"k": 0}, 1000) is not None  # Touched: most recently used
+    cache.put(SCOPE, {"k": 10}, entries(1000, 10))
+    assert cache.evictions == 2  # Down to 90% of the budget
+    assert cache.get(SCOPE, {"k": 1}, 1000) is None and cache.get(SCOPE, {"k": 2}, 1000) is None
+    assert cache.get(SCOPE, {"k": 0}, 1000) is not None and cache.get(SCOPE, {"k": 10}, 1000) is not None
+
+
+STRATEGIES = {
+    "001_plain": "class Indicator_Plain:\n    def generate_signals_fixed(self, data, params): pass\n",
+    "002_core": ("try:\n    from zenatus_core import kernels\nexcept ImportError:\n    kernels = None\n"
+                 "class Indicator_Core:\n    def generate_signals_fixed(self, data, params): pass\n"),
+    "003_random": ("import numpy as np\nclass Indicator_Random:\n"
+                   "    def generate_signals_fixed(self, data, params): return np.random.normal(0, 1, 5)\n"),
+    "004_seeded": ("import numpy as np\nclass Indicator_Seeded:\n"
+                   "    def generate_signals_fixed(self, data, params): return np.random.default_rng(42).normal(0, 1, 5)\n"),
+}
+
+
+def test_signal_hash(tmp_path, monkeypatch):
+    strategy_dir, core = tmp_path / "strategies", tmp_path / "zenatus_core"
+    strategy_dir.mkdir()
+    core.mkdir()
+    for name, source in STRATEGIES.items():
+        (strategy_dir / f"{name}.py").write_text(source)
+    (core / "kernels.py").write_text("from zenatus_core.store import frame_hash\n")
+    (core / "store.py").write_text("def frame_hash(df): return 1\n")
+    monkeypatch.setattr(registry, "CORE_DIR", core)
+
+    def hashes():
+        reg = registry.StrategyRegistry(strategy_dir, tmp_path / "index.json")  # New process: core sources re-read
+        return {name: reg.signal_hash(name) for name in STRATEGIES}, reg
+
+    before, reg = hashes()
+    assert reg.entry("002_core")["core"] == ["kernels"]
+    assert before["001_plain"] == reg.entry("001_plain")["hash"]
+    assert before["002_core"] not in (None, reg.entry("002_core")["hash"])
+    assert before["003_random"] is None and before["004_seeded"] is not None
+    (core / "store.py").write_text("def frame_hash(df): return 2\n")  # Imported by kernels
+    after, _ = hashes()
+    assert after["002_core"] != before["002_core"]
+    assert after["001_plain"] == before["001_plain"]
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+zenatus_core.signals: fixed_exits against the per-bar TP/SL loop of the
+strategies (the fallback each module keeps for runs without Zenatus_Core)
+and the FixedExitStrategy base class.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import STRATEGY_PATH, load_strategy, ohlcv
+from zenatus_core import signals
+from zenatus_core.profiling import find_strategy_class
+from zenatus_core.signals import FixedExitStrategy, fixed_exits
+
+FIXED_EXITS = sorted(p.stem for p in STRATEGY_PATH.glob("*.py")
+                     if "from zenatus_core.signals import fixed_exits" in p.read_text(encoding="utf-8"))
+TP_PIPS, SL_PIPS = 20, 15
+
+
+def loop_exits(data, entries, tp_pips, sl_pips, pip=0.0001):
+    """The strategies' loop (001_trend_sma)."""
+    exits = pd.Series(False, index=data.index)
+    in_position = False
+    for i in range(1, len(data)):
+        if entries.iloc[i] and not in_position:
+            in_position = True
+            entry_price = data["close"].iloc[i]
+            tp_level = entry_price + (tp_pips * pip)
+            sl_level = entry_price - (sl_pips * pip)
+        elif in_position:
+            if data["high"].iloc[i] >= tp_level or data["low"].iloc[i] <= sl_level:
+                exits.iloc[i] = True
+                in_position = False
+    return exits
+
+
+@pytest.mark.parametrize("every", [1, 2, 9, 60])
+@pytest.mark.parametrize("pip", [0.0001, 0.01])
+def test_fixed_exits_loop(every, pip):
+    """Entries on bar 0, while in a position and on exit bars; NaN bars never trigger an exit."""
+    df = ohlcv(800, price=150.0 if pip == 0.01 else 1.1)
+    df.iloc[[50, 51, 300], df.columns.get_indexer(["high", "low"])] = np.nan
+    entries = pd.Series(np.arange(len(df)) % every == 0, index=df.index)
+    expected = loop_exits(df, entries, TP_PIPS, SL_PIPS, pip)
+    assert expected.sum() > 1
+    assert fixed_exits(df, entries, TP_PIPS, SL_PIPS, pip).equals(expected)
+    assert fixed_exits(df, entries.values, TP_PIPS, SL_PIPS, pip).equals(expected)
+
+
+def test_fixed_exits_truthiness():
+    """Non-bool entries are read like ``if entries.iloc[i]``: NaN and non-zero are entries, 0 and None are not."""
+    df = ohlcv(400)
+    rng = np.random.default_rng(0)
+    floats = pd.Series(np.where(rng.random(len(df)) > 0.9, np.nan, rng.integers(0, 2, len(df))), index=df.index)
+    objects = pd.Series(np.where(rng.random(len(df)) > 0.9, None, rng.random(len(df)) > 0.8), index=df.index)
+    for entries in [floats, floats.fillna(0).astype(int), objects]:
+        assert fixed_exits(df, entries, TP_PIPS, SL_PIPS).equals(loop_exits(df, entries, TP_PIPS, SL_PIPS))
+
+
+class Every(FixedExitStrategy):
+    PARAMETERS = {"every": {"default": 5}, "tp_pips": {"default": 40}, "sl_pips": {"default": 30}}
+
+    def generate_entries(self, data, params):
+        return np.arange(len(data)) % params.get("every", self.default("every", 5)) == 0
+
+
+def test_fixed_exit_strategy():
+    df = ohlcv()
+    strategy = Every()
+    s = strategy.generate_signals_fixed(df, {"sl_pips": 10})
+    assert s["entries"].sum() == len(df) // 5
+    assert s["exits"].equals(loop_exits(df, s["entries"], 40, 10))
+    assert s["tp_levels"].isna().all() and s["sl_levels"].isna().all()
+    strategy.signals_only = True
+    assert not strategy.generate_signals_fixed(df, {})["exits"].any()
+
+
+def memoized(instance):
+    """Compute ``calculate`` once per (data, params): the second run only pays for the exit loop."""
+    if not hasattr(instance, "calculate"):
+        return
+    calculate, memo = instance.calculate, {}
+
+    def cached(data, params):
+        key = (id(data), repr(params))
+        if key not in memo:
+            memo[key] = calculate(data, params)
+        return memo[key]
+
+    instance.calculate = cached
+
+
+def test_strategies_found():
+    assert len(FIXED_EXITS) > 400
+
+
+@pytest.mark.parametrize("name", FIXED_EXITS)
+def test_strategy_parity(name, monkeypatch):
+    """generate_signals_fixed with fixed_exits == with the module's loop (fixed_exits = None)."""
+    module = load_strategy(name)
+    instance = find_strategy_class(module)()
+    params = {k: v["default"] for k, v in getattr(instance, "PARAMETERS", {}).items()
+              if isinstance(v, dict) and "default" in v}
+    params.update(tp_pips=TP_PIPS, sl_pips=SL_PIPS)
+    df = ohlcv()
+    memoized(instance)
+    calls = []
+
+    def spy(data, entries, tp_pips, sl_pips, pip=signals.DEFAULT_PIP):
+        calls.append((tp_pips, sl_pips))
+        return fixed_exits(data, entries, tp_pips, sl_pips, pip)
+
+    monkeypatch.setattr(module, "fixed_exits", spy)
+    np.random.seed(0)  # Monte Carlo / random-tree strategies draw from the global generator
+    try:
+        helper = instance.generate_signals_fixed(df, params)
+    except ImportError as e:  # talib
+        pytest.skip(str(e))
+    assert calls == [(TP_PIPS, SL_PIPS)]
+    monkeypatch.setattr(module, "fixed_exits", None)
+    np.random.seed(0)
+    loop = instance.generate_signals_fixed(df, params)
+    assert helper["entries"].equals(loop["entries"])
+    assert helper["exits"].equals(loop["exits"])
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Import contract of the strategy modules (zenatus_core/signals.py): no
+vectorbt/talib/scipy/sklearn at module level, so loading a module costs
+milliseconds. The full timed run is BENCHMARK_STRATEGY_IMPORTS.py.
+
+    python -m pytest 00_Backtester/Zenatus_Core/tests -q
+"""
+import pytest
+
+from conftest import STRATEGY_PATH
+from zenatus_core.profiling import IMPORT_BUDGET_SEC, cold_import, eager_imports
+
+
+def test_no_eager_imports():
+    eager = {p.stem: eager_imports(p) for p in sorted(STRATEGY_PATH.glob("*.py"))}
+    assert eager
+    assert {k: v for k, v in eager.items() if v} == {}
+
+
+@pytest.mark.parametrize("name", ["001_trend_sma", "013_trend_vidya", "241_skewness", "256_linear_regression"])
+def test_cold_import(name):
+    path = STRATEGY_PATH / f"{name}.py"
+    row = cold_import(path)
+    assert row.get("error") is None
+    assert row["heavy"] == []
+    assert row["sec"] < IMPORT_BUDGET_SEC * 5  # Loose: shared CI machines
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+Zenatus Core
+Shared building blocks for the Fixed_Exit backtest workers.
+
+The worker scripts put ``00_Backtester/Zenatus_Core`` on ``sys.path`` and
+import the submodules they need, e.g. ``from zenatus_core import simulation``.
+"""
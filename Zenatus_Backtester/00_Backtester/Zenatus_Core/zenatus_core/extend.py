@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+Extend mode: continue a Fixed_Exit backtest when new bars were appended.
+
+A full run (worker ``--extend`` without a usable checkpoint) stores, per
+TP/SL column, the accumulator state of `fixed_exit_metrics_nb` (cash,
+position, trade counters, drawdown peak, return statistics) at its *resume
+bar*: the entry bar of the trade still open at the last bar, or the first
+bar after the data if the column is flat. Everything before the resume bar
+is final.
+
+After an ingest (see ingest.py) the next ``--extend`` run checks that the
+old bars and the old entry signals are unchanged (content hash /
+fingerprint) and then simulates only ``close[cut:]`` with ``cut`` = earliest
+resume bar; entries before a column's own resume bar are masked, and the
+window starts with the column's checkpointed cash. The simulation of the
+window therefore reproduces the orders of a full rerun exactly; the metrics
+continue from the stored state. Sharpe ratios combine the stored and the
+new return statistics (Chan et al.), equal to a full rerun up to float
+rounding.
+
+Only the broadcast/vectorbt path of the per-symbol loop is supported
+(no cross-symbol, no first_passage).
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import vectorbt as vbt
+from numba import njit
+
+from vectorbt.returns.nb import get_return_nb
+from vectorbt.utils.math_ import add_nb
+
+from zenatus_core.metrics import ORDER_SIDE_BUY, ann_factor_for, fill_metrics_nb, fixed_exit_metrics_dt
+from zenatus_core.signals import entries_fingerprint
+from zenatus_core.store import frame_hash
+
+CHECKPOINT_VERSION = 1
+
+# Accumulators of fixed_exit_metrics_nb for the bars before `resume`
+extend_state_dt = np.dtype([
+    ("resume", np.int64),
+    ("init_cash", np.float64),
+    ("cash", np.float64),
+    ("cash_flow", np.float64),
+    ("position", np.float64),
+    ("entry_price", np.float64),
+    ("entry_fees", np.float64),
+    ("n_orders", np.int64),
+    ("n_trades", np.int64),
+    ("n_win", np.int64),
+    ("n_loss", np.int64),
+    ("win_sum", np.float64),
+    ("loss_sum", np.float64),
+    ("win_max", np.float64),
+    ("loss_min", np.float64),
+    ("peak", np.float64),
+    ("max_dd", np.float64),
+    ("prev_value", np.float64),
+    ("n_valid", np.int64),
+    ("ret_count", np.int64),
+    ("ret_mean", np.float64),
+    ("ret_m2", np.float64),
+], align=True)
+
+
+def initial_state(init_cash, n_cols):
+    """State of columns that have not seen a bar yet (resume=0)."""
+    state = np.zeros(n_cols, dtype=extend_state_dt)
+    state["init_cash"] = init_cash
+    state["cash"] = init_cash
+    state["prev_value"] = init_cash
+    state["win_max"] = np.nan
+    state["loss_min"] = np.nan
+    state["peak"] = -np.inf
+    return state
+
+
+@njit(cache=True)
+def resume_bars_nb(order_records, n_cols, offset, n_bars):
+    """Resume bar per column: bar of an entry without exit (open trade), else n_bars."""
+    resume = np.full(n_cols, n_bars, dtype=np.int64)
+    for r in range(len(order_records)):
+        col = order_records[r]['col']
+        if order_records[r]['side'] == ORDER_SIDE_BUY:
+            resume[col] = order_records[r]['idx'] + offset
+        else:
+            resume[col] = n_bars
+    return resume
+
+
+@njit(cache=True)
+def combine_returns_nb(count, mean, m2, returns):
+    """Merge (count, mean, M2) of earlier returns with the non-NaN values of ``returns``."""
+    cnt = len(returns) - np.count_nonzero(np.isnan(returns))
+    if cnt == 0:
+        return count, mean, m2
+    mean_b = np.nanmean(returns)
+    m2_b = np.nanvar(returns) * cnt
+    if count == 0:
+        return cnt, mean_b, m2_b
+    n = count + cnt
+    delta = mean_b - mean
+    return n, mean + delta * cnt / n, m2 + m2_b + delta * delta * count * cnt / n
+
+
+@njit(cache=True)
+def resume_metrics_nb(order_records, close, offset, state, snap, commission_per_lot, lot_size, ann_factor):
+    """
+    `fixed_exit_metrics_nb` (single close series, no gaps) continued from ``state``.
+
+    Args:
+        order_records: records of a simulation over ``close[offset:]``
+        close: full 1-D close
+        offset: first bar of the simulated window
+        state: extend_state_dt per column, ``state['resume'] >= offset``
+        snap: bar per column at which the returned state is taken (>= resume)
+
+    Returns:
+        (fixed_exit_metrics_dt per column, extend_state_dt per column)
+    """
+    n_bars = len(close)
+    n_cols = len(state)
+    out = np.empty(n_cols, dtype=fixed_exit_metrics_dt)
+    new_state = np.empty(n_cols, dtype=extend_state_dt)
+    returns = np.empty(n_bars, dtype=np.float64)
+
+    col_start = np.zeros(n_cols, dtype=np.int64)
+    col_count = np.zeros(n_cols, dtype=np.int64)
+    for r in range(len(order_records)):
+        col_count[order_records[r]['col']] += 1
+    for col in range(1, n_cols):
+        col_start[col] = col_start[col - 1] + col_count[col - 1]
+
+    for col in range(n_cols):
+        st = state[col]
+        r = col_start[col]
+        r_end = r + col_count[col]
+        init_cash = st['init_cash']
+
+        cash = st['cash']
+        cash_flow = st['cash_flow']
+        position = st['position']
+        entry_price = st['entry_price']
+        entry_fees = st['entry_fees']
+        n_orders = st['n_orders'] + col_count[col]
+
+        n_trades = st['n_trades']
+        n_win = st['n_win']
+        n_loss = st['n_loss']
+        win_sum = st['win_sum']
+        loss_sum = st['loss_sum']
+        win_max = st['win_max']
+        loss_min = st['loss_min']
+
+        peak = st['peak']
+        max_dd = st['max_dd']
+        prev_value = st['prev_value']
+        n_new = 0
+
+        for i in range(st['resume'], n_bars + 1):
+            if i == snap[col]:
+                new_state[col]['resume'] = i
+                new_state[col]['init_cash'] = init_cash
+                new_state[col]['cash'] = cash
+                new_state[col]['cash_flow'] = cash_flow
+                new_state[col]['position'] = position
+                new_state[col]['entry_price'] = entry_price
+                new_state[col]['entry_fees'] = entry_fees
+                new_state[col]['n_orders'] = st['n_orders'] + (r - col_start[col])
+                new_state[col]['n_trades'] = n_trades
+                new_state[col]['n_win'] = n_win
+                new_state[col]['n_loss'] = n_loss
+                new_state[col]['win_sum'] = win_sum
+                new_state[col]['loss_sum'] = loss_sum
+                new_state[col]['win_max'] = win_max
+                new_state[col]['loss_min'] = loss_min
+                new_state[col]['peak'] = peak
+                new_state[col]['max_dd'] = max_dd
+                new_state[col]['prev_value'] = prev_value
+                new_state[col]['n_valid'] = st['n_valid'] + n_new
+                cnt, mean, m2 = combine_returns_nb(st['ret_count'], st['ret_mean'], st['ret_m2'], returns[:n_new])
+                new_state[col]['ret_count'] = cnt
+                new_state[col]['ret_mean'] = mean
+                new_state[col]['ret_m2'] = m2
+            if i == n_bars:
+                break
+
+            while r < r_end and order_records[r]['idx'] + offset == i:
+                size = order_records[r]['size']
+                price = order_records[r]['price']
+                fees = order_records[r]['fees']
+                if order_records[r]['side'] == ORDER_SIDE_BUY:
+                    cash = add_nb(cash, -(size * price + fees))
+                    cash_flow = add_nb(cash_flow, -(size * price + fees))
+                    if position == 0.:
+                        entry_price = price
+                        entry_fees = fees
+                    position = add_nb(position, size)
+                else:
+                    cash = add_nb(cash, size * price - fees)
+                    cash_flow = add_nb(cash_flow, size * price - fees)
+                    position = add_nb(position, -size)
+                    pnl = add_nb(size * price, -(size * entry_price)) - entry_fees - fees
+                    n_trades += 1
+                    if pnl > 0.:
+                        n_win += 1
+                        win_sum += pnl
+                        if np.isnan(win_max) or pnl > win_max:
+                            win_max = pnl
+                    elif pnl < 0.:
+                        n_loss += 1
+                        loss_sum += pnl
+                        if np.isnan(loss_min) or pnl < loss_min:
+                            loss_min = pnl
+                r += 1
+
+            value = cash + close[i] * position
+            if value > peak:
+                peak = value
+            dd = (value - peak) / peak
+            if dd < max_dd:
+                max_dd = dd
+            returns[n_new] = get_return_nb(prev_value, value)
+            n_new += 1
+            prev_value = value
+
+        # Open trade is valued at the last close (like vectorbt's open EntryTrades)
+        if position > 0.:
+            pnl = add_nb(position * close[n_bars - 1], -(position * entry_price)) - entry_fees
+            n_trades += 1
+            if pnl > 0.:
+                n_win += 1
+                win_sum += pnl
+                if np.isnan(win_max) or pnl > win_max:
+                    win_max = pnl
+            elif pnl < 0.:
+                n_loss += 1
+                loss_sum += pnl
+                if np.isnan(loss_min) or pnl < loss_min:
+                    loss_min = pnl
+
+        total_profit = cash_flow + position * close[n_bars - 1] if n_orders > 0 else 0.
+
+        if st['n_valid'] + n_new < 2:
+            sharpe = np.nan
+        else:
+            cnt, mean, m2 = combine_returns_nb(st['ret_count'], st['ret_mean'], st['ret_m2'], returns[:n_new])
+            std = np.sqrt(m2 / (cnt - 1)) if cnt > 1 else np.nan
+            sharpe = np.inf if std == 0. else mean / std * np.sqrt(ann_factor)
+
+        fill_metrics_nb(out, col, init_cash, total_profit, n_trades, n_win, n_loss, win_sum, loss_sum,
+                        win_max, loss_min, max_dd, sharpe, commission_per_lot, lot_size)
+    return out, new_state
+
+
+def window_entries(entries, state):
+    """(bars after cut) x columns entries with each column masked before its resume bar. Returns (cut, entries)."""
+    entries = np.asarray(entries, dtype=np.bool_)
+    cut = int(state["resume"].min())
+    window = np.repeat(entries[cut:, None], len(state), axis=1)
+    window[np.arange(len(entries) - cut)[:, None] < (state["resume"] - cut)[None, :]] = False
+    return cut, window
+
+
+def simulate_window(close, entries, state, tp_stop, sl_stop, **pf_kwargs):
+    """
+    Simulate only the bars from the earliest resume bar on.
+
+    Args:
+        close: full pd.Series with close prices
+        entries: full 1-D entries (unchanged before the checkpoint)
+        state: extend_state_dt per column (checkpoint)
+        tp_stop, sl_stop: 1-D arrays, one stop per column
+        pf_kwargs: forwarded to ``vbt.Portfolio.from_signals`` (init_cash is the checkpointed cash)
+
+    Returns:
+        (vbt.Portfolio over close[cut:], cut)
+    """
+    cut, window = window_entries(entries, state)
+    max_orders = len(state) * (2 * int(np.count_nonzero(np.asarray(entries)[cut:])) + 1)
+    pf = vbt.Portfolio.from_signals(
+        close=close.iloc[cut:],
+        entries=window,
+        tp_stop=np.asarray(tp_stop, dtype=np.float64)[None, :],
+        sl_stop=np.asarray(sl_stop, dtype=np.float64)[None, :],
+        init_cash=np.ascontiguousarray(state["cash"]),
+        max_orders=max_orders,
+        broadcast_kwargs=dict(require_kwargs=dict(requirements=[])),
+        **pf_kwargs
+    )
+    return pf, cut
+
+
+def extend_metrics(pf, close, offset, state, commission_per_lot, lot_size, freq):
+    """
+    Metrics of all bars plus the checkpoint for the next extension.
+
+    ``pf`` simulated ``close[offset:]`` (offset 0 and `initial_state` for a full run).
+    """
+    close = np.ascontiguousarray(np.asarray(close, dtype=np.float64))
+    snap = resume_bars_nb(pf.order_records, len(state), offset, len(close))
+    snap = np.maximum(snap, state["resume"])
+    return resume_metrics_nb(pf.order_records, close, offset, state, snap, float(commission_per_lot),
+                             float(lot_size), ann_factor_for(freq))
+
+
+def stops_hash(tp_stop, sl_stop, *params):
+    """Hash of the TP/SL columns and the simulation parameters a checkpoint was made with."""
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(tp_stop, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(sl_stop, dtype=np.float64).tobytes())
+    h.update(json.dumps([float(p) for p in params]).encode())
+    return h.hexdigest()[:16]
+
+
+class ExtendCheckpoint:
+    """
+    Checkpoints of one indicator/timeframe, one .npz with two arrays per
+    (symbol, entry params): ``<key>_state`` and ``<key>_meta`` (JSON).
+
+    Entries not used in a run are dropped on save, so the file always
+    matches the last result CSV. ``path=None`` keeps nothing (warm-up).
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.items = {}
+        self.new_items = {}
+        self._prefix_hashes = {}
+        self.resumed = 0
+        self.full = 0
+        self.window_bars = []
+        if self.path is not None and self.path.exists():
+            try:
+                with np.load(self.path, allow_pickle=False) as z:
+                    for name in z.files:
+                        if name.endswith("_meta"):
+                            key = name[:-len("_meta")]
+                            self.items[key] = (json.loads(str(z[name])), z[key + "_state"])
+            except Exception as e:
+                print(f"[EXTEND] Checkpoint {self.path.name} unreadable ({e}), full run")
+                self.items = {}
+
+    @staticmethod
+    def key(symbol, entry_params):
+        return hashlib.sha1(f"{symbol}|{json.dumps(entry_params, sort_keys=True, default=str)}".encode()).hexdigest()[:20]
+
+    def _prefix_hash(self, df, n):
+        k = (id(df), n)
+        if k not in self._prefix_hashes:
+            self._prefix_hashes[k] = frame_hash(df.iloc[:n])
+        return self._prefix_hashes[k]
+
+    def lookup(self, key, df, entries, stops):
+        """Stored state if the old bars, old entries and stops are unchanged, else None."""
+        item = self.items.get(key)
+        if item is None:
+            return None
+        meta, state = item
+        n = meta["n_bars"]
+        if (meta.get("version") != CHECKPOINT_VERSION or meta["stops"] != stops or n > len(df) or n == 0
+                or str(df.index[n - 1]) != meta["last"]
+                or self._prefix_hash(df, n) != meta["data_hash"]
+                or entries_fingerprint(np.asarray(entries)[:n]) != meta["entries"]):
+            return None
+        return state
+
+    def summary(self):
+        """Short tag for the indicator summary line, e.g. 'Extend: 12/14 resumed, window 630-768 bars'."""
+        text = f"Extend: {self.resumed}/{self.resumed + self.full} resumed"
+        if self.window_bars:
+            lo, hi = min(self.window_bars), max(self.window_bars)
+            text += f", window {lo if lo == hi else f'{lo}-{hi}'} bars"
+        return text
+
+    def put(self, key, df, entries, stops, state):
+        n = len(df)
+        meta = {"version": CHECKPOINT_VERSION, "n_bars": n, "last": str(df.index[n - 1]),
+                "data_hash": self._prefix_hash(df, n), "entries": entries_fingerprint(entries), "stops": stops}
+        self.new_items[key] = (meta, state)
+
+    def save(self):
+        if self.path is None or not self.new_items:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {}
+        for key, (meta, state) in self.new_items.items():
+            arrays[key + "_meta"] = np.array(json.dumps(meta))
+            arrays[key + "_state"] = state
+        tmp = self.path.with_name(self.path.stem + ".tmp.npz")
+        np.savez_compressed(tmp, **arrays)
+        tmp.replace(self.path)
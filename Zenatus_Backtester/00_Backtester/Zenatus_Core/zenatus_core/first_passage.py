@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed TP/SL first-passage engine.
+
+For a long-only strategy with fixed relative TP/SL stops the outcome of an
+entry only depends on when the price path after the entry first touches each
+TP and SL level. Instead of re-simulating the whole bar series per (tp, sl)
+pair, the engine
+
+1. scans forward once per entry bar and records the first-hit bar of every
+   distinct TP and SL level (`first_hit_bars_nb`), and
+2. assembles the trades of every combo from these tables with the
+   single-position constraint (`assemble_fixed_exit_nb`).
+
+Stop semantics follow vectorbt's ``from_signals``: entries fill at the close,
+stops are checked from the next bar on, SL before TP, a gap through the level
+fills at the open, and new entries on the exit bar are ignored. Passing
+high=low=open=close (``use_high_low=False``) reproduces the close-only
+vectorbt run of the workers (tests/test_first_passage.py).
+
+The result is the metrics record array of `zenatus_core.metrics`, so the CSV
+schema is the same as for the vectorbt engine. The engines differ in what a
+stop means (``first_passage`` checks open/high/low, ``first_passage_close``
+and ``vectorbt`` the close), so `engine_results_dir` keeps their rows apart.
+"""
+
+from pathlib import Path
+
+import numpy as np
+from numba import njit
+
+from vectorbt.returns.nb import get_return_nb
+from vectorbt.utils.math_ import add_nb
+
+from zenatus_core.metrics import ann_factor_for, fill_metrics_nb, fixed_exit_metrics_dt
+
+EXIT_ENGINES = ("vectorbt", "first_passage", "first_passage_close")
+DEFAULT_EXIT_ENGINE = "vectorbt"
+FIRST_PASSAGE_HIGH_LOW = {"first_passage": True, "first_passage_close": False}  # Engine -> use_high_low
+
+
+def engine_results_dir(results_dir, engine):
+    """
+    Results directory of an exit engine: the default engine keeps results_dir,
+    the others write to a subdirectory of their name, so the resume checks
+    (existing CSV = done) never mix rows of different stop semantics.
+    """
+    results_dir = Path(results_dir)
+    return results_dir if engine == DEFAULT_EXIT_ENGINE else results_dir / engine
+
+
+@njit(cache=True)
+def sl_hit_price_nb(entry_price, stop, open_, low, high):
+    """Fill price of a long SL on this bar or NaN (see vectorbt's get_stop_price_nb)."""
+    stop_price = entry_price * (1 - stop)
+    if open_ <= stop_price:
+        return open_
+    if low <= stop_price <= high:
+        return stop_price
+    return np.nan
+
+
+@njit(cache=True)
+def tp_hit_price_nb(entry_price, stop, open_, low, high):
+    """Fill price of a long TP on this bar or NaN (see vectorbt's get_stop_price_nb)."""
+    stop_price = entry_price * (1 + stop)
+    if stop_price <= open_:
+        return open_
+    if low <= stop_price <= high:
+        return stop_price
+    return np.nan
+
+
+@njit(cache=True)
+def first_hit_bars_nb(entry_idx, open_, high, low, close, tp_levels, sl_levels):
+    """
+    First bar after each entry at which each TP/SL level is touched.
+
+    Args:
+        entry_idx: sorted entry bar indices
+        open_, high, low, close: 1-D price arrays
+        tp_levels: distinct relative TP stops, sorted ascending
+        sl_levels: distinct relative SL stops, sorted ascending
+
+    Returns:
+        first_tp (entries x tp levels), first_sl (entries x sl levels);
+        -1 where the level is never reached.
+    """
+    n_bars = close.shape[0]
+    n_entries = entry_idx.shape[0]
+    n_tp = tp_levels.shape[0]
+    n_sl = sl_levels.shape[0]
+    first_tp = np.full((n_entries, n_tp), -1, dtype=np.int64)
+    first_sl = np.full((n_entries, n_sl), -1, dtype=np.int64)
+
+    for k in range(n_entries):
+        e = entry_idx[k]
+        entry_price = close[e]
+        # Levels are sorted from nearest to farthest, so their first-hit bars
+        # are non-decreasing and one pointer per side suffices.
+        t = 0
+        s = 0
+        j = e + 1
+        while j < n_bars and (t < n_tp or s < n_sl):
+            while t < n_tp and not np.isnan(tp_hit_price_nb(entry_price, tp_levels[t], open_[j], low[j], high[j])):
+                first_tp[k, t] = j
+                t += 1
+            while s < n_sl and not np.isnan(sl_hit_price_nb(entry_price, sl_levels[s], open_[j], low[j], high[j])):
+                first_sl[k, s] = j
+                s += 1
+            j += 1
+    return first_tp, first_sl
+
+
+@njit(cache=True)
+def assemble_fixed_exit_nb(entry_idx, open_, high, low, close, first_tp, first_sl, tp_levels, sl_levels,
+                           tp_level_idx, sl_level_idx, init_cash, size, commission_per_lot, lot_size, ann_factor):
+    """
+    Assemble the trades of every (tp, sl) combo and reduce them to metrics.
+
+    Each combo walks its trades only; equity, drawdown and returns are updated
+    on in-position bars, flat stretches contribute zero returns in closed form.
+
+    Returns:
+        Structured array of `fixed_exit_metrics_dt`, one record per combo.
+    """
+    n_bars = close.shape[0]
+    n_entries = entry_idx.shape[0]
+    n_combos = tp_level_idx.shape[0]
+    out = np.empty(n_combos, dtype=fixed_exit_metrics_dt)
+
+    for col in range(n_combos):
+        t = tp_level_idx[col]
+        s = sl_level_idx[col]
+
+        cash = init_cash
+        cash_flow = 0.
+        position = 0.
+        n_trades = 0
+        n_win = 0
+        n_loss = 0
+        win_sum = 0.
+        loss_sum = 0.
+        win_max = np.nan
+        loss_min = np.nan
+
+        peak = init_cash
+        max_dd = 0.
+        prev_value = init_cash
+        ret_sum = 0.
+        ret_sum_sq = 0.
+        has_orders = False
+
+        k = 0
+        while k < n_entries:
+            e = entry_idx[k]
+            entry_price = close[e]
+            # Amount sizing with partial fill when cash is short (like vectorbt)
+            entry_size = min(size, cash / entry_price)
+            if entry_size <= 0.:
+                break
+            has_orders = True
+            cash = add_nb(cash, -(entry_size * entry_price))
+            cash_flow = add_nb(cash_flow, -(entry_size * entry_price))
+            position = entry_size
+
+            x_tp = first_tp[k, t]
+            x_sl = first_sl[k, s]
+            if x_sl == -1:
+                exit_i = x_tp
+            elif x_tp == -1:
+                exit_i = x_sl
+            else:
+                exit_i = min(x_tp, x_sl)
+            last_i = exit_i - 1 if exit_i != -1 else n_bars - 1
+
+            # In-position bars
+            for i in range(e, last_i + 1):
+                value = cash + close[i] * position
+                if value > peak:
+                    peak = value
+                dd = (value - peak) / peak
+                if dd < max_dd:
+                    max_dd = dd
+                ret = get_return_nb(prev_value, value)
+                ret_sum += ret
+                ret_sum_sq += ret * ret
+                prev_value = value
+
+            if exit_i == -1:
+                # Open trade is valued at the last close
+                pnl = add_nb(position * close[n_bars - 1], -(position * entry_price))
+            else:
+                # SL is checked before TP on the same bar
+                if exit_i == x_sl:
+                    exit_price = sl_hit_price_nb(entry_price, sl_levels[s], open_[exit_i], low[exit_i], high[exit_i])
+                else:
+                    exit_price = tp_hit_price_nb(entry_price, tp_levels[t], open_[exit_i], low[exit_i], high[exit_i])
+                cash = add_nb(cash, position * exit_price)
+                cash_flow = add_nb(cash_flow, position * exit_price)
+                pnl = add_nb(position * exit_price, -(position * entry_price))
+
+                value = cash
+                if value > peak:
+                    peak = value
+                dd = (value - peak) / peak
+                if dd < max_dd:
+                    max_dd = dd
+                ret = get_return_nb(prev_value, value)
+                ret_sum += ret
+                ret_sum_sq += ret * ret
+                prev_value = value
+
+            n_trades += 1
+            if pnl > 0.:
+                n_win += 1
+                win_sum += pnl
+                if np.isnan(win_max) or pnl > win_max:
+                    win_max = pnl
+            elif pnl < 0.:
+                n_loss += 1
+                loss_sum += pnl
+                if np.isnan(loss_min) or pnl < loss_min:
+                    loss_min = pnl
+
+            if exit_i == -1:
+                break
+            position = 0.
+            # Entries on the exit bar are ignored, the next one must come later
+            k = np.searchsorted(entry_idx, exit_i + 1)
+
+        total_profit = cash_flow + position * close[n_bars - 1] if has_orders else 0.
+
+        # Flat bars have a return of exactly 0 and only add to the count
+        if n_bars < 2:
+            sharpe = np.nan
+        else:
+            mean = ret_sum / n_bars
+            var = max(ret_sum_sq / n_bars - mean * mean, 0.)
+            std = np.sqrt(var * n_bars / (n_bars - 1))
+            sharpe = np.inf if std == 0. else mean / std * np.sqrt(ann_factor)
+
+        fill_metrics_nb(out, col, init_cash, total_profit, n_trades, n_win, n_loss, win_sum, loss_sum,
+                        win_max, loss_min, max_dd, sharpe, commission_per_lot, lot_size)
+    return out
+
+
+def first_passage_metrics(df, entries, tp_stop, sl_stop, init_cash, size, commission_per_lot, lot_size, freq,
+                          use_high_low=True):
+    """
+    Fixed_Exit metrics for all (tp_stop[i], sl_stop[i]) combos of one entry signal.
+
+    Args:
+        df: OHLC DataFrame (lowercase columns)
+        entries: boolean entry signal aligned with df
+        tp_stop, sl_stop: relative stops, one pair per combo
+        use_high_low: check stops against open/high/low; False checks the
+            close only, like the vectorbt engine of the workers
+
+    Returns:
+        Structured array of `fixed_exit_metrics_dt`, one record per combo.
+    """
+    close = np.ascontiguousarray(df["close"].values, dtype=np.float64)
+    if use_high_low:
+        open_ = np.ascontiguousarray(df["open"].values, dtype=np.float64)
+        high = np.ascontiguousarray(df["high"].values, dtype=np.float64)
+        low = np.ascontiguousarray(df["low"].values, dtype=np.float64)
+        # Missing OHLC values are resolved like vectorbt does
+        open_ = np.where(np.isnan(open_), close, open_)
+        low = np.where(np.isnan(low), np.minimum(open_, close), low)
+        high = np.where(np.isnan(high), np.maximum(open_, close), high)
+    else:
+        open_ = high = low = close
+
+    entry_idx = np.flatnonzero(np.asarray(entries, dtype=np.bool_)).astype(np.int64)
+    tp_levels, tp_level_idx = np.unique(np.asarray(tp_stop, dtype=np.float64), return_inverse=True)
+    sl_levels, sl_level_idx = np.unique(np.asarray(sl_stop, dtype=np.float64), return_inverse=True)
+
+    first_tp, first_sl = first_hit_bars_nb(entry_idx, open_, high, low, close, tp_levels, sl_levels)
+    return assemble_fixed_exit_nb(
+        entry_idx, open_, high, low, close,
+        first_tp, first_sl, tp_levels, sl_levels,
+        tp_level_idx.astype(np.int64), sl_level_idx.astype(np.int64),
+        float(init_cash), float(size), float(commission_per_lot), float(lot_size),
+        ann_factor_for(freq)
+    )
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental (one bar per call) versions of the indicator primitives.
+
+Live/paper trading and extending a backtest by a few bars only need the
+signal of the newest bar; recomputing ``calculate`` over the whole history
+for it is O(n) per bar. The classes here keep the running state of one
+primitive and return its value of the new bar in O(1) (O(window) memory),
+with the same floating point operations as pandas, so the values are
+bit-identical to the batch expression:
+
+- `RollingSum` / `RollingMean` / `RollingStd`: ``x.rolling(w, min_periods).sum()``
+  / ``.mean()`` / ``.std()`` (Kahan-compensated running sums, Welford
+  variance, the exact value for a window of one repeated value)
+- `Ewm`: ``x.ewm(span=.., com=.. or alpha=.., adjust=..).mean()``
+- `Lag`: ``x.shift(n)``
+- `TrueRange` / `Atr`: ``_true_range`` / its rolling mean as in
+  zenatus_core.primitives
+- `CrossAbove`: ``(a > b) & (a.shift(1) <= b.shift(1))``
+- `div`: ``a / b`` with numpy's inf/NaN on a zero divisor
+
+NaN inputs are skipped like pandas does (not counted as observations).
+Strategies build their ``update`` from these (incremental contract in
+zenatus_core/signals.py); `run` feeds a frame bar by bar, for the parity
+tests (tests/test_incremental.py) and to warm up a state on history.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class _Window:
+    """Last ``window`` inputs, the value leaving the window on each update."""
+
+    def __init__(self, window, min_periods=None):
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got {window}")
+        self.window = int(window)
+        self.min_periods = self.window if min_periods is None else int(min_periods)
+        self.values = deque(maxlen=self.window)
+        self.reset()
+
+    def reset(self):
+        self.nobs = 0
+        self.same = 0  # Consecutive equal observations (pandas' num_consecutive_same_value)
+        self.prev = math.nan
+
+    def _push(self, x):
+        """Append x; the removed value (NaN: none). A window of 1 restarts every bar, as in pandas."""
+        if self.window == 1 and self.values:
+            self.values.clear()
+            self.reset()
+        removed = self.values[0] if len(self.values) == self.window else math.nan
+        self.values.append(x)
+        return removed
+
+    def _observe(self, x):
+        self.nobs += 1
+        self.same = self.same + 1 if x == self.prev else 1
+        self.prev = x
+
+
+class RollingSum(_Window):
+    """``x.rolling(window, min_periods).sum()`` one value at a time."""
+
+    def reset(self):
+        super().reset()
+        self.sum = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+
+    def _add(self, x):
+        y = x - self.comp_add
+        t = self.sum + y
+        self.comp_add = t - self.sum - y
+        self.sum = t
+
+    def _remove(self, x):
+        y = -x - self.comp_remove
+        t = self.sum + y
+        self.comp_remove = t - self.sum - y
+        self.sum = t
+
+    def update(self, x):
+        removed = self._push(x)
+        if removed == removed:
+            self.nobs -= 1
+            self._remove(removed)
+        if x == x:
+            self._observe(x)
+            self._add(x)
+        return self.value()
+
+    def value(self):
+        if self.nobs == 0 == self.min_periods:
+            return 0.0
+        if self.nobs < self.min_periods:
+            return math.nan
+        if self.same >= self.nobs:
+            return self.prev * self.nobs
+        return self.sum
+
+
+class RollingMean(RollingSum):
+    """``x.rolling(window, min_periods).mean()`` one value at a time."""
+
+    def reset(self):
+        super().reset()
+        self.neg_ct = 0
+
+    def update(self, x):
+        removed = self._push(x)
+        if removed == removed:
+            self.nobs -= 1
+            self._remove(removed)
+            if np.signbit(removed):
+                self.neg_ct -= 1
+        if x == x:
+            self._observe(x)
+            self._add(x)
+            if np.signbit(x):
+                self.neg_ct += 1
+        return self.value()
+
+    def value(self):
+        if self.nobs < self.min_periods or self.nobs == 0:
+            return math.nan
+        if self.same >= self.nobs:
+            return self.prev
+        result = self.sum / self.nobs
+        if self.neg_ct == 0 and result < 0 or self.neg_ct == self.nobs and result > 0:
+            return 0.0  # Wrong sign from the compensation: pandas clips to 0
+        return result
+
+
+class RollingStd(_Window):
+    """``x.rolling(window, min_periods).std(ddof)`` one value at a time (Welford, as pandas' roll_var)."""
+
+    def __init__(self, window, min_periods=None, ddof=1):
+        self.ddof = ddof
+        super().__init__(window, min_periods)
+
+    def reset(self):
+        super().reset()
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+
+    def update(self, x):
+        removed = self._push(x)
+        if removed == removed:
+            self.nobs -= 1
+            if self.nobs:
+                prev_mean = self.mean - self.comp_remove
+                y = removed - self.comp_remove
+                t = y - self.mean
+                self.comp_remove = t + self.mean - y
+                self.mean = self.mean - t / self.nobs
+                self.ssqdm = self.ssqdm - (removed - prev_mean) * (removed - self.mean)
+            else:
+                self.mean = 0.0
+                self.ssqdm = 0.0
+        if x == x:
+            self._observe(x)
+            prev_mean = self.mean - self.comp_add
+            y = x - self.comp_add
+            t = y - self.mean
+            self.comp_add = t + self.mean - y
+            self.mean = self.mean + t / self.nobs
+            self.ssqdm = self.ssqdm + (x - prev_mean) * (x - self.mean)
+        return self.value()
+
+    def value(self):
+        if self.nobs < self.min_periods or self.nobs <= self.ddof:
+            return math.nan
+        if self.nobs == 1 or self.same >= self.nobs:
+            return 0.0
+        var = self.ssqdm / (self.nobs - self.ddof)
+        return math.sqrt(var) if var > 0 else 0.0
+
+
+class Ewm:
+    """
+    ``x.ewm(span=.., com=.. or alpha=.., adjust=adjust).mean()`` one value at a
+    time (ignore_na=False, min_periods=0; the recursion of kernels.ewm_mean_batch_nb).
+    """
+
+    def __init__(self, span=None, com=None, alpha=None, adjust=False):
+        if span is not None:
+            com = (span - 1) / 2.0
+        elif alpha is not None:
+            com = (1 - alpha) / alpha
+        if com is None or com < 0:
+            raise ValueError("Ewm needs span >= 1, com >= 0 or 0 < alpha <= 1")
+        alpha = 1.0 / (1.0 + com)  # pandas derives alpha from com
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = 1.0 if adjust else alpha
+        self.adjust = adjust
+        self.weighted = math.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+        self.started = False
+
+    def update(self, x):
+        is_obs = x == x
+        if not self.started:
+            self.started = True
+            self.weighted = x
+        elif self.weighted == self.weighted:
+            self.old_wt *= self.old_wt_factor
+            if is_obs:
+                if self.weighted != x:  # pandas skips the update on a constant series
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * x) / (self.old_wt + self.new_wt)
+                self.old_wt = self.old_wt + self.new_wt if self.adjust else 1.0
+        elif is_obs:
+            self.weighted = x
+        self.nobs += is_obs
+        return self.weighted if self.nobs >= 1 else math.nan
+
+
+class Lag:
+    """``x.shift(n)`` one value at a time (NaN for the first n bars)."""
+
+    def __init__(self, n=1):
+        self.n = int(n)
+        self.values = deque(maxlen=self.n + 1)
+
+    def update(self, x):
+        self.values.append(x)
+        return self.values[0] if len(self.values) > self.n else math.nan
+
+
+class TrueRange:
+    """max(high - low, |high - prev close|, |low - prev close|) skipping NaN (high - low on the first bar)."""
+
+    def __init__(self):
+        self.prev_close = math.nan
+
+    def update(self, high, low, close):
+        prev, self.prev_close = self.prev_close, close
+        ranges = [v for v in (high - low, abs(high - prev), abs(low - prev)) if v == v]
+        return max(ranges) if ranges else math.nan
+
+
+class Atr:
+    """``_true_range(high, low, close).rolling(period, min_periods).mean()`` one bar at a time."""
+
+    def __init__(self, period, min_periods=None):
+        self.tr = TrueRange()
+        self.mean = RollingMean(period, min_periods)
+
+    def update(self, high, low, close):
+        return self.mean.update(self.tr.update(high, low, close))
+
+
+def div(a, b):
+    """a / b with numpy semantics (inf/NaN for b == 0, as in the pandas expression)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(a) / np.float64(b))
+
+
+class CrossAbove:
+    """``(a > b) & (a.shift(1) <= b.shift(1))`` one bar at a time (False on the first bar and on NaN)."""
+
+    def __init__(self):
+        self.prev_a = math.nan
+        self.prev_b = math.nan
+
+    def update(self, a, b):
+        cross = a > b and self.prev_a <= self.prev_b
+        self.prev_a, self.prev_b = a, b
+        return bool(cross)
+
+
+def run(strategy, data, params, state=None):
+    """
+    Feed the bars of data through ``strategy.update``.
+
+    Args:
+        strategy: instance implementing ``init_state`` / ``update``
+        data: OHLCV frame
+        params: strategy params
+        state: state to continue (default: ``strategy.init_state(params)``)
+
+    Returns:
+        (entries bool array, values list of ``state['value']`` per bar, state)
+    """
+    if state is None:
+        state = strategy.init_state(params)
+    fields = [f for f in BAR_FIELDS if f in data.columns]
+    columns = [data[f].values.astype(np.float64) for f in fields]
+    entries = np.zeros(len(data), dtype=np.bool_)
+    values = []
+    for i in range(len(data)):
+        bar = {f: float(col[i]) for f, col in zip(fields, columns)}
+        entries[i] = strategy.update(state, bar)
+        values.append(state.get("value"))
+    return entries, values, state
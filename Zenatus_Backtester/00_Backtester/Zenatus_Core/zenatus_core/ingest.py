@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental bar ingestion into the OHLCV store.
+
+Built like vectorbt's data updaters (``vectorbt/data/updater.py``), with the
+local aggregates taking the place of an exchange API:
+
+- ``LocalData.download_symbol``: the bars already in the store (the parsed
+  source file if the symbol was never converted)
+- ``LocalData.update_symbol``: only the bars from the watermark (last stored
+  bar) on. A CSV that only grew is parsed from the old end of file; a
+  rewritten file (or parquet) is re-read completely and vectorbt's
+  concat/dedup keeps the revised values
+- ``StoreUpdater.update``: appends the result to the store (atomic rewrite,
+  workers that still map the old arrays are not affected) and records the
+  watermark, also on a schedule via ``update_every``
+
+Schema additions::
+
+    "watermark": {"last", "prev", "first_changed"}   first_changed: first bar
+                 whose stored values changed (None if bars were only appended)
+    "ingest":    [{"at", "prev", "last", "added", "first_changed"}, ...]
+
+Results computed up to ``prev`` stay valid as long as ``first_changed`` is None;
+the worker's extend mode (``zenatus_core.extend``) re-simulates only the
+bars after that.
+"""
+
+import io
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from vectorbt.data.base import Data
+from vectorbt.data.updater import DataUpdater
+from vectorbt.utils.config import merge_dicts
+
+from zenatus_core.store import (_source_info, frame_from_arrays, is_fresh, open_store, read_aggregated, read_schema,
+                                source_path, source_tail_hash, store_path, write_store)
+from zenatus_core.validate import validate_frame
+
+INGEST_LOG_SIZE = 20  # Ingest entries kept in the schema
+
+
+def _naive(df):
+    """Index as naive UTC (vectorbt localizes naive data to UTC, the store keeps it naive like the CSVs)."""
+    if getattr(df.index, "tz", None) is not None:
+        df = df.tz_convert(None)
+    return df
+
+
+def read_source_since(src, source_info, since):
+    """
+    Bars of the source file that are not in the store yet.
+
+    Args:
+        src: aggregated CSV/parquet
+        source_info: ``schema["source"]`` of the store (size/mtime/tail at the last ingest)
+        since: watermark, the last stored bar
+
+    Returns None if the file did not change. If the CSV was only appended to
+    (same tail hash before the old size), just the new bytes are parsed.
+    Otherwise the whole file is returned and the caller's dedup (keep last)
+    picks up revised bars.
+    """
+    src = Path(src)
+    source_info = source_info or {}
+    size = source_info.get("size")
+    st = os.stat(src)
+    if size == st.st_size and source_info.get("mtime_ns") == st.st_mtime_ns:
+        return None
+    if (src.suffix == ".csv" and size and st.st_size > size and source_info.get("tail")
+            and source_tail_hash(src, size) == source_info["tail"]):
+        with open(src, "rb") as f:
+            header = f.readline()
+            f.seek(size)
+            tail = f.read()
+        df = read_aggregated(io.BytesIO(header + tail))
+        return df[df.index >= _naive_ts(since)]
+    return read_aggregated(src)
+
+
+def _naive_ts(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_convert(None) if ts.tz is not None else ts
+
+
+def first_difference(old, new):
+    """
+    First bar at which ``new`` no longer extends ``old`` unchanged (a changed
+    or missing bar), None if new is old plus appended bars.
+    """
+    old_t = old.index.values.astype("datetime64[ns]")
+    new_t = new.index.values.astype("datetime64[ns]")
+    n = min(len(old_t), len(new_t))
+    diff = old_t[:n] != new_t[:n]
+    for c in old.columns:
+        if c in new.columns:
+            a = np.asarray(old[c].values[:n], dtype=np.float64)
+            b = np.asarray(new[c].values[:n], dtype=np.float64)
+            diff |= ~((a == b) | (np.isnan(a) & np.isnan(b)))
+    pos = np.flatnonzero(diff)
+    if len(pos):
+        return pd.Timestamp(min(old_t[pos[0]], new_t[pos[0]]))
+    if len(new_t) < len(old_t):
+        return pd.Timestamp(old_t[n])
+    return None
+
+
+class LocalData(Data):
+    """``vbt.Data`` over the local aggregates/store of one timeframe (kwargs: data_path, timeframe)."""
+
+    @classmethod
+    def download_symbol(cls, symbol, data_path=None, timeframe=None):
+        """Bars currently in the store, the parsed source file if there is no store yet."""
+        opened = open_store(store_path(data_path, timeframe, symbol))
+        if opened is not None:
+            times, columns, _ = opened
+            return frame_from_arrays(times, columns)
+        return read_aggregated(source_path(data_path, timeframe, symbol))
+
+    def update_symbol(self, symbol, **kwargs):
+        """Bars after the watermark (plus revised ones if the source file was rewritten)."""
+        kwargs = merge_dicts(self.select_symbol_kwargs(symbol, self.download_kwargs), kwargs)
+        data_path, timeframe = kwargs["data_path"], kwargs["timeframe"]
+        schema = read_schema(store_path(data_path, timeframe, symbol)) or {}
+        new = read_source_since(source_path(data_path, timeframe, symbol), schema.get("source"),
+                                self.data[symbol].index[-1])
+        return self.data[symbol].iloc[:0] if new is None else new
+
+
+class StoreUpdater(DataUpdater):
+    """
+    ``DataUpdater`` that appends every update to the store.
+
+        updaters = StoreUpdater.for_symbols(DATA_PATH, "1h", ["EUR_USD", "GBP_USD"])
+        for updater in updaters:
+            updater.update()                   # once
+        updaters[0].update_every(15, "minutes")  # or on a schedule (blocks; see INGEST_NEW_BARS.py --every)
+    """
+
+    last_ingest = None  # Ingest entry of the last update (see append_to_store)
+
+    @classmethod
+    def for_symbols(cls, data_path, timeframe, symbols, schedule_manager=None):
+        """One updater per symbol (symbols have different bars, vectorbt would align them with NaNs)."""
+        return [cls(LocalData.download(symbol, data_path=str(data_path), timeframe=timeframe),
+                    schedule_manager=schedule_manager)
+                for symbol in symbols]
+
+    def update(self, **kwargs):
+        old = self.data
+        super().update(**kwargs)
+        data_path = self.data.download_kwargs["data_path"]
+        timeframe = self.data.download_kwargs["timeframe"]
+        for symbol in self.data.symbols:
+            self.last_ingest = append_to_store(data_path, timeframe, symbol, old.data[symbol], self.data.data[symbol])
+
+
+def append_to_store(data_path, timeframe, symbol, old, new):
+    """
+    Write the updated bars of one symbol to its store and record the watermark.
+
+    Returns the ingest entry ({"prev", "last", "added", "first_changed"}).
+    """
+    old = _naive(old)
+    new, report = validate_frame(_naive(new), timeframe, f"{symbol} {timeframe}")
+    path = store_path(data_path, timeframe, symbol)
+    src = source_path(data_path, timeframe, symbol)
+    schema = read_schema(path)
+    prev = old.index[-1] if len(old) else None
+    changed = first_difference(old, new)
+    entry = {
+        "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "prev": str(prev) if prev is not None else None,
+        "last": str(new.index[-1]) if len(new) else None,
+        "added": int(np.count_nonzero(new.index > prev)) if prev is not None else len(new),
+        "first_changed": str(changed) if changed is not None else None,
+    }
+    if changed is None and entry["added"] == 0 and is_fresh(schema, src):
+        print(f"[INGEST] {symbol} {timeframe}: up to date ({entry['last']})")
+        return entry
+
+    log = ((schema or {}).get("ingest") or [])[-(INGEST_LOG_SIZE - 1):] + [entry]
+    watermark = {"last": entry["last"], "prev": entry["prev"], "first_changed": entry["first_changed"]}
+    write_store(path, new, _source_info(src) if src.exists() else None, {"watermark": watermark, "ingest": log},
+                report=report)
+    if schema is None:
+        print(f"[INGEST] {symbol} {timeframe}: new store, {len(new)} bars up to {entry['last']}")
+    else:
+        print(f"[INGEST] {symbol} {timeframe}: +{entry['added']} bars, {entry['prev']} -> {entry['last']}"
+              + (f", changed from {entry['first_changed']}" if changed is not None else ""))
+    return entry
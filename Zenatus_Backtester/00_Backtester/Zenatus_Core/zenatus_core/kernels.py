@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+"""
+Numba kernels for the rolling calculations that strategies otherwise run as
+per-bar Python loops.
+
+Each ``*_nb`` kernel reproduces the numpy/pandas expression it replaces
+operation by operation, so a ported strategy gives bit-identical values
+(checked by tests/test_kernels.py against the original loops):
+
+- reductions: ``np_sum_nb`` / ``np_mean_nb`` / ``np_std_nb`` sum pairwise like
+  numpy (a plain loop differs in the last bits)
+- logarithms are taken with numpy outside the kernels, numba's ``log`` is not
+  the SIMD one numpy uses (``rolling_hurst_rs``)
+- ``np.polyfit(x, y, 1)``: same scaled least squares (LAPACK gelsd)
+- ``np.linalg.norm``: ``sqrt(np.dot(d, d))``, both call BLAS ddot
+
+Kernels:
+
+- ``rolling_rs_nb`` / ``hurst_slope_nb``: R/S table and Hurst exponent
+  (118_trend_hurstexponent)
+- ``rolling_volume_profile_nb``: POC and value area (187_volume_profile)
+- ``rolling_quantile_nb``, ``rolling_rank_nb``: pandas ``rolling().quantile``
+  / ``rolling().rank`` and ``np.quantile`` per window
+- ``rolling_quantile_clusters_nb``, ``rolling_label_hit_rate_nb``: quantile
+  centroids and hit rate per label (341_kmeans_clustering)
+- ``adaptive_ema_nb``: recursive filter with per-bar alpha (VIDYA, KAMA)
+- ``rolling_linreg_nb``: ``np.polyfit(np.arange(window), x, 1)`` per window
+- ``rolling_mean_batch_nb``, ``ewm_mean_batch_nb``: pandas ``rolling().mean()``
+  / ``ewm().mean()`` for many windows at once (bars x windows), same
+  algorithms as pandas (compensated running sum, EWM weights), for the
+  strategies' ``calculate_batch`` (zenatus_core.signals)
+
+Strategies import the module optionally and keep their loop as fallback
+(the modules in All_Strategys stay importable without Zenatus_Core)::
+
+    try:
+        from zenatus_core import kernels
+    except ImportError:
+        kernels = None
+"""
+
+import numpy as np
+from numba import njit
+
+
+# numpy-identical building blocks
+
+@njit(cache=True)
+def np_sum_nb(a):
+    """``np.sum`` of a contiguous 1-D float64 array (numpy's pairwise summation)."""
+    n = len(a)
+    if n < 8:
+        res = 0.0
+        for i in range(n):
+            res += a[i]
+        return res
+    if n <= 128:
+        r0, r1, r2, r3 = a[0], a[1], a[2], a[3]
+        r4, r5, r6, r7 = a[4], a[5], a[6], a[7]
+        i = 8
+        while i < n - (n % 8):
+            r0 += a[i]
+            r1 += a[i + 1]
+            r2 += a[i + 2]
+            r3 += a[i + 3]
+            r4 += a[i + 4]
+            r5 += a[i + 5]
+            r6 += a[i + 6]
+            r7 += a[i + 7]
+            i += 8
+        res = ((r0 + r1) + (r2 + r3)) + ((r4 + r5) + (r6 + r7))
+        while i < n:
+            res += a[i]
+            i += 1
+        return res
+    n2 = n // 2
+    n2 -= n2 % 8
+    return np_sum_nb(a[:n2]) + np_sum_nb(a[n2:])
+
+
+@njit(cache=True)
+def np_mean_nb(a):
+    """``np.mean`` of a contiguous 1-D float64 array."""
+    return np_sum_nb(a) / len(a)
+
+
+@njit(cache=True)
+def np_std_nb(a):
+    """``np.std`` (ddof=0) of a contiguous 1-D float64 array."""
+    d = a - np_mean_nb(a)
+    return np.sqrt(np_sum_nb(d * d) / len(a))
+
+
+@njit(cache=True)
+def polyfit1_nb(x, y):
+    """(slope, intercept) of ``np.polyfit(x, y, 1)``: columns scaled to unit norm, lstsq with the same rcond."""
+    m = len(x)
+    lhs = np.empty((m, 2))
+    s0 = 0.0
+    s1 = 0.0
+    for k in range(m):
+        lhs[k, 0] = x[k]
+        lhs[k, 1] = 1.0
+        s0 += x[k] * x[k]
+        s1 += 1.0
+    s0 = np.sqrt(s0)
+    s1 = np.sqrt(s1)
+    for k in range(m):
+        lhs[k, 0] /= s0
+        lhs[k, 1] /= s1
+    c = np.linalg.lstsq(lhs, y, m * np.finfo(np.float64).eps)[0]
+    return c[0] / s0, c[1] / s1
+
+
+@njit(cache=True)
+def _has_nan(a):
+    for v in a:
+        if np.isnan(v):
+            return True
+    return False
+
+
+# Hurst exponent (R/S analysis)
+
+@njit(cache=True)
+def rolling_rs_nb(returns, period, max_lag):
+    """
+    R/S table of the rolling Hurst exponent.
+
+    Row i covers the log returns of close[i-period:i] (``returns[i-period:i-1]``).
+    For lag = 2 .. min(max_lag, (period-1)//2)-1 with at least two chunks: the
+    mean R/S of the chunks with std > 0. Lags without such a chunk are
+    skipped, the values are stored left-aligned with ``counts[i]`` of them.
+    """
+    n = len(returns) + 1
+    width = max(max_lag - 2, 0)
+    rs = np.full((n, width), np.nan)
+    counts = np.zeros(n, dtype=np.int64)
+    n_ret = period - 1
+    if n_ret < 10:
+        return rs, counts
+    buf = np.empty(n_ret)
+    for i in range(period, n):
+        r = returns[i - period:i - 1]
+        m = 0
+        for lag in range(2, min(max_lag, n_ret // 2)):
+            n_chunks = n_ret // lag
+            if n_chunks < 2:
+                continue
+            c = 0
+            for j in range(n_chunks):
+                chunk = r[j * lag:(j + 1) * lag]
+                mean = np_mean_nb(chunk)
+                cum = 0.0
+                lo = np.inf
+                hi = -np.inf
+                for v in chunk:
+                    cum += v - mean
+                    lo = min(lo, cum)
+                    hi = max(hi, cum)
+                s = np_std_nb(chunk)
+                if s > 0:
+                    buf[c] = (hi - lo) / s
+                    c += 1
+            if c > 0:
+                rs[i, m] = np_mean_nb(buf[:c])
+                m += 1
+        counts[i] = m
+    return rs, counts
+
+
+@njit(cache=True)
+def hurst_slope_nb(log_lags, log_rs, counts, default):
+    """Slope of log(R/S) over log(lag) per row (more than two values), clipped to 0..1; default otherwise."""
+    n = len(counts)
+    out = np.full(n, default)
+    for i in range(n):
+        m = counts[i]
+        if m > 2:
+            x = log_lags[:m]
+            if np_std_nb(x) > 0:
+                h = polyfit1_nb(x, np.ascontiguousarray(log_rs[i, :m]))[0]
+                if not np.isnan(h):
+                    out[i] = min(max(h, 0.0), 1.0)
+    return out
+
+
+def rolling_hurst_rs(close, period, max_lag=20, default=0.5):
+    """Rolling Hurst exponent of close[i-period:i] for every bar i (default before the first window)."""
+    returns = np.diff(np.log(np.asarray(close, dtype=np.float64)))
+    rs, counts = rolling_rs_nb(returns, period, max_lag)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_rs = np.log(rs)
+    log_lags = np.log(np.arange(2, max(max_lag, 2), dtype=np.float64))
+    return hurst_slope_nb(log_lags, log_rs, counts, default)
+
+
+# Volume profile
+
+@njit(cache=True)
+def rolling_volume_profile_nb(high, low, close, volume, period, bins, value_area):
+    """
+    Volume profile of bars i-period .. i-1 for every bar i.
+
+    ``bins`` price edges from the lowest low to the highest high
+    (``np.linspace``), the volume of a bar goes to the interval of its
+    typical price (``np.digitize``, the top edge is outside). Returns
+    (poc, vah, val): mid of the interval with the most volume, upper/lower
+    edge of the intervals that hold ``value_area`` of the volume (taken in
+    descending order of volume). NaN where the window has no volume.
+    """
+    n = len(close)
+    poc = np.full(n, np.nan)
+    vah = np.full(n, np.nan)
+    val = np.full(n, np.nan)
+    typical = (high + low + close) / 3
+    nb = bins - 1
+    edges = np.empty(bins)
+    profile = np.empty(max(nb, 0))
+    used = np.empty(max(nb, 0), dtype=np.bool_)
+    for i in range(period, n):
+        pmin = np.inf
+        pmax = -np.inf
+        for j in range(i - period, i):
+            if low[j] < pmin:
+                pmin = low[j]
+            if high[j] > pmax:
+                pmax = high[j]
+        delta = pmax - pmin
+        step = delta / (bins - 1)
+        for k in range(bins):
+            edges[k] = (k / (bins - 1)) * delta + pmin if step == 0 else k * step + pmin
+        edges[bins - 1] = pmax
+        profile[:] = 0.0
+        for j in range(i - period, i):
+            idx = np.searchsorted(edges, typical[j], side="right") - 1
+            if 0 <= idx < nb:
+                profile[idx] += volume[j]
+        if nb == 0:
+            continue
+        total = np_sum_nb(profile)
+        if not total > 0:
+            continue
+        k = np.argmax(profile)
+        poc[i] = (edges[k] + edges[k + 1]) / 2
+        used[:] = False
+        cum = 0.0
+        lo = nb
+        hi = -1
+        for _ in range(nb):
+            best = -1
+            for k in range(nb - 1, -1, -1):
+                if not used[k] and (best < 0 or profile[k] > profile[best]):
+                    best = k
+            used[best] = True
+            cum += profile[best]
+            lo = min(lo, best)
+            hi = max(hi, best)
+            if cum >= total * value_area:
+                break
+        vah[i] = edges[hi + 1]
+        val[i] = edges[lo]
+    return poc, vah, val
+
+
+# Rolling quantile / rank
+
+@njit(cache=True)
+def _quantile_sorted(s, q, numpy_lerp):
+    n = len(s)
+    v = (n - 1) * q
+    if v >= n - 1:
+        return s[n - 1]
+    lo = int(np.floor(v))
+    t = v - lo
+    a = s[lo]
+    b = s[lo + 1]
+    if numpy_lerp:
+        diff = b - a
+        return b - diff * (1 - t) if t >= 0.5 else a + diff * t
+    if t == 0:
+        return a
+    return a + (b - a) * t
+
+
+@njit(cache=True)
+def rolling_quantile_nb(x, window, q, numpy_lerp):
+    """
+    Linear quantile of x[i-window+1 .. i] (NaN if the window has a NaN).
+
+    numpy_lerp=False: ``Series.rolling(window).quantile(q)``;
+    True: ``np.quantile(window_values, q)`` (numpy interpolates from the upper
+    value for fractions >= 0.5).
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        w = x[i - window + 1:i + 1]
+        if not _has_nan(w):
+            out[i] = _quantile_sorted(np.sort(w), q, numpy_lerp)
+    return out
+
+
+@njit(cache=True)
+def rolling_rank_nb(x, window, pct):
+    """``Series.rolling(window).rank(pct=pct)``: average rank of x[i] within x[i-window+1 .. i]."""
+    n = len(x)
+    out = np.full(n, np.nan)
+    for i in range(window - 1, n):
+        w = x[i - window + 1:i + 1]
+        if _has_nan(w):
+            continue
+        less = 0
+        equal = 0
+        for v in w:
+            if v < x[i]:
+                less += 1
+            elif v == x[i]:
+                equal += 1
+        rank = less + (equal + 1) / 2
+        out[i] = rank / window if pct else rank
+    return out
+
+
+@njit(cache=True)
+def rolling_quantile_clusters_nb(features, window, quantiles):
+    """
+    Nearest quantile centroid per bar (simplified k-means of 341).
+
+    The centroids of bar i are the column-wise quantiles (``DataFrame.quantile``,
+    numpy interpolation) of features[i-window:i]; the label is the index of
+    the centroid closest to features[i] (Euclidean, first one on ties), 0
+    before the first window.
+    """
+    n, f = features.shape
+    labels = np.zeros(n, dtype=np.int64)
+    centroids = np.empty((len(quantiles), f))
+    d = np.empty(f)
+    for i in range(window, n):
+        for c in range(f):
+            s = np.sort(features[i - window:i, c])
+            for k in range(len(quantiles)):
+                centroids[k, c] = _quantile_sorted(s, quantiles[k], True)
+        best = 0
+        best_dist = np.inf
+        for k in range(len(quantiles)):
+            for c in range(f):
+                d[c] = features[i, c] - centroids[k, c]
+            dist = np.sqrt(np.dot(d, d))
+            if dist < best_dist:
+                best = k
+                best_dist = dist
+        labels[i] = best
+    return labels
+
+
+@njit(cache=True)
+def rolling_label_hit_rate_nb(labels, values, window, default):
+    """
+    Share of values > 0 among bars i-window .. i-1 with the label of bar i
+    (default if there is none, NaN before the first window).
+    """
+    n = len(labels)
+    out = np.full(n, np.nan)
+    for i in range(window, n):
+        hits = 0
+        count = 0
+        for j in range(i - window, i):
+            if labels[j] == labels[i]:
+                count += 1
+                if values[j] > 0:
+                    hits += 1
+        out[i] = hits / count if count > 0 else default
+    return out
+
+
+# Adaptive-alpha filters and rolling regression
+
+@njit(cache=True)
+def adaptive_ema_nb(x, alpha, default_alpha):
+    """
+    y[i] = a[i] * x[i] + (1 - a[i]) * y[i-1] with y[0] = x[0]; a[i] = alpha[i],
+    default_alpha where alpha is NaN. VIDYA (alpha = base * |CMO|), KAMA (alpha = sc**2).
+    """
+    n = len(x)
+    y = np.empty(n)
+    if n == 0:
+        return y
+    y[0] = x[0]
+    for i in range(1, n):
+        a = alpha[i]
+        if np.isnan(a):
+            a = default_alpha
+        y[i] = a * x[i] + (1 - a) * y[i - 1]
+    return y
+
+
+@njit(cache=True)
+def rolling_linreg_nb(x, window):
+    """
+    Least-squares line through x[i-window+1 .. i] over 0 .. window-1, as
+    ``x.rolling(window).apply(lambda w: np.polyfit(np.arange(len(w)), w, 1)[0])``.
+
+    Returns (slope, intercept at the first bar of the window, r2); NaN before
+    the first window and for windows with NaN (r2 also for a flat window).
+    """
+    n = len(x)
+    slope = np.full(n, np.nan)
+    intercept = np.full(n, np.nan)
+    r2 = np.full(n, np.nan)
+    t = np.arange(window).astype(np.float64)
+    for i in range(window - 1, n):
+        w = np.ascontiguousarray(x[i - window + 1:i + 1])
+        if _has_nan(w):
+            continue
+        b, a = polyfit1_nb(t, w)
+        slope[i] = b
+        intercept[i] = a
+        mean = np_mean_nb(w)
+        ss_tot = 0.0
+        ss_res = 0.0
+        for k in range(window):
+            ss_tot += (w[k] - mean) ** 2
+            ss_res += (w[k] - (a + b * t[k])) ** 2
+        if ss_tot > 0:
+            r2[i] = 1 - ss_res / ss_tot
+    return slope, intercept, r2
+
+
+# Batched moving averages (one column per window, for calculate_batch)
+
+@njit(cache=True)
+def rolling_mean_batch_nb(x, windows, min_periods):
+    """
+    ``Series(x).rolling(w, min_periods).mean()`` for every w in windows
+    (min_periods <= 0: w), bars x windows. pandas' algorithm: Kahan-compensated
+    running sum, the exact value for a window of one repeated value and 0 if the
+    mean has the wrong sign.
+    """
+    n = len(x)
+    out = np.empty((n, len(windows)))
+    for k in range(len(windows)):
+        w = windows[k]
+        minp = w if min_periods <= 0 else min_periods
+        nobs = 0
+        neg_ct = 0
+        sum_x = 0.0
+        comp_add = 0.0
+        comp_remove = 0.0
+        same = 0
+        prev = x[0] if n else 0.0
+        for i in range(n):
+            if i > 0 and w == 1:
+                # pandas restarts the window when it does not overlap the previous one
+                nobs = 0
+                neg_ct = 0
+                sum_x = 0.0
+                comp_add = 0.0
+                comp_remove = 0.0
+                same = 0
+                prev = x[i]
+            elif i >= w:
+                v = x[i - w]
+                if v == v:
+                    nobs -= 1
+                    y = -v - comp_remove
+                    t = sum_x + y
+                    comp_remove = t - sum_x - y
+                    sum_x = t
+                    if np.signbit(v):
+                        neg_ct -= 1
+            v = x[i]
+            if v == v:
+                nobs += 1
+                y = v - comp_add
+                t = sum_x + y
+                comp_add = t - sum_x - y
+                sum_x = t
+                if np.signbit(v):
+                    neg_ct += 1
+                if v == prev:
+                    same += 1
+                else:
+                    same = 1
+                prev = v
+            if nobs >= minp and nobs > 0:
+                result = sum_x / nobs
+                if same >= nobs:
+                    result = prev
+                elif neg_ct == 0 and result < 0:
+                    result = 0.0
+                elif neg_ct == nobs and result > 0:
+                    result = 0.0
+                out[i, k] = result
+            else:
+                out[i, k] = np.nan
+    return out
+
+
+@njit(cache=True)
+def ewm_mean_batch_nb(x, coms, adjust):
+    """
+    ``Series(x).ewm(com=c, adjust=adjust).mean()`` for every c in coms, bars x
+    coms (span s: com = (s - 1) / 2, alpha a: com = 1 / a - 1). pandas'
+    recursion with ignore_na=False and min_periods=0.
+    """
+    n = len(x)
+    out = np.empty((n, len(coms)))
+    for k in range(len(coms)):
+        alpha = 1.0 / (1.0 + coms[k])
+        old_wt_factor = 1.0 - alpha
+        new_wt = 1.0 if adjust else alpha
+        if n == 0:
+            continue
+        weighted = x[0]
+        nobs = 1 if weighted == weighted else 0
+        out[0, k] = weighted if nobs >= 1 else np.nan
+        old_wt = 1.0
+        for i in range(1, n):
+            cur = x[i]
+            is_obs = cur == cur
+            nobs += is_obs
+            if weighted == weighted:
+                old_wt *= old_wt_factor
+                if is_obs:
+                    # pandas skips the update on a constant series (no rounding drift)
+                    if weighted != cur:
+                        weighted = old_wt * weighted + new_wt * cur
+                        weighted /= (old_wt + new_wt)
+                    if adjust:
+                        old_wt += new_wt
+                    else:
+                        old_wt = 1.0
+            elif is_obs:
+                weighted = cur
+            out[i, k] = weighted if nobs >= 1 else np.nan
+    return out
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Adaptive chunking and RSS telemetry for the Fixed_Exit workers.
+
+The start chunk comes from ``simulation.chunk_size_for_budget`` (bars x
+combos x bytes per column vs. the per-process memory budget). If a chunk
+still raises ``MemoryError`` (several nodes on one box, fragmentation, ...)
+it is halved and retried, and the smaller size is kept for the rest of the
+indicator.
+
+Peak RSS is read from ``VmHWM`` in /proc/self/status and reset per
+indicator via /proc/self/clear_refs (Linux >= 4.0). Elsewhere the process
+lifetime peak (``resource``/``psutil``) is reported instead.
+"""
+
+import gc
+import sys
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_PROC_STATUS = "/proc/self/status"
+_PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _proc_status_kb(key):
+    try:
+        with open(_PROC_STATUS) as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def rss_mb():
+    """Current resident set size in MB (None if unknown)."""
+    kb = _proc_status_kb("VmRSS")
+    if kb is not None:
+        return kb / 1024
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    return None
+
+
+def peak_rss_mb():
+    """Peak resident set size in MB since the last reset_peak_rss() (None if unknown)."""
+    kb = _proc_status_kb("VmHWM")
+    if kb is not None:
+        return kb / 1024
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, KB on Linux
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1024 ** 2
+    return None
+
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS counter. Returns False if not supported."""
+    try:
+        with open(_PROC_CLEAR_REFS, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class ChunkStats:
+    """
+    Chunk sizes, MemoryError retries and peak RSS of one indicator.
+
+    ``limit`` is the largest chunk allowed after a MemoryError; it applies to
+    all following run_chunks() calls until reset().
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.sizes = []
+        self.shrinks = 0
+        self.limit = None
+        self.peak_is_lifetime = not reset_peak_rss()
+
+    def summary(self):
+        """Short tag for the indicator summary line, e.g. 'RSS: 812MB, Chunk: 640-1250 x14'."""
+        peak = peak_rss_mb()
+        parts = [f"RSS: {peak:.0f}MB" + ("*" if self.peak_is_lifetime else "") if peak is not None else "RSS: n/a"]
+        if self.sizes:
+            lo, hi = min(self.sizes), max(self.sizes)
+            parts.append(f"Chunk: {lo if lo == hi else f'{lo}-{hi}'} x{len(self.sizes)}")
+        if self.shrinks:
+            parts.append(f"OOM-Shrinks: {self.shrinks}")
+        return ", ".join(parts)
+
+
+def run_chunks(n_items, chunk_size, run_chunk, stats=None, min_chunk=1):
+    """
+    Call ``run_chunk(start, stop)`` over ``range(n_items)`` in chunks.
+
+    On MemoryError the chunk is halved and retried from the same start;
+    a MemoryError at min_chunk is re-raised. Other exceptions are not
+    caught here (the workers log and skip failed chunks themselves).
+
+    Returns:
+        list of the run_chunk return values, in order
+    """
+    if n_items <= 0:
+        return []
+    chunk = max(min_chunk, int(chunk_size))
+    if stats is not None and stats.limit is not None:
+        chunk = min(chunk, stats.limit)
+
+    out = []
+    start = 0
+    while start < n_items:
+        stop = min(start + chunk, n_items)
+        try:
+            out.append(run_chunk(start, stop))
+        except MemoryError:
+            if stop - start <= min_chunk:
+                raise
+            gc.collect()
+            chunk = max(min_chunk, (stop - start) // 2)
+            print(f"[MEM] MemoryError at {stop - start} combos, retrying with {chunk}")
+            if stats is not None:
+                stats.shrinks += 1
+                stats.limit = chunk
+            continue
+        if stats is not None:
+            stats.sizes.append(stop - start)
+        start = stop
+    return out
+
+
+def node_memory_budget_mb(n_nodes, fraction=0.8, base_rss_mb=600, min_budget_mb=128):
+    """
+    Chunk memory budget per node when n_nodes workers share this machine.
+
+    fraction of the currently available RAM split over the nodes, minus the
+    base RSS of a worker (Python, vectorbt/numba, OHLCV data). None if the
+    available memory is unknown (psutil missing and no /proc/meminfo).
+    """
+    available_mb = None
+    if psutil is not None:
+        available_mb = psutil.virtual_memory().available / 1024 ** 2
+    else:
+        try:
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        available_mb = int(line.split()[1]) / 1024
+                        break
+        except (OSError, ValueError, IndexError):
+            pass
+    if available_mb is None:
+        return None
+    per_node = available_mb * fraction / max(1, int(n_nodes)) - base_rss_mb
+    return int(max(min_budget_mb, per_node))
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Fused Fixed_Exit metrics.
+
+`fixed_exit_metrics_nb` walks the order records and the close prices once per
+column and produces every metric of the Fixed_Exit CSV schema at once, instead
+of calling a dozen ``pf.trades`` / ``pf.value()`` accessors that each rebuild
+records and pandas objects.
+
+Assumptions (true for all Fixed_Exit runs): long-only, no accumulation, one
+open position per column, order records sorted by column and bar index as
+produced by vectorbt.
+"""
+
+import numpy as np
+import pandas as pd
+from numba import njit
+
+from vectorbt.returns.nb import get_return_nb
+from vectorbt.utils.math_ import add_nb
+
+# Field names follow the CSV columns ("Win_Rate" is written as "Win_Rate_%")
+fixed_exit_metrics_dt = np.dtype([
+    ("Total_Return", np.float64),
+    ("Max_Drawdown", np.float64),
+    ("Daily_Drawdown", np.float64),
+    ("Win_Rate", np.float64),
+    ("Total_Trades", np.int64),
+    ("Winning_Trades", np.int64),
+    ("Losing_Trades", np.int64),
+    ("Avg_Win", np.float64),
+    ("Avg_Loss", np.float64),
+    ("Highest_Win", np.float64),
+    ("Highest_Loss", np.float64),
+    ("Gross_Profit", np.float64),
+    ("Commission", np.float64),
+    ("Net_Profit", np.float64),
+    ("Profit_Factor", np.float64),
+    ("Sharpe_Ratio", np.float64),
+], align=True)
+
+# CSV column -> (record field, decimals)
+METRIC_COLUMNS = {
+    "Total_Return": ("Total_Return", 4),
+    "Max_Drawdown": ("Max_Drawdown", 4),
+    "Daily_Drawdown": ("Daily_Drawdown", 4),
+    "Win_Rate_%": ("Win_Rate", 2),
+    "Total_Trades": ("Total_Trades", None),
+    "Winning_Trades": ("Winning_Trades", None),
+    "Losing_Trades": ("Losing_Trades", None),
+    "Avg_Win": ("Avg_Win", 2),
+    "Avg_Loss": ("Avg_Loss", 2),
+    "Highest_Win": ("Highest_Win", 2),
+    "Highest_Loss": ("Highest_Loss", 2),
+    "Gross_Profit": ("Gross_Profit", 2),
+    "Commission": ("Commission", 2),
+    "Net_Profit": ("Net_Profit", 2),
+    "Profit_Factor": ("Profit_Factor", 3),
+    "Sharpe_Ratio": ("Sharpe_Ratio", 3),
+}
+
+ORDER_SIDE_BUY = 0
+
+
+def ann_factor_for(freq, year_freq="365 days"):
+    """Annualization factor as used by vectorbt (year_freq / freq)."""
+    return pd.Timedelta(year_freq) / pd.Timedelta(freq)
+
+
+@njit(cache=True)
+def fill_metrics_nb(out, col, init_cash, total_profit, n_trades, n_win, n_loss, win_sum, loss_sum,
+                    win_max, loss_min, max_dd, sharpe, commission_per_lot, lot_size):
+    """Write the reduced trade/equity statistics of one column into `out[col]`."""
+    commission = n_trades * commission_per_lot * lot_size
+    net_profit = total_profit - commission
+
+    out[col]['Total_Return'] = (net_profit / init_cash) * 100
+    out[col]['Max_Drawdown'] = abs(max_dd) * 100
+    out[col]['Daily_Drawdown'] = 0.
+    out[col]['Win_Rate'] = n_win / n_trades * 100 if n_trades > 0 else np.nan
+    out[col]['Total_Trades'] = n_trades
+    out[col]['Winning_Trades'] = n_win
+    out[col]['Losing_Trades'] = n_loss
+    out[col]['Avg_Win'] = win_sum / n_win if n_win > 0 else np.nan
+    out[col]['Avg_Loss'] = loss_sum / n_loss if n_loss > 0 else np.nan
+    out[col]['Highest_Win'] = win_max
+    out[col]['Highest_Loss'] = loss_min
+    out[col]['Gross_Profit'] = win_sum
+    out[col]['Commission'] = commission
+    out[col]['Net_Profit'] = net_profit
+    if n_trades == 0:
+        out[col]['Profit_Factor'] = np.nan
+    elif loss_sum == 0.:
+        out[col]['Profit_Factor'] = np.inf if win_sum > 0. else np.nan
+    else:
+        out[col]['Profit_Factor'] = win_sum / abs(loss_sum)
+    out[col]['Sharpe_Ratio'] = sharpe
+
+
+@njit(cache=True)
+def fixed_exit_metrics_nb(order_records, close, close_col, valid, init_cash, commission_per_lot, lot_size, ann_factor):
+    """
+    Reduce order records and close prices to one metrics record per column.
+
+    Args:
+        order_records: vectorbt order records (col, idx, size, price, fees, side)
+        close: 2-D close prices (bars x symbols)
+        close_col: column of `close`/`valid` used by each portfolio column
+        valid: bars x symbols mask; invalid bars (gaps on a common index) are
+            skipped for equity, drawdown and returns
+        init_cash: starting cash per column
+        commission_per_lot: commission per lot and trade (deducted from the profit)
+        lot_size: position size in lots
+        ann_factor: annualization factor for the Sharpe ratio
+
+    Returns:
+        Structured array of `fixed_exit_metrics_dt`, one record per column.
+    """
+    n_bars = close.shape[0]
+    n_cols = len(init_cash)
+    out = np.empty(n_cols, dtype=fixed_exit_metrics_dt)
+    returns = np.empty(n_bars, dtype=np.float64)  # reused for every column
+
+    # Record ranges per column (records are sorted by column)
+    col_start = np.zeros(n_cols, dtype=np.int64)
+    col_count = np.zeros(n_cols, dtype=np.int64)
+    for r in range(len(order_records)):
+        col_count[order_records[r]['col']] += 1
+    for col in range(1, n_cols):
+        col_start[col] = col_start[col - 1] + col_count[col - 1]
+
+    for col in range(n_cols):
+        c = close_col[col]
+        r = col_start[col]
+        r_end = r + col_count[col]
+
+        # Same accumulation order as vectorbt (add_nb snaps float noise to 0)
+        cash = init_cash[col]
+        cash_flow = 0.
+        position = 0.
+        entry_price = 0.
+        entry_fees = 0.
+
+        n_trades = 0
+        n_win = 0
+        n_loss = 0
+        win_sum = 0.
+        loss_sum = 0.
+        win_max = np.nan
+        loss_min = np.nan
+
+        peak = -np.inf
+        max_dd = 0.
+        prev_value = init_cash[col]
+        n_valid = 0
+
+        for i in range(n_bars):
+            while r < r_end and order_records[r]['idx'] == i:
+                size = order_records[r]['size']
+                price = order_records[r]['price']
+                fees = order_records[r]['fees']
+                if order_records[r]['side'] == ORDER_SIDE_BUY:
+                    cash = add_nb(cash, -(size * price + fees))
+                    cash_flow = add_nb(cash_flow, -(size * price + fees))
+                    if position == 0.:
+                        entry_price = price
+                        entry_fees = fees
+                    position = add_nb(position, size)
+                else:
+                    cash = add_nb(cash, size * price - fees)
+                    cash_flow = add_nb(cash_flow, size * price - fees)
+                    position = add_nb(position, -size)
+                    pnl = add_nb(size * price, -(size * entry_price)) - entry_fees - fees
+                    n_trades += 1
+                    if pnl > 0.:
+                        n_win += 1
+                        win_sum += pnl
+                        if np.isnan(win_max) or pnl > win_max:
+                            win_max = pnl
+                    elif pnl < 0.:
+                        n_loss += 1
+                        loss_sum += pnl
+                        if np.isnan(loss_min) or pnl < loss_min:
+                            loss_min = pnl
+                r += 1
+
+            if not valid[i, c]:
+                continue
+            value = cash + close[i, c] * position
+            if value > peak:
+                peak = value
+            dd = (value - peak) / peak
+            if dd < max_dd:
+                max_dd = dd
+            returns[n_valid] = get_return_nb(prev_value, value)
+            n_valid += 1
+            prev_value = value
+
+        # Open trade is valued at the last close (like vectorbt's open EntryTrades)
+        if position > 0.:
+            pnl = add_nb(position * close[n_bars - 1, c], -(position * entry_price)) - entry_fees
+            n_trades += 1
+            if pnl > 0.:
+                n_win += 1
+                win_sum += pnl
+                if np.isnan(win_max) or pnl > win_max:
+                    win_max = pnl
+            elif pnl < 0.:
+                n_loss += 1
+                loss_sum += pnl
+                if np.isnan(loss_min) or pnl < loss_min:
+                    loss_min = pnl
+
+        total_profit = cash_flow + position * close[n_bars - 1, c] if col_count[col] > 0 else 0.
+
+        if n_valid < 2:
+            sharpe = np.nan
+        else:
+            col_returns = returns[:n_valid]
+            mean = np.nanmean(col_returns)
+            cnt = n_valid - np.count_nonzero(np.isnan(col_returns))
+            std = np.sqrt(np.nanvar(col_returns) * cnt / (cnt - 1)) if cnt > 1 else np.nan
+            sharpe = np.inf if std == 0. else mean / std * np.sqrt(ann_factor)
+
+        fill_metrics_nb(out, col, init_cash[col], total_profit, n_trades, n_win, n_loss, win_sum, loss_sum,
+                        win_max, loss_min, max_dd, sharpe, commission_per_lot, lot_size)
+    return out
+
+
+def fixed_exit_metrics(pf, commission_per_lot, lot_size, freq, close=None, close_col=None, valid=None):
+    """
+    Run `fixed_exit_metrics_nb` on a vectorbt portfolio.
+
+    By default all columns share the portfolio's (single) close series. For
+    cross-symbol runs pass the aligned `close`/`valid` (bars x symbols) and
+    `close_col`, the symbol of every portfolio column.
+    """
+    n_cols = pf.wrapper.shape_2d[1]
+    if close is None:
+        close = np.asarray(pf.close)
+        if close.ndim == 1:
+            close = close[:, None]
+        if close.shape[1] == 1:
+            close_col = np.zeros(n_cols, dtype=np.int64)
+        else:
+            close_col = np.arange(n_cols)
+    if valid is None:
+        valid = np.ones((1, close.shape[1]), dtype=np.bool_)
+        valid = np.broadcast_to(valid, close.shape)
+    init_cash = np.broadcast_to(np.asarray(pf.init_cash, dtype=np.float64), (n_cols,))
+    return fixed_exit_metrics_nb(
+        pf.order_records,
+        close,
+        np.asarray(close_col, dtype=np.int64),
+        valid,
+        np.ascontiguousarray(init_cash),
+        float(commission_per_lot),
+        float(lot_size),
+        ann_factor_for(freq)
+    )
+
+
+def round_half_exact(values, decimals):
+    """
+    Round like ``float(f"{x:.{decimals}f}")``.
+
+    ``np.round`` scales by 10**decimals first and therefore rounds some binary
+    ties (e.g. 0.015) differently; those rare cases fall back to ``round``.
+    """
+    out = np.round(values, decimals)
+    scaled = values * 10.0 ** decimals
+    ties = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in ties:
+        out[i] = round(float(values[i]), decimals)
+    return out
+
+
+def metrics_frame(metrics):
+    """
+    Convert metric records into CSV-ready columns.
+
+    NaN averages/extremes become 0.0 and non-finite Profit_Factor/Sharpe_Ratio
+    become 0.0, rounded like the CSV always was.
+    """
+    data = {}
+    for col_name, (field, decimals) in METRIC_COLUMNS.items():
+        values = metrics[field]
+        if decimals is None:
+            data[col_name] = values.astype(np.int64)
+            continue
+        values = np.where(np.isfinite(values), values, 0.0)
+        data[col_name] = round_half_exact(values, decimals)
+    return pd.DataFrame(data)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Aligned multi-symbol OHLCV panel.
+
+``Panel.from_frames`` puts the bars of several symbols on one sorted union
+time axis as a single ``values`` array (symbols x bars x fields, float64)
+plus a ``valid`` mask (symbols x bars: the symbol has a bar there). It is
+built once per run from ``data_cache`` with plain searchsorted scatter, no
+pandas joins.
+
+- ``field("close")``: (symbols x bars) view, NaN where a symbol has no bar
+- ``filled("close")``: gaps forward filled (leading gaps back filled), the
+  layout ``simulation.align_close`` returns transposed
+- ``frame(symbol)``: the symbol's own bars as a DataFrame (a view without
+  copy if the symbol has a bar at every time of the axis)
+- ``series(symbol, values)``: a value per panel bar back on the symbol's
+  own index, e.g. entries computed across all symbols at once
+
+Cross-asset strategies can implement ``generate_signals_panel(panel, params)``
+returning ``{"entries": bars x symbols}`` (array or DataFrame with symbol
+columns). ``entries(klass, symbol, params)`` computes them once per param set
+for all symbols and hands out the symbol's column.
+"""
+
+import numpy as np
+import pandas as pd
+
+from zenatus_core.store import OHLCV_COLUMNS, TIME_COLUMN
+
+PANEL_SIGNAL_CACHE = 256  # Param sets of panel strategies kept (bars x symbols bool each)
+
+
+def _times(index):
+    return np.ascontiguousarray(index.values.astype("datetime64[ns]").view(np.int64))
+
+
+class Panel:
+    """Symbols x bars x fields on a common time axis (see module docstring)."""
+
+    def __init__(self, index, symbols, fields, values, valid):
+        self.index = index
+        self.symbols = list(symbols)
+        self.fields = list(fields)
+        self.values = values
+        self.valid = valid
+        self._pos = {s: k for k, s in enumerate(self.symbols)}
+        self._rows = {}
+        self._signals = {}
+
+    @classmethod
+    def from_frames(cls, frames, fields=None):
+        """
+        Args:
+            frames: {symbol: OHLCV DataFrame}, each sorted by time
+            fields: columns to keep (default: the OHLCV columns present in any frame)
+        """
+        symbols = list(frames)
+        if fields is None:
+            present = {c for df in frames.values() for c in df.columns}
+            fields = [c for c in OHLCV_COLUMNS if c in present]
+        times = [_times(frames[s].index) for s in symbols]
+        axis = np.unique(np.concatenate(times)) if times else np.empty(0, dtype=np.int64)
+
+        values = np.full((len(symbols), len(axis), len(fields)), np.nan)
+        valid = np.zeros((len(symbols), len(axis)), dtype=bool)
+        for k, (s, t) in enumerate(zip(symbols, times)):
+            pos = np.searchsorted(axis, t)
+            valid[k, pos] = True
+            df = frames[s]
+            for f, c in enumerate(fields):
+                if c in df.columns:
+                    values[k, pos, f] = df[c].values
+        index = pd.DatetimeIndex(axis.view("datetime64[ns]"), name=TIME_COLUMN)
+        return cls(index, symbols, fields, values, valid)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.valid.nbytes
+
+    def __repr__(self):
+        s, t, f = self.shape
+        return f"Panel({s} symbols x {t} bars x {f} fields, {self.nbytes / 1e6:.1f} MB)"
+
+    def field(self, name):
+        """(symbols x bars) view of one field, NaN where a symbol has no bar."""
+        return self.values[:, :, self.fields.index(name)]
+
+    def filled(self, name):
+        """(symbols x bars) copy of one field with gaps forward filled, leading gaps back filled."""
+        a = self.field(name)
+        has = ~np.isnan(a)
+        n = a.shape[1]
+        last = np.maximum.accumulate(np.where(has, np.arange(n), -1), axis=1)
+        first = np.where(has.any(axis=1), has.argmax(axis=1), 0)
+        last = np.where(last < 0, first[:, None], last)
+        return np.take_along_axis(a, last, axis=1)
+
+    def aligned_close(self):
+        """index, close (bars x symbols, gaps filled), valid (bars x symbols), like ``simulation.align_close``."""
+        return (self.index, np.ascontiguousarray(self.filled("close").T),
+                np.ascontiguousarray(self.valid.T))
+
+    def rows(self, symbol):
+        """Positions of the symbol's own bars on the panel axis."""
+        if symbol not in self._rows:
+            self._rows[symbol] = np.flatnonzero(self.valid[self._pos[symbol]])
+        return self._rows[symbol]
+
+    def frame(self, symbol):
+        """The symbol's bars as an OHLCV DataFrame."""
+        k = self._pos[symbol]
+        rows = self.rows(symbol)
+        if len(rows) == len(self.index):
+            return pd.DataFrame(self.values[k], index=self.index, columns=self.fields, copy=False)
+        return pd.DataFrame(self.values[k, rows], index=self.index[rows], columns=self.fields)
+
+    def series(self, symbol, values):
+        """Values on the panel axis (1-D) as a Series on the symbol's own bars."""
+        rows = self.rows(symbol)
+        return pd.Series(np.asarray(values)[rows], index=self.index[rows])
+
+    def column(self, symbol, matrix):
+        """Column of a (bars x symbols) array or DataFrame with symbol columns."""
+        if isinstance(matrix, pd.DataFrame):
+            return matrix[symbol].values
+        return np.asarray(matrix)[:, self._pos[symbol]]
+
+    def entries(self, klass, symbol, params):
+        """Boolean entries of a panel strategy (``generate_signals_panel``) on the symbol's own bars."""
+        key = (klass, repr(params))
+        matrix = self._signals.get(key)
+        if matrix is None:
+            if len(self._signals) >= PANEL_SIGNAL_CACHE or any(k[0] is not klass for k in self._signals):
+                self._signals.clear()
+            signals = klass().generate_signals_panel(self, params)
+            matrix = signals["entries"] if isinstance(signals, dict) else signals
+            self._signals[key] = matrix
+        entries = np.asarray(self.column(symbol, matrix))
+        if entries.dtype != bool:
+            entries = np.nan_to_num(entries.astype(np.float64)) != 0
+        return self.series(symbol, entries)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent pool of pre-warmed worker processes with per-task hard timeouts.
+
+Workers are forked once, run an initializer (load data, compile the Numba
+kernels) and then process tasks until shutdown. Every worker talks to the
+supervisor through its own pipe, so a worker that overruns the timeout can be
+killed and replaced without touching the others.
+"""
+
+import multiprocessing
+import time
+import traceback
+from multiprocessing.connection import wait
+
+TASK_DONE = "done"
+TASK_ERROR = "error"
+TASK_TIMEOUT = "timeout"
+TASK_CRASHED = "crashed"
+
+
+def _worker_loop(conn, task_fn, initializer, initargs):
+    """Body of one pool process: warm up, then serve tasks until None arrives."""
+    try:
+        if initializer is not None:
+            initializer(*initargs)
+    except Exception:
+        traceback.print_exc()
+    conn.send(("ready", None, None))
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        task_id, task = msg
+        try:
+            conn.send((TASK_DONE, task_id, task_fn(task)))
+        except Exception as e:
+            conn.send((TASK_ERROR, task_id, f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+class _Slot:
+    """Supervisor-side state of one worker process."""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.task_id = None
+        self.started = None
+
+
+class WarmWorkerPool:
+    """
+    Long-lived worker processes that keep imports, data and compiled kernels.
+
+    Args:
+        task_fn: called as ``task_fn(task)`` inside a worker, must return a picklable result
+        initializer: optional warm-up called once per (re)started worker
+        initargs: arguments for the initializer
+        processes: number of worker processes
+        timeout_sec: hard limit per task, overrunning workers are killed and replaced
+
+    Uses the ``fork`` start method so large read-only data is shared copy-on-write.
+    """
+
+    def __init__(self, task_fn, initializer=None, initargs=(), processes=1, timeout_sec=None):
+        self._ctx = multiprocessing.get_context("fork")
+        self.task_fn = task_fn
+        self.initializer = initializer
+        self.initargs = initargs
+        self.timeout_sec = timeout_sec
+        self.recycled = 0
+        self._slots = [self._spawn() for _ in range(max(1, int(processes)))]
+
+    def _spawn(self):
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        process = self._ctx.Process(
+            target=_worker_loop,
+            args=(child_conn, self.task_fn, self.initializer, self.initargs),
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Slot(process, parent_conn)
+
+    def _recycle(self, idx):
+        """Kill the worker in slot `idx` and start a fresh one."""
+        slot = self._slots[idx]
+        if slot.process.is_alive():
+            slot.process.terminate()
+            slot.process.join(1)
+            if slot.process.is_alive():
+                slot.process.kill()  # Hard kill (SIGKILL)
+                slot.process.join(1)
+        slot.conn.close()
+        self._slots[idx] = self._spawn()
+        self.recycled += 1
+
+    def imap_unordered(self, tasks, poll_sec=1.0):
+        """
+        Run all tasks and yield ``(task, status, result)`` as they finish.
+
+        status is one of TASK_DONE, TASK_ERROR, TASK_TIMEOUT or TASK_CRASHED.
+        """
+        tasks = list(tasks)
+        next_task = 0
+        pending = len(tasks)
+
+        while pending:
+            # Hand out work to idle, warmed-up workers
+            for slot in self._slots:
+                if next_task < len(tasks) and slot.ready and slot.task_id is None:
+                    slot.conn.send((next_task, tasks[next_task]))
+                    slot.task_id = next_task
+                    slot.started = time.time()
+                    next_task += 1
+
+            conns = {slot.conn: idx for idx, slot in enumerate(self._slots)}
+            for conn in wait(list(conns), timeout=poll_sec):
+                idx = conns[conn]
+                slot = self._slots[idx]
+                try:
+                    status, task_id, result = conn.recv()
+                except (EOFError, OSError):
+                    # Worker died (segfault, OOM killer, ...)
+                    if slot.task_id is not None:
+                        pending -= 1
+                        yield tasks[slot.task_id], TASK_CRASHED, None
+                    self._recycle(idx)
+                    continue
+                if status == "ready":
+                    slot.ready = True
+                    continue
+                slot.task_id = None
+                slot.started = None
+                pending -= 1
+                yield tasks[task_id], status, result
+
+            # Supervisor timeouts: only the overrunning worker is replaced
+            if self.timeout_sec is not None:
+                now = time.time()
+                for idx, slot in enumerate(self._slots):
+                    if slot.task_id is not None and now - slot.started > self.timeout_sec:
+                        task_id = slot.task_id
+                        self._recycle(idx)
+                        pending -= 1
+                        yield tasks[task_id], TASK_TIMEOUT, None
+
+    def close(self):
+        """Stop all workers (graceful first, then hard kill)."""
+        for slot in self._slots:
+            try:
+                slot.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for slot in self._slots:
+            slot.process.join(5)
+            if slot.process.is_alive():
+                slot.process.kill()
+                slot.process.join(1)
+            slot.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
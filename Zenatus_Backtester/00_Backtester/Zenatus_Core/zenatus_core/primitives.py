@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Memoized indicator primitives (SMA, EMA, rolling std/min/max, RSI, true
+range, ATR) per worker process.
+
+Many strategies start from the same primitives of the same symbol data
+(``close.rolling(20).mean()`` alone appears in ~100 modules). A
+``PrimitiveCache`` computes each one once, with exactly the pandas
+expression the strategies use (results are bit-identical), and keeps the
+values under an LRU byte budget.
+
+Key: (data fingerprint, field, primitive, params). The fingerprint of a
+column of a frame passed to ``register`` (the workers' data_cache, with its
+content hash) is looked up by buffer address, so prefix slices
+(``df.iloc[:n]``) hit as well; other arrays are content-hashed.
+
+Strategies opt in through the ``primitives`` attribute the workers set on
+the instance (the modules stay importable without Zenatus_Core)::
+
+    p = getattr(self, 'primitives', None)
+    sma = p.sma(data['close'], period) if p else data['close'].rolling(period).mean()
+
+Cached arrays are read-only; the returned Series wrap them without a copy.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BUDGET_MB = 256
+
+
+def _rsi(close, period, wilder, adjust, eps):
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    if wilder:
+        gain = gain.ewm(alpha=1 / period, min_periods=period, adjust=adjust).mean()
+        loss = loss.ewm(alpha=1 / period, min_periods=period, adjust=adjust).mean()
+    else:
+        gain = gain.rolling(period).mean()
+        loss = loss.rolling(period).mean()
+    rs = gain / (loss + eps)
+    return 100 - (100 / (1 + rs))
+
+
+def _true_range(high, low, close):
+    prev = close.shift(1)
+    return pd.concat([high - low, abs(high - prev), abs(low - prev)], axis=1).max(axis=1)
+
+
+class PrimitiveCache:
+    """LRU cache of primitive values with hit/miss counters (see module docstring)."""
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self.budget = int(budget_mb * 1024 ** 2)
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._registered = {}  # buffer address -> (fingerprint, rows, dtype, array kept alive)
+        self.reset()
+
+    def reset(self):
+        """Start the counters of the next indicator (the cached values stay)."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def register(self, df, data_hash):
+        """Use ``data_hash`` as fingerprint for the columns of df (and every prefix of them)."""
+        for c in df.columns:
+            a = df[c].values
+            if isinstance(a, np.ndarray) and a.ndim == 1:
+                self._registered[a.__array_interface__["data"][0]] = (f"{data_hash}/{c}", len(a), a.dtype, a)
+
+    def fingerprint(self, values):
+        a = np.asarray(values)
+        reg = self._registered.get(a.__array_interface__["data"][0])
+        if reg is not None and a.ndim == 1 and a.dtype == reg[2] and len(a) <= reg[1] and a.strides == (a.itemsize,):
+            return f"{reg[0]}:{len(a)}"
+        h = hashlib.blake2b(digest_size=12)
+        h.update(str(a.dtype).encode())
+        h.update(np.ascontiguousarray(a).tobytes())
+        return h.hexdigest()
+
+    def _get(self, key, compute):
+        values = self._items.get(key)
+        if values is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return values
+        self.misses += 1
+        values = np.asarray(compute())
+        values.flags.writeable = False
+        if values.nbytes <= self.budget:
+            self._items[key] = values
+            self.nbytes += values.nbytes
+            while self.nbytes > self.budget:
+                _, old = self._items.popitem(last=False)
+                self.nbytes -= old.nbytes
+                self.evictions += 1
+        return values
+
+    def _series(self, series, primitive, params, compute):
+        key = (self.fingerprint(series.values), series.name, primitive, params)
+        values = self._get(key, lambda: compute().values)
+        return pd.Series(values, index=series.index, name=series.name, copy=False)
+
+    def _frame_series(self, data, primitive, params, compute):
+        fields = ("high", "low", "close")
+        key = (tuple(self.fingerprint(data[c].values) for c in fields), fields, primitive, params)
+        values = self._get(key, lambda: compute().values)
+        return pd.Series(values, index=data.index, copy=False)
+
+    # Primitives: same expressions (and defaults) as in the strategies
+    def sma(self, series, window, min_periods=None):
+        """``series.rolling(window, min_periods).mean()``"""
+        return self._series(series, "sma", (window, min_periods),
+                            lambda: series.rolling(window, min_periods=min_periods).mean())
+
+    def ema(self, series, span, adjust=True):
+        """``series.ewm(span=span, adjust=adjust).mean()``"""
+        return self._series(series, "ema", (span, adjust), lambda: series.ewm(span=span, adjust=adjust).mean())
+
+    def rolling_std(self, series, window, min_periods=None):
+        """``series.rolling(window, min_periods).std()``"""
+        return self._series(series, "std", (window, min_periods),
+                            lambda: series.rolling(window, min_periods=min_periods).std())
+
+    def rolling_min(self, series, window, min_periods=None):
+        return self._series(series, "min", (window, min_periods),
+                            lambda: series.rolling(window, min_periods=min_periods).min())
+
+    def rolling_max(self, series, window, min_periods=None):
+        return self._series(series, "max", (window, min_periods),
+                            lambda: series.rolling(window, min_periods=min_periods).max())
+
+    def rsi(self, close, period, wilder=False, adjust=True, eps=1e-10):
+        """
+        RSI = 100 - 100 / (1 + gain / (loss + eps)); gains/losses averaged with
+        ``rolling(period).mean()`` or, with wilder=True, ``ewm(alpha=1/period, min_periods=period, adjust)``.
+        """
+        return self._series(close, "rsi", (period, wilder, adjust, eps),
+                            lambda: _rsi(close, period, wilder, adjust, eps))
+
+    def true_range(self, data):
+        """max(high - low, |high - prev close|, |low - prev close|)"""
+        return self._frame_series(data, "tr", (), lambda: _true_range(data["high"], data["low"], data["close"]))
+
+    def atr(self, data, period):
+        """``true_range.rolling(period).mean()``"""
+        return self._frame_series(data, "atr", (period,), lambda: self.true_range(data).rolling(period).mean())
+
+    def summary(self):
+        """Short tag for the indicator summary line, e.g. 'Prim: 42/50 hits, 12.3MB'."""
+        tag = f"Prim: {self.hits}/{self.hits + self.misses} hits, {self.nbytes / 1024 ** 2:.1f}MB"
+        if self.evictions:
+            tag += f", {self.evictions} evicted"
+        return tag
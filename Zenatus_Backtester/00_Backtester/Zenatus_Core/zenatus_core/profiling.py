@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""
+Cost model of the ``All_Strategys`` modules, for scheduling.
+
+Two parts, both written into one cost table (JSON, PROFILE_STRATEGIES.py):
+
+- measured: every module is imported and ``calculate`` /
+  ``generate_signals_fixed`` (default params, ``signals_only``) are timed on
+  synthetic OHLCV at a few bar counts. A log-log fit gives the scaling
+  exponent, ``t(bars) = t(ref) * (bars / ref) ** exponent`` with ref the
+  largest measured bar count.
+- static: an AST scan of the source for the usual hot paths, ``.iloc[i]`` /
+  ``.iat[i]`` inside loops, ``rolling(...).apply`` (lambda or function) and
+  nested per-bar loops. Flags only, they explain a slow row, the schedulers
+  use the measured model.
+
+Consumers (RUN_ALL_10_NODES*.py, QUICKTEST_1H_FIRST_RUN_595.py) call
+`read_cost_table` and `predict_seconds`; strategies missing from the table
+predict None and are scheduled as before. The prediction covers the entry
+signals only, the TP/SL simulation is bounded by the combo limit and about
+the same for every strategy.
+"""
+
+import ast
+import importlib.util
+import json
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROFILE_BARS = (500, 2000, 8000)
+MAX_CALL_SEC = 30  # Larger bar counts are skipped once a call is predicted to exceed this
+EXIT_PARAMS = ("tp_pips", "sl_pips")  # Not part of the entry grid
+TRADING_DAYS = 5 / 7  # Share of calendar time with FX bars
+HEAVY_MODULES = ("vectorbt", "talib", "scipy", "sklearn")  # Imported where used (signals.py import contract)
+IMPORT_BUDGET_SEC = 0.1  # Cold import of one strategy module on top of numpy/pandas/numba
+ITER_ATTRS = ("iloc", "iat", "loc", "at")
+WINDOW_ATTRS = ("rolling", "expanding")
+
+
+def synthetic_ohlcv(n, seed=42, price=1.1, scale=0.002):
+    """Random-walk OHLCV frame with an hourly DatetimeIndex (same layout as load_ohlcv)."""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, scale, n)))
+    spread = np.abs(rng.normal(0, scale, n)) * price
+    idx = pd.date_range("2024-01-01", periods=n, freq="h", name="time")
+    return pd.DataFrame({"open": np.r_[close[0], close[:-1]], "high": close + spread, "low": close - spread,
+                         "close": close, "volume": np.round(rng.uniform(100, 5000, n), 2)}, index=idx)
+
+
+def find_strategy_class(module):
+    """The class the workers pick (first ``*Indicator*`` or ``generate_signals_fixed`` class)."""
+    for attr in dir(module):
+        obj = getattr(module, attr)
+        if isinstance(obj, type) and ("Indicator" in attr or hasattr(obj, "generate_signals_fixed")):
+            return obj
+    return None
+
+
+def load_strategy_module(path):
+    path = Path(path)
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def entry_grid_size(klass):
+    """Entry param sets of the PARAMETERS grid (product of the ``values`` lists without TP/SL)."""
+    n = 1
+    for name, cfg in (getattr(klass, "PARAMETERS", None) or {}).items():
+        if name in EXIT_PARAMS or not isinstance(cfg, dict):
+            continue
+        values = cfg.get("values")
+        if isinstance(values, list) and values:
+            n *= len(values)
+    return n
+
+
+def exit_grid_size(klass):
+    """TP/SL pairs with tp > sl of the PARAMETERS grid (what the handbook expands to), None without them."""
+    params = getattr(klass, "PARAMETERS", None) or {}
+    tp, sl = (params[k].get("values") if isinstance(params.get(k), dict) else None for k in EXIT_PARAMS)
+    if not tp or not sl:
+        return None
+    return sum(1 for t in tp for s in sl if t > s) or None
+
+
+def entry_calls(row, combo_limit=None):
+    """Entry param sets a worker runs per symbol (the combo limit ends the entry loop early)."""
+    n = row.get("entry_combos") or 1
+    if combo_limit and row.get("exit_combos"):
+        n = min(n, -(-combo_limit // row["exit_combos"]))
+    return n
+
+
+def fit_cost(bars, seconds):
+    """
+    (seconds per bar, scaling exponent) of measured call times.
+
+    seconds per bar is taken at the largest bar count, the exponent is the
+    least-squares slope of log(seconds) over log(bars) (None with fewer than
+    two usable points).
+    """
+    pts = [(b, s) for b, s in zip(bars, seconds) if s is not None and s > 0]
+    if not pts:
+        return None, None
+    b_max, s_max = max(pts)
+    if len(pts) < 2:
+        return s_max / b_max, None
+    x = np.log([b for b, _ in pts])
+    y = np.log([s for _, s in pts])
+    return s_max / b_max, float(np.polyfit(x, y, 1)[0])
+
+
+def _timed(fn, repeats):
+    best = None
+    for _ in range(max(1, repeats)):
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best
+
+
+def profile_strategy(path, bars=PROFILE_BARS, repeats=1, max_call_sec=MAX_CALL_SEC):
+    """
+    Time one module; returns a cost table row (status "ok" or "error").
+
+    Bar counts are run in ascending order; once the fitted model predicts a
+    call above ``max_call_sec`` the remaining ones are skipped (the row keeps
+    None for them), so a quadratic module does not eat the profiling budget.
+    """
+    path = Path(path)
+    row = {"status": "ok", "bars": list(bars), "calculate_sec": [None] * len(bars),
+           "signals_sec": [None] * len(bars)}
+    try:
+        t0 = time.perf_counter()
+        module = load_strategy_module(path)
+        row["import_sec"] = time.perf_counter() - t0
+        klass = find_strategy_class(module)
+        if klass is None:
+            raise LookupError("class not found")
+        row["entry_combos"] = entry_grid_size(klass)
+        row["exit_combos"] = exit_grid_size(klass)
+        instance = klass()
+        instance.signals_only = True
+
+        for k, n in enumerate(bars):
+            if k:
+                per_bar, exponent = fit_cost(bars[:k], row["signals_sec"][:k])
+                if per_bar is not None and _extrapolate(per_bar * bars[k - 1], bars[k - 1], n, exponent) > max_call_sec:
+                    break
+            data = synthetic_ohlcv(n)
+            row["calculate_sec"][k] = _timed(lambda: instance.calculate(data, {}), repeats)
+            row["signals_sec"][k] = _timed(lambda: instance.generate_signals_fixed(data, {}), repeats)
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+
+    row["sec_per_bar"], row["exponent"] = fit_cost(bars, row["signals_sec"])
+    measured = [n for n, s in zip(bars, row["signals_sec"]) if s is not None]
+    row["ref_bars"] = max(measured) if measured else None
+    return row
+
+
+def _extrapolate(seconds, ref_bars, bars, exponent):
+    # Sub-linear fits come from per-call overhead at small sizes, extrapolate at least linearly
+    return seconds * (bars / ref_bars) ** max(1.0, exponent if exponent is not None else 1.0)
+
+
+def predict_seconds(row, bars, calls=1):
+    """Predicted seconds of ``calls`` generate_signals_fixed calls at ``bars`` bars (None if unknown)."""
+    if not row or row.get("status") != "ok" or not row.get("sec_per_bar"):
+        return None
+    ref = row["ref_bars"]
+    return _extrapolate(row["sec_per_bar"] * ref, ref, bars, row.get("exponent")) * calls
+
+
+def expected_bars(timeframe, start, end):
+    """Approximate bar count of an FX date range (weekends closed)."""
+    from zenatus_core.resample import timeframe_seconds
+    span = (pd.Timestamp(end) - pd.Timestamp(start)).total_seconds()
+    return max(1, int(span * TRADING_DAYS / timeframe_seconds(timeframe)))
+
+
+HOT_ROOTS = ("calculate", "generate_signals_fixed")  # What the workers call per param set
+
+
+def eager_imports(path):
+    """HEAVY_MODULES imported at module level (static, nothing is imported)."""
+    tree = ast.parse(Path(path).read_bytes())
+    found = []
+    for node in tree.body:
+        names = [a.name for a in node.names] if isinstance(node, ast.Import) else \
+            [node.module or ""] if isinstance(node, ast.ImportFrom) else []
+        found += [n.split(".")[0] for n in names if n.split(".")[0] in HEAVY_MODULES]
+    return sorted(set(found))
+
+
+_COLD_IMPORT = """
+import importlib.util, json, sys, time
+import numpy, pandas
+try:
+    import numba  # Loaded by every loader (vectorbt, zenatus_core.kernels); brings part of scipy
+except ImportError:
+    pass
+before = set(sys.modules)
+t0 = time.perf_counter()
+spec = importlib.util.spec_from_file_location("cold_import", sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+sec = time.perf_counter() - t0
+print(json.dumps({"sec": sec, "modules": sorted({m.split(".")[0] for m in set(sys.modules) - before})}))
+"""
+
+
+def cold_import(path, timeout=60):
+    """
+    Import time of one module in a fresh interpreter with numpy/pandas/numba
+    already loaded (what every loader has anyway) and the top-level packages of
+    the modules it pulled in on top.
+    """
+    try:
+        proc = subprocess.run([sys.executable, "-c", _COLD_IMPORT, str(path)], capture_output=True, text=True,
+                              timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"sec": None, "modules": [], "heavy": [], "error": f"timeout after {timeout}s"}
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {"sec": None, "modules": [], "heavy": [], "error": lines[-1] if lines else f"exit {proc.returncode}"}
+    row = json.loads(proc.stdout.strip().splitlines()[-1])
+    row["heavy"] = [m for m in row["modules"] if m in HEAVY_MODULES]
+    return row
+
+
+class _HotPathScanner(ast.NodeVisitor):
+    def __init__(self):
+        self.called = set()  # Names of module functions / self methods called on the scanned path
+        self.loop_depth = 0
+        self.bar_depth = 0  # Enclosing per-bar loops
+        self.counts = {"iloc_in_loop": 0, "rolling_apply": 0, "rolling_apply_lambda": 0,
+                       "per_bar_loops": 0, "nested_loops": 0}
+        self.max_loop_depth = 0
+
+    @staticmethod
+    def _is_per_bar(node):
+        # for i in range(..., len(x)) / range(x.shape[0]); a bound stored in a variable first is not followed
+        if not (isinstance(node, ast.For) and isinstance(node.iter, ast.Call)
+                and isinstance(node.iter.func, ast.Name) and node.iter.func.id == "range"):
+            return False
+        for arg in node.iter.args:
+            for sub in ast.walk(arg):
+                if isinstance(sub, ast.Call) and isinstance(sub.func, ast.Name) and sub.func.id == "len":
+                    return True
+                if isinstance(sub, ast.Attribute) and sub.attr == "shape":
+                    return True
+        return False
+
+    def _loop(self, node):
+        per_bar = self._is_per_bar(node)
+        if self.loop_depth:
+            self.counts["nested_loops"] += 1 if (per_bar or self.bar_depth) else 0
+        self.counts["per_bar_loops"] += per_bar
+        self.loop_depth += 1
+        self.bar_depth += per_bar
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth)
+        self.generic_visit(node)
+        self.loop_depth -= 1
+        self.bar_depth -= per_bar
+
+    visit_For = visit_While = _loop
+
+    def visit_If(self, node):
+        # Exit loop behind ``if not getattr(self, 'signals_only', False)`` is skipped by the workers
+        test = node.test
+        if (isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not) and isinstance(test.operand, ast.Call)
+                and isinstance(test.operand.func, ast.Name) and test.operand.func.id == "getattr"
+                and any(isinstance(a, ast.Constant) and a.value == "signals_only" for a in test.operand.args)):
+            for child in node.orelse:
+                self.visit(child)
+            return
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node):
+        if self.loop_depth and isinstance(node.value, ast.Attribute) and node.value.attr in ITER_ATTRS:
+            self.counts["iloc_in_loop"] += 1
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        func = node.func
+        if isinstance(func, ast.Name):
+            self.called.add(func.id)
+        elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self":
+            self.called.add(func.attr)
+        if (isinstance(func, ast.Attribute) and func.attr == "apply" and isinstance(func.value, ast.Call)
+                and isinstance(func.value.func, ast.Attribute) and func.value.func.attr in WINDOW_ATTRS):
+            self.counts["rolling_apply"] += 1
+            args = list(node.args) + [kw.value for kw in node.keywords if kw.arg == "func"]
+            if args and isinstance(args[0], ast.Lambda):
+                self.counts["rolling_apply_lambda"] += 1
+        self.generic_visit(node)
+
+
+def scan_hot_paths(path, roots=HOT_ROOTS):
+    """
+    Counts of the hot-path patterns plus the list of raised flags.
+
+    Only the code the workers run is scanned: the ``roots`` methods and the
+    module functions / methods they call (transitively), without the
+    signals_only-guarded exit loop.
+    """
+    source = Path(path).read_text(encoding="utf-8", errors="ignore")
+    functions = {}
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.setdefault(node.name, []).append(node)
+    scanner = _HotPathScanner()
+    todo, done = list(roots), set()
+    while todo:
+        name = todo.pop()
+        if name in done or name not in functions:
+            continue
+        done.add(name)
+        for fn in functions[name]:
+            for stmt in fn.body:
+                scanner.visit(stmt)
+        todo.extend(scanner.called - done)
+    counts = dict(scanner.counts, max_loop_depth=scanner.max_loop_depth)
+    counts["flags"] = [k for k in ("iloc_in_loop", "rolling_apply_lambda", "rolling_apply", "nested_loops")
+                       if counts[k]]
+    if "rolling_apply_lambda" in counts["flags"] and "rolling_apply" in counts["flags"]:
+        counts["flags"].remove("rolling_apply")
+    return counts
+
+
+def write_cost_table(path, rows, bars=PROFILE_BARS):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"created": datetime.now().isoformat(timespec="seconds"), "bars": list(bars),
+               "strategies": {name: rows[name] for name in sorted(rows)}}
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1)
+    tmp.replace(path)
+
+
+def read_cost_table(path):
+    """{strategy name: row} of a cost table ({} if missing or unreadable)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("strategies", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def balance_by_cost(scripts, costs, n_chunks, default=None):
+    """
+    Split scripts into n_chunks with similar summed cost (longest first onto the lightest chunk).
+
+    Unknown costs count as ``default`` (the median of the known ones if None);
+    every chunk keeps the original script order.
+    """
+    known = [c for c in (costs.get(s) for s in scripts) if c is not None]
+    if default is None:
+        default = float(np.median(known)) if known else 1.0
+    chunks = [[] for _ in range(max(1, min(n_chunks, len(scripts))))]
+    load = [0.0] * len(chunks)
+    cost = {s: costs.get(s) if costs.get(s) is not None else default for s in scripts}
+    for s in sorted(scripts, key=lambda s: -cost[s]):
+        k = load.index(min(load))
+        chunks[k].append(s)
+        load[k] += cost[s]
+    order = {s: i for i, s in enumerate(scripts)}
+    return [sorted(c, key=order.get) for c in chunks], load
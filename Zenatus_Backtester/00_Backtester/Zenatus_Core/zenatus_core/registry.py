@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+Index of the strategy modules (``All_Strategys``), so loaders do not glob
+the directory and scan ``dir(module)`` for every indicator.
+
+One entry per module (keyed by file stem):
+
+- ``num``: leading indicator number (not unique, see `names_for`)
+- ``file``, ``class``: file name and strategy class (the workers' rule:
+  first class by name with "Indicator" in it or a ``generate_signals_fixed``)
+- ``classes``: all top-level class names (sorted), for loaders with their
+  own rule (the Lazora scripts' name patterns, ``load_class(name, class_name)``)
+- ``hash``, ``mtime_ns``, ``size``: source sha1 and the stat it was taken at
+- ``parameters``: the declared ``PARAMETERS`` literal (None if not a literal)
+- ``capabilities``: optional contracts of the class, e.g.
+  ``generate_entries_batch`` / ``generate_signals_panel`` (zenatus_core.signals,
+  zenatus_core.panel), ``kernels`` / ``primitives`` / ``signals_only``
+- ``core``: zenatus_core modules the strategy uses (imported, or the
+  ``primitives`` attribute the workers set)
+- ``random``: the class draws from an unseeded random generator
+  (``np.random.normal``, ``default_rng()``, ...), its entries differ per run
+
+`signal_hash` combines the source hash with the sources of the ``core``
+modules (and the core modules they import), the strategy part of the
+signal cache key (zenatus_core.signal_cache).
+
+Entries are built from the AST, nothing is imported, so the index can be
+built on machines without the strategies' dependencies. `refresh` stats
+every source and only re-reads files whose mtime or size changed; a changed
+file is only re-parsed when its hash changed. The index is stored as compact
+JSON (written atomically, several nodes may refresh at the same time).
+"""
+
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+REGISTRY_VERSION = 4
+CAPABILITY_METHODS = ("calculate_batch", "generate_entries_batch", "generate_signals_panel",
+                      "generate_signals_fixed", "generate_signals_dynamic", "init_state")
+CAPABILITY_ATTRS = ("primitives", "signals_only")  # getattr(self, "...") opt-ins
+CORE_DIR = Path(__file__).resolve().parent
+RNG_SEEDING = ("seed", "default_rng", "RandomState", "Generator")  # Seeded when called with arguments
+
+
+def _source_hash(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def _strategy_class(tree):
+    """Class node the workers' ``dir(module)`` scan would pick (sorted by name)."""
+    classes = sorted((n for n in tree.body if isinstance(n, ast.ClassDef)), key=lambda n: n.name)
+    for node in classes:
+        methods = {m.name for m in node.body if isinstance(m, (ast.FunctionDef, ast.AsyncFunctionDef))}
+        if "Indicator" in node.name or "generate_signals_fixed" in methods:
+            return node, methods
+    return None, set()
+
+
+def _parameters(class_node):
+    for stmt in class_node.body:
+        if (isinstance(stmt, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "PARAMETERS" for t in stmt.targets)):
+            try:
+                return ast.literal_eval(stmt.value)
+            except (ValueError, SyntaxError, TypeError):
+                return None
+    return None
+
+
+def _core_imports(tree):
+    """zenatus_core submodules imported anywhere in tree (also inside functions)."""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module:
+            if node.module == "zenatus_core":
+                names.update(a.name for a in node.names)
+            elif node.module.startswith("zenatus_core."):
+                names.add(node.module.split(".")[1])
+        elif isinstance(node, ast.Import):
+            names.update(a.name.split(".")[1] for a in node.names if a.name.startswith("zenatus_core."))
+    return names
+
+
+def _dotted(node):
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return []
+    parts.append(node.id)
+    return parts[::-1]
+
+
+def _unseeded_random(class_node):
+    """The class draws from numpy's global / an unseeded generator and seeds nothing."""
+    draws = seeded = False
+    for node in ast.walk(class_node):
+        if not isinstance(node, ast.Call):
+            continue
+        parts = _dotted(node.func)
+        if len(parts) < 2 or parts[-2] != "random":
+            if parts and parts[-1] in RNG_SEEDING[1:]:
+                draws, seeded = draws or not (node.args or node.keywords), seeded or bool(node.args or node.keywords)
+            continue
+        if parts[-1] == "seed":
+            seeded = True
+        elif parts[-1] in RNG_SEEDING:
+            if node.args or node.keywords:
+                seeded = True
+            else:
+                draws = True
+        else:
+            draws = True
+    return draws and not seeded
+
+
+def scan_module(path, data=None):
+    """Index entry of one module (parsed, not imported)."""
+    path = Path(path)
+    data = path.read_bytes() if data is None else data
+    stem = path.stem
+    try:
+        num = int(stem.split("_")[0])
+    except ValueError:
+        num = None
+    entry = {"num": num, "file": path.name, "hash": _source_hash(data), "class": None, "classes": [],
+             "parameters": None, "capabilities": []}
+    try:
+        tree = ast.parse(data)
+    except SyntaxError as e:
+        entry["error"] = f"SyntaxError: {e}"
+        return entry
+    entry["classes"] = sorted(n.name for n in tree.body if isinstance(n, ast.ClassDef))
+    class_node, methods = _strategy_class(tree)
+    if class_node is None:
+        return entry
+    entry["class"] = class_node.name
+    entry["parameters"] = _parameters(class_node)
+    caps = [m for m in CAPABILITY_METHODS if m in methods]
+    strings = {n.value for n in ast.walk(class_node) if isinstance(n, ast.Constant) and isinstance(n.value, str)}
+    caps += [a for a in CAPABILITY_ATTRS if a in strings]
+    core = _core_imports(tree)
+    if "kernels" in core:
+        caps.append("kernels")
+    if "primitives" in caps:
+        core.add("primitives")
+    entry["capabilities"] = caps
+    entry["core"] = sorted(core)
+    entry["random"] = _unseeded_random(class_node)
+    return entry
+
+
+class StrategyRegistry:
+    """
+    Strategy index of one directory, refreshed on construction.
+
+    Args:
+        strategy_dir: directory with the ``NNN_name.py`` modules
+        index_file: JSON index (default: ``strategy_registry.json`` in strategy_dir)
+        refresh: stat the sources and update the index now
+    """
+
+    def __init__(self, strategy_dir, index_file=None, refresh=True):
+        self.strategy_dir = Path(strategy_dir)
+        self.index_file = Path(index_file) if index_file else self.strategy_dir / "strategy_registry.json"
+        self.modules = {}
+        self.rebuilt = 0
+        self._classes = {}  # (stem, class_name) -> (hash, class) of this process
+        self._core = {}  # zenatus_core module -> (source hash, imported core modules) of this process
+        self._load()
+        if refresh:
+            self.refresh()
+
+    def _load(self):
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        if payload.get("version") == REGISTRY_VERSION and payload.get("strategy_dir") == str(self.strategy_dir):
+            self.modules = payload.get("modules", {})
+
+    def save(self):
+        payload = {"version": REGISTRY_VERSION, "strategy_dir": str(self.strategy_dir), "modules": self.modules}
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_file.with_name(f"{self.index_file.name}.{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            tmp.replace(self.index_file)
+        except OSError as e:
+            print(f"[WARN] Strategy registry not saved ({self.index_file}): {e}")
+
+    def refresh(self):
+        """Update entries of new/changed/removed sources; returns the number of re-parsed modules."""
+        seen = set()
+        changed = rebuilt = 0
+        with os.scandir(self.strategy_dir) as it:
+            for de in it:
+                if not (de.name.endswith(".py") and de.is_file()):
+                    continue
+                stem = de.name[:-3]
+                seen.add(stem)
+                st = de.stat()
+                entry = self.modules.get(stem)
+                if entry and entry.get("mtime_ns") == st.st_mtime_ns and entry.get("size") == st.st_size:
+                    continue
+                data = Path(de.path).read_bytes()
+                if not entry or entry.get("hash") != _source_hash(data):
+                    entry = scan_module(de.path, data)
+                    rebuilt += 1
+                entry["mtime_ns"], entry["size"] = st.st_mtime_ns, st.st_size
+                self.modules[stem] = entry
+                changed += 1
+        for stem in set(self.modules) - seen:
+            del self.modules[stem]
+            changed += 1
+        if changed:
+            self.save()
+        self.rebuilt = rebuilt
+        return rebuilt
+
+    def __contains__(self, name):
+        return name in self.modules
+
+    def __len__(self):
+        return len(self.modules)
+
+    def names(self):
+        return sorted(self.modules)
+
+    def names_for(self, num):
+        """Module stems with this indicator number (some numbers are used twice)."""
+        return sorted(s for s, e in self.modules.items() if e.get("num") == int(num))
+
+    def entry(self, name):
+        return self.modules.get(name)
+
+    def path(self, name):
+        entry = self.modules.get(name)
+        return self.strategy_dir / entry["file"] if entry else None
+
+    def has(self, name, capability):
+        entry = self.modules.get(name)
+        return bool(entry) and capability in entry.get("capabilities", [])
+
+    def _core_module(self, module):
+        if module not in self._core:
+            try:
+                data = (CORE_DIR / f"{module}.py").read_bytes()
+                self._core[module] = (_source_hash(data), _core_imports(ast.parse(data)))
+            except (OSError, SyntaxError):
+                self._core[module] = ("missing", set())
+        return self._core[module]
+
+    def signal_hash(self, name):
+        """
+        Hash of everything the entries of the module depend on: its source and
+        the zenatus_core modules it uses, transitively. None if unknown or
+        random (entries differ per run, not cacheable).
+        """
+        entry = self.modules.get(name)
+        if entry is None or entry.get("random"):
+            return None
+        if not entry.get("core"):
+            return entry["hash"]
+        todo, seen = list(entry["core"]), set()
+        while todo:
+            module = todo.pop()
+            if module not in seen:
+                seen.add(module)
+                todo.extend(self._core_module(module)[1])
+        h = hashlib.sha1(entry["hash"].encode())
+        for module in sorted(seen):
+            h.update(f"|{module}:{self._core_module(module)[0]}".encode())
+        return h.hexdigest()
+
+    def load_class(self, name, class_name=None):
+        """
+        Import the module and return its strategy class (None if unknown or without one).
+
+        class_name: load this class instead of the ``class`` entry (a name from ``classes``)
+        """
+        entry = self.modules.get(name)
+        if entry is None:
+            return None
+        key = (name, class_name)
+        cached = self._classes.get(key)
+        if cached is not None and cached[0] == entry["hash"]:
+            return cached[1]
+        spec = importlib.util.spec_from_file_location(name, self.strategy_dir / entry["file"])
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if class_name:
+            klass = getattr(module, class_name, None)
+            klass = klass if isinstance(klass, type) else None
+        else:
+            klass = getattr(module, entry["class"], None) if entry.get("class") else None
+            if not isinstance(klass, type):
+                # Class not visible to the AST (imported / built dynamically): the workers' scan
+                klass = None
+                for attr in dir(module):
+                    obj = getattr(module, attr)
+                    if isinstance(obj, type) and ("Indicator" in attr or hasattr(obj, "generate_signals_fixed")):
+                        klass = obj
+                        break
+        if klass is not None:
+            self._classes[key] = (entry["hash"], klass)
+        return klass
+
+    def summary(self):
+        caps = {}
+        for e in self.modules.values():
+            for c in e.get("capabilities", []):
+                caps[c] = caps.get(c, 0) + 1
+        opt_in = ", ".join(f"{c}={n}" for c, n in sorted(caps.items()) if c not in ("generate_signals_fixed",
+                                                                                 "generate_signals_dynamic"))
+        return f"Registry: {len(self.modules)} modules, {self.rebuilt} re-parsed ({opt_in or 'no opt-ins'})"
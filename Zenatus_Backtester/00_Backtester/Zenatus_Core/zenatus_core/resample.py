@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Timeframe resampling from the finest available base timeframe.
+
+``resample_ohlcv_nb`` aggregates a sorted bar series in one compiled pass
+(open first, high max, low min, close last, volume sum; NaNs skipped, empty
+bins dropped). Bins are left-closed and left-labelled with pandas' default
+origin (midnight of the first day), so the result equals
+``df.resample(tf).agg(...)`` - the existing 1h/4h/1d aggregates are exactly
+the 30m data resampled this way.
+
+``load_resampled`` caches the result as a store (see store.py) in
+``{tf}/{symbol}/{symbol}_resampled_store``. The schema records the base
+timeframe and the content hash of the base data; the cache is rebuilt when
+either changes. Timeframes without their own aggregate (2h, 3h, ...) can be
+backtested directly.
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numba import njit
+
+from zenatus_core.store import (OHLCV_COLUMNS, frame_from_arrays, frame_hash, load_ohlcv, open_store, read_schema,
+                                slice_range, source_path, store_path, write_store)
+from zenatus_core.validate import validate_frame
+
+RESAMPLED_SUFFIX = "_resampled_store"
+_TF_UNITS = {"m": 60, "min": 60, "h": 3600, "d": 86400}
+_NS = 1_000_000_000
+
+
+def timeframe_seconds(timeframe):
+    """'30m' -> 1800, '2h' -> 7200, '1d' -> 86400 (ValueError for weeks/months)."""
+    m = re.fullmatch(r"(\d+)\s*(min|m|h|d)", str(timeframe).strip().lower())
+    if not m:
+        raise ValueError(f"Unsupported timeframe '{timeframe}', expected <n>m, <n>h or <n>d")
+    return int(m.group(1)) * _TF_UNITS[m.group(2)]
+
+
+@njit(cache=True)
+def resample_ohlcv_nb(times, open_, high, low, close, volume, origin, step):
+    """
+    Aggregate sorted int64 ns bars into bins of ``step`` ns starting at ``origin``.
+
+    Volume uses Kahan summation like pandas' groupby sum, so results match
+    ``resample().sum()`` bit for bit.
+    """
+    n = len(times)
+    out_t = np.empty(n, dtype=np.int64)
+    out_o = np.empty(n, dtype=np.float64)
+    out_h = np.empty(n, dtype=np.float64)
+    out_l = np.empty(n, dtype=np.float64)
+    out_c = np.empty(n, dtype=np.float64)
+    out_v = np.empty(n, dtype=np.float64)
+    comp = 0.0
+    k = -1
+    cur = np.iinfo(np.int64).min
+    for i in range(n):
+        b = origin + ((times[i] - origin) // step) * step
+        if b != cur:
+            k += 1
+            cur = b
+            out_t[k] = b
+            out_o[k] = np.nan
+            out_h[k] = np.nan
+            out_l[k] = np.nan
+            out_c[k] = np.nan
+            out_v[k] = 0.0
+            comp = 0.0
+        if np.isnan(out_o[k]) and not np.isnan(open_[i]):
+            out_o[k] = open_[i]
+        if not np.isnan(high[i]) and (np.isnan(out_h[k]) or high[i] > out_h[k]):
+            out_h[k] = high[i]
+        if not np.isnan(low[i]) and (np.isnan(out_l[k]) or low[i] < out_l[k]):
+            out_l[k] = low[i]
+        if not np.isnan(close[i]):
+            out_c[k] = close[i]
+        if not np.isnan(volume[i]):
+            y = volume[i] - comp
+            t = out_v[k] + y
+            comp = t - out_v[k] - y
+            out_v[k] = t
+    keep = ~np.isnan(out_o[:k + 1])
+    return (out_t[:k + 1][keep], out_o[:k + 1][keep], out_h[:k + 1][keep], out_l[:k + 1][keep],
+            out_c[:k + 1][keep], out_v[:k + 1][keep])
+
+
+def resample_frame(df, timeframe):
+    """Resample an OHLC(V) frame with a DatetimeIndex to ``timeframe``."""
+    step = timeframe_seconds(timeframe) * _NS
+    times = np.ascontiguousarray(df.index.values.astype("datetime64[ns]").view(np.int64))
+    if not len(times):
+        return df.iloc[:0][[c for c in OHLCV_COLUMNS if c in df.columns]]
+    origin = int(times[0] // (86400 * _NS)) * 86400 * _NS  # pandas origin="start_day"
+    has_volume = "volume" in df.columns
+    cols = [np.ascontiguousarray(df[c].values, dtype=np.float64) for c in ("open", "high", "low", "close")]
+    volume = np.ascontiguousarray(df["volume"].values, dtype=np.float64) if has_volume else np.zeros(len(times))
+    out = resample_ohlcv_nb(times, *cols, volume, origin, step)
+    names = list(OHLCV_COLUMNS) if has_volume else list(OHLCV_COLUMNS[:4])
+    index = pd.DatetimeIndex(out[0].view("datetime64[ns]"), name=df.index.name)
+    return pd.DataFrame(dict(zip(names, out[1:1 + len(names)])), index=index)
+
+
+def available_timeframes(data_path, symbol):
+    """Timeframes with an aggregate (or a converted store) for the symbol, finest first."""
+    found = []
+    for p in Path(data_path).iterdir():
+        if not p.is_dir():
+            continue
+        try:
+            seconds = timeframe_seconds(p.name)
+        except ValueError:
+            continue
+        if source_path(data_path, p.name, symbol).exists() or read_schema(store_path(data_path, p.name, symbol)):
+            found.append((seconds, p.name))
+    return [tf for _, tf in sorted(found)]
+
+
+def finest_base(data_path, timeframe, symbol):
+    """Finest available timeframe whose bars tile ``timeframe`` (may be the timeframe itself), None if none."""
+    target = timeframe_seconds(timeframe)
+    for tf in available_timeframes(data_path, symbol):
+        seconds = timeframe_seconds(tf)
+        if seconds <= target and target % seconds == 0:
+            return tf
+    return None
+
+
+def resampled_store_path(data_path, timeframe, symbol):
+    return Path(data_path) / timeframe / symbol / f"{symbol}{RESAMPLED_SUFFIX}"
+
+
+def load_resampled(data_path, timeframe, symbol, start=None, end=None, base=None):
+    """
+    ``timeframe`` bars built from the finest base (or ``base``), cached in the store.
+
+    The cache is keyed by (symbol, timeframe, base timeframe, base content
+    hash). Returns None if there is no usable base.
+    """
+    base = base or finest_base(data_path, timeframe, symbol)
+    if base is None:
+        return None
+    if timeframe_seconds(base) == timeframe_seconds(timeframe):
+        return load_ohlcv(data_path, base, symbol, start, end)
+
+    base_df = load_ohlcv(data_path, base, symbol)
+    if base_df is None:
+        return None
+    base_hash = frame_hash(base_df)
+    path = resampled_store_path(data_path, timeframe, symbol)
+    schema = read_schema(path)
+    source = (schema or {}).get("source") or {}
+    if source.get("base") != base or source.get("hash") != base_hash:
+        print(f"[RESAMPLE] {symbol} {base} -> {timeframe} (base hash {base_hash})")
+        df, report = validate_frame(resample_frame(base_df, timeframe), timeframe, f"{symbol} {timeframe}")
+        write_store(path, df, {"base": base, "hash": base_hash}, report=report)
+
+    times, columns, _ = open_store(path)
+    lo, hi = slice_range(times, start, end)
+    return frame_from_arrays(times, columns, lo, hi)
+
+
+def load_timeframe(data_path, timeframe, symbol, start=None, end=None, from_base=False):
+    """
+    Bars of ``timeframe``: its own aggregate if there is one (unless from_base),
+    otherwise resampled from the finest base timeframe.
+    """
+    if not from_base:
+        df = load_ohlcv(data_path, timeframe, symbol, start, end)
+        if df is not None:
+            return df
+    return load_resampled(data_path, timeframe, symbol, start, end)
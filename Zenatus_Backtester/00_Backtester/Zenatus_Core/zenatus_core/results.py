@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming result writer for the Fixed_Exit workers.
+
+Result frames are appended as they come out of the simulation instead of
+being collected until the indicator is done:
+
+- CSV (compatibility export): appended to ``<name>.csv.partial`` and renamed
+  to ``<name>.csv`` on close, so an existing CSV still means "indicator done".
+- Parquet: every flushed batch becomes its own part file in
+  ``<name>.parts/`` (written to a temp file, then renamed). On close the parts
+  are merged into ``<name>.parquet`` with one row group per part.
+
+Memory is bounded by ``flush_rows``. A killed indicator leaves the .partial
+CSV and the part files behind, both readable (``pd.read_parquet(parts_dir)``).
+They are replaced when the indicator runs again.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+RESULT_FORMATS = ("csv", "parquet")
+DEFAULT_FLUSH_ROWS = 20000
+
+PARAM_COLUMNS = [f"Parameter {i}" for i in range(1, 11)]
+METRIC_FLOAT_COLUMNS = ["Total_Return", "Max_Drawdown", "Daily_Drawdown", "Win_Rate_%", "Avg_Win", "Avg_Loss",
+                        "Highest_Win", "Highest_Loss", "Gross_Profit", "Commission", "Net_Profit",
+                        "Profit_Factor", "Sharpe_Ratio"]
+RESULT_COLUMNS = ["Indicator_Num", "Indicator", "Symbol", "Timeframe"] + PARAM_COLUMNS + \
+                 ["TP_Pips", "SL_Pips", "Spread_Pips", "Slippage_Pips",
+                  "Entry_period", "Total_Return", "Max_Drawdown", "Daily_Drawdown", "Win_Rate_%", "Total_Trades",
+                  "Winning_Trades", "Losing_Trades", "Avg_Win", "Avg_Loss", "Highest_Win", "Highest_Loss",
+                  "Gross_Profit", "Commission", "Net_Profit", "Profit_Factor", "Sharpe_Ratio", "Data_Hash"]
+
+
+def result_schema():
+    """Arrow schema of the result table (parameters are stored as text, like in the CSV)."""
+    fields = []
+    for c in RESULT_COLUMNS:
+        if c == "Indicator_Num" or c in ("Total_Trades", "Winning_Trades", "Losing_Trades"):
+            fields.append(pa.field(c, pa.int64()))
+        elif c in ("Indicator", "Symbol", "Timeframe", "Entry_period", "Data_Hash") or c in PARAM_COLUMNS:
+            fields.append(pa.field(c, pa.string()))
+        else:
+            fields.append(pa.field(c, pa.float64()))
+    return pa.schema(fields)
+
+
+def pad_result_columns(frame):
+    """Add missing result columns (parameters/data hash 'NA', metrics 0) and order them like RESULT_COLUMNS."""
+    for c in RESULT_COLUMNS:
+        if c not in frame.columns:
+            frame[c] = "NA" if c in PARAM_COLUMNS or c == "Data_Hash" else 0
+    return frame[RESULT_COLUMNS]
+
+
+class ResultWriter:
+    """
+    Incremental writer for one indicator's result table.
+
+    Args:
+        path: output path without suffix, e.g. RESULTS_DIR / "001_001_trend_sma_1h"
+        formats: subset of RESULT_FORMATS
+        flush_rows: rows buffered before a batch is written
+        float_format: CSV float format (same as the previous one-shot export)
+
+    Tracks the row count, the best row by Net_Profit and per-column min/max,
+    so callers don't need the full table for summaries and checkpoints.
+    """
+
+    def __init__(self, path, formats=RESULT_FORMATS, flush_rows=DEFAULT_FLUSH_ROWS, float_format="%.6f"):
+        self.path = Path(path)
+        self.formats = [f for f in formats if f in RESULT_FORMATS]
+        if "parquet" in self.formats and pa is None:
+            print("[WARN] pyarrow not installed, writing CSV results only")
+            self.formats = [f for f in self.formats if f != "parquet"] or ["csv"]
+        self.flush_rows = max(1, int(flush_rows))
+        self.float_format = float_format
+
+        self.csv_path = self.path.with_name(self.path.name + ".csv")
+        self.csv_partial = self.path.with_name(self.path.name + ".csv.partial")
+        self.parquet_path = self.path.with_name(self.path.name + ".parquet")
+        self.parts_dir = self.path.with_name(self.path.name + ".parts")
+
+        self.n_rows = 0
+        self.n_parts = 0
+        self.best_row = None
+        self.col_max = {}
+        self.col_min = {}
+        self._buffer = []
+        self._buffered = 0
+        self._csv_header = True
+        self._closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Leftovers of a killed run are replaced
+        if self.csv_partial.exists():
+            self.csv_partial.unlink()
+        if self.parts_dir.exists():
+            shutil.rmtree(self.parts_dir)
+
+    def write(self, frame):
+        """Append a result frame (buffered up to flush_rows)."""
+        if frame is None or not len(frame):
+            return
+        frame = pad_result_columns(frame)
+        self._track(frame)
+        self._buffer.append(frame)
+        self._buffered += len(frame)
+        self.n_rows += len(frame)
+        if self._buffered >= self.flush_rows:
+            self.flush()
+
+    def _track(self, frame):
+        net = frame["Net_Profit"].values
+        if len(net) and not np.all(np.isnan(net)):
+            k = int(np.nanargmax(net))
+            # First occurrence wins, like DataFrame.idxmax over the whole table
+            if self.best_row is None or net[k] > self.best_row["Net_Profit"]:
+                self.best_row = frame.iloc[k].copy()
+        for c in METRIC_FLOAT_COLUMNS + ["Total_Trades"]:
+            hi = frame[c].max()
+            lo = frame[c].min()
+            self.col_max[c] = hi if c not in self.col_max else max(self.col_max[c], hi)
+            self.col_min[c] = lo if c not in self.col_min else min(self.col_min[c], lo)
+
+    def flush(self):
+        """Write the buffered rows as one batch."""
+        if not self._buffer:
+            return
+        batch = pd.concat(self._buffer, ignore_index=True) if len(self._buffer) > 1 else self._buffer[0]
+        self._buffer = []
+        self._buffered = 0
+
+        if "csv" in self.formats:
+            with open(self.csv_partial, "a", newline="") as f:
+                batch.to_csv(f, index=False, header=self._csv_header, float_format=self.float_format)
+                f.flush()
+                os.fsync(f.fileno())
+            self._csv_header = False
+
+        if "parquet" in self.formats:
+            self.parts_dir.mkdir(parents=True, exist_ok=True)
+            part = self.parts_dir / f"part-{self.n_parts:05d}.parquet"
+            tmp = self.parts_dir / f".{part.name}.tmp"  # Hidden, dataset readers skip it
+            pq.write_table(self._to_table(batch), tmp, compression="zstd")
+            os.replace(tmp, part)
+            self.n_parts += 1
+
+    def _to_table(self, batch):
+        batch = batch.copy()
+        for c in PARAM_COLUMNS:
+            batch[c] = batch[c].astype(str)
+        return pa.Table.from_pandas(batch, schema=result_schema(), preserve_index=False)
+
+    def close(self):
+        """Flush and finalize: rename the CSV, merge the parquet parts (one row group each)."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+
+        if "csv" in self.formats and self.csv_partial.exists():
+            os.replace(self.csv_partial, self.csv_path)
+
+        if "parquet" in self.formats and self.n_parts:
+            tmp = self.parquet_path.with_suffix(".parquet.tmp")
+            with pq.ParquetWriter(tmp, result_schema(), compression="zstd") as writer:
+                for k in range(self.n_parts):
+                    writer.write_table(pq.read_table(self.parts_dir / f"part-{k:05d}.parquet"))
+            os.replace(tmp, self.parquet_path)
+            shutil.rmtree(self.parts_dir)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Entry parameter search strategies for the Fixed_Exit workers.
+
+- ``grid``: every entry combo on the full date range (default).
+- ``successive-halving``: all entry combos are scored on a short prefix of the
+  date range, the best ``1/eta`` survive and the window grows by ``eta`` per
+  stage. The survivors of the last prefix stage are then run on the full
+  range by the normal worker loop.
+
+With eta=3 and 3 stages the budget is about n/9 + n/9 + n/9 combo-ranges
+instead of n, i.e. a third of the grid.
+"""
+
+import time
+
+import numpy as np
+
+SEARCH_MODES = ("grid", "successive-halving")
+DEFAULT_SEARCH_MODE = "grid"
+DEFAULT_ETA = 3
+DEFAULT_STAGES = 3
+MIN_STAGE_BARS = 500  # Shorter prefixes give too few trades to rank on
+
+
+def halving_windows(n_bars, eta=DEFAULT_ETA, n_stages=DEFAULT_STAGES, min_bars=MIN_STAGE_BARS):
+    """
+    Prefix lengths (bars) of the pruning stages, shortest first.
+
+    The full range is the final stage and not part of the list; windows
+    shorter than min_bars are dropped.
+    """
+    windows = []
+    for k in range(n_stages - 1, 0, -1):
+        n = int(n_bars // eta ** k)
+        if n >= min_bars and n < n_bars:
+            windows.append(n)
+    return windows
+
+
+def successive_halving(candidates, score_fn, n_bars, eta=DEFAULT_ETA, n_stages=DEFAULT_STAGES,
+                       min_bars=MIN_STAGE_BARS):
+    """
+    Prune candidates on growing prefixes of the date range.
+
+    Args:
+        candidates: list of entry param dicts
+        score_fn: ``score_fn(candidate, n_prefix_bars) -> float``, higher is
+            better, NaN for "no trades" (ranked last)
+        n_bars: bars of the full date range
+
+    Returns:
+        survivors (best first), stages: list of dicts with window, number of
+        candidates/survivors, seconds and the surviving candidates
+    """
+    survivors = list(candidates)
+    stages = []
+    for window in halving_windows(n_bars, eta, n_stages, min_bars):
+        if len(survivors) <= 1:
+            break
+        t0 = time.time()
+        scores = np.array([score_fn(c, window) for c in survivors], dtype=np.float64)
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        keep = max(1, int(np.ceil(len(survivors) / eta)))
+        # Stable sort: ties keep the grid order
+        order = np.argsort(-scores, kind="stable")[:keep]
+        stages.append({
+            "window_bars": int(window),
+            "candidates": len(survivors),
+            "survivors": int(keep),
+            "seconds": round(time.time() - t0, 2),
+            "best_score": float(scores[order[0]]) if np.isfinite(scores[order[0]]) else None,
+            "kept": [survivors[k] for k in order],
+        })
+        survivors = [survivors[k] for k in order]
+    return survivors, stages
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Shared-memory OHLCV cache for the RUN_ALL node launchers.
+
+The launcher loads every symbol once (``SharedDataCache.publish``) into one
+POSIX shared memory segment per symbol and writes a small JSON manifest.
+Workers started with ``--shm-manifest`` attach by name (``attach_frames``)
+and get read-only DataFrame views on the segments, so the OHLCV data exists
+once in RAM instead of once per node.
+
+Segment layout (one symbol)::
+
+    int64[rows]    time, ns since epoch
+    float64[rows]  one block per column (open, high, low, close, volume, ...)
+
+Cleanup: the launcher unlinks all segments on exit (``close``/atexit).
+Workers that are attached keep their mapping until they exit; workers
+unregister from multiprocessing's resource_tracker, otherwise their exit
+would unlink the segments under the other nodes.
+"""
+
+import atexit
+import json
+import os
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from zenatus_core.resample import load_timeframe
+from zenatus_core.store import TIME_COLUMN
+
+MANIFEST_VERSION = 1
+
+_ATTACHED = []  # SharedMemory handles of attached segments (views must not outlive them)
+
+
+def _open_segment(name):
+    """Attach to an existing segment without resource_tracker ownership."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _views(buf, rows, columns):
+    times = np.ndarray((rows,), dtype=np.int64, buffer=buf, offset=0)
+    blocks = {c: np.ndarray((rows,), dtype=np.float64, buffer=buf, offset=8 * rows * (k + 1))
+              for k, c in enumerate(columns)}
+    return times, blocks
+
+
+class SharedDataCache:
+    """
+    Launcher side: owns the segments and the manifest.
+
+    Use as a context manager (or call close()); close is also registered
+    with atexit so segments are unlinked when the launcher exits normally
+    or on Ctrl+C.
+    """
+
+    def __init__(self, prefix=None):
+        self.prefix = prefix or f"zen{os.getpid()}"
+        self.segments = []
+        self.manifest = None
+        self.manifest_path = None
+        atexit.register(self.close)
+
+    def publish(self, data_path, timeframe, symbols, start=None, end=None):
+        """Load the symbols (store, source file or resampled) into shared memory. Returns the manifest."""
+        entries = {}
+        for symbol in symbols:
+            df = load_timeframe(data_path, timeframe, symbol, start, end)
+            if df is None:
+                print(f"[SHM] {symbol} {timeframe}: no data, nodes will skip it")
+                continue
+            columns = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+            rows = len(df)
+            name = f"{self.prefix}_{timeframe}_{symbol}"
+            shm = shared_memory.SharedMemory(name=name, create=True, size=max(8, 8 * rows * (len(columns) + 1)))
+            self.segments.append(shm)
+            times, blocks = _views(shm.buf, rows, columns)
+            times[:] = df.index.values.astype("datetime64[ns]").view(np.int64)
+            for c in columns:
+                blocks[c][:] = df[c].values
+            del times, blocks  # No exported buffers left, close() must succeed
+            entries[symbol] = {"name": name, "rows": rows, "columns": columns}
+        self.manifest = {"version": MANIFEST_VERSION, "timeframe": timeframe, "start": start, "end": end,
+                         "pid": os.getpid(), "symbols": entries}
+        return self.manifest
+
+    def write_manifest(self, path):
+        """Write the manifest for the workers (--shm-manifest)."""
+        self.manifest_path = Path(path)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        return self.manifest_path
+
+    @property
+    def nbytes(self):
+        return sum(s.size for s in self.segments)
+
+    def close(self):
+        """Unlink all segments and remove the manifest (idempotent)."""
+        for shm in self.segments:
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.segments = []
+        if self.manifest_path is not None and self.manifest_path.exists():
+            self.manifest_path.unlink()
+        self.manifest_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_frames(manifest_path, timeframe=None, start=None, end=None):
+    """
+    Worker side: read-only DataFrame views for the symbols in the manifest.
+
+    Returns {} (the caller loads from disk) if the manifest is missing, was
+    published for another timeframe/date range, or the segments are gone.
+    """
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        print(f"[SHM] Manifest {manifest_path} not found, loading from disk")
+        return {}
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    expected = {"timeframe": timeframe, "start": start, "end": end}
+    mismatch = {k: manifest.get(k) for k, v in expected.items() if v is not None and manifest.get(k) != v}
+    if manifest.get("version") != MANIFEST_VERSION or mismatch:
+        print(f"[SHM] Manifest does not match this run {mismatch}, loading from disk")
+        return {}
+
+    frames = {}
+    for symbol, entry in manifest["symbols"].items():
+        try:
+            shm = _open_segment(entry["name"])
+        except FileNotFoundError:
+            print(f"[SHM] Segment {entry['name']} is gone, loading {symbol} from disk")
+            continue
+        _ATTACHED.append(shm)
+        times, blocks = _views(shm.buf, entry["rows"], entry["columns"])
+        for a in [times] + list(blocks.values()):
+            a.flags.writeable = False
+        index = pd.DatetimeIndex(times.view("datetime64[ns]"), name=TIME_COLUMN)
+        frames[symbol] = pd.DataFrame(blocks, index=index, copy=False)
+    return frames
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed on-disk cache of entry signals.
+
+The entries of a strategy depend only on its source, the bars and the
+params, so a rerun of a timeframe (after a crash, a TP/SL or config change,
+Lazora phase 1 after the full backtest) can reuse them instead of calling
+``generate_signals_fixed`` again.
+
+Key: (strategy hash, data content hash, timeframe, date range, canonical
+params) plus `SIGNAL_CACHE_VERSION`. The strategy hash is the registry's
+``signal_hash`` (zenatus_core.registry): the strategy source and the
+zenatus_core modules it uses (kernels, primitives, ...), so a fix in those
+invalidates its entries too. The data hash is the workers' ``frame_hash``.
+Not cached: strategies that read other symbols (``generate_signals_panel``,
+their entries depend on more than one data hash) and strategies drawing
+unseeded random numbers (registry ``random``, ``signal_hash`` is None), whose
+first draw would otherwise be served forever.
+
+One file per key (``<root>/<key[:2]>/<key>.sig``): int64 bar count followed
+by the entries packed into bits (`pack_entries`, 8 bars per byte). Files are
+written atomically, so several nodes can share one root. Eviction is LRU by
+mtime (a hit touches the file) once the root exceeds the byte budget.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from zenatus_core.signals import pack_entries
+
+SIGNAL_CACHE_VERSION = 2
+DEFAULT_BUDGET_MB = 2048
+EVICT_TO = 0.9  # Evict down to this fraction of the budget (not one file per put)
+SUFFIX = ".sig"
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def canonical_params(params):
+    """Params as sorted compact JSON; numpy scalars equal to their Python values (np.int64(5) == 5)."""
+    return json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=_json_default)
+
+
+class SignalCache:
+    """
+    Entry signals under ``root`` with a byte budget shared by all processes
+    using that root. ``scope`` fixes everything but the params (see `scope`).
+
+    Args:
+        root: cache directory (created on first write)
+        budget_mb: LRU size bound of root, 0: no bound
+    """
+
+    def __init__(self, root, budget_mb=DEFAULT_BUDGET_MB):
+        self.root = Path(root)
+        self.budget = int(budget_mb * 1024 ** 2)
+        self._nbytes = None  # Size of root, scanned before the first write
+        self.reset()
+
+    def reset(self):
+        """Start the counters of the next indicator (the files stay)."""
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @staticmethod
+    def scope(strategy_hash, data_hash, timeframe, start, end):
+        """Key prefix of one strategy source on one symbol's bars."""
+        return f"v{SIGNAL_CACHE_VERSION}|{strategy_hash}|{data_hash}|{timeframe}|{start}|{end}"
+
+    def path(self, scope, params):
+        key = hashlib.blake2b(f"{scope}|{canonical_params(params)}".encode(), digest_size=16).hexdigest()
+        return self.root / key[:2] / f"{key}{SUFFIX}"
+
+    def get(self, scope, params, n_bars):
+        """Cached entries (bool array of n_bars) or None."""
+        path = self.path(scope, params)
+        try:
+            raw = np.fromfile(path, dtype=np.uint8)
+        except (FileNotFoundError, OSError, ValueError):
+            self.misses += 1
+            return None
+        if len(raw) < 8 or int(raw[:8].view(np.int64)[0]) != n_bars or len(raw) - 8 != (n_bars + 7) // 8:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU: last use
+        except OSError:
+            pass
+        self.hits += 1
+        return np.unpackbits(raw[8:], count=n_bars).astype(np.bool_)
+
+    def put(self, scope, params, entries):
+        entries = np.asarray(entries, dtype=np.bool_)
+        path = self.path(scope, params)
+        data = np.int64(len(entries)).tobytes() + pack_entries(entries).tobytes()
+        if self.budget and self._nbytes is None:
+            self._nbytes = sum(size for _, size, _ in self._files())
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                f.write(data)
+            tmp.replace(path)
+        except OSError as e:
+            print(f"[WARN] Signal cache write failed ({path}): {e}")
+            return
+        self.writes += 1
+        if self.budget:
+            self._nbytes += len(data)
+            if self._nbytes > self.budget:
+                self.evict()
+
+    def entries(self, scope, params, n_bars, compute):
+        """Cached entries of params, else ``compute()`` (bool vector of n_bars), stored for the next run."""
+        cached = self.get(scope, params, n_bars)
+        if cached is not None:
+            return cached
+        entries = np.asarray(compute(), dtype=np.bool_)
+        self.put(scope, params, entries)
+        return entries
+
+    def _files(self):
+        if not self.root.exists():
+            return []
+        files = []
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for de in os.scandir(sub.path):
+                if de.name.endswith(SUFFIX):
+                    try:
+                        st = de.stat()
+                    except OSError:
+                        continue  # Evicted by another process meanwhile
+                    files.append((st.st_mtime, st.st_size, de.path))
+        return files
+
+    def evict(self):
+        """Delete least recently used files until root is below EVICT_TO of the budget (rescans root)."""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = self.budget * EVICT_TO
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except OSError:
+                pass
+            total -= size
+        self._nbytes = total
+
+    def summary(self):
+        """Short tag for the indicator summary line, e.g. 'Sig: 40/48 cached'."""
+        tag = f"Sig: {self.hits}/{self.hits + self.misses} cached"
+        if self.evictions:
+            tag += f", {self.evictions} evicted"
+        return tag
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Entry signal helpers shared by the Fixed_Exit workers.
+
+Signals-only contract: the workers simulate TP/SL themselves (``tp_stop`` /
+``sl_stop``, ``exits=False``), so the exits a strategy computes are never
+used. They set ``signals_only = True`` on the strategy instance before
+calling ``generate_signals_fixed``:
+
+- ``FixedExitStrategy`` subclasses only implement ``generate_entries``; the
+  exits are added by `fixed_exits` unless ``signals_only`` is set
+- the legacy modules in ``All_Strategys`` compute their exits with
+  `fixed_exits` (their ``backtest_vectorbt``) unless ``signals_only`` is
+  set; they keep their per-bar exit loop as the fallback for scripts that
+  load them without Zenatus_Core on the path
+
+`fixed_exits` is that loop compiled once, for callers that still need the
+exits of a strategy's entries.
+
+Batch contract (optional): a strategy may implement
+
+- ``calculate_batch(data, param_list)``: indicator values, bars x n_params
+- ``generate_entries_batch(data, param_list)``: entries, bars x n_params
+  (bool array or DataFrame), column k equal to the entries of
+  ``generate_signals_fixed(data, param_list[k])``
+
+and share work across the param sets (e.g. all SMA periods in one pass,
+zenatus_core.kernels). The workers hand the entry combos to `EntryBatches`
+when the class has ``generate_entries_batch`` and call
+``generate_signals_fixed`` per param set otherwise.
+
+Import contract: strategy modules import only numpy/pandas (and the
+optional Zenatus_Core helpers) at module level. vectorbt (``backtest_vectorbt``),
+talib, scipy and sklearn are imported inside the function that uses them,
+so loading a module costs milliseconds instead of seconds
+(BENCHMARK_STRATEGY_IMPORTS.py, tests/test_strategy_imports.py).
+
+Incremental contract (optional): for live/paper trading a strategy may implement
+
+- ``init_state(params)``: state dict of one param set (picklable)
+- ``update(state, bar)``: entry of the new bar (bar: mapping with
+  open/high/low/close/volume), O(1) per call; ``state['value']`` is the
+  value of ``calculate`` at that bar (dict of columns for a frame)
+
+fed with the bars in order, equal to ``generate_signals_fixed`` /
+``calculate`` on all bars (zenatus_core.incremental, tests/test_incremental.py).
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from numba import njit
+
+DEFAULT_PIP = 0.0001
+ENTRY_BATCH_SIZE = 64  # Param sets per generate_entries_batch call
+ENTRY_BATCH_MB = 128  # Entry columns kept per EntryBatches (bool, bars bytes each)
+
+
+def pack_entries(entries):
+    """Pack a boolean entries vector into bits (8 bars per byte)."""
+    return np.packbits(np.asarray(entries, dtype=np.bool_))
+
+
+def entries_fingerprint(entries):
+    """
+    Fingerprint of an entries vector.
+
+    Two vectors of the same symbol/date range with the same fingerprint are
+    bit-identical, so their backtest results can be reused.
+    """
+    entries = np.asarray(entries, dtype=np.bool_)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.int64(len(entries)).tobytes())
+    h.update(pack_entries(entries).tobytes())
+    return h.hexdigest()
+
+
+@njit(cache=True)
+def fixed_exits_nb(entries, close, high, low, tp, sl):
+    """
+    Exit bars of the strategies' fixed TP/SL loop: entry at the close of an
+    entry bar (entries are ignored while in a position, bar 0 is skipped),
+    exit on the first later bar with high >= close + tp or low <= close - sl.
+    """
+    exits = np.zeros(len(entries), dtype=np.bool_)
+    in_position = False
+    tp_level = 0.0
+    sl_level = 0.0
+    for i in range(1, len(entries)):
+        if entries[i] and not in_position:
+            in_position = True
+            tp_level = close[i] + tp
+            sl_level = close[i] - sl
+        elif in_position:
+            if high[i] >= tp_level or low[i] <= sl_level:
+                exits[i] = True
+                in_position = False
+    return exits
+
+
+def _truthy(values):
+    """Entries as the loop's ``if entries.iloc[i]`` reads them (NaN is an entry, None is not)."""
+    values = np.asarray(values)
+    if values.dtype == np.bool_:
+        return values
+    if values.dtype.kind in "iuf":
+        return values != 0
+    return np.fromiter((bool(v) for v in values), dtype=np.bool_, count=len(values))
+
+
+def fixed_exits(data, entries, tp_pips, sl_pips, pip=DEFAULT_PIP):
+    """Exits as a boolean Series on data.index, same result as the per-bar loop of the strategies."""
+    exits = fixed_exits_nb(_truthy(entries), np.asarray(data["close"].values, dtype=np.float64),
+                           np.asarray(data["high"].values, dtype=np.float64),
+                           np.asarray(data["low"].values, dtype=np.float64), tp_pips * pip, sl_pips * pip)
+    return pd.Series(exits, index=data.index)
+
+
+class FixedExitStrategy:
+    """
+    Base class for strategies that only define their entries.
+
+    Subclasses set ``PARAMETERS`` and implement ``generate_entries(data, params)``
+    (boolean Series or array on data.index). ``generate_signals_fixed`` returns
+    the usual signal dict; its exits come from `fixed_exits` with the
+    ``tp_pips``/``sl_pips`` params (defaults from ``PARAMETERS``) and stay all
+    False when ``signals_only`` is set.
+    """
+    PARAMETERS = {}
+    signals_only = False
+    pip = DEFAULT_PIP
+
+    def generate_entries(self, data, params):
+        raise NotImplementedError
+
+    def default(self, name, fallback):
+        return self.PARAMETERS.get(name, {}).get("default", fallback)
+
+    def generate_signals_fixed(self, data, params):
+        entries = self.generate_entries(data, params)
+        entries = pd.Series(np.asarray(entries), index=data.index).fillna(False).astype(bool)
+        if self.signals_only:
+            exits = pd.Series(False, index=data.index)
+        else:
+            exits = fixed_exits(data, entries, params.get("tp_pips", self.default("tp_pips", 50)),
+                                params.get("sl_pips", self.default("sl_pips", 25)), self.pip)
+        return {"entries": entries, "exits": exits, "tp_levels": pd.Series(np.nan, index=data.index),
+                "sl_levels": pd.Series(np.nan, index=data.index)}
+
+    def get_parameter_grid(self):
+        return {k: v.get("values", []) for k, v in self.PARAMETERS.items() if v.get("optimize")}
+
+    def backtest_vectorbt(self, data, params, init_cash=10000, fees=0.0, freq="1H"):
+        """Single vectorbt run with the strategy's own exits (vectorbt is imported here, see the import contract)."""
+        import vectorbt as vbt
+        signals = self.generate_signals_fixed(data, params)
+        return vbt.Portfolio.from_signals(data["close"], entries=signals["entries"], exits=signals["exits"],
+                                          freq=freq, init_cash=init_cash, fees=fees)
+
+
+class EntryBatches:
+    """
+    Entries of a strategy with ``generate_entries_batch`` for the param sets
+    of one symbol.
+
+    ``entries(params)`` computes the requested param set together with the
+    next ``batch_size - 1`` not yet computed ones of ``param_list`` in one
+    call and keeps the columns (LRU, ``budget_mb``) until they are asked for.
+    Param sets that are not in the list are computed on their own.
+    """
+
+    def __init__(self, instance, data, param_list, batch_size=ENTRY_BATCH_SIZE, budget_mb=ENTRY_BATCH_MB):
+        self.instance = instance
+        self.data = data
+        self.param_list = list(param_list)
+        self.batch_size = max(int(batch_size), 1)
+        self.budget = int(budget_mb * 1024 ** 2)
+        self.calls = 0
+        self._pos = {}
+        for k, params in enumerate(self.param_list):
+            self._pos.setdefault(repr(params), k)
+        self._columns = OrderedDict()
+        self._nbytes = 0
+
+    def _compute(self, param_list):
+        self.calls += 1
+        matrix = self.instance.generate_entries_batch(self.data, param_list)
+        matrix = np.asarray(matrix.values if isinstance(matrix, pd.DataFrame) else matrix)
+        if matrix.shape != (len(self.data), len(param_list)):
+            raise ValueError(f"generate_entries_batch returned shape {matrix.shape}, "
+                             f"expected {(len(self.data), len(param_list))}")
+        if matrix.dtype != np.bool_:
+            matrix = np.nan_to_num(matrix.astype(np.float64)) != 0
+        return matrix
+
+    def _keep(self, k, column):
+        self._columns[k] = column
+        self._nbytes += column.nbytes
+        while self._nbytes > self.budget and len(self._columns) > 1:
+            _, old = self._columns.popitem(last=False)
+            self._nbytes -= old.nbytes
+
+    def entries(self, params):
+        """Boolean entries Series of one param set on data.index."""
+        k = self._pos.get(repr(params))
+        if k is None:
+            return pd.Series(self._compute([params])[:, 0], index=self.data.index)
+        column = self._columns.get(k)
+        if column is None:
+            block = [k]
+            for j in range(k + 1, len(self.param_list)):
+                if len(block) >= self.batch_size:
+                    break
+                if j not in self._columns:
+                    block.append(j)
+            matrix = self._compute([self.param_list[j] for j in block])
+            for j, c in zip(block, matrix.T):
+                self._keep(j, np.ascontiguousarray(c))
+            column = matrix[:, 0]
+        else:
+            self._columns.move_to_end(k)
+        return pd.Series(column, index=self.data.index)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed_Exit simulation helpers shared by the 1h/30m workers.
+
+Two modes are supported:
+
+- ``broadcast``: close/entries are passed once as 1-D series and only the
+  TP/SL arrays carry one value per column. vectorbt broadcasts close as a
+  read-only stride-0 view, so no (bars x combos) copies are materialized.
+- ``replicate``: legacy behaviour, ``pd.concat`` of close/entries per combo.
+
+`simulate_fixed_exit_cross` runs several symbols aligned on a common index in
+a single call (symbol-major column layout, per-column TP/SL).
+
+Passing ``parallel=<threads>`` simulates the columns in parallel threads
+(vendored vectorbt only, see ``Vectorbt_Master``).
+"""
+
+import numpy as np
+import pandas as pd
+import vectorbt as vbt
+
+SIM_MODES = ("broadcast", "replicate")
+DEFAULT_SIM_MODE = "broadcast"
+DEFAULT_MEMORY_BUDGET_MB = 512
+
+# Approximate peak bytes per (bar, column) cell during one chunk.
+# broadcast: call_seq (int64) built by vectorbt + headroom; metrics are reduced
+#            per column by zenatus_core.metrics, so no value/cash frames exist
+# replicate: additionally the copied close (8) and entries (1) frames plus
+#            the order records sized bars*cols by default (56)
+# cross:     close/entries gathered per column, order records bounded
+BYTES_PER_CELL = {
+    "broadcast": 16,
+    "replicate": 16 + 8 + 1 + 56,
+    "cross": 16 + 8 + 1,
+}
+ORDER_RECORD_BYTES = 56
+
+
+def chunk_size_for_budget(n_bars, n_combos, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB, mode=DEFAULT_SIM_MODE,
+                          n_entries=0):
+    """Number of TP/SL columns that fit into the memory budget for one chunk."""
+    if n_combos <= 0:
+        return 0
+    per_column = max(1, int(n_bars)) * BYTES_PER_CELL.get(mode, BYTES_PER_CELL["replicate"])
+    if mode in ("broadcast", "cross"):
+        # Order records are bounded by the entry count (see max_orders_for)
+        per_column += (2 * int(n_entries) + 1) * ORDER_RECORD_BYTES
+    chunk = int(memory_budget_mb * 1024 * 1024 // per_column)
+    return max(1, min(chunk, int(n_combos)))
+
+
+def max_orders_for(entries, n_cols):
+    """Upper bound of order records: one entry and one exit per entry signal."""
+    n_entries = int(np.count_nonzero(np.asarray(entries)))
+    return int(n_cols) * (2 * n_entries + 1)
+
+
+def simulate_fixed_exit(close, entries, tp_stop, sl_stop, mode=DEFAULT_SIM_MODE, **pf_kwargs):
+    """
+    Run ``Portfolio.from_signals`` for one chunk of TP/SL combos.
+
+    Args:
+        close: pd.Series with close prices
+        entries: boolean pd.Series aligned with close
+        tp_stop, sl_stop: 1-D arrays, one (relative) stop per column
+        mode: 'broadcast' or 'replicate'
+        pf_kwargs: forwarded to ``vbt.Portfolio.from_signals``
+
+    Returns:
+        vbt.Portfolio with one column per TP/SL combo
+    """
+    if mode not in SIM_MODES:
+        raise ValueError(f"Unknown simulation mode '{mode}', expected one of {SIM_MODES}")
+    tp_stop = np.asarray(tp_stop, dtype=np.float64)
+    sl_stop = np.asarray(sl_stop, dtype=np.float64)
+    n_cols = len(tp_stop)
+
+    if mode == "broadcast":
+        # (1, N) rows broadcast against the (bars,) close -> (bars, N) without copying close.
+        # requirements=[] keeps the broadcast view read-only instead of forcing a writable copy.
+        return vbt.Portfolio.from_signals(
+            close=close,
+            entries=entries,
+            tp_stop=tp_stop[None, :],
+            sl_stop=sl_stop[None, :],
+            max_orders=max_orders_for(entries, n_cols),
+            broadcast_kwargs=dict(require_kwargs=dict(requirements=[])),
+            **pf_kwargs
+        )
+
+    # Always use DataFrame to ensure consistent 2D shape for vbt
+    close_in = pd.concat([close] * n_cols, axis=1)
+    entries_in = pd.concat([entries] * n_cols, axis=1)
+
+    # Ensure unique column names
+    cols = [f"c{k}" for k in range(n_cols)]
+    close_in.columns = cols
+    entries_in.columns = cols
+
+    return vbt.Portfolio.from_signals(
+        close=close_in,
+        entries=entries_in,
+        tp_stop=tp_stop,
+        sl_stop=sl_stop,
+        **pf_kwargs
+    )
+
+
+def align_close(frames):
+    """
+    Align the close prices of several symbols on their common (union) index.
+
+    Args:
+        frames: list of OHLC DataFrames, one per symbol
+
+    Returns:
+        index, close (bars x symbols, gaps forward/back filled), valid mask
+    """
+    from zenatus_core.panel import Panel
+    return Panel.from_frames(dict(enumerate(frames)), ["close"]).aligned_close()
+
+
+def simulate_fixed_exit_cross(index, close, entries, col_symbol, tp_stop, sl_stop, **pf_kwargs):
+    """
+    Run ``Portfolio.from_signals`` for several symbols in a single call.
+
+    Args:
+        index: common index of the aligned symbols
+        close: aligned close prices (bars x symbols), see `align_close`
+        entries: aligned boolean entries (bars x symbols), False on gaps
+        col_symbol: symbol (column of close/entries) of every portfolio column
+        tp_stop, sl_stop: 1-D arrays, one (relative) stop per portfolio column
+        pf_kwargs: forwarded to ``vbt.Portfolio.from_signals``
+
+    Filled gap bars repeat the last close, so stops never trigger on them and
+    entries are masked there; metrics skip them via the valid mask.
+    """
+    col_symbol = np.asarray(col_symbol, dtype=np.int64)
+    tp_stop = np.asarray(tp_stop, dtype=np.float64)
+    sl_stop = np.asarray(sl_stop, dtype=np.float64)
+    n_entries = np.count_nonzero(entries, axis=0)
+    col_orders = 2 * n_entries[col_symbol] + 1
+    if pf_kwargs.get("parallel"):
+        # The parallel simulation splits max_orders evenly across columns
+        max_orders = len(col_symbol) * int(col_orders.max())
+    else:
+        max_orders = int(col_orders.sum())
+    return vbt.Portfolio.from_signals(
+        close=pd.DataFrame(close[:, col_symbol], index=index),
+        entries=pd.DataFrame(entries[:, col_symbol], index=index),
+        tp_stop=tp_stop[None, :],
+        sl_stop=sl_stop[None, :],
+        max_orders=max_orders,
+        broadcast_kwargs=dict(require_kwargs=dict(requirements=[])),
+        **pf_kwargs
+    )
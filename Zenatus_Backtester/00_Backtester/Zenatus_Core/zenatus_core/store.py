@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Memory-mapped columnar OHLCV store.
+
+Every symbol/timeframe ``99_Historic_Data/Forex/Major/{tf}/{symbol}/{symbol}_aggregated.csv``
+(or ``.parquet``, e.g. 30m) gets a store directory next to it::
+
+    {symbol}_store/
+        schema.json     columns, dtypes, rows, first/last bar, content hash, source file size/mtime
+        validation.json validation report of the conversion/ingest (see validate.py)
+        time.npy        int64, ns since epoch (naive, like the CSV), ascending
+        open.npy ...    float64, one file per column
+
+The arrays are opened with ``np.load(mmap_mode="c")``: nothing is read until
+a page is touched, all processes share the page cache, and writes (strategies
+that modify ``df`` in place) go to private copy-on-write pages, never to the
+file. Date ranges are sliced with ``searchsorted`` on the time column.
+
+``load_ohlcv`` falls back to parsing the source file when there is no store
+or it changed since the conversion (size/mtime differ from the schema); the
+parsed file is then normalized like a conversion would (validate.py), so
+both paths give the same bars. Convert once with
+``00_Backtester/Zenatus_Core/CONVERT_OHLCV_STORE.py``.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from zenatus_core.validate import validate_frame, write_validation
+
+STORE_VERSION = 1
+STORE_SUFFIX = "_store"
+SCHEMA_FILE = "schema.json"
+TIME_COLUMN = "time"
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+SOURCE_SUFFIXES = (".csv", ".parquet")
+
+
+def source_path(data_path, timeframe, symbol):
+    """Aggregated source file of one symbol/timeframe (CSV, else parquet; the CSV path if neither exists)."""
+    base = Path(data_path) / timeframe / symbol / f"{symbol}_aggregated"
+    for suffix in SOURCE_SUFFIXES:
+        if base.with_suffix(suffix).exists():
+            return base.with_suffix(suffix)
+    return base.with_suffix(SOURCE_SUFFIXES[0])
+
+
+def store_path(data_path, timeframe, symbol):
+    """Store directory of one symbol/timeframe."""
+    return Path(data_path) / timeframe / symbol / f"{symbol}{STORE_SUFFIX}"
+
+
+def read_aggregated(fp):
+    """
+    Parse an aggregated CSV/parquet like the workers always did: lower-case
+    columns, first of duplicate columns, ``time`` as DatetimeIndex.
+    """
+    is_parquet = isinstance(fp, (str, os.PathLike)) and Path(fp).suffix == ".parquet"
+    df = pd.read_parquet(fp) if is_parquet else pd.read_csv(fp)  # Buffers are CSV (see ingest.py)
+    df.columns = [c.lower() for c in df.columns]
+    if len(df.columns) != len(set(df.columns)):
+        print(f"[WARN] Duplicate columns in {Path(fp).name}: {df.columns.tolist()}")
+        df = df.loc[:, ~df.columns.duplicated()]
+    df[TIME_COLUMN] = pd.to_datetime(df[TIME_COLUMN])
+    df.set_index(TIME_COLUMN, inplace=True)
+    return df
+
+
+def frame_hash(df):
+    """Content hash of a time-indexed frame (index + column names and values), 16 hex chars."""
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(df.index.values.astype("datetime64[ns]").view(np.int64)).tobytes())
+    for c in df.columns:
+        h.update(str(c).encode())
+        h.update(np.ascontiguousarray(df[c].values, dtype=np.float64).tobytes())
+    return h.hexdigest()[:16]
+
+
+SOURCE_TAIL_BYTES = 4096
+
+
+def source_tail_hash(fp, size):
+    """sha1 of the last SOURCE_TAIL_BYTES before ``size`` (detects rewrites of an appended-to file)."""
+    with open(fp, "rb") as f:
+        f.seek(max(0, size - SOURCE_TAIL_BYTES))
+        return hashlib.sha1(f.read(min(size, SOURCE_TAIL_BYTES))).hexdigest()[:16]
+
+
+def _source_info(fp):
+    st = os.stat(fp)
+    return {"path": Path(fp).name, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+            "tail": source_tail_hash(fp, st.st_size)}
+
+
+def write_store(path, df, source=None, extra=None, report=None):
+    """
+    Write a time-indexed frame as a store (temp dir + rename, readers never
+    see a half-written store; processes that still map the old arrays keep them).
+
+    ``report`` (validate_frame) is stored as validation.json, the content
+    hash (frame_hash) always goes into the schema.
+
+    Numeric columns are stored as float64, the index as int64 ns. Unsorted
+    input is sorted (stable) so the time column can be binary searched.
+    """
+    path = Path(path)
+    if not df.index.is_monotonic_increasing:
+        print(f"[WARN] {path.name}: time index not sorted, sorting")
+        df = df.sort_index(kind="stable")
+    columns = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    times = df.index.values.astype("datetime64[ns]").view(np.int64)
+    np.save(tmp / f"{TIME_COLUMN}.npy", np.ascontiguousarray(times, dtype=np.int64))
+    for c in columns:
+        np.save(tmp / f"{c}.npy", np.ascontiguousarray(df[c].values, dtype=np.float64))
+
+    schema = {
+        "version": STORE_VERSION,
+        "rows": int(len(df)),
+        "time": {"name": TIME_COLUMN, "dtype": "int64", "unit": "ns"},
+        "columns": [{"name": c, "dtype": "float64"} for c in columns],
+        "first": str(df.index[0]) if len(df) else None,
+        "last": str(df.index[-1]) if len(df) else None,
+        "hash": frame_hash(df[columns]),
+        "validated": report is not None,
+        "source": source,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    schema.update(extra or {})
+    with open(tmp / SCHEMA_FILE, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
+    if report is not None:
+        write_validation(tmp, dict(report, hash=schema["hash"]))
+
+    old = path.with_name(f".{path.name}.old-{os.getpid()}")
+    if path.exists():
+        os.replace(path, old)
+    os.replace(tmp, path)
+    if old.exists():
+        shutil.rmtree(old, ignore_errors=True)
+    return schema
+
+
+def read_schema(path):
+    """Schema dict of a store, None if there is none."""
+    fp = Path(path) / SCHEMA_FILE
+    if not fp.exists():
+        return None
+    with open(fp, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_fresh(schema, source_fp):
+    """True if the store was converted from the source file as it is now."""
+    if schema is None or schema.get("version") != STORE_VERSION:
+        return False
+    source = schema.get("source")
+    if source is None or not Path(source_fp).exists():
+        return True  # No source to compare against, the store is the data
+    st = os.stat(source_fp)
+    return source.get("size") == st.st_size and source.get("mtime_ns") == st.st_mtime_ns
+
+
+def convert_symbol(data_path, timeframe, symbol, force=False):
+    """
+    Convert one aggregated CSV/parquet into a store.
+
+    Returns the schema, or None if there is no source file. Skips the
+    conversion if the store is already current (unless force).
+    """
+    src = source_path(data_path, timeframe, symbol)
+    if not src.exists():
+        return None
+    dst = store_path(data_path, timeframe, symbol)
+    schema = read_schema(dst)
+    if not force and is_fresh(schema, src):
+        return schema
+    df, report = validate_frame(read_aggregated(src), timeframe, f"{symbol} {timeframe}")
+    return write_store(dst, df, _source_info(src), report=report)
+
+
+def open_store(path):
+    """
+    Open a store zero-copy.
+
+    Returns:
+        (times int64 memmap, {column: float64 memmap}, schema), or None
+    """
+    path = Path(path)
+    schema = read_schema(path)
+    if schema is None:
+        return None
+    times = np.load(path / f"{TIME_COLUMN}.npy", mmap_mode="c")
+    columns = {c["name"]: np.load(path / f"{c['name']}.npy", mmap_mode="c") for c in schema["columns"]}
+    return times, columns, schema
+
+
+def slice_range(times, start=None, end=None):
+    """Bar positions [lo, hi) of start <= time < end (binary search on sorted int64 ns)."""
+    lo = 0 if start is None else int(np.searchsorted(times, pd.Timestamp(start).value, side="left"))
+    hi = len(times) if end is None else int(np.searchsorted(times, pd.Timestamp(end).value, side="left"))
+    return lo, max(lo, hi)
+
+
+def frame_from_arrays(times, columns, lo=0, hi=None):
+    """DataFrame over [lo, hi) of the arrays without copying the column data."""
+    hi = len(times) if hi is None else hi
+    index = pd.DatetimeIndex(times[lo:hi].view("datetime64[ns]"), name=TIME_COLUMN)
+    return pd.DataFrame({c: a[lo:hi] for c, a in columns.items()}, index=index, copy=False)
+
+
+def load_ohlcv(data_path, timeframe, symbol, start=None, end=None):
+    """
+    OHLCV frame of one symbol/timeframe for start <= time < end.
+
+    Uses the memory-mapped store when it is current, otherwise parses the
+    aggregated source file (same result, just slower). None if neither exists.
+    """
+    src = source_path(data_path, timeframe, symbol)
+    dst = store_path(data_path, timeframe, symbol)
+    schema = read_schema(dst)
+    if is_fresh(schema, src):
+        times, columns, _ = open_store(dst)
+        lo, hi = slice_range(times, start, end)
+        return frame_from_arrays(times, columns, lo, hi)
+
+    if not src.exists():
+        return None
+    if schema is not None:
+        print(f"[WARN] {symbol} {timeframe}: store outdated, reading {src.name} (run CONVERT_OHLCV_STORE.py)")
+    df, _ = validate_frame(read_aggregated(src), timeframe, f"{symbol} {timeframe}")
+    if start is not None:
+        df = df[df.index >= start]
+    if end is not None:
+        df = df[df.index < end]
+    return df
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Validation and normalization of OHLCV frames, run once when a source file
+is converted or ingested into the store (store.convert_symbol,
+ingest.append_to_store), not on every backtest run.
+
+Normalization (changes the data):
+- time index sorted (stable) and unique (duplicate timestamps: last row wins)
+- bars without any OHLC value dropped
+
+Checks (reported only, the bars stay):
+- bars with some OHLC values missing
+- zero-range bars (high == low)
+- inconsistent bars (high < max(open, close), low > min(open, close))
+- gaps longer than one bar, split into regular weekend closes and other
+  gaps (holidays, missing data)
+
+The report is written as ``validation.json`` into the store directory, next
+to the content hash in ``schema.json``; workers trust a current store and
+do no cleaning of their own.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ("open", "high", "low", "close")
+VALIDATION_FILE = "validation.json"
+WEEKEND_GAP_MAX_HOURS = 80  # Friday close -> Sunday/Monday open (daily bars: Fri -> Mon = 72h)
+MAX_LISTED_GAPS = 10
+
+
+class DataValidationError(ValueError):
+    """The frame cannot be used at all (e.g. OHLC columns missing)."""
+
+
+def _step_seconds(index, timeframe=None):
+    if timeframe is not None:
+        from zenatus_core.resample import timeframe_seconds  # resample -> store -> validate
+        try:
+            return timeframe_seconds(timeframe)
+        except ValueError:
+            pass
+    if len(index) < 2:
+        return None
+    return int(np.median(np.diff(index.values.astype("datetime64[s]").astype(np.int64))))
+
+
+def _gaps(index, step):
+    """(weekend gaps, largest other gaps as [{start, end, hours}], bars missing in other gaps, other gaps)."""
+    if step is None or len(index) < 2:
+        return 0, [], 0, 0
+    t = index.values.astype("datetime64[s]").astype(np.int64)
+    d = np.diff(t)
+    pos = np.flatnonzero(d > step)
+    starts, ends = index[pos], index[pos + 1]
+    weekend = ((starts.dayofweek >= 4) & ((ends.dayofweek == 6) | (ends.dayofweek == 0))
+               & (d[pos] <= WEEKEND_GAP_MAX_HOURS * 3600))
+    other = pos[~weekend]
+    other = other[np.argsort(-d[other], kind="stable")]
+    listed = [{"start": str(index[k]), "end": str(index[k + 1]), "hours": round(float(d[k]) / 3600, 2)}
+              for k in other[:MAX_LISTED_GAPS]]
+    missing = int(np.sum(d[other] // step - 1))
+    return int(np.count_nonzero(weekend)), listed, missing, len(other)
+
+
+def validate_frame(df, timeframe=None, name=""):
+    """
+    Normalize an OHLCV frame and describe its quality.
+
+    Returns:
+        (normalized frame, report dict). Raises DataValidationError if OHLC
+        columns are missing or the index is not a DatetimeIndex.
+    """
+    missing_cols = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing_cols:
+        raise DataValidationError(f"{name}: missing columns {missing_cols}")
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise DataValidationError(f"{name}: index is not a DatetimeIndex")
+
+    rows_in = len(df)
+    unsorted = 0
+    if not df.index.is_monotonic_increasing:
+        unsorted = int(np.count_nonzero(np.diff(df.index.values.astype("datetime64[ns]").astype(np.int64)) < 0))
+        df = df.sort_index(kind="stable")
+    duplicated = df.index.duplicated(keep="last")
+    if duplicated.any():
+        df = df[~duplicated]
+    ohlc = df[list(REQUIRED_COLUMNS)]
+    nan_any = ohlc.isna().any(axis=1).values
+    nan_all = ohlc.isna().all(axis=1).values
+    if nan_all.any():
+        df = df[~nan_all]
+        ohlc = df[list(REQUIRED_COLUMNS)]
+
+    o, h, l, c = (ohlc[k].values for k in REQUIRED_COLUMNS)
+    with np.errstate(invalid="ignore"):
+        zero_range = int(np.count_nonzero(h == l))
+        inconsistent = int(np.count_nonzero((h < np.fmax(o, c)) | (l > np.fmin(o, c)) | (h < l)))
+    step = _step_seconds(df.index, timeframe)
+    weekend_gaps, gaps, missing_bars, n_gaps = _gaps(df.index, step)
+
+    checks = {
+        "unsorted": unsorted,
+        "duplicate_times": int(np.count_nonzero(duplicated)),
+        "empty_bars": int(np.count_nonzero(nan_all)),
+        "partial_nan_bars": int(np.count_nonzero(nan_any & ~nan_all)),
+        "zero_range_bars": zero_range,
+        "inconsistent_bars": inconsistent,
+        "weekend_gaps": weekend_gaps,
+        "other_gaps": n_gaps,
+        "missing_bars": missing_bars,
+    }
+    fixed = checks["unsorted"] + checks["duplicate_times"] + checks["empty_bars"]
+    warnings = checks["partial_nan_bars"] + checks["inconsistent_bars"]
+    report = {
+        "name": name,
+        "timeframe": timeframe,
+        "status": "fixed" if fixed else ("warn" if warnings else "ok"),
+        "rows_in": rows_in,
+        "rows": int(len(df)),
+        "first": str(df.index[0]) if len(df) else None,
+        "last": str(df.index[-1]) if len(df) else None,
+        "step_seconds": step,
+        "columns": list(df.columns),
+        "checks": checks,
+        "largest_other_gaps": gaps,
+    }
+    if report["status"] != "ok":
+        problems = ", ".join(f"{k}={v}" for k, v in checks.items()
+                             if v and k in ("unsorted", "duplicate_times", "empty_bars", "partial_nan_bars",
+                                            "inconsistent_bars"))
+        print(f"[VALIDATE] {name}: {report['status']} ({problems})")
+    return df, report
+
+
+def read_validation(store_dir):
+    """Validation report of a store, None if there is none."""
+    fp = Path(store_dir) / VALIDATION_FILE
+    if not fp.exists():
+        return None
+    with open(fp, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_validation(store_dir, report):
+    with open(Path(store_dir) / VALIDATION_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
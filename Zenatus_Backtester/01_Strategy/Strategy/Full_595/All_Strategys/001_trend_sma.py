@@ -5,11 +5,23 @@ Einfachster Trend-Indikator, Basis für viele andere
 
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import warnings
 warnings.filterwarnings("ignore")
 
+try:
+    from zenatus_core import kernels  # Numba kernels (Zenatus_Core on the path), otherwise pandas per period
+except ImportError:
+    kernels = None
+try:
+    from zenatus_core import incremental  # init_state/update (Live/Paper-Trading), otherwise batch only
+except ImportError:
+    incremental = None
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
+
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
 __date__ = "2025-10-02"
@@ -91,10 +103,53 @@ class Indicator_SMA:
         period = params.get('period', self.PARAMETERS['period']['default'])
         
         # Simple Moving Average
-        sma = data['close'].rolling(window=period, min_periods=1).mean()
+        p = getattr(self, 'primitives', None)
+        sma = p.sma(data['close'], period, min_periods=1) if p else data['close'].rolling(window=period, min_periods=1).mean()
         
         return sma
     
+    def calculate_batch(self, data: pd.DataFrame, param_list: List[Dict]) -> np.ndarray:
+        """
+        SMA für mehrere Parameter-Sets in einem Durchlauf.
+        
+        Returns:
+            np.ndarray: bars x n_params, Spalte k == calculate(data, param_list[k])
+        """
+        for params in param_list:
+            self.validate_params(params)
+        periods = [params.get('period', self.PARAMETERS['period']['default']) for params in param_list]
+        if kernels is not None:
+            return kernels.rolling_mean_batch_nb(data['close'].values.astype(np.float64),
+                                                 np.array(periods, dtype=np.int64), 1)
+        return np.column_stack([data['close'].rolling(window=p, min_periods=1).mean().values for p in periods])
+    
+    def generate_entries_batch(self, data: pd.DataFrame, param_list: List[Dict]) -> np.ndarray:
+        """Long-Entries von generate_signals_fixed für mehrere Parameter-Sets (bars x n_params)."""
+        sma = self.calculate_batch(data, param_list)
+        close = data['close'].values.astype(np.float64)[:, None]
+        entries = close > sma
+        entries[0] = False
+        entries[1:] &= close[:-1] <= sma[:-1]
+        return entries
+    
+    def init_state(self, params: Dict) -> Dict:
+        """Zustand für update() eines Parameter-Sets (zenatus_core.incremental)."""
+        if incremental is None:
+            raise ImportError("init_state/update need zenatus_core.incremental (Zenatus_Core on the path)")
+        self.validate_params(params)
+        period = params.get('period', self.PARAMETERS['period']['default'])
+        return {'sma': incremental.RollingMean(period, min_periods=1),
+                'cross': incremental.CrossAbove(), 'value': np.nan}
+    
+    def update(self, state: Dict, bar) -> bool:
+        """
+        Long-Entry des neuen Bars in O(1).
+        
+        Die Bars der Reihe nach: Entries == generate_signals_fixed, state['value'] == calculate.
+        """
+        state['value'] = state['sma'].update(bar['close'])
+        return state['cross'].update(bar['close'], state['value'])
+    
     def generate_signals_fixed(
         self, 
         data: pd.DataFrame, 
@@ -140,17 +195,20 @@ class Indicator_SMA:
         in_position = False
         entry_price = 0
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                # Check TP/SL
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    # Check TP/SL
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         # Dummy TP/SL levels für VectorBT (werden nicht verwendet)
         tp_levels = pd.Series(np.nan, index=data.index)
@@ -331,7 +389,7 @@ class Indicator_SMA:
         strategy_type: str = 'fixed',
         init_cash: float = 10000,
         fees: float = 0.0
-    ) -> vbt.Portfolio:
+    ) -> "vbt.Portfolio":
         """
         Führt VectorBT Backtest durch.
         
@@ -345,6 +403,7 @@ class Indicator_SMA:
         Returns:
             vbt.Portfolio: Backtest Ergebnis
         """
+        import vectorbt as vbt
         if strategy_type == 'fixed':
             signals = self.generate_signals_fixed(data, params)
             
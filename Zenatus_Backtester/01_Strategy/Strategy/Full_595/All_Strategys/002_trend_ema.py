@@ -5,11 +5,23 @@ Gewichtet neuere Preise stärker als ältere
 
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
-from typing import Dict
+from typing import Dict, List
 import warnings
 warnings.filterwarnings("ignore")
 
+try:
+    from zenatus_core import kernels  # Numba kernels (Zenatus_Core on the path), otherwise pandas per period
+except ImportError:
+    kernels = None
+try:
+    from zenatus_core import incremental  # init_state/update (Live/Paper-Trading), otherwise batch only
+except ImportError:
+    incremental = None
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
+
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
 __date__ = "2025-10-02"
@@ -81,9 +93,43 @@ class Indicator_EMA:
         """
         self.validate_params(params)
         period = params.get('period', self.PARAMETERS['period']['default'])
-        ema = data['close'].ewm(span=period, adjust=False).mean()
+        p = getattr(self, 'primitives', None)
+        ema = p.ema(data['close'], period, adjust=False) if p else data['close'].ewm(span=period, adjust=False).mean()
         return ema
     
+    def calculate_batch(self, data: pd.DataFrame, param_list: List[Dict]) -> np.ndarray:
+        """EMA für mehrere Parameter-Sets in einem Durchlauf (bars x n_params, Spalte k == calculate(data, param_list[k]))."""
+        for params in param_list:
+            self.validate_params(params)
+        periods = [params.get('period', self.PARAMETERS['period']['default']) for params in param_list]
+        if kernels is not None:
+            coms = (np.array(periods, dtype=np.float64) - 1) / 2  # span -> com wie in pandas
+            return kernels.ewm_mean_batch_nb(data['close'].values.astype(np.float64), coms, False)
+        return np.column_stack([data['close'].ewm(span=p, adjust=False).mean().values for p in periods])
+    
+    def generate_entries_batch(self, data: pd.DataFrame, param_list: List[Dict]) -> np.ndarray:
+        """Long-Entries von generate_signals_fixed für mehrere Parameter-Sets (bars x n_params)."""
+        ema = self.calculate_batch(data, param_list)
+        close = data['close'].values.astype(np.float64)[:, None]
+        entries = close > ema
+        entries[0] = False
+        entries[1:] &= close[:-1] <= ema[:-1]
+        return entries
+    
+    def init_state(self, params: Dict) -> Dict:
+        """Zustand für update() eines Parameter-Sets (zenatus_core.incremental)."""
+        if incremental is None:
+            raise ImportError("init_state/update need zenatus_core.incremental (Zenatus_Core on the path)")
+        self.validate_params(params)
+        period = params.get('period', self.PARAMETERS['period']['default'])
+        return {'ema': incremental.Ewm(span=period, adjust=False),
+                'cross': incremental.CrossAbove(), 'value': np.nan}
+    
+    def update(self, state: Dict, bar) -> bool:
+        """Long-Entry des neuen Bars in O(1) (Entries == generate_signals_fixed, state['value'] == calculate)."""
+        state['value'] = state['ema'].update(bar['close'])
+        return state['cross'].update(bar['close'], state['value'])
+    
     def generate_signals_fixed(self, data: pd.DataFrame, params: Dict) -> Dict[str, pd.Series]:
         """A.a) Fixed TP/SL Strategie."""
         ema = self.calculate(data, params)
@@ -98,16 +144,19 @@ class Indicator_EMA:
         in_position = False
         entry_price, tp_level, sl_level = 0, 0, 0
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         tp_levels = pd.Series(np.nan, index=data.index)
         sl_levels = pd.Series(np.nan, index=data.index)
@@ -189,8 +238,9 @@ class Indicator_EMA:
         return grid
     
     def backtest_vectorbt(self, data: pd.DataFrame, params: Dict, strategy_type: str = 'fixed',
-                         init_cash: float = 10000, fees: float = 0.0) -> vbt.Portfolio:
+                         init_cash: float = 10000, fees: float = 0.0) -> "vbt.Portfolio":
         """Führt VectorBT Backtest durch."""
+        import vectorbt as vbt
         if strategy_type == 'fixed':
             signals = self.generate_signals_fixed(data, params)
             portfolio = vbt.Portfolio.from_signals(
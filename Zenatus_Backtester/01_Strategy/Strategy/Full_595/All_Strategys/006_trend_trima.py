@@ -5,10 +5,13 @@ Doppelt geglätteter Moving Average
 
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
@@ -101,16 +104,19 @@ class Indicator_TRIMA:
         in_position = False
         entry_price, tp_level, sl_level = 0, 0, 0
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         tp_levels = pd.Series(np.nan, index=data.index)
         sl_levels = pd.Series(np.nan, index=data.index)
@@ -173,8 +179,9 @@ class Indicator_TRIMA:
         return grid
     
     def backtest_vectorbt(self, data: pd.DataFrame, params: Dict, strategy_type: str = 'fixed',
-                         init_cash: float = 10000, fees: float = 0.0) -> vbt.Portfolio:
+                         init_cash: float = 10000, fees: float = 0.0) -> "vbt.Portfolio":
         """Führt VectorBT Backtest durch."""
+        import vectorbt as vbt
         if strategy_type == 'fixed':
             signals = self.generate_signals_fixed(data, params)
             portfolio = vbt.Portfolio.from_signals(
@@ -5,11 +5,19 @@ Passt sich an Markt-Volatilität an
 
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
 
+try:
+    from zenatus_core import incremental  # init_state/update (Live/Paper-Trading), otherwise batch only
+except ImportError:
+    incremental = None
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
+
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
 __date__ = "2025-10-02"
@@ -119,6 +127,35 @@ class Indicator_KAMA:
         
         return kama
     
+    def init_state(self, params: Dict) -> Dict:
+        """Zustand für update() eines Parameter-Sets (zenatus_core.incremental)."""
+        if incremental is None:
+            raise ImportError("init_state/update need zenatus_core.incremental (Zenatus_Core on the path)")
+        self.validate_params(params)
+        period = params.get('period', self.PARAMETERS['period']['default'])
+        fast = params.get('fast', self.PARAMETERS['fast']['default'])
+        slow = params.get('slow', self.PARAMETERS['slow']['default'])
+        return {'period': period, 'fast_sc': 2 / (fast + 1), 'slow_sc': 2 / (slow + 1), 'bars': 0,
+                'lag': incremental.Lag(period), 'prev_close': incremental.Lag(1),
+                'volatility': incremental.RollingSum(period),
+                'cross': incremental.CrossAbove(), 'value': np.nan}
+    
+    def update(self, state: Dict, bar) -> bool:
+        """Long-Entry des neuen Bars in O(1) (Entries == generate_signals_fixed, state['value'] == calculate)."""
+        close = bar['close']
+        change = abs(close - state['lag'].update(close))
+        volatility = state['volatility'].update(abs(close - state['prev_close'].update(close)))
+        
+        # Gleiche Rekursion wie calculate: Start bei Bar 'period'
+        i, state['bars'] = state['bars'], state['bars'] + 1
+        if i == state['period']:
+            state['value'] = close
+        elif i > state['period']:
+            er = change / (volatility + 1e-10)
+            sc = (er * (state['fast_sc'] - state['slow_sc']) + state['slow_sc']) ** 2
+            state['value'] = state['value'] + sc * (close - state['value'])
+        return state['cross'].update(close, state['value'])
+    
     def generate_signals_fixed(self, data: pd.DataFrame, params: Dict) -> Dict[str, pd.Series]:
         """A.a) Fixed TP/SL Strategie."""
         kama = self.calculate(data, params)
@@ -134,16 +171,19 @@ class Indicator_KAMA:
         in_position = False
         entry_price, tp_level, sl_level = 0, 0, 0
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         tp_levels = pd.Series(np.nan, index=data.index)
         sl_levels = pd.Series(np.nan, index=data.index)
@@ -212,8 +252,9 @@ class Indicator_KAMA:
         return grid
     
     def backtest_vectorbt(self, data: pd.DataFrame, params: Dict, strategy_type: str = 'fixed',
-                         init_cash: float = 10000, fees: float = 0.0) -> vbt.Portfolio:
+                         init_cash: float = 10000, fees: float = 0.0) -> "vbt.Portfolio":
         """Führt VectorBT Backtest durch."""
+        import vectorbt as vbt
         if strategy_type == 'fixed':
             signals = self.generate_signals_fixed(data, params)
             portfolio = vbt.Portfolio.from_signals(
@@ -5,11 +5,23 @@ Volatilitäts-adaptiver EMA
 
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
 
+try:
+    from zenatus_core import kernels  # Numba kernels (Zenatus_Core on the path), otherwise the Python loops below
+except ImportError:
+    kernels = None
+try:
+    from zenatus_core import incremental  # init_state/update (Live/Paper-Trading), otherwise batch only
+except ImportError:
+    incremental = None
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
+
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
 __date__ = "2025-10-02"
@@ -55,11 +67,49 @@ class Indicator_VIDYA:
         
         # VIDYA
         vidya = data['close'].ewm(alpha=base_alpha, adjust=False).mean()
-        for i in range(1, len(data)):
-            alpha = adaptive_alpha.iloc[i] if not np.isnan(adaptive_alpha.iloc[i]) else base_alpha
-            vidya.iloc[i] = alpha * data['close'].iloc[i] + (1 - alpha) * vidya.iloc[i-1]
+        if kernels is not None:
+            vidya[:] = kernels.adaptive_ema_nb(data['close'].values.astype(np.float64),
+                                               adaptive_alpha.values.astype(np.float64), base_alpha)
+        else:
+            for i in range(1, len(data)):
+                alpha = adaptive_alpha.iloc[i] if not np.isnan(adaptive_alpha.iloc[i]) else base_alpha
+                vidya.iloc[i] = alpha * data['close'].iloc[i] + (1 - alpha) * vidya.iloc[i-1]
         
         return vidya
+    
+    def init_state(self, params: Dict) -> Dict:
+        """Zustand für update() eines Parameter-Sets (zenatus_core.incremental)."""
+        if incremental is None:
+            raise ImportError("init_state/update need zenatus_core.incremental (Zenatus_Core on the path)")
+        self.validate_params(params)
+        period = params.get('period', 20)
+        cmo_period = params.get('cmo_period', 9)
+        return {'base_alpha': 2 / (period + 1), 'prev_close': incremental.Lag(1),
+                'sum_up': incremental.RollingSum(cmo_period), 'sum_down': incremental.RollingSum(cmo_period),
+                'cross': incremental.CrossAbove(), 'value': np.nan, 'bars': 0}
+    
+    def update(self, state: Dict, bar) -> bool:
+        """Long-Entry des neuen Bars in O(1) (Entries == generate_signals_fixed, state['value'] == calculate)."""
+        close = bar['close']
+        diff = close - state['prev_close'].update(close)
+        
+        # CMO wie in calculate (clip lässt NaN stehen)
+        up = diff if diff >= 0 or diff != diff else 0.0
+        down = -(diff if diff <= 0 or diff != diff else 0.0)
+        sum_up = state['sum_up'].update(up)
+        sum_down = state['sum_down'].update(down)
+        cmo = abs((sum_up - sum_down) / (sum_up + sum_down + 1e-10))
+        
+        alpha = state['base_alpha'] * cmo
+        if alpha != alpha:
+            alpha = state['base_alpha']
+        if state['bars'] == 0:
+            state['value'] = close
+        else:
+            state['value'] = alpha * close + (1 - alpha) * state['value']
+        state['bars'] += 1
+        return state['cross'].update(close, state['value'])
+    
     def generate_signals_fixed(self, data: pd.DataFrame, params: Dict) -> Dict[str, pd.Series]:
         vidya = self.calculate(data, params)
         entries = (data['close'] > vidya) & (data['close'].shift(1) <= vidya.shift(1))
@@ -71,16 +121,19 @@ class Indicator_VIDYA:
         in_position = False
         entry_price, tp_level, sl_level = 0, 0, 0
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         tp_levels = pd.Series(np.nan, index=data.index)
         sl_levels = pd.Series(np.nan, index=data.index)
@@ -114,7 +167,8 @@ class Indicator_VIDYA:
         return {k: v.get('values', []) for k, v in self.PARAMETERS.items() if v.get('optimize')}
     
     def backtest_vectorbt(self, data: pd.DataFrame, params: Dict, strategy_type: str = 'fixed',
-                         init_cash: float = 10000, fees: float = 0.0) -> vbt.Portfolio:
+                         init_cash: float = 10000, fees: float = 0.0) -> "vbt.Portfolio":
+        import vectorbt as vbt
         signals = self.generate_signals_fixed(data, params) if strategy_type == 'fixed' else self.generate_signals_dynamic(data, params)
         return vbt.Portfolio.from_signals(data['close'], entries=signals['entries'], exits=signals['exits'],
                                          tp_stop=signals.get('tp_levels'), sl_stop=signals.get('sl_levels'),
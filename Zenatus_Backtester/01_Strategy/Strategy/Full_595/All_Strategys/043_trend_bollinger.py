@@ -5,10 +5,13 @@ Volatilitäts-Indikator mit dynamischen Bändern
 
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
@@ -103,12 +106,13 @@ class Indicator_BollingerBands:
         multiplier = params.get('multiplier', self.PARAMETERS['multiplier']['default'])
         
         close = data['close']
+        p = getattr(self, 'primitives', None)
         
         # Middle Band (SMA)
-        middle = close.rolling(window=period, min_periods=1).mean()
+        middle = p.sma(close, period, min_periods=1) if p else close.rolling(window=period, min_periods=1).mean()
         
         # Standard Deviation
-        std_dev = close.rolling(window=period, min_periods=1).std()
+        std_dev = p.rolling_std(close, period, min_periods=1) if p else close.rolling(window=period, min_periods=1).std()
         
         # Upper and Lower Bands
         upper = middle + (std_dev * multiplier)
@@ -150,16 +154,19 @@ class Indicator_BollingerBands:
         in_position = False
         entry_price, tp_level, sl_level = 0, 0, 0
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         # Dummy TP/SL levels
         tp_levels = pd.Series(np.nan, index=data.index)
@@ -263,8 +270,9 @@ class Indicator_BollingerBands:
         strategy_type: str = 'fixed',
         init_cash: float = 10000,
         fees: float = 0.0
-    ) -> vbt.Portfolio:
+    ) -> "vbt.Portfolio":
         """Führt VectorBT Backtest durch."""
+        import vectorbt as vbt
         if strategy_type == 'fixed':
             signals = self.generate_signals_fixed(data, params)
         else:
@@ -5,10 +5,13 @@ Kombiniert Preis und Volumen für Trend-Stärke
 
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
@@ -40,12 +43,15 @@ class Indicator_ForceIndex:
         entries = (fi > 0) & (fi.shift(1) <= 0)
         tp_pips, sl_pips, pip = params.get('tp_pips', 50), params.get('sl_pips', 25), 0.0001
         exits, in_position, entry_price, tp_level, sl_level = pd.Series(False, index=data.index), False, 0, 0, 0
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position, entry_price = True, data['close'].iloc[i]
-                tp_level, sl_level = entry_price + (tp_pips * pip), entry_price - (sl_pips * pip)
-            elif in_position and (data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level):
-                exits.iloc[i], in_position = True, False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position, entry_price = True, data['close'].iloc[i]
+                    tp_level, sl_level = entry_price + (tp_pips * pip), entry_price - (sl_pips * pip)
+                elif in_position and (data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level):
+                    exits.iloc[i], in_position = True, False
         return {'entries': entries, 'exits': exits, 'tp_levels': pd.Series(np.nan, index=data.index), 
                 'sl_levels': pd.Series(np.nan, index=data.index), 'signal_strength': abs(fi).clip(0, 100000) / 100000}
     
@@ -67,7 +73,8 @@ class Indicator_ForceIndex:
     def get_parameter_grid(self) -> Dict:
         return {k: v.get('values', []) for k, v in self.PARAMETERS.items() if v.get('optimize')}
     
-    def backtest_vectorbt(self, data: pd.DataFrame, params: Dict, strategy_type: str = 'fixed', init_cash: float = 10000, fees: float = 0.0) -> vbt.Portfolio:
+    def backtest_vectorbt(self, data: pd.DataFrame, params: Dict, strategy_type: str = 'fixed', init_cash: float = 10000, fees: float = 0.0) -> "vbt.Portfolio":
+        import vectorbt as vbt
         signals = self.generate_signals_fixed(data, params) if strategy_type == 'fixed' else self.generate_signals_dynamic(data, params)
         return vbt.Portfolio.from_signals(data['close'], entries=signals['entries'], exits=signals['exits'],
                                          tp_stop=signals.get('tp_levels'), sl_stop=signals.get('sl_levels'), freq='30T', init_cash=init_cash, fees=fees)
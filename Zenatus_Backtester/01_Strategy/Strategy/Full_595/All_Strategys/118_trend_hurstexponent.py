@@ -1,10 +1,18 @@
 """118 - Hurst Exponent"""
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
+
+try:
+    from zenatus_core import kernels  # Numba kernels (Zenatus_Core on the path), otherwise the Python loops below
+except ImportError:
+    kernels = None
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
 __status__ = "Production"
@@ -26,62 +34,65 @@ class Indicator_HurstExponent:
         # Calculate Hurst Exponent using R/S analysis
         hurst = pd.Series(0.5, index=data.index)
         
-        for i in range(period, len(data)):
-            prices = data['close'].iloc[i-period:i].values
+        if kernels is not None:
+            hurst[:] = kernels.rolling_hurst_rs(data['close'].values, period)
+        else:
+            for i in range(period, len(data)):
+                prices = data['close'].iloc[i-period:i].values
             
-            if len(prices) < period:
-                continue
+                if len(prices) < period:
+                    continue
             
-            # Calculate log returns
-            returns = np.diff(np.log(prices,),)
+                # Calculate log returns
+                returns = np.diff(np.log(prices,),)
             
-            if len(returns) < 10:
-                continue
+                if len(returns) < 10:
+                    continue
             
-            # R/S Analysis
-            lags = range(2, min(20, len(returns) // 2))
-            rs_values = []
+                # R/S Analysis
+                lags = range(2, min(20, len(returns) // 2))
+                rs_values = []
             
-            for lag in lags:
-                # Split into chunks
-                n_chunks = len(returns) // lag
+                for lag in lags:
+                    # Split into chunks
+                    n_chunks = len(returns) // lag
                 
-                if n_chunks < 2:
-                    continue
+                    if n_chunks < 2:
+                        continue
                 
-                rs_chunk = []
-                for j in range(n_chunks):
-                    chunk = returns[j*lag:(j+1)*lag]
+                    rs_chunk = []
+                    for j in range(n_chunks):
+                        chunk = returns[j*lag:(j+1)*lag]
                     
-                    if len(chunk) < lag:
-                        continue
+                        if len(chunk) < lag:
+                            continue
                     
-                    # Mean
-                    mean = np.mean(chunk)
+                        # Mean
+                        mean = np.mean(chunk)
                     
-                    # Cumulative deviation
-                    cumdev = np.cumsum(chunk - mean)
+                        # Cumulative deviation
+                        cumdev = np.cumsum(chunk - mean)
                     
-                    # Range
-                    r = np.max(cumdev) - np.min(cumdev)
+                        # Range
+                        r = np.max(cumdev) - np.min(cumdev)
                     
-                    # Standard deviation
-                    s = np.std(chunk)
+                        # Standard deviation
+                        s = np.std(chunk)
                     
-                    if s > 0:
-                        rs_chunk.append(r / s)
+                        if s > 0:
+                            rs_chunk.append(r / s)
                 
-                if rs_chunk:
-                    rs_values.append(np.mean(rs_chunk))
+                    if rs_chunk:
+                        rs_values.append(np.mean(rs_chunk))
             
-            # Calculate Hurst exponent (slope of log-log plot)
-            if len(rs_values) > 2:
-                x = np.log(list(lags[:len(rs_values)]))
-                y = np.log(rs_values)
+                # Calculate Hurst exponent (slope of log-log plot)
+                if len(rs_values) > 2:
+                    x = np.log(list(lags[:len(rs_values)]))
+                    y = np.log(rs_values)
                 
-                if np.std(x) > 0:
-                    h = np.polyfit(x, y, 1)[0]
-                    hurst.iloc[i] = np.clip(h, 0, 1)
+                    if np.std(x) > 0:
+                        h = np.polyfit(x, y, 1)[0]
+                        hurst.iloc[i] = np.clip(h, 0, 1)
         
         return hurst.fillna(0.5)
     
@@ -103,16 +114,19 @@ class Indicator_HurstExponent:
         exits = pd.Series(False, index=data.index)
         in_position = False
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         return {
             'entries': entries,
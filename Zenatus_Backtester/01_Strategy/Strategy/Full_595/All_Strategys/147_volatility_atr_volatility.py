@@ -1,10 +1,17 @@
 """147 - ATR Volatility"""
 import numpy as np
 import pandas as pd
-import vectorbt as vbt
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
+try:
+    from zenatus_core import incremental  # init_state/update (Live/Paper-Trading), otherwise batch only
+except ImportError:
+    incremental = None
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 
 class Indicator_ATRVolatility:
     """ATR Volatility - Normalized Volatility Measure"""
@@ -21,6 +28,16 @@ class Indicator_ATRVolatility:
         atr_std = atr_normalized.rolling(atr_period).std()
         volatility_ratio = (atr_normalized - atr_smooth) / atr_std
         return pd.DataFrame({'atr': atr, 'atr_normalized': atr_normalized, 'volatility_ratio': volatility_ratio})
+    def init_state(self, params):
+        if incremental is None: raise ImportError("init_state/update need zenatus_core.incremental (Zenatus_Core on the path)")
+        atr_period, smooth_period = params.get('atr_period', 14), params.get('smooth_period', 5)
+        return {'threshold': params.get('threshold', 1.5), 'atr': incremental.Atr(atr_period), 'smooth': incremental.RollingMean(smooth_period), 'std': incremental.RollingStd(atr_period), 'cross': incremental.CrossAbove(), 'value': None}
+    def update(self, state, bar):
+        atr = state['atr'].update(bar['high'], bar['low'], bar['close'])
+        atr_normalized = incremental.div(atr, bar['close']) * 100
+        volatility_ratio = incremental.div(atr_normalized - state['smooth'].update(atr_normalized), state['std'].update(atr_normalized))
+        state['value'] = {'atr': atr, 'atr_normalized': atr_normalized, 'volatility_ratio': volatility_ratio}
+        return state['cross'].update(volatility_ratio, state['threshold'])
     def generate_signals_fixed(self, data, params):
         vol = self.calculate(data, params)
         threshold = params.get('threshold', 1.5)
@@ -29,16 +46,19 @@ class Indicator_ATRVolatility:
         exits = pd.Series(False, index=data.index)
         in_position = False
         entry_price, tp_level, sl_level = 0, 0, 0
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         tp_levels = pd.Series(np.nan, index=data.index)
         sl_levels = pd.Series(np.nan, index=data.index)
         signal_strength = abs(vol['volatility_ratio']) / 3.0
@@ -63,5 +83,6 @@ class Indicator_ATRVolatility:
     def validate_params(self, params): pass
     def get_parameter_grid(self): return {k: v.get('values', []) for k, v in self.PARAMETERS.items() if v.get('optimize')}
     def backtest_vectorbt(self, data, params, strategy_type='fixed', init_cash=10000, fees=0.0):
+        import vectorbt as vbt
         signals = self.generate_signals_fixed(data, params) if strategy_type == 'fixed' else self.generate_signals_dynamic(data, params)
         return vbt.Portfolio.from_signals(data['close'], entries=signals['entries'], exits=signals['exits'], tp_stop=signals.get('tp_levels'), sl_stop=signals.get('sl_levels'), freq='30T', init_cash=init_cash, fees=fees)
@@ -5,6 +5,15 @@ import pandas as pd
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
+
+try:
+    from zenatus_core import kernels  # Numba kernels (Zenatus_Core on the path), otherwise the Python loops below
+except ImportError:
+    kernels = None
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
 __status__ = "Production"
@@ -30,43 +39,47 @@ class Indicator_VolumeProfile:
         value_area_high = pd.Series(index=data.index, dtype=float)
         value_area_low = pd.Series(index=data.index, dtype=float)
         
-        for i in range(period, len(data)):
-            window_data = data.iloc[i-period:i]
+        if kernels is not None:
+            poc[:], value_area_high[:], value_area_low[:] = kernels.rolling_volume_profile_nb(
+                *(data[c].values.astype(np.float64) for c in ('high', 'low', 'close', 'volume')), period, bins, 0.7)
+        else:
+            for i in range(period, len(data)):
+                window_data = data.iloc[i-period:i]
             
-            # Create price bins
-            price_min = window_data['low'].min()
-            price_max = window_data['high'].max()
-            price_bins = np.linspace(price_min, price_max, bins)
+                # Create price bins
+                price_min = window_data['low'].min()
+                price_max = window_data['high'].max()
+                price_bins = np.linspace(price_min, price_max, bins)
             
-            # Assign volume to bins
-            typical_price = (window_data['high'] + window_data['low'] + window_data['close']) / 3
-            vol_profile = np.zeros(bins-1)
+                # Assign volume to bins
+                typical_price = (window_data['high'] + window_data['low'] + window_data['close']) / 3
+                vol_profile = np.zeros(bins-1)
             
-            for j, (tp, vol) in enumerate(zip(typical_price, window_data['volume'])):
-                bin_idx = np.digitize(tp, price_bins) - 1
-                if 0 <= bin_idx < len(vol_profile):
-                    vol_profile[bin_idx] += vol
+                for j, (tp, vol) in enumerate(zip(typical_price, window_data['volume'])):
+                    bin_idx = np.digitize(tp, price_bins) - 1
+                    if 0 <= bin_idx < len(vol_profile):
+                        vol_profile[bin_idx] += vol
             
-            # POC = price level with highest volume
-            if len(vol_profile) > 0 and vol_profile.sum() > 0:
-                poc_idx = np.argmax(vol_profile)
-                poc.iloc[i] = (price_bins[poc_idx] + price_bins[poc_idx+1]) / 2
+                # POC = price level with highest volume
+                if len(vol_profile) > 0 and vol_profile.sum() > 0:
+                    poc_idx = np.argmax(vol_profile)
+                    poc.iloc[i] = (price_bins[poc_idx] + price_bins[poc_idx+1]) / 2
                 
-                # Value area (70% of volume)
-                sorted_idx = np.argsort(vol_profile)[::-1]
-                cumsum = 0
-                total_vol = vol_profile.sum()
-                value_bins = []
+                    # Value area (70% of volume)
+                    sorted_idx = np.argsort(vol_profile)[::-1]
+                    cumsum = 0
+                    total_vol = vol_profile.sum()
+                    value_bins = []
                 
-                for idx in sorted_idx:
-                    cumsum += vol_profile[idx]
-                    value_bins.append(idx)
-                    if cumsum >= total_vol * 0.7:
-                        break
+                    for idx in sorted_idx:
+                        cumsum += vol_profile[idx]
+                        value_bins.append(idx)
+                        if cumsum >= total_vol * 0.7:
+                            break
                 
-                if value_bins:
-                    value_area_high.iloc[i] = price_bins[max(value_bins)+1]
-                    value_area_low.iloc[i] = price_bins[min(value_bins)]
+                    if value_bins:
+                        value_area_high.iloc[i] = price_bins[max(value_bins)+1]
+                        value_area_low.iloc[i] = price_bins[min(value_bins)]
         
         # Fill NaN
         poc = poc.fillna(method='ffill')
@@ -97,16 +110,19 @@ class Indicator_VolumeProfile:
         exits = pd.Series(False, index=data.index)
         in_position = False
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         return {
             'entries': entries,
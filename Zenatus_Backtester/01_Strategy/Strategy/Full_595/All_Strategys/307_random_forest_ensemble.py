@@ -5,6 +5,10 @@ import pandas as pd
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
 __status__ = "Production"
@@ -27,21 +31,25 @@ class Indicator_RandomForestEnsemble:
         
         # Create multiple simple decision rules (trees)
         votes = []
+        p = getattr(self, 'primitives', None)
         
         # Tree 1: Price vs SMA
-        sma = data['close'].rolling(period).mean()
+        sma = p.sma(data['close'], period) if p else data['close'].rolling(period).mean()
         votes.append((data['close'] > sma).astype(int))
         
         # Tree 2: RSI
-        delta = data['close'].diff()
-        gain = delta.where(delta > 0, 0).rolling(period).mean()
-        loss = -delta.where(delta < 0, 0).rolling(period).mean()
-        rs = gain / (loss + 1e-10)
-        rsi = 100 - (100 / (1 + rs))
+        if p:
+            rsi = p.rsi(data['close'], period)
+        else:
+            delta = data['close'].diff()
+            gain = delta.where(delta > 0, 0).rolling(period).mean()
+            loss = -delta.where(delta < 0, 0).rolling(period).mean()
+            rs = gain / (loss + 1e-10)
+            rsi = 100 - (100 / (1 + rs))
         votes.append((rsi < 70).astype(int))
         
         # Tree 3: Volume
-        vol_ma = data['volume'].rolling(period).mean()
+        vol_ma = p.sma(data['volume'], period) if p else data['volume'].rolling(period).mean()
         votes.append((data['volume'] > vol_ma).astype(int))
         
         # Tree 4: Momentum
@@ -55,13 +63,13 @@ class Indicator_RandomForestEnsemble:
         votes.append((volatility < vol_ma * 1.5).astype(int))
         
         # Tree 6: MACD
-        ema_12 = data['close'].ewm(span=12).mean()
-        ema_26 = data['close'].ewm(span=26).mean()
+        ema_12 = p.ema(data['close'], 12) if p else data['close'].ewm(span=12).mean()
+        ema_26 = p.ema(data['close'], 26) if p else data['close'].ewm(span=26).mean()
         macd = ema_12 - ema_26
         votes.append((macd > 0).astype(int))
         
         # Tree 7: Bollinger Bands
-        bb_std = data['close'].rolling(period).std()
+        bb_std = p.rolling_std(data['close'], period) if p else data['close'].rolling(period).std()
         bb_upper = sma + 2 * bb_std
         bb_lower = sma - 2 * bb_std
         votes.append((data['close'] > bb_lower).astype(int))
@@ -74,8 +82,8 @@ class Indicator_RandomForestEnsemble:
         votes.append((adx_signal > 0.3).astype(int))
         
         # Tree 9: Stochastic
-        low_min = data['low'].rolling(period).min()
-        high_max = data['high'].rolling(period).max()
+        low_min = p.rolling_min(data['low'], period) if p else data['low'].rolling(period).min()
+        high_max = p.rolling_max(data['high'], period) if p else data['high'].rolling(period).max()
         stoch = (data['close'] - low_min) / (high_max - low_min + 1e-10) * 100
         votes.append((stoch < 80).astype(int))
         
@@ -112,16 +120,19 @@ class Indicator_RandomForestEnsemble:
         exits = pd.Series(False, index=data.index)
         in_position = False
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         return {
             'entries': entries,
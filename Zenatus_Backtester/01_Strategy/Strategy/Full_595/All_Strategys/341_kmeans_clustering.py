@@ -5,6 +5,15 @@ import pandas as pd
 from typing import Dict
 import warnings
 warnings.filterwarnings("ignore")
+
+try:
+    from zenatus_core import kernels  # Numba kernels (Zenatus_Core on the path), otherwise the Python loops below
+except ImportError:
+    kernels = None
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 __version__ = "1.0.0"
 __author__ = "Nikola Cedomir Petar Cekic"
 __status__ = "Production"
@@ -38,37 +47,47 @@ class Indicator_KMeansClustering:
         cluster_labels = pd.Series(0, index=data.index)
         cluster_centers = []
         
-        for i in range(period, len(data)):
-            window = features.iloc[i-period:i]
+        if kernels is not None:
+            # Same quantiles as window.quantile (DataFrame.quantile goes through np.percentile)
+            quantiles = np.array([(k + 1) / (n_clusters + 1) for k in range(n_clusters)]) * 100.0 / 100
+            cluster_labels[:] = kernels.rolling_quantile_clusters_nb(
+                np.ascontiguousarray(features.values, dtype=np.float64), period, quantiles)
+        else:
+            for i in range(period, len(data)):
+                window = features.iloc[i-period:i]
             
-            # Initialize centroids (simple: use quantiles)
-            centroids = []
-            for k in range(n_clusters):
-                quantile = (k + 1) / (n_clusters + 1)
-                centroid = window.quantile(quantile).values
-                centroids.append(centroid)
+                # Initialize centroids (simple: use quantiles)
+                centroids = []
+                for k in range(n_clusters):
+                    quantile = (k + 1) / (n_clusters + 1)
+                    centroid = window.quantile(quantile).values
+                    centroids.append(centroid)
             
-            # Assign current point to nearest cluster
-            current = features.iloc[i].values
-            distances = [np.linalg.norm(current - c) for c in centroids]
-            cluster_labels.iloc[i] = np.argmin(distances)
+                # Assign current point to nearest cluster
+                current = features.iloc[i].values
+                distances = [np.linalg.norm(current - c) for c in centroids]
+                cluster_labels.iloc[i] = np.argmin(distances)
         
         # Analyze cluster performance
         future_returns = returns.shift(-1)
         
         cluster_performance = pd.Series(0.0, index=data.index)
         
-        for i in range(period, len(data)):
-            current_cluster = cluster_labels.iloc[i]
+        if kernels is not None:
+            performance = kernels.rolling_label_hit_rate_nb(cluster_labels.values, future_returns.values, period, 0.5)
+            cluster_performance.iloc[period:] = performance[period:]
+        else:
+            for i in range(period, len(data)):
+                current_cluster = cluster_labels.iloc[i]
             
-            # Historical performance of this cluster
-            cluster_mask = (cluster_labels.iloc[i-period:i] == current_cluster)
+                # Historical performance of this cluster
+                cluster_mask = (cluster_labels.iloc[i-period:i] == current_cluster)
             
-            if cluster_mask.sum() > 0:
-                cluster_returns = future_returns.iloc[i-period:i][cluster_mask]
-                cluster_performance.iloc[i] = (cluster_returns > 0).mean()
-            else:
-                cluster_performance.iloc[i] = 0.5
+                if cluster_mask.sum() > 0:
+                    cluster_returns = future_returns.iloc[i-period:i][cluster_mask]
+                    cluster_performance.iloc[i] = (cluster_returns > 0).mean()
+                else:
+                    cluster_performance.iloc[i] = 0.5
         
         # Smooth
         cluster_smooth = cluster_performance.rolling(5).mean()
@@ -93,16 +112,19 @@ class Indicator_KMeansClustering:
         exits = pd.Series(False, index=data.index)
         in_position = False
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip)
-                sl_level = entry_price - (sl_pips * pip)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip)
+                    sl_level = entry_price - (sl_pips * pip)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         return {
             'entries': entries,
@@ -24,7 +24,10 @@ ML-Ready: Yes (extracts 10+ features)
 import numpy as np
 import pandas as pd
 from typing import Dict, Tuple, Optional
-import talib
+try:
+    from zenatus_core.signals import fixed_exits  # Compiled TP/SL exit loop (Zenatus_Core on the path), otherwise the loop below
+except ImportError:
+    fixed_exits = None
 
 
 class Indicator_ExecutionQualityScore:
@@ -49,6 +52,7 @@ class Indicator_ExecutionQualityScore:
         - impact_period: Period for impact estimation (default: 13)
         - slippage_period: Period for slippage analysis (default: 8)
         """
+        import talib
         quality_period = params.get('quality_period', 21)
         impact_period = params.get('impact_period', 13)
         slippage_period = params.get('slippage_period', 8)
@@ -142,16 +146,19 @@ class Indicator_ExecutionQualityScore:
         in_position = False
         entry_price, tp_level, sl_level = 0, 0, 0
         
-        for i in range(1, len(data)):
-            if entries.iloc[i] and not in_position:
-                in_position = True
-                entry_price = data['close'].iloc[i]
-                tp_level = entry_price + (tp_pips * pip_value)
-                sl_level = entry_price - (sl_pips * pip_value)
-            elif in_position:
-                if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
-                    exits.iloc[i] = True
-                    in_position = False
+        if not getattr(self, 'signals_only', False) and fixed_exits is not None:
+            exits = fixed_exits(data, entries, tp_pips, sl_pips, pip_value)
+        elif not getattr(self, 'signals_only', False):
+            for i in range(1, len(data)):
+                if entries.iloc[i] and not in_position:
+                    in_position = True
+                    entry_price = data['close'].iloc[i]
+                    tp_level = entry_price + (tp_pips * pip_value)
+                    sl_level = entry_price - (sl_pips * pip_value)
+                elif in_position:
+                    if data['high'].iloc[i] >= tp_level or data['low'].iloc[i] <= sl_level:
+                        exits.iloc[i] = True
+                        in_position = False
         
         # Dummy levels
         tp_levels = pd.Series(np.nan, index=data.index)
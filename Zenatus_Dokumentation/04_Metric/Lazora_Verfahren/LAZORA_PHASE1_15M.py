@@ -17,6 +17,7 @@ import time
 import pandas as pd
 import numpy as np
 import importlib.util
+import os
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, TimeoutError
 import multiprocessing
 from datetime import datetime
@@ -45,6 +46,27 @@ HEATMAP_PATH = BASE_PATH / "08_Heatmaps" / "Fixed_Exit"
 CHECKPOINT_PATH = OUTPUT_PATH / "CHECKPOINTS"
 CHECKPOINT_PATH.mkdir(parents=True, exist_ok=True)
 
+# Strategy registry of Zenatus_Core (optional): index of INDICATORS_PATH, re-parsed only for changed sources
+CORE_PATH = Path(os.environ.get("ZENATUS_BASE_PATH", r"/opt/Zenatus_Backtester")) / "00_Backtester" / "Zenatus_Core"
+sys.path.insert(0, str(CORE_PATH))
+try:
+    from zenatus_core.registry import StrategyRegistry
+    REGISTRY = StrategyRegistry(INDICATORS_PATH, CHECKPOINT_PATH / "strategy_registry.json")
+except (ImportError, OSError):
+    REGISTRY = None
+# OHLCV store of Zenatus_Core (optional): memory-mapped bars if converted, else the aggregated file as before
+try:
+    from zenatus_core.store import load_ohlcv
+except ImportError:
+    load_ohlcv = None
+# Entry signal cache (optional): entries of an unchanged strategy source on unchanged bars are read from disk
+try:
+    from zenatus_core.signal_cache import SignalCache
+    from zenatus_core.store import frame_hash
+    SIGNALS = SignalCache(CHECKPOINT_PATH / "signal_cache") if REGISTRY is not None else None
+except ImportError:
+    SIGNALS = None
+
 TIMEFRAME = '15m'
 FREQ = '15T'
 SYMBOLS = ['EUR_USD', 'GBP_USD', 'USD_JPY', 'AUD_USD', 'USD_CAD', 'NZD_USD']
@@ -124,14 +146,20 @@ SL_VALUES = [10, 15, 20, 25, 30, 40, 50, 60, 75, 100, 125, 150]
 DATA_CACHE = {}
 print("\nLoading data...")
 for symbol in SYMBOLS:
-    fp = DATA_PATH / TIMEFRAME / symbol / f"{symbol}_aggregated.csv"
-    if not fp.exists():
-        continue
-    df = pd.read_csv(fp)
-    df.columns = [c.lower() for c in df.columns]
-    df['time'] = pd.to_datetime(df['time'])
-    df.set_index('time', inplace=True)
-    df = df[(df.index >= DATE_START) & (df.index < DATE_END)]
+    if load_ohlcv is not None:
+        # Zenatus_Core/CONVERT_OHLCV_STORE.py converts DATA_PATH once; unconverted symbols parse the CSV/parquet
+        df = load_ohlcv(DATA_PATH, TIMEFRAME, symbol, DATE_START, DATE_END)
+        if df is None:
+            continue
+    else:
+        fp = DATA_PATH / TIMEFRAME / symbol / f"{symbol}_aggregated.csv"
+        if not fp.exists():
+            continue
+        df = pd.read_csv(fp)
+        df.columns = [c.lower() for c in df.columns]
+        df['time'] = pd.to_datetime(df['time'])
+        df.set_index('time', inplace=True)
+        df = df[(df.index >= DATE_START) & (df.index < DATE_END)]
     
     df_train = df[(df.index >= DATE_START) & (df.index < TRAIN_END)]
     df_test = df[(df.index >= TEST_START) & (df.index < DATE_END)]
@@ -141,6 +169,8 @@ for symbol in SYMBOLS:
         'train': df_train,
         'test': df_test
     }
+    if SIGNALS is not None:
+        DATA_CACHE[symbol]['hash'] = {part: frame_hash(DATA_CACHE[symbol][part]) for part in ('full', 'train', 'test')}
     print(f"  {symbol}: {len(df)} bars (Train: {len(df_train)}, Test: {len(df_test)})")
 
 # ============================================================================
@@ -336,6 +366,24 @@ def backtest_combination(df, entries, tp_pips, sl_pips, spread_pips):
         # Silent fail - return None (expected for some combos)
         return None
 
+def cached_entries(ind_instance, ind_name, symbol, part, entry_params):
+    """Entries of one param set on DATA_CACHE[symbol][part] ('train', 'test', 'full'), from the signal cache if possible"""
+    df = DATA_CACHE[symbol][part]
+    
+    def compute():
+        entries = ind_instance.generate_signals_fixed(df, entry_params)['entries']
+        if isinstance(entries, np.ndarray):
+            entries = pd.Series(entries, index=df.index)
+        return entries.fillna(False).astype(bool).values
+    
+    # Source + used zenatus_core modules; None for unknown and random strategies (not cached)
+    strategy_hash = REGISTRY.signal_hash(ind_name) if SIGNALS is not None else None
+    if strategy_hash is None:
+        return pd.Series(compute(), index=df.index)
+    start, end = {'train': (DATE_START, TRAIN_END), 'test': (TEST_START, DATE_END), 'full': (DATE_START, DATE_END)}[part]
+    scope = SIGNALS.scope(strategy_hash, DATA_CACHE[symbol]['hash'][part], TIMEFRAME, start, end)
+    return pd.Series(SIGNALS.entries(scope, entry_params, len(df), compute), index=df.index)
+
 # ============================================================================
 # SYMBOL TESTING FUNCTION (for parallel execution)
 # ============================================================================
@@ -393,12 +441,7 @@ def test_symbol_for_indicator(symbol, ind_instance, ind_num, ind_name, sobol_com
     
     for param_key, entry_params in unique_params.items():
         try:
-            signals = ind_instance.generate_signals_fixed(df_train, entry_params)
-            entries = signals['entries'].values
-            
-            if isinstance(entries, np.ndarray):
-                entries = pd.Series(entries, index=df_train.index)
-            entries = entries.fillna(False).astype(bool)
+            entries = cached_entries(ind_instance, ind_name, symbol, 'train', entry_params)
             
             if entries.sum() >= 3:
                 precomputed_signals[param_key] = entries.values
@@ -583,11 +626,8 @@ def test_symbol_for_indicator(symbol, ind_instance, ind_num, ind_name, sobol_com
         
         for param_key, entry_params in top_unique_params.items():
             try:
-                signals_test = ind_instance.generate_signals_fixed(df_test, entry_params)
-                precomputed_test[param_key] = signals_test['entries'].fillna(False).astype(bool)
-                
-                signals_full = ind_instance.generate_signals_fixed(df_full, entry_params)
-                precomputed_full[param_key] = signals_full['entries'].fillna(False).astype(bool)
+                precomputed_test[param_key] = cached_entries(ind_instance, ind_name, symbol, 'test', entry_params)
+                precomputed_full[param_key] = cached_entries(ind_instance, ind_name, symbol, 'full', entry_params)
             except:
                 continue
         
@@ -732,6 +772,25 @@ def test_symbol_for_indicator(symbol, ind_instance, ind_num, ind_name, sobol_com
 # MAIN TESTING FUNCTION
 # ============================================================================
 
+def find_class_name(ind_num, ind_name, names):
+    """Indicator class among names (dir(module) or the registry's class names), None if no pattern matches."""
+    # Pattern 1: Exact match with filename
+    for attr in names:
+        if attr.lower() == ind_name.lower():
+            return attr
+    
+    # Pattern 2: Look for "Indicator_*" classes
+    for attr in names:
+        if attr.startswith('Indicator_') and not attr.startswith('_'):
+            return attr
+    
+    # Pattern 3: Look for any class that contains indicator number
+    ind_num_str = f"{ind_num:03d}"
+    for attr in names:
+        if ind_num_str in attr and attr[0].isupper():
+            return attr
+    return None
+
 def test_indicator(ind_file):
     ind_name = ind_file.stem
     try:
@@ -752,41 +811,25 @@ def test_indicator(ind_file):
     print(f"\n[START] Ind#{ind_num:03d} | {ind_name} | Loading indicator class...")
     
     try:
-        spec = importlib.util.spec_from_file_location(ind_name, ind_file)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        
-        print(f"[LOAD] Ind#{ind_num:03d} | Module loaded, searching for class...")
-        
-        # Try multiple class name patterns
-        class_name = None
-        
-        # Pattern 1: Exact match with filename
-        for attr in dir(module):
-            if attr.lower() == ind_name.lower():
-                class_name = attr
-                break
-        
-        # Pattern 2: Look for "Indicator_*" classes
-        if not class_name:
-            for attr in dir(module):
-                if attr.startswith('Indicator_') and not attr.startswith('_'):
-                    class_name = attr
-                    break
-        
-        # Pattern 3: Look for any class that contains indicator number
-        if not class_name:
-            ind_num_str = f"{ind_num:03d}"
-            for attr in dir(module):
-                if ind_num_str in attr and attr[0].isupper():
-                    class_name = attr
-                    break
-        
-        if not class_name:
-            print(f"[ERROR] Ind#{ind_num:03d} | Class not found! Available: {[a for a in dir(module) if not a.startswith('_')][:5]}")
-            return None
+        # Registry index first (class names from the AST, no dir() scan), else the module; same name patterns
+        entry = REGISTRY.entry(ind_name) if REGISTRY is not None else None
+        class_name = find_class_name(ind_num, ind_name, entry.get("classes", [])) if entry else None
+        ind_class = REGISTRY.load_class(ind_name, class_name) if class_name else None
+        if ind_class is None:
+            spec = importlib.util.spec_from_file_location(ind_name, ind_file)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        
+            print(f"[LOAD] Ind#{ind_num:03d} | Module loaded, searching for class...")
+        
+            class_name = find_class_name(ind_num, ind_name, dir(module))
+        
+            if not class_name:
+                print(f"[ERROR] Ind#{ind_num:03d} | Class not found! Available: {[a for a in dir(module) if not a.startswith('_')][:5]}")
+                return None
         
-        ind_instance = getattr(module, class_name)()
+            ind_class = getattr(module, class_name)
+        ind_instance = ind_class()
         print(f"[LOAD] Ind#{ind_num:03d} | Class instantiated, generating Sobol samples...")
         
         # Generate Sobol samples
@@ -892,7 +935,10 @@ log("="*80)
 log(f"LAZORA PHASE 1 START - {TIMEFRAME}")
 log("="*80)
 
-all_indicators = sorted(INDICATORS_PATH.glob("*.py"))
+if REGISTRY is not None:
+    all_indicators = [REGISTRY.path(name) for name in REGISTRY.names()]
+else:
+    all_indicators = sorted(INDICATORS_PATH.glob("*.py"))
 checkpoint = load_checkpoint()
 completed = checkpoint['completed_indicators']
 